@@ -0,0 +1,282 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from core.models import AppliedControl, Asset, Evidence
+from iam.models import Folder
+
+from test_utils import EndpointTestsUtils
+
+
+@pytest.mark.django_db
+class TestBulkEndpoints:
+    """Perform tests on the bulk create/update endpoints"""
+
+    def test_bulk_create_assets(self, authenticated_client):
+        folder = Folder.objects.create(name="test")
+        parent = Asset.objects.create(name="parent", type="PR", folder=folder)
+
+        response = authenticated_client.post(
+            reverse("assets-bulk"),
+            {
+                "mode": "create",
+                "items": [
+                    {
+                        "name": f"asset {i}",
+                        "type": "SP",
+                        "folder": str(folder.id),
+                        "parent_assets": [str(parent.id)],
+                    }
+                    for i in range(3)
+                ]
+                + [{"name": "asset 0", "type": "SP", "folder": str(folder.id)}],
+            },
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED, response.json()
+        data = response.json()
+        assert (data["created"], data["errors"]) == (3, 1)
+        assert data["results"][3]["status"] == "error"
+        assert "name" in data["results"][3]["errors"]
+        assert set(parent.child_assets.values_list("name", flat=True)) == {
+            "asset 0",
+            "asset 1",
+            "asset 2",
+        }
+
+    def test_bulk_upsert_applied_controls_by_ref_id(self, authenticated_client):
+        folder = Folder.objects.create(name="test")
+        existing = AppliedControl.objects.create(
+            name="existing", ref_id="AC-1", folder=folder
+        )
+
+        response = authenticated_client.post(
+            reverse("applied-controls-bulk"),
+            {
+                "mode": "upsert",
+                "match_on": "ref_id",
+                "items": [
+                    {"ref_id": "AC-1", "status": "active"},
+                    {"ref_id": "AC-2", "name": "new", "folder": str(folder.id)},
+                ],
+            },
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED, response.json()
+        assert [r["status"] for r in response.json()["results"]] == [
+            "updated",
+            "created",
+        ]
+        existing.refresh_from_db()
+        assert existing.status == "active"
+        assert existing.progress_field == 100
+        assert AppliedControl.objects.get(ref_id="AC-2").name == "new"
+
+    def test_bulk_upsert_by_ref_id_is_scoped_to_the_given_folder(
+        self, authenticated_client
+    ):
+        folders = [Folder.objects.create(name=name) for name in ("first", "second")]
+        for folder in folders:
+            AppliedControl.objects.create(
+                name=folder.name, ref_id="AC-1", folder=folder
+            )
+
+        response = authenticated_client.post(
+            reverse("applied-controls-bulk"),
+            {
+                "mode": "upsert",
+                "match_on": "ref_id",
+                "items": [
+                    {"ref_id": "AC-1", "status": status_, "folder": str(folder.id)}
+                    for folder, status_ in zip(folders, ("active", "deprecated"))
+                ],
+            },
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_200_OK, response.json()
+        assert [r["status"] for r in response.json()["results"]] == [
+            "updated",
+            "updated",
+        ]
+        assert dict(AppliedControl.objects.values_list("folder__name", "status")) == {
+            "first": "active",
+            "second": "deprecated",
+        }
+
+    def test_bulk_upsert_does_not_match_objects_out_of_view(self, authenticated_client):
+        client, outside_folder, folder = EndpointTestsUtils.get_test_client_and_folder(
+            authenticated_client, "BI-UG-DMA", "test_outside_domain"
+        )
+        visible = AppliedControl.objects.create(
+            name="visible", ref_id="AC-1", folder=folder
+        )
+        hidden = AppliedControl.objects.create(
+            name="hidden", ref_id="AC-1", folder=outside_folder
+        )
+
+        response = client.post(
+            reverse("applied-controls-bulk"),
+            {
+                "mode": "upsert",
+                "match_on": "ref_id",
+                "items": [{"ref_id": "AC-1", "status": "active"}],
+            },
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_200_OK, response.json()
+        assert response.json()["results"][0]["id"] == str(visible.id)
+        visible.refresh_from_db()
+        hidden.refresh_from_db()
+        assert (visible.status, hidden.status) == ("active", "--")
+
+    def test_bulk_publishes_root_folder_objects_like_single_creation(
+        self, authenticated_client
+    ):
+        root_folder = Folder.get_root_folder()
+        item = {"type": "PR", "folder": str(root_folder.id), "is_published": False}
+
+        response = authenticated_client.post(
+            reverse("assets-list"), {"name": "single", **item}, format="json"
+        )
+        assert response.status_code == status.HTTP_201_CREATED, response.json()
+        response = authenticated_client.post(
+            reverse("assets-bulk"),
+            {"mode": "create", "items": [{"name": "bulk", **item}]},
+            format="json",
+        )
+        assert response.status_code == status.HTTP_201_CREATED, response.json()
+
+        assert dict(Asset.objects.values_list("name", "is_published")) == {
+            "single": True,
+            "bulk": True,
+        }
+
+    def test_bulk_invalidates_caches_once_per_batch(
+        self, authenticated_client, monkeypatch, django_capture_on_commit_callbacks
+    ):
+        from core.asset_graph_cache import ASSET_GRAPH_CACHE_KEY
+        from core.bounded_contexts.security_graph.services.graph_builder import (
+            get_graph_builder,
+        )
+        from iam.snapshot_cache import VersionStore
+
+        folder = Folder.objects.create(name="test")
+        bumps, graph_invalidations = [], []
+        bump = VersionStore.bump
+        monkeypatch.setattr(
+            VersionStore, "bump", lambda key: bumps.append(key) or bump(key)
+        )
+        monkeypatch.setattr(
+            get_graph_builder(), "invalidate_assets", graph_invalidations.append
+        )
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = authenticated_client.post(
+                reverse("assets-bulk"),
+                {
+                    "mode": "create",
+                    "items": [
+                        {"name": f"asset {i}", "type": "PR", "folder": str(folder.id)}
+                        for i in range(5)
+                    ],
+                },
+                format="json",
+            )
+
+        assert response.status_code == status.HTTP_201_CREATED, response.json()
+        assert bumps.count(ASSET_GRAPH_CACHE_KEY) == 1
+        assert len(graph_invalidations) == 1
+        assert {asset_id for asset_id, _ in graph_invalidations[0]} == set(
+            Asset.objects.filter(folder=folder).values_list("id", flat=True)
+        )
+
+    def test_bulk_atomic_rejects_whole_batch(self, authenticated_client):
+        folder = Folder.objects.create(name="test")
+        items = [
+            {"name": "evidence", "folder": str(folder.id)},
+            {"folder": str(folder.id)},
+        ]
+
+        response = authenticated_client.post(
+            reverse("evidences-bulk"),
+            {"mode": "create", "atomic": True, "items": items},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["results"][0]["index"] == 1
+        assert not Evidence.objects.filter(name="evidence").exists()
+
+        response = authenticated_client.post(
+            reverse("evidences-bulk"),
+            {"mode": "create", "items": items},
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED, response.json()
+        evidence = Evidence.objects.get(name="evidence")
+        assert evidence.revisions.count() == 1
+
+    def test_bulk_creates_filtering_labels_given_by_name(self, authenticated_client):
+        folder = Folder.objects.create(name="test")
+
+        response = authenticated_client.post(
+            reverse("applied-controls-bulk"),
+            {
+                "mode": "create",
+                "items": [
+                    {
+                        "name": "labelled",
+                        "folder": str(folder.id),
+                        "filtering_labels": ["critical"],
+                    }
+                ],
+            },
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED, response.json()
+        control = AppliedControl.objects.get(name="labelled")
+        assert list(control.filtering_labels.values_list("label", flat=True)) == [
+            "critical"
+        ]
+
+    def test_bulk_reports_unexpected_errors_per_item(
+        self, authenticated_client, monkeypatch
+    ):
+        from django.db import IntegrityError
+
+        from core.views import BulkWriteMixin
+
+        folder = Folder.objects.create(name="test")
+        prepare_item = BulkWriteMixin._bulk_prepare_item
+
+        def failing_prepare_item(self, request, item, instance, can_add):
+            if item["name"] == "conflicting":
+                raise IntegrityError("duplicate key")
+            return prepare_item(self, request, item, instance, can_add)
+
+        monkeypatch.setattr(BulkWriteMixin, "_bulk_prepare_item", failing_prepare_item)
+
+        response = authenticated_client.post(
+            reverse("evidences-bulk"),
+            {
+                "mode": "create",
+                "items": [
+                    {"name": "conflicting", "folder": str(folder.id)},
+                    {"name": "valid", "folder": str(folder.id)},
+                ],
+            },
+            format="json",
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED, response.json()
+        assert [r["status"] for r in response.json()["results"]] == [
+            "error",
+            "created",
+        ]
+        assert Evidence.objects.filter(name="valid").exists()
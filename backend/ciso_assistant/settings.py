@@ -243,6 +243,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "global_settings.middleware.GlobalSettingsCacheMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -700,7 +701,54 @@ elif TASK_QUEUE_BACKEND == "celery":
 
 AUDITLOG_RETENTION_DAYS = int(os.environ.get("AUDITLOG_RETENTION_DAYS", 90))
 AUDITLOG_MAX_RECORDS = int(os.environ.get("AUDITLOG_MAX_RECORDS", 50000))
+# Number of entries deleted per transaction when pruning the audit log
+AUDITLOG_PRUNE_BATCH_SIZE = int(os.environ.get("AUDITLOG_PRUNE_BATCH_SIZE", 10000))
+# Write the audit log entries of a request in bulk once its transactions commit
+AUDITLOG_BUFFERED = os.environ.get("AUDITLOG_BUFFERED", "False") == "True"
+AUDITLOG_BUFFER_SIZE = int(os.environ.get("AUDITLOG_BUFFER_SIZE", 1000))
+
+# Number of workflow nodes waiting on I/O (HTTP, email, connectors...) run at
+# the same time by an execution
+WORKFLOW_MAX_PARALLEL_NODES = int(os.environ.get("WORKFLOW_MAX_PARALLEL_NODES", 4))
+
+# Number of folder security graphs kept in memory by each process
+SECURITY_GRAPH_CACHED_FOLDERS = int(
+    os.environ.get("SECURITY_GRAPH_CACHED_FOLDERS", 32)
+)
+
+## CRQ Monte Carlo settings
+# Adaptive mode runs simulations in batches and stops once the ALE and the
+# tracked VaR percentiles are within the relative tolerance (95% confidence)
+CRQ_ADAPTIVE_SIMULATION = os.environ.get("CRQ_ADAPTIVE_SIMULATION", "False") == "True"
+CRQ_SIMULATION_RELATIVE_TOLERANCE = float(
+    os.environ.get("CRQ_SIMULATION_RELATIVE_TOLERANCE", 0.05)
+)
+CRQ_SIMULATION_BATCH_SIZE = int(os.environ.get("CRQ_SIMULATION_BATCH_SIZE", 10000))
+CRQ_SIMULATION_MIN_ITERATIONS = int(
+    os.environ.get("CRQ_SIMULATION_MIN_ITERATIONS", 10000)
+)
+CRQ_SIMULATION_MAX_ITERATIONS = int(
+    os.environ.get("CRQ_SIMULATION_MAX_ITERATIONS", 1000000)
+)
 
 WEBHOOK_ALLOW_PRIVATE_IPS = (
     os.environ.get("WEBHOOK_ALLOW_PRIVATE_IPS", "False") == "True"
 )
+
+## Automated evidence collection
+# Sources are collected in parallel, the rules of a source share one connector
+# session. Per-source limits can be overridden with the "max_concurrency" and
+# "rate_limit" keys of the source configuration (0 disables the rate limit).
+EVIDENCE_COLLECTION_CONCURRENCY = int(
+    os.environ.get("EVIDENCE_COLLECTION_CONCURRENCY", 4)
+)
+EVIDENCE_SOURCE_CONCURRENCY = int(os.environ.get("EVIDENCE_SOURCE_CONCURRENCY", 1))
+EVIDENCE_SOURCE_RATE_LIMIT = float(os.environ.get("EVIDENCE_SOURCE_RATE_LIMIT", 0))
+
+## Outgoing webhook delivery
+# Events of a transaction are delivered by one task per endpoint, in chunks of
+# WEBHOOK_BATCH_SIZE events. Concurrency and rate limits apply per endpoint and
+# per worker process (0 disables the rate limit).
+WEBHOOK_BATCH_SIZE = int(os.environ.get("WEBHOOK_BATCH_SIZE", 100))
+WEBHOOK_ENDPOINT_CONCURRENCY = int(os.environ.get("WEBHOOK_ENDPOINT_CONCURRENCY", 2))
+WEBHOOK_ENDPOINT_RATE_LIMIT = float(os.environ.get("WEBHOOK_ENDPOINT_RATE_LIMIT", 10))
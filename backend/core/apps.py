@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from django.conf import settings
 from django.db.models.signals import post_migrate
 import os
 
@@ -14,6 +15,57 @@ class CoreConfig(AppConfig):
         # This import runs the @webhook_registry.register decorator
         import core.webhooks
 
+        from core.bounded_contexts.security_graph.signals import connect_signals
+
+        connect_signals()
+        self._connect_asset_graph_cache_signals()
+
+        if getattr(settings, "AUDITLOG_BUFFERED", False):
+            from core.custom_middleware import install_audit_log_buffer
+
+            install_audit_log_buffer()
+
         # avoid post_migrate handler if we are in the main, as it interferes with restore
         if not os.environ.get("RUN_MAIN"):
             post_migrate.connect(startup, sender=self)
+
+    def _connect_asset_graph_cache_signals(self):
+        from django.db.models.signals import m2m_changed, post_delete, post_save
+
+        from core.asset_graph_cache import invalidate_asset_graph_cache
+
+        Asset = self.get_model("Asset")
+        AssetCapability = self.get_model("AssetCapability")
+
+        def _asset_graph_changed(sender, **kwargs):
+            invalidate_asset_graph_cache()
+
+        def _asset_links_changed(sender, instance, action, **kwargs):
+            if action in {"post_add", "post_remove", "post_clear"}:
+                invalidate_asset_graph_cache()
+
+        for model in (Asset, AssetCapability):
+            post_save.connect(
+                _asset_graph_changed,
+                sender=model,
+                dispatch_uid=f"core.{model._meta.model_name}.save.invalidate_asset_graph_cache",
+                weak=False,
+            )
+            post_delete.connect(
+                _asset_graph_changed,
+                sender=model,
+                dispatch_uid=f"core.{model._meta.model_name}.delete.invalidate_asset_graph_cache",
+                weak=False,
+            )
+        m2m_changed.connect(
+            _asset_links_changed,
+            sender=Asset.parent_assets.through,
+            dispatch_uid="core.asset.parent_assets.m2m.invalidate_asset_graph_cache",
+            weak=False,
+        )
+        m2m_changed.connect(
+            _asset_links_changed,
+            sender=Asset.overridden_children_capabilities.through,
+            dispatch_uid="core.asset.overridden_children_capabilities.m2m.invalidate_asset_graph_cache",
+            weak=False,
+        )
@@ -0,0 +1,317 @@
+"""
+asset_graph_cache.py
+
+Versioned snapshot of the asset dependency graph.
+
+The snapshot holds, for every asset, its ancestor and descendant closures
+plus the rolled-up objectives and capabilities that depend on them, so asset
+list and detail endpoints only do dictionary lookups per asset.
+
+Design goals (same as iam/cache_builders.py):
+- No circular imports: DO NOT import core.models at runtime.
+- Import-time setup is DB-free.
+- The snapshot is rebuilt only when its CacheVersion row is bumped.
+- Snapshots are immutable-ish via MappingProxyType + frozenset.
+
+The cache is not registered in CacheRegistry: CacheRegistry.hydrate_all()
+hydrates every registered cache, and folder/IAM lookups should not pay for
+rebuilding the asset graph after each asset edit. Accessing it costs a
+single CacheVersion SELECT.
+
+Key:
+- core.asset_graph
+"""
+
+from __future__ import annotations
+
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from graphlib import CycleError, TopologicalSorter
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Iterable, Mapping, Optional, Set
+
+from django.apps import apps
+
+from iam.snapshot_cache import VersionedSnapshotCache, VersionStore
+
+ASSET_GRAPH_CACHE_KEY = "core.asset_graph"
+
+Objectives = Mapping[str, Mapping]
+
+
+@dataclass(frozen=True, slots=True)
+class AssetGraphState:
+    names: Mapping[uuid.UUID, str]
+    primary_ids: FrozenSet[uuid.UUID]
+    ancestors: Mapping[uuid.UUID, FrozenSet[uuid.UUID]]
+    descendants: Mapping[uuid.UUID, FrozenSet[uuid.UUID]]
+    # Support assets only: rolled up from their primary ancestors
+    security_objectives: Mapping[uuid.UUID, Objectives]
+    disaster_recovery_objectives: Mapping[uuid.UUID, Objectives]
+    # Primary assets only: rolled up from their supporting descendants
+    security_capabilities: Mapping[uuid.UUID, Objectives]
+    recovery_capabilities: Mapping[uuid.UUID, Objectives]
+
+
+def _transitive_closure(
+    node_ids: Iterable[uuid.UUID], adjacency: Mapping[uuid.UUID, Set[uuid.UUID]]
+) -> Dict[uuid.UUID, FrozenSet[uuid.UUID]]:
+    """
+    Nodes reachable from each node (excluding itself).
+
+    Nodes are processed successors-first so each BFS stops at nodes whose
+    closure is already known. Cycles are not allowed in the asset graph;
+    if one exists anyway the order is arbitrary and results stay correct.
+    """
+    node_ids = list(node_ids)
+    try:
+        order = list(
+            TopologicalSorter(
+                {node_id: adjacency.get(node_id, ()) for node_id in node_ids}
+            ).static_order()
+        )
+    except CycleError:
+        order = node_ids
+
+    closure: Dict[uuid.UUID, FrozenSet[uuid.UUID]] = {}
+    for start in order:
+        reached: Set[uuid.UUID] = set()
+        queue = deque(adjacency.get(start, ()))
+        while queue:
+            current = queue.popleft()
+            if current in reached or current == start:
+                continue
+            reached.add(current)
+            known = closure.get(current)
+            if known is not None:
+                reached.update(known)
+            else:
+                queue.extend(adjacency.get(current, ()))
+        reached.discard(start)
+        closure[start] = frozenset(reached)
+    return closure
+
+
+def _aggregate_security_objectives(objective_sets: Iterable[Objectives]) -> dict:
+    """Aggregates security objectives from primary ancestors (highest value wins)."""
+    agg_obj = {}
+    for objectives in objective_sets:
+        for key, content in objectives.items():
+            if not content.get("is_enabled", False):
+                continue
+
+            value = content.get("value", 0)
+            if key not in agg_obj or value > agg_obj[key].get("value", 0):
+                agg_obj[key] = dict(content)
+    return agg_obj
+
+
+def _aggregate_dro_objectives(objective_sets: Iterable[Objectives]) -> dict:
+    """Aggregates DRO objectives from primary ancestors (lowest non-zero value wins)."""
+    agg_obj = {}
+    for objectives in objective_sets:
+        for key, content in objectives.items():
+            value = content.get("value")
+            # Skip None or 0 values (treat as "not set")
+            if not value:
+                continue
+
+            current_value = agg_obj.get(key, {}).get("value")
+            if current_value is None or value < current_value:
+                agg_obj[key] = dict(content)
+    return agg_obj
+
+
+def _aggregate_capabilities(
+    supporting_ids: Iterable[uuid.UUID],
+    capabilities: Mapping[uuid.UUID, Objectives],
+    overrides: Mapping[uuid.UUID, FrozenSet[str]],
+    descendants: Mapping[uuid.UUID, FrozenSet[uuid.UUID]],
+    *,
+    require_enabled: bool,
+    lowest_wins: bool,
+) -> dict:
+    """
+    Aggregates capabilities from supporting descendants.
+
+    Supporting assets can override capabilities - when overridden, the
+    overriding asset's value is used directly, and its descendants are
+    excluded for that capability only (not globally).
+    """
+    supporting_ids = list(supporting_ids)
+    overriding: Dict[str, list] = {}
+    for asset_id in supporting_ids:
+        for cap_name in overrides.get(asset_id, ()):
+            overriding.setdefault(cap_name, []).append(asset_id)
+
+    agg_cap = {}
+    for asset_id in supporting_ids:
+        for key, content in capabilities.get(asset_id, {}).items():
+            if require_enabled and not content.get("is_enabled", False):
+                continue
+
+            value = content.get("value")
+            if value is None:
+                continue
+
+            # Skip if this asset is a descendant of an overriding asset
+            if any(
+                asset_id != overriding_id
+                and asset_id in descendants.get(overriding_id, ())
+                for overriding_id in overriding.get(key, ())
+            ):
+                continue
+
+            current_value = agg_cap.get(key, {}).get("value")
+            if (
+                current_value is None
+                or (lowest_wins and value < current_value)
+                or (not lowest_wins and value > current_value)
+            ):
+                agg_cap[key] = dict(content)
+    return agg_cap
+
+
+def _freeze(rollups: Dict[uuid.UUID, dict]) -> Mapping[uuid.UUID, Objectives]:
+    return MappingProxyType(
+        {
+            asset_id: MappingProxyType(
+                {key: MappingProxyType(content) for key, content in objectives.items()}
+            )
+            for asset_id, objectives in rollups.items()
+        }
+    )
+
+
+def build_asset_graph_state() -> AssetGraphState:
+    """
+    Build the asset graph snapshot with three queries: assets, parent links
+    and capability overrides.
+    """
+    asset_model = apps.get_model("core", "Asset")
+    primary_type = asset_model.Type.PRIMARY
+
+    rows = asset_model.objects.values_list(
+        "id",
+        "name",
+        "type",
+        "security_objectives",
+        "disaster_recovery_objectives",
+        "security_capabilities",
+        "recovery_capabilities",
+    )
+
+    names: Dict[uuid.UUID, str] = {}
+    primary_ids: Set[uuid.UUID] = set()
+    raw: Dict[str, Dict[uuid.UUID, Objectives]] = {
+        "security_objectives": {},
+        "disaster_recovery_objectives": {},
+        "security_capabilities": {},
+        "recovery_capabilities": {},
+    }
+    for asset_id, name, asset_type, *json_fields in rows:
+        names[asset_id] = name
+        if asset_type == primary_type:
+            primary_ids.add(asset_id)
+        for field_name, value in zip(raw, json_fields):
+            raw[field_name][asset_id] = (value or {}).get("objectives", {})
+
+    child_to_parents: Dict[uuid.UUID, Set[uuid.UUID]] = {}
+    parent_to_children: Dict[uuid.UUID, Set[uuid.UUID]] = {}
+    for child_id, parent_id in asset_model.parent_assets.through.objects.values_list(
+        "from_asset_id", "to_asset_id"
+    ):
+        child_to_parents.setdefault(child_id, set()).add(parent_id)
+        parent_to_children.setdefault(parent_id, set()).add(child_id)
+
+    overrides: Dict[uuid.UUID, Set[str]] = {}
+    for (
+        asset_id,
+        cap_name,
+    ) in asset_model.overridden_children_capabilities.through.objects.values_list(
+        "asset_id", "assetcapability__name"
+    ):
+        overrides.setdefault(asset_id, set()).add(cap_name)
+    frozen_overrides = {k: frozenset(v) for k, v in overrides.items()}
+
+    ancestors = _transitive_closure(names, child_to_parents)
+    descendants = _transitive_closure(names, parent_to_children)
+
+    security_objectives: Dict[uuid.UUID, dict] = {}
+    disaster_recovery_objectives: Dict[uuid.UUID, dict] = {}
+    security_capabilities: Dict[uuid.UUID, dict] = {}
+    recovery_capabilities: Dict[uuid.UUID, dict] = {}
+    for asset_id in names:
+        if asset_id in primary_ids:
+            supporting_ids = [d for d in descendants[asset_id] if d not in primary_ids]
+            if not supporting_ids:
+                continue
+            security_capabilities[asset_id] = _aggregate_capabilities(
+                supporting_ids,
+                raw["security_capabilities"],
+                frozen_overrides,
+                descendants,
+                require_enabled=True,
+                lowest_wins=True,
+            )
+            recovery_capabilities[asset_id] = _aggregate_capabilities(
+                supporting_ids,
+                raw["recovery_capabilities"],
+                frozen_overrides,
+                descendants,
+                require_enabled=False,
+                lowest_wins=False,
+            )
+        else:
+            primary_ancestor_ids = [a for a in ancestors[asset_id] if a in primary_ids]
+            if not primary_ancestor_ids:
+                continue
+            security_objectives[asset_id] = _aggregate_security_objectives(
+                raw["security_objectives"][a] for a in primary_ancestor_ids
+            )
+            disaster_recovery_objectives[asset_id] = _aggregate_dro_objectives(
+                raw["disaster_recovery_objectives"][a] for a in primary_ancestor_ids
+            )
+
+    return AssetGraphState(
+        names=MappingProxyType(names),
+        primary_ids=frozenset(primary_ids),
+        ancestors=MappingProxyType(ancestors),
+        descendants=MappingProxyType(descendants),
+        security_objectives=_freeze(security_objectives),
+        disaster_recovery_objectives=_freeze(disaster_recovery_objectives),
+        security_capabilities=_freeze(security_capabilities),
+        recovery_capabilities=_freeze(recovery_capabilities),
+    )
+
+
+_asset_graph_cache: VersionedSnapshotCache[AssetGraphState] = VersionedSnapshotCache(
+    key=ASSET_GRAPH_CACHE_KEY, builder=build_asset_graph_state
+)
+
+
+def get_asset_graph_state(*, force_reload: bool = False) -> AssetGraphState:
+    versions = VersionStore.ensure_and_get_versions([ASSET_GRAPH_CACHE_KEY]).versions
+    return _asset_graph_cache.get(versions, force_reload=force_reload)
+
+
+def invalidate_asset_graph_cache() -> Optional[int]:
+    return _asset_graph_cache.invalidate()
+
+
+def copy_objectives(objectives: Optional[Objectives]) -> Optional[dict]:
+    """Mutable copy of cached objectives, safe to hand out to callers."""
+    if objectives is None:
+        return None
+    return {key: dict(content) for key, content in objectives.items()}
+
+
+__all__ = [
+    "ASSET_GRAPH_CACHE_KEY",
+    "AssetGraphState",
+    "build_asset_graph_state",
+    "copy_objectives",
+    "get_asset_graph_state",
+    "invalidate_asset_graph_cache",
+]
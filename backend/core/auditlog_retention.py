@@ -0,0 +1,327 @@
+"""
+Retention of the audit log (auditlog.LogEntry).
+
+The log entry table grows by millions of rows, so it is never pruned with a
+single DELETE (slow, long locks, bloat). Entries are deleted in batches
+instead, each batch in its own transaction: ranges of ids when keeping the
+latest entries, the oldest timestamps when expiring entries (buffered entries
+are written after entries logged later, so ids do not follow timestamps).
+
+On PostgreSQL, the table can also be converted to monthly partitions on its
+timestamp (see the partition_auditlog command). Retention then drops the
+partitions of expired months, and only the expired rows of the partition
+containing the cutoff are deleted in batches.
+
+Partitions are named <table>_pYYYYMM and cover a UTC calendar month. A default
+partition catches the rows out of their range, so that writing to the audit
+log never fails for lack of a partition. Its rows are moved to the partition of
+their month when that partition is created.
+"""
+
+import re
+from datetime import date, datetime, time, timezone as dt_timezone
+
+from auditlog.models import LogEntry
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.db.models import Min
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_BATCH_SIZE = 10_000
+# Months for which partitions are created in advance
+PARTITIONS_AHEAD = 3
+
+TABLE = LogEntry._meta.db_table
+DEFAULT_PARTITION = f"{TABLE}_default"
+# Per-object history: LogEntry.objects.get_for_object(...) ordered by timestamp
+OBJECT_HISTORY_INDEX = f"{TABLE}_object_history_idx"
+OBJECT_HISTORY_COLUMNS = '"content_type_id", "object_pk", "timestamp" DESC'
+
+_PARTITION_NAME = re.compile(rf"^{re.escape(TABLE)}_p(\d{{4}})(\d{{2}})$")
+
+
+def get_batch_size() -> int:
+    return getattr(settings, "AUDITLOG_PRUNE_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+
+
+def delete_up_to_id(last_id: int, batch_size: int = None, **filters) -> int:
+    """
+    Delete the entries whose id is lower than or equal to `last_id` and which
+    match `filters`, one range of `batch_size` ids at a time.
+
+    Returns the number of deleted entries.
+    """
+    batch_size = batch_size or get_batch_size()
+    queryset = LogEntry.objects.filter(id__lte=last_id, **filters)
+    deleted = 0
+    start = queryset.aggregate(Min("id"))["id__min"]
+    while start is not None:
+        end = start + batch_size
+        deleted += queryset.filter(id__gte=start, id__lt=end).delete()[0]
+        # Skip the gaps left by previous prunings
+        start = queryset.filter(id__gte=end).aggregate(Min("id"))["id__min"]
+    return deleted
+
+
+def prune_to_max_records(max_records: int, batch_size: int = None) -> int:
+    """Delete the oldest entries to keep the `max_records` most recent ones."""
+    # Entries are numbered in order of creation, the id of the first entry
+    # to delete is found on the primary key index without counting the table.
+    last_id = list(
+        LogEntry.objects.order_by("-id").values_list("id", flat=True)[
+            max_records : max_records + 1
+        ]
+    )
+    if not last_id:
+        return 0
+    return delete_up_to_id(last_id[0], batch_size)
+
+
+def prune_before(before: datetime, batch_size: int = None) -> int:
+    """
+    Delete the entries older than `before`. Partitions that only contain such
+    entries are dropped, their rows are not counted in the returned number.
+    """
+    if is_partitioned():
+        drop_partitions_before(before)
+        try:
+            create_partitions()
+        except DatabaseError:
+            # New entries still go to the default partition, pruning goes on
+            logger.exception("Could not create the audit log partitions")
+    batch_size = batch_size or get_batch_size()
+    expired = LogEntry.objects.filter(timestamp__lt=before).order_by("timestamp")
+    deleted = 0
+    while True:
+        # Batches are taken on the timestamp index, not on id ranges
+        ids = list(expired.values_list("id", flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        deleted += LogEntry.objects.filter(id__in=ids, timestamp__lt=before).delete()[0]
+
+
+def _quote(name: str) -> str:
+    return connection.ops.quote_name(name)
+
+
+def _month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def _next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def _bound(month: date) -> str:
+    return f"'{month.isoformat()} 00:00:00+00'"
+
+
+def partition_name(month: date) -> str:
+    return f"{TABLE}_p{month:%Y%m}"
+
+
+def is_partitioned() -> bool:
+    """Whether the log entry table is a partitioned PostgreSQL table."""
+    if connection.vendor != "postgresql":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", [TABLE]
+        )
+        row = cursor.fetchone()
+    return row is not None and row[0] == "p"
+
+
+def get_partitions() -> dict:
+    """Monthly partitions of the log entry table: {month: name}."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = to_regclass(%s)",
+            [TABLE],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    partitions = {}
+    for name in names:
+        match = _PARTITION_NAME.match(name)
+        if match:
+            partitions[date(int(match[1]), int(match[2]), 1)] = name
+    return partitions
+
+
+def create_partitions(
+    first_month: date = None, months_ahead: int = PARTITIONS_AHEAD
+) -> list:
+    """
+    Create the missing partitions from `first_month` (the current month by
+    default) to `months_ahead` months after the current one.
+
+    Returns the names of the created partitions.
+    """
+    current = _month_start(datetime.now(dt_timezone.utc).date())
+    month = _month_start(first_month) if first_month else current
+    last = current
+    for _ in range(months_ahead):
+        last = _next_month(last)
+
+    existing = get_partitions()
+    created = []
+    while month <= last:
+        if month not in existing:
+            _create_partition(month)
+            created.append(partition_name(month))
+        month = _next_month(month)
+    if created:
+        logger.info("Created audit log partitions", partitions=created)
+    return created
+
+
+def _create_partition(month: date):
+    """
+    Create the partition of `month`. PostgreSQL refuses to create a partition
+    while the default one holds rows of its range, these rows are moved to the
+    new table before it is attached.
+    """
+    table = _quote(TABLE)
+    name = _quote(partition_name(month))
+    default = _quote(DEFAULT_PARTITION)
+    bounds = f"FROM ({_bound(month)}) TO ({_bound(_next_month(month))})"
+    in_range = (
+        f'"timestamp" >= {_bound(month)} AND "timestamp" < {_bound(_next_month(month))}'
+    )
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [DEFAULT_PARTITION])
+        has_default = cursor.fetchone()[0]
+        if has_default:
+            cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {in_range})")
+        if not has_default or not cursor.fetchone()[0]:
+            cursor.execute(
+                f"CREATE TABLE {name} PARTITION OF {table} FOR VALUES {bounds}"
+            )
+            return
+        # Indexes and constraints of the parent are added on attachment
+        cursor.execute(
+            f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING STORAGE "
+            "INCLUDING COMMENTS)"
+        )
+        cursor.execute(
+            f"WITH moved AS (DELETE FROM {default} WHERE {in_range} RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        )
+        moved = cursor.rowcount
+        cursor.execute(
+            f"ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES {bounds}"
+        )
+        logger.info(
+            "Moved audit log entries out of the default partition",
+            partition=partition_name(month),
+            entries=moved,
+        )
+
+
+def drop_partitions_before(before: datetime) -> list:
+    """
+    Drop the partitions whose entries are all older than `before`.
+
+    Returns the names of the dropped partitions.
+    """
+    before = before.astimezone(dt_timezone.utc)
+    dropped = []
+    with connection.cursor() as cursor:
+        for month, name in sorted(get_partitions().items()):
+            end = datetime.combine(_next_month(month), time.min, dt_timezone.utc)
+            if end > before:
+                break
+            cursor.execute(f"DROP TABLE {_quote(name)}")
+            dropped.append(name)
+    if dropped:
+        logger.info("Dropped audit log partitions", partitions=dropped)
+    return dropped
+
+
+def partition_table(months_ahead: int = PARTITIONS_AHEAD) -> list:
+    """
+    Convert the log entry table into a table partitioned by month on its
+    timestamp, with the same columns, indexes and foreign keys. The primary
+    key becomes (id, timestamp), as PostgreSQL requires the partition key in
+    unique constraints.
+
+    The table is locked while its rows are copied, run it during maintenance.
+    Returns the names of the created partitions.
+    """
+    if connection.vendor != "postgresql":
+        raise NotImplementedError("Audit log partitioning requires PostgreSQL")
+    if is_partitioned():
+        return []
+
+    table = _quote(TABLE)
+    unpartitioned = _quote(f"{TABLE}_unpartitioned")
+    fields = [
+        field
+        for field in LogEntry._meta.concrete_fields
+        if not field.primary_key and (field.db_index or field.is_relation)
+    ]
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f"LOCK TABLE {table} IN ACCESS EXCLUSIVE MODE")
+        cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [TABLE])
+        sequence = cursor.fetchone()[0]
+        cursor.execute(f'SELECT min("timestamp") FROM {table}')
+        first_entry = cursor.fetchone()[0]
+
+        # Index names are unique per schema, the old table keeps its own
+        cursor.execute(f"DROP INDEX IF EXISTS {_quote(OBJECT_HISTORY_INDEX)}")
+        cursor.execute(f"ALTER TABLE {table} RENAME TO {unpartitioned}")
+        cursor.execute(
+            f"CREATE TABLE {table} (LIKE {unpartitioned} INCLUDING DEFAULTS "
+            "INCLUDING IDENTITY INCLUDING STORAGE INCLUDING COMMENTS) "
+            'PARTITION BY RANGE ("timestamp")'
+        )
+        cursor.execute(
+            f"CREATE TABLE {_quote(DEFAULT_PARTITION)} PARTITION OF {table} DEFAULT"
+        )
+        created = create_partitions(
+            first_entry.date() if first_entry else None, months_ahead
+        )
+        cursor.execute(f"INSERT INTO {table} SELECT * FROM {unpartitioned}")
+
+        # Indexes and constraints are built once the rows are copied
+        cursor.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT {_quote(f'{TABLE}_partitioned_pkey')} "
+            'PRIMARY KEY ("id", "timestamp")'
+        )
+        for field in fields:
+            cursor.execute(
+                f"CREATE INDEX {_quote(f'{TABLE}_{field.column}_part_idx')} "
+                f"ON {table} ({_quote(field.column)})"
+            )
+        cursor.execute(
+            f"CREATE INDEX {_quote(OBJECT_HISTORY_INDEX)} "
+            f"ON {table} ({OBJECT_HISTORY_COLUMNS})"
+        )
+        for field in fields:
+            if not field.is_relation:
+                continue
+            target = field.target_field
+            cursor.execute(
+                f"ALTER TABLE {table} ADD CONSTRAINT "
+                f"{_quote(f'{TABLE}_{field.column}_part_fk')} "
+                f"FOREIGN KEY ({_quote(field.column)}) "
+                f"REFERENCES {_quote(target.model._meta.db_table)} ({_quote(target.column)}) "
+                "DEFERRABLE INITIALLY DEFERRED"
+            )
+
+        # Keep numbering entries from where the old table stopped
+        cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [TABLE])
+        new_sequence = cursor.fetchone()[0]
+        if new_sequence and new_sequence != sequence:
+            cursor.execute(
+                f'SELECT setval(%s, coalesce(max("id"), 0) + 1, false) FROM {table}',
+                [new_sequence],
+            )
+        elif sequence:
+            cursor.execute(f'ALTER SEQUENCE {sequence} OWNED BY {table}."id"')
+        cursor.execute(f"DROP TABLE {unpartitioned}")
+    return created
@@ -138,8 +138,7 @@ class NessusScan(AggregateRoot):
         from ..domain_events import NessusScanUploaded
         self._raise_event(NessusScanUploaded(
             aggregate_id=self.id,
-            system_group_id=str(system_group_id),
-            filename=filename
+            payload={'system_group_id': str(system_group_id), 'filename': filename}
         ))
 
     def mark_processing_started(self):
@@ -150,7 +149,7 @@ class NessusScan(AggregateRoot):
         from ..domain_events import NessusScanProcessingStarted
         self._raise_event(NessusScanProcessingStarted(
             aggregate_id=self.id,
-            filename=self.filename
+            payload={'filename': self.filename}
         ))
 
     def mark_processing_completed(self, metadata: Dict[str, Any]):
@@ -174,9 +173,11 @@ class NessusScan(AggregateRoot):
         from ..domain_events import NessusScanProcessingCompleted
         self._raise_event(NessusScanProcessingCompleted(
             aggregate_id=self.id,
-            filename=self.filename,
-            total_hosts=self.total_hosts,
-            total_vulnerabilities=self.total_vulnerabilities
+            payload={
+                'filename': self.filename,
+                'total_hosts': self.total_hosts,
+                'total_vulnerabilities': self.total_vulnerabilities
+            }
         ))
 
     def mark_processing_failed(self, error_message: str):
@@ -187,8 +188,7 @@ class NessusScan(AggregateRoot):
         from ..domain_events import NessusScanProcessingFailed
         self._raise_event(NessusScanProcessingFailed(
             aggregate_id=self.id,
-            filename=self.filename,
-            error_message=error_message
+            payload={'filename': self.filename, 'error_message': error_message}
         ))
 
     def add_correlation(self, checklist_id: uuid.UUID):
@@ -199,7 +199,7 @@ class NessusScan(AggregateRoot):
             from ..domain_events import NessusScanChecklistCorrelated
             self._raise_event(NessusScanChecklistCorrelated(
                 aggregate_id=self.id,
-                checklist_id=str(checklist_id)
+                payload={'checklist_id': str(checklist_id)}
             ))
 
     def remove_correlation(self, checklist_id: uuid.UUID):
@@ -205,8 +205,7 @@ class StigChecklist(AggregateRoot):
         from ..domain_events import StigChecklistImported
         self._raise_event(StigChecklistImported(
             aggregate_id=self.id,
-            host_name=self.hostName,
-            stig_type=self.stigType
+            payload={'host_name': self.hostName, 'stig_type': self.stigType}
         ))
 
     def export_to_ckl(self) -> Dict[str, Any]:
@@ -9,11 +9,50 @@ from typing import Optional, List, Dict, Any
 import uuid
 from datetime import datetime, timedelta
 
+from django.db.models.functions import Length, Substr
+
 from core.domain.repository import BaseRepository
 from ..aggregates.nessus_scan import NessusScan
 from ..services.nessus_parser import NessusParser
 
 
+# Characters of raw XML fetched per query by RawXmlReader
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+class RawXmlReader:
+    """
+    File object reading the raw XML of a scan from the database one chunk at
+    a time, so that parsing a scan never loads its whole content.
+    """
+
+    def __init__(self, scan_id: uuid.UUID, chunk_size: int = READ_CHUNK_SIZE):
+        self.queryset = NessusScan.objects.filter(id=scan_id)
+        self.chunk_size = chunk_size
+        # SQL substrings start at 1
+        self.position = 1
+        self.buffer = ''
+
+    def _fetch(self) -> str:
+        chunk = self.queryset.annotate(
+            chunk=Substr('raw_xml_content', self.position, self.chunk_size)
+        ).values_list('chunk', flat=True).first() or ''
+        self.position += len(chunk)
+        return chunk
+
+    def read(self, size: int = -1) -> str:
+        if size is None or size < 0:
+            chunks = [self.buffer]
+            while chunk := self._fetch():
+                chunks.append(chunk)
+            self.buffer = ''
+            return ''.join(chunks)
+        if not self.buffer:
+            self.buffer = self._fetch()
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+
 class NessusScanRepository(BaseRepository[NessusScan]):
     """
     Repository for NessusScan aggregates.
@@ -83,10 +122,14 @@ class NessusScanRepository(BaseRepository[NessusScan]):
 
         return {item['processing_status']: item['count'] for item in status_counts}
 
+    def _get_without_content(self, scan_id: uuid.UUID) -> Optional[NessusScan]:
+        """Scan without its raw XML, read with RawXmlReader when needed"""
+        return NessusScan.objects.defer('raw_xml_content').filter(id=scan_id).first()
+
     def process_scan_file(self, scan_id: uuid.UUID) -> bool:
         """Process a newly uploaded scan file"""
         try:
-            scan = self.get_by_id(scan_id)
+            scan = self._get_without_content(scan_id)
             if not scan or scan.processing_status != 'uploaded':
                 return False
 
@@ -96,8 +139,12 @@ class NessusScanRepository(BaseRepository[NessusScan]):
 
             # Parse the XML content
             try:
-                parsed_data = self.parser.parse_nessus_file(scan.raw_xml_content)
-                summary = self.parser.extract_scan_summary(parsed_data)
+                # Only the summary is kept: stream the file without building the tree
+                stream = self.parser.stream_nessus_file(RawXmlReader(scan.id)).consume()
+                summary = self.parser.extract_scan_summary({
+                    'metadata': stream.metadata,
+                    'statistics': stream.statistics
+                })
 
                 # Update scan with parsed metadata
                 scan.mark_processing_completed(summary)
@@ -192,14 +239,17 @@ class NessusScanRepository(BaseRepository[NessusScan]):
     def validate_scan_data(self, scan_id: uuid.UUID) -> Dict[str, Any]:
         """Validate scan data integrity"""
         try:
-            scan = self.get_by_id(scan_id)
+            scan = self._get_without_content(scan_id)
             if not scan:
                 return {'valid': False, 'errors': ['Scan not found']}
 
             errors = []
 
             # Check required fields
-            if not scan.raw_xml_content:
+            has_content = NessusScan.objects.alias(
+                raw_xml_content_length=Length('raw_xml_content')
+            ).filter(id=scan.id, raw_xml_content_length__gt=0).exists()
+            if not has_content:
                 errors.append('Missing raw XML content')
 
             if scan.processing_status == 'completed':
@@ -209,9 +259,9 @@ class NessusScanRepository(BaseRepository[NessusScan]):
                     errors.append('Invalid vulnerability count')
 
             # Validate XML structure if content exists
-            if scan.raw_xml_content:
+            if has_content:
                 try:
-                    self.parser.parse_nessus_file(scan.raw_xml_content)
+                    self.parser.stream_nessus_file(RawXmlReader(scan.id)).consume()
                 except Exception as e:
                     errors.append(f'XML parsing error: {str(e)}')
 
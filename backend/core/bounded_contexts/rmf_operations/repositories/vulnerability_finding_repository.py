@@ -4,13 +4,40 @@ VulnerabilityFinding Repository
 Repository for VulnerabilityFinding aggregates.
 """
 
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Any
 import uuid
+from django.db import transaction
 from django.http import HttpRequest
 
 from core.domain.repository import BaseRepository
 from ..aggregates.vulnerability_finding import VulnerabilityFinding
+from ..value_objects import VulnerabilityStatus
 from ..services.audit_service import audit_service
+from ..services.ckl_parser import CKLParser, DEFAULT_BATCH_SIZE
+
+# CKL STATUS -> VulnerabilityStatus.status
+CKL_STATUS_MAP = {
+    'Open': 'open',
+    'NotAFinding': 'not_a_finding',
+    'Not_Applicable': 'not_applicable',
+    'Not_Reviewed': 'not_reviewed'
+}
+
+# CKL Severity -> SeverityCategory.category
+CKL_SEVERITY_MAP = {
+    'high': 'cat1',
+    'cat i': 'cat1',
+    'medium': 'cat2',
+    'cat ii': 'cat2',
+    'low': 'cat3',
+    'cat iii': 'cat3'
+}
+
+# Columns refreshed when a finding of the checklist is imported again
+CKL_IMPORT_UPDATE_FIELDS = [
+    'stigId', 'ruleId', 'ruleTitle', 'ruleDiscussion', 'checkContent', 'fixText',
+    'status_data', 'severity_category', 'ruleVersion', 'cciIds', 'updated_at'
+]
 
 
 class VulnerabilityFindingRepository(BaseRepository[VulnerabilityFinding]):
@@ -209,3 +236,88 @@ class VulnerabilityFindingRepository(BaseRepository[VulnerabilityFinding]):
         # This is more complex as it needs to account for overrides
         # For now, return by base severity - overrides would need custom logic
         return list(VulnerabilityFinding.objects.filter(severity_category=severity.lower()))
+
+    def import_from_ckl(self, checklist_id: uuid.UUID, source,
+                        batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, Any]:
+        """
+        Import the findings of a CKL file into a checklist.
+
+        The file (path or file object) is streamed and every batch of VULN
+        elements is written with a single bulk upsert on (checklistId, vulnId),
+        so memory stays flat whatever the size of the checklist. Findings
+        imported again are refreshed, including their status.
+        """
+        stream = CKLParser().stream_ckl_file(source, batch_size)
+        imported = 0
+        skipped = 0
+        with transaction.atomic():
+            for batch in stream:
+                findings = {}
+                for vuln in batch:
+                    finding = self._finding_from_ckl(checklist_id, vuln)
+                    if finding is None:
+                        skipped += 1
+                        continue
+                    # Last occurrence wins, an upsert cannot touch a row twice
+                    findings[finding.vulnId] = finding
+                VulnerabilityFinding.objects.bulk_create(
+                    findings.values(),
+                    update_conflicts=True,
+                    unique_fields=['checklistId', 'vulnId'],
+                    update_fields=CKL_IMPORT_UPDATE_FIELDS
+                )
+                imported += len(findings)
+
+        return {
+            'imported': imported,
+            'skipped': skipped,
+            'version': stream.version,
+            'asset': stream.asset,
+            'stig_info': stream.stigs.get('stig_info', []),
+            'statistics': stream.statistics
+        }
+
+    def _finding_from_ckl(self, checklist_id: uuid.UUID,
+                          vuln: Dict[str, Any]) -> Optional[VulnerabilityFinding]:
+        """Unsaved finding built from a parsed CKL vulnerability, None without Vuln_Num"""
+        attributes = {}
+        cci_ids = []
+        for item in vuln.get('stig_data', []):
+            attribute = item.get('attribute') or ''
+            data = (item.get('data') or '').strip()
+            if attribute == 'CCI_REF':
+                if data:
+                    cci_ids.append(data)
+            elif attribute not in attributes:
+                attributes[attribute] = data
+
+        vuln_id = attributes.get('Vuln_Num', '')
+        if not vuln_id:
+            return None
+
+        severity_override = (vuln.get('severity_override') or '').lower() or None
+        severity_justification = vuln.get('severity_justification') or ''
+        if severity_override not in VulnerabilityStatus.VALID_SEVERITY_OVERRIDES or not severity_justification.strip():
+            severity_override = None
+
+        return VulnerabilityFinding(
+            checklistId=checklist_id,
+            vulnId=vuln_id[:50],
+            stigId=attributes.get('Rule_Ver', '')[:50],
+            ruleId=attributes.get('Rule_ID', '')[:50],
+            ruleTitle=attributes.get('Rule_Title', '')[:500],
+            ruleDiscussion=attributes.get('Vuln_Discuss', ''),
+            checkContent=attributes.get('Check_Content', ''),
+            fixText=attributes.get('Fix_Text', ''),
+            ruleVersion=attributes.get('Rule_Ver', '')[:50],
+            cciIds=cci_ids,
+            # bulk_create bypasses save(), status_data must be complete
+            status_data={
+                'status': CKL_STATUS_MAP.get(vuln.get('status'), 'not_reviewed'),
+                'finding_details': vuln.get('finding_details') or '',
+                'comments': vuln.get('comments') or '',
+                'severity_override': severity_override,
+                'severity_justification': severity_justification if severity_override else ''
+            },
+            severity_category=CKL_SEVERITY_MAP.get(attributes.get('Severity', '').lower(), 'cat2')
+        )
@@ -3,11 +3,17 @@ CKL Parser Service
 
 Service for parsing and validating STIG checklist files in CKL (Checklist) XML format.
 Supports both CKL v1.0 and v2.0 formats used by SCAP tools.
+
+Files are read incrementally with iterparse: each VULN is turned into a record
+and dropped from the tree as soon as it is complete, so memory does not grow
+with the size of the checklist (see CKLParser.stream_ckl_file).
 """
 
+import io
 import logging
+import os
 import xml.etree.ElementTree as ET
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Iterator, Optional, Tuple, Union
 from datetime import datetime
 import uuid
 
@@ -16,6 +22,9 @@ from django.utils import timezone
 
 logger = logging.getLogger(__name__)
 
+# Number of vulnerabilities per batch yielded by CKLStream
+DEFAULT_BATCH_SIZE = 500
+
 
 class CKLParser:
     """
@@ -37,6 +46,20 @@ class CKLParser:
         """Initialize the CKL parser"""
         self.supported_versions = ['1.0', '2.0']
 
+    def stream_ckl_file(self, source: Union[str, os.PathLike, io.IOBase],
+                        batch_size: int = DEFAULT_BATCH_SIZE) -> 'CKLStream':
+        """
+        Read a CKL file incrementally.
+
+        Args:
+            source: Path of the file, or a file object opened for reading
+            batch_size: Maximum number of vulnerabilities per batch
+
+        Returns:
+            CKLStream yielding batches of vulnerability records
+        """
+        return CKLStream(self, source, batch_size)
+
     def parse_ckl_file(self, ckl_content: str) -> Dict[str, Any]:
         """
         Parse CKL file content and return structured data.
@@ -51,84 +74,35 @@ class CKLParser:
             ValidationError: If CKL file is invalid or unsupported
         """
         try:
-            # Parse XML
-            root = ET.fromstring(ckl_content)
-
-            # Validate CKL format
-            self._validate_ckl_format(root)
-
-            # Extract version
-            version = self._extract_version(root)
-
-            # Parse based on version
-            if version == '1.0':
-                return self._parse_ckl_v1(root)
-            elif version == '2.0':
-                return self._parse_ckl_v2(root)
-            else:
-                raise ValidationError(f"Unsupported CKL version: {version}")
+            stream = self.stream_ckl_file(io.StringIO(ckl_content))
+            vulnerabilities = []
+            for batch in stream:
+                vulnerabilities.extend(batch)
+
+            return {
+                'version': stream.version,
+                'asset': stream.asset,
+                'stigs': stream.stigs,
+                'vulnerabilities': vulnerabilities,
+                'metadata': {
+                    'parsed_at': timezone.now().isoformat(),
+                    'parser_version': '1.0',
+                    'ckl_version': stream.version
+                }
+            }
 
-        except ET.ParseError as e:
-            raise ValidationError(f"Invalid XML format: {str(e)}")
+        except ValidationError:
+            raise
         except Exception as e:
             logger.error(f"Error parsing CKL file: {str(e)}")
             raise ValidationError(f"Failed to parse CKL file: {str(e)}")
 
-    def _validate_ckl_format(self, root: ET.Element) -> None:
-        """Validate that this is a proper CKL file"""
-        # Check for CHECKLIST root element
-        if root.tag != 'CHECKLIST':
-            raise ValidationError("Invalid CKL format: Root element must be 'CHECKLIST'")
-
-        # Check for required child elements
-        required_elements = ['ASSET', 'STIGS']
-        for element in required_elements:
-            if root.find(element) is None:
-                raise ValidationError(f"Invalid CKL format: Missing required element '{element}'")
-
-    def _extract_version(self, root: ET.Element) -> str:
-        """Extract CKL version from the file"""
-        # Look for version in STIG_INFO
-        stigs_elem = root.find('STIGS')
-        if stigs_elem is not None:
-            stig_info = stigs_elem.find('iSTIG/STIG_INFO')
-            if stig_info is not None:
-                for si_data in stig_info.findall('SI_DATA'):
-                    sid_name = si_data.find('SID_NAME')
-                    sid_data = si_data.find('SID_DATA')
-
-                    if (sid_name is not None and sid_data is not None and
-                        sid_name.text == 'version'):
-                        return sid_data.text
-
-        # Default to 1.0 if version not found
-        logger.warning("CKL version not found, defaulting to 1.0")
-        return '1.0'
-
-    def _parse_ckl_v1(self, root: ET.Element) -> Dict[str, Any]:
-        """Parse CKL version 1.0 format"""
-        return self._parse_ckl_common(root, '1.0')
-
-    def _parse_ckl_v2(self, root: ET.Element) -> Dict[str, Any]:
-        """Parse CKL version 2.0 format"""
-        # CKL 2.0 has similar structure but may have additional fields
-        return self._parse_ckl_common(root, '2.0')
-
-    def _parse_ckl_common(self, root: ET.Element, version: str) -> Dict[str, Any]:
-        """Common parsing logic for both CKL versions"""
-        checklist_data = {
-            'version': version,
-            'asset': self._parse_asset_info(root.find('ASSET')),
-            'stigs': self._parse_stigs_info(root.find('STIGS')),
-            'vulnerabilities': self._parse_vulnerabilities(root.find('STIGS')),
-            'metadata': {
-                'parsed_at': timezone.now().isoformat(),
-                'parser_version': '1.0',
-                'ckl_version': version
-            }
-        }
-
-        return checklist_data
+    def _extract_version(self, stig_info: List[Dict[str, str]]) -> Optional[str]:
+        """Extract CKL version from the parsed STIG_INFO of the first iSTIG"""
+        for item in stig_info:
+            if item['sid_name'] == 'version':
+                return item['sid_data']
+        return None
 
     def _parse_asset_info(self, asset_elem: ET.Element) -> Dict[str, Any]:
         """Parse asset information from CKL"""
@@ -205,34 +179,15 @@ class CKLParser:
 
         return asset_data
 
-    def _parse_stigs_info(self, stigs_elem: ET.Element) -> Dict[str, Any]:
-        """Parse STIG information from CKL"""
-        if stigs_elem is None:
-            return {}
-
-        stigs_data = {}
-
-        # Find iSTIG element
-        istig_elem = stigs_elem.find('iSTIG')
-        if istig_elem is None:
-            return stigs_data
-
-        # Parse STIG_INFO
-        stig_info_elem = istig_elem.find('STIG_INFO')
-        if stig_info_elem is not None:
-            stigs_data['stig_info'] = self._parse_stig_info(stig_info_elem)
-
-        # Parse STIG_DATA (vulnerability definitions)
-        stig_data_elem = istig_elem.find('STIG_DATA')
-        if stig_data_elem is not None:
-            stigs_data['stig_data'] = []
-            for vuln_data in stig_data_elem:
-                stigs_data['stig_data'].append({
-                    'vuln_attribute': vuln_data.find('VULN_ATTRIBUTE').text if vuln_data.find('VULN_ATTRIBUTE') is not None else '',
-                    'attribute_data': vuln_data.find('ATTRIBUTE_DATA').text if vuln_data.find('ATTRIBUTE_DATA') is not None else ''
-                })
-
-        return stigs_data
+    def _parse_stig_data(self, stig_data_elem: ET.Element) -> List[Dict[str, str]]:
+        """Parse an iSTIG level STIG_DATA section (vulnerability definitions)"""
+        return [
+            {
+                'vuln_attribute': vuln_data.find('VULN_ATTRIBUTE').text if vuln_data.find('VULN_ATTRIBUTE') is not None else '',
+                'attribute_data': vuln_data.find('ATTRIBUTE_DATA').text if vuln_data.find('ATTRIBUTE_DATA') is not None else ''
+            }
+            for vuln_data in stig_data_elem
+        ]
 
     def _parse_stig_info(self, stig_info_elem: ET.Element) -> List[Dict[str, str]]:
         """Parse STIG_INFO section"""
@@ -250,22 +205,6 @@ class CKLParser:
 
         return stig_info
 
-    def _parse_vulnerabilities(self, stigs_elem: ET.Element) -> List[Dict[str, Any]]:
-        """Parse vulnerability findings from CKL"""
-        vulnerabilities = []
-
-        if stigs_elem is None:
-            return vulnerabilities
-
-        # Find VULN elements
-        vuln_elements = stigs_elem.findall('.//VULN')
-        for vuln_elem in vuln_elements:
-            vuln_data = self._parse_single_vulnerability(vuln_elem)
-            if vuln_data:
-                vulnerabilities.append(vuln_data)
-
-        return vulnerabilities
-
     def _parse_single_vulnerability(self, vuln_elem: ET.Element) -> Optional[Dict[str, Any]]:
         """Parse a single vulnerability element"""
         try:
@@ -291,11 +230,12 @@ class CKLParser:
             severity_justification_elem = vuln_elem.find('SEVERITY_JUSTIFICATION')
             vuln_data['severity_justification'] = severity_justification_elem.text if severity_justification_elem is not None else ''
 
-            # STIG data (vulnerability attributes)
+            # STIG data (vulnerability attributes): STIG Viewer repeats STIG_DATA
+            # for each attribute, CKLExporter nests them in a single STIG_DATA
             stig_data = []
-            stig_data_elem = vuln_elem.find('STIG_DATA')
-            if stig_data_elem is not None:
-                for data_elem in stig_data_elem:
+            for stig_data_elem in vuln_elem.findall('STIG_DATA'):
+                data_elems = [stig_data_elem] if stig_data_elem.find('VULN_ATTRIBUTE') is not None else list(stig_data_elem)
+                for data_elem in data_elems:
                     stig_data.append({
                         'attribute': data_elem.find('VULN_ATTRIBUTE').text if data_elem.find('VULN_ATTRIBUTE') is not None else '',
                         'data': data_elem.find('ATTRIBUTE_DATA').text if data_elem.find('ATTRIBUTE_DATA') is not None else ''
@@ -408,19 +348,123 @@ class CKLParser:
                 summary['stig_version'] = item['sid_data']
 
         # Vulnerability summary
-        vulnerabilities = checklist_data.get('vulnerabilities', [])
-        summary['total_vulnerabilities'] = len(vulnerabilities)
+        for vuln in checklist_data.get('vulnerabilities', []):
+            self._count_vulnerability(summary, vuln)
 
-        for vuln in vulnerabilities:
-            if vuln.get('status') == 'Open':
-                summary['open_findings'] += 1
+        return summary
 
-            severity = vuln.get('severity', '').lower()
-            if severity in ['high', 'cat i']:
-                summary['severity_breakdown']['high'] += 1
-            elif severity in ['medium', 'cat ii']:
-                summary['severity_breakdown']['medium'] += 1
-            elif severity in ['low', 'cat iii']:
-                summary['severity_breakdown']['low'] += 1
+    def _count_vulnerability(self, stats: Dict[str, Any], vuln: Dict[str, Any]) -> None:
+        """Add a vulnerability to the total/open_findings/severity_breakdown counters"""
+        stats['total_vulnerabilities'] += 1
+        if vuln.get('status') == 'Open':
+            stats['open_findings'] += 1
 
-        return summary
+        severity = vuln.get('severity', '').lower()
+        if severity in ['high', 'cat i']:
+            stats['severity_breakdown']['high'] += 1
+        elif severity in ['medium', 'cat ii']:
+            stats['severity_breakdown']['medium'] += 1
+        elif severity in ['low', 'cat iii']:
+            stats['severity_breakdown']['low'] += 1
+
+
+class CKLStream:
+    """
+    Incremental reader of a CKL file.
+
+    Iterating yields lists of at most `batch_size` vulnerabilities, as returned
+    by CKLParser._parse_single_vulnerability. `version`, `asset` and `stigs` are
+    available once their section has been read (before the first batch for
+    well-formed checklists); `statistics` is complete once the iteration is
+    over. A stream can be iterated only once.
+
+    Raises ValidationError if the file is not a valid or supported CKL file.
+    """
+
+    def __init__(self, parser: CKLParser, source, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.parser = parser
+        self.source = source
+        self.batch_size = max(batch_size, 1)
+        self.version: Optional[str] = None
+        self.asset: Dict[str, Any] = {}
+        self.stigs: Dict[str, Any] = {}
+        self.statistics: Dict[str, Any] = {
+            'total_vulnerabilities': 0,
+            'open_findings': 0,
+            'severity_breakdown': {'high': 0, 'medium': 0, 'low': 0}
+        }
+        self._consumed = False
+
+    def __iter__(self) -> Iterator[List[Dict[str, Any]]]:
+        if self._consumed:
+            raise RuntimeError("CKLStream can only be iterated once")
+        self._consumed = True
+        try:
+            yield from self._read()
+        except ET.ParseError as e:
+            raise ValidationError(f"Invalid XML format: {str(e)}")
+
+    def _set_version(self, version: Optional[str]) -> None:
+        if version is None:
+            logger.warning("CKL version not found, defaulting to 1.0")
+            version = '1.0'
+        if version not in self.parser.supported_versions:
+            raise ValidationError(f"Unsupported CKL version: {version}")
+        self.version = version
+
+    def _read(self) -> Iterator[List[Dict[str, Any]]]:
+        parser = self.parser
+        batch: List[Dict[str, Any]] = []
+        # Open elements, from the root to the current one
+        stack: List[ET.Element] = []
+        seen = set()
+        istig_count = 0
+
+        for event, elem in ET.iterparse(self.source, events=('start', 'end')):
+            if event == 'start':
+                if not stack and elem.tag != 'CHECKLIST':
+                    raise ValidationError("Invalid CKL format: Root element must be 'CHECKLIST'")
+                if len(stack) == 1:
+                    seen.add(elem.tag)
+                elif len(stack) == 2 and stack[1].tag == 'STIGS' and elem.tag == 'iSTIG':
+                    istig_count += 1
+                stack.append(elem)
+                continue
+
+            stack.pop()
+            parent = stack[-1] if stack else None
+            depth = len(stack)
+            # Only the first iSTIG describes the checklist
+            in_first_istig = depth == 3 and istig_count == 1 and parent.tag == 'iSTIG'
+
+            if depth == 1 and elem.tag == 'ASSET':
+                self.asset = parser._parse_asset_info(elem)
+                parent.remove(elem)
+            elif in_first_istig and elem.tag == 'STIG_INFO' and 'stig_info' not in self.stigs:
+                self.stigs['stig_info'] = parser._parse_stig_info(elem)
+                if self.version is None:
+                    self._set_version(parser._extract_version(self.stigs['stig_info']))
+                parent.remove(elem)
+            elif in_first_istig and elem.tag == 'STIG_DATA' and 'stig_data' not in self.stigs:
+                self.stigs['stig_data'] = parser._parse_stig_data(elem)
+                parent.remove(elem)
+            elif elem.tag == 'VULN' and depth >= 2 and stack[1].tag == 'STIGS':
+                if self.version is None:
+                    self._set_version(None)
+                vuln_data = parser._parse_single_vulnerability(elem)
+                parent.remove(elem)
+                if vuln_data:
+                    parser._count_vulnerability(self.statistics, vuln_data)
+                    batch.append(vuln_data)
+                    if len(batch) >= self.batch_size:
+                        yield batch
+                        batch = []
+
+        for element in ('ASSET', 'STIGS'):
+            if element not in seen:
+                raise ValidationError(f"Invalid CKL format: Missing required element '{element}'")
+        if self.version is None:
+            self._set_version(None)
+
+        if batch:
+            yield batch
@@ -4,16 +4,125 @@ Nessus Parser Service
 Service for parsing Nessus ACAS vulnerability scan XML files.
 Extracts scan metadata, host information, and vulnerability findings
 for correlation with STIG checklists.
+
+Files are read incrementally with iterparse: each ReportHost is turned into
+records and dropped from the tree as soon as it is complete, so memory does
+not grow with the size of the export (see NessusParser.stream_nessus_file).
 """
 
+import io
 import logging
+import os
 import xml.etree.ElementTree as ET
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterator, Optional, Union
 from datetime import datetime
+from django.core.exceptions import ValidationError
 from django.utils import timezone
 
 logger = logging.getLogger(__name__)
 
+# Number of vulnerability records per batch yielded by NessusStream
+DEFAULT_BATCH_SIZE = 1000
+
+
+class NessusStream:
+    """
+    Incremental reader of a Nessus file.
+
+    Iterating yields batches {'hosts': [...], 'vulnerabilities': [...]} of at
+    most `batch_size` vulnerabilities; hosts are emitted in the batch in which
+    they end. `metadata` and `statistics` are filled in while reading and are
+    complete once the iteration is over. A stream can be iterated only once.
+
+    Raises ValidationError if the file is not a valid Nessus file.
+    """
+
+    def __init__(self, parser: 'NessusParser', source, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.parser = parser
+        self.source = source
+        self.batch_size = max(batch_size, 1)
+        self.metadata: Dict[str, Any] = {}
+        self.statistics: Dict[str, Any] = parser._empty_statistics()
+        self._consumed = False
+
+    def __iter__(self) -> Iterator[Dict[str, List[Dict[str, Any]]]]:
+        if self._consumed:
+            raise RuntimeError("NessusStream can only be iterated once")
+        self._consumed = True
+        try:
+            yield from self._read()
+        except ET.ParseError as e:
+            raise ValidationError(f"Invalid XML format: {str(e)}")
+
+    def consume(self) -> 'NessusStream':
+        """Read the whole file, discarding the records (metadata and statistics only)"""
+        for _ in self:
+            pass
+        return self
+
+    def _read(self) -> Iterator[Dict[str, List[Dict[str, Any]]]]:
+        parser = self.parser
+        hosts: List[Dict[str, Any]] = []
+        vulnerabilities: List[Dict[str, Any]] = []
+        # Open elements, from the root to the current one
+        stack: List[ET.Element] = []
+        seen = set()
+        host: Optional[Dict[str, Any]] = None
+
+        for event, elem in ET.iterparse(self.source, events=('start', 'end')):
+            if event == 'start':
+                if not stack and elem.tag != 'NessusClientData_v2':
+                    raise ValidationError("Invalid Nessus format: Root element must be 'NessusClientData_v2'")
+                if len(stack) == 1:
+                    seen.add(elem.tag)
+                    if elem.tag == 'Report':
+                        self.metadata['report_name'] = elem.get('name', '')
+                elif len(stack) == 2 and elem.tag == 'ReportHost':
+                    host = {
+                        'name': elem.get('name', ''),
+                        'properties': {},
+                        'vulnerabilities': [],
+                        'vulnerability_summary': {},
+                        'total_vulnerabilities': 0
+                    }
+                stack.append(elem)
+                continue
+
+            stack.pop()
+            parent = stack[-1] if stack else None
+            depth = len(stack)
+
+            if depth == 1 and elem.tag == 'Policy':
+                self.metadata.update(parser._extract_policy_metadata(elem))
+                parent.remove(elem)
+            elif host is not None and depth == 3 and elem.tag == 'HostProperties':
+                host['properties'] = parser._extract_host_properties(elem)
+                parent.remove(elem)
+            elif host is not None and depth == 3 and elem.tag == 'ReportItem':
+                vuln_data = parser._parse_report_item(elem, host['name'])
+                severity = vuln_data['severity']
+                host['vulnerability_summary'][severity] = host['vulnerability_summary'].get(severity, 0) + 1
+                host['total_vulnerabilities'] += 1
+                parser._count_vulnerability(self.statistics, vuln_data)
+                vulnerabilities.append(vuln_data)
+                parent.remove(elem)
+            elif host is not None and depth == 2 and elem.tag == 'ReportHost':
+                hosts.append(host)
+                self.statistics['total_hosts'] += 1
+                host = None
+                parent.remove(elem)
+
+            if len(vulnerabilities) >= self.batch_size:
+                yield {'hosts': hosts, 'vulnerabilities': vulnerabilities}
+                hosts, vulnerabilities = [], []
+
+        for element in ('Policy', 'Report'):
+            if element not in seen:
+                raise ValidationError(f"Invalid Nessus format: Missing required element '{element}'")
+
+        if hosts or vulnerabilities:
+            yield {'hosts': hosts, 'vulnerabilities': vulnerabilities}
+
 
 class NessusParser:
     """
@@ -27,6 +136,20 @@ class NessusParser:
         """Initialize the Nessus parser"""
         self.supported_versions = ['2.0']  # Nessus XML format version
 
+    def stream_nessus_file(self, source: Union[str, os.PathLike, io.IOBase],
+                           batch_size: int = DEFAULT_BATCH_SIZE) -> NessusStream:
+        """
+        Read a Nessus file incrementally.
+
+        Args:
+            source: Path of the file, or a file object opened for reading
+            batch_size: Maximum number of vulnerability records per batch
+
+        Returns:
+            NessusStream yielding batches of host/vulnerability records
+        """
+        return NessusStream(self, source, batch_size)
+
     def parse_nessus_file(self, xml_content: str) -> Dict[str, Any]:
         """
         Parse Nessus XML file and return structured data.
@@ -41,18 +164,18 @@ class NessusParser:
             ValidationError: If Nessus file is invalid
         """
         try:
-            # Parse XML
-            root = ET.fromstring(xml_content)
-
-            # Validate Nessus format
-            self._validate_nessus_format(root)
+            stream = self.stream_nessus_file(io.StringIO(xml_content))
+            hosts = []
+            vulnerabilities = []
+            for batch in stream:
+                hosts.extend(batch['hosts'])
+                vulnerabilities.extend(batch['vulnerabilities'])
 
-            # Extract scan data
             scan_data = {
-                'metadata': self._extract_scan_metadata(root),
-                'hosts': self._extract_hosts(root),
-                'vulnerabilities': self._extract_vulnerabilities(root),
-                'statistics': self._calculate_statistics(root),
+                'metadata': stream.metadata,
+                'hosts': hosts,
+                'vulnerabilities': vulnerabilities,
+                'statistics': stream.statistics,
                 'parsing_info': {
                     'parsed_at': timezone.now().isoformat(),
                     'parser_version': '1.0',
@@ -62,165 +185,103 @@ class NessusParser:
 
             return scan_data
 
-        except ET.ParseError as e:
-            from django.core.exceptions import ValidationError
-            raise ValidationError(f"Invalid XML format: {str(e)}")
+        except ValidationError:
+            raise
         except Exception as e:
             logger.error(f"Error parsing Nessus file: {str(e)}")
-            from django.core.exceptions import ValidationError
             raise ValidationError(f"Failed to parse Nessus file: {str(e)}")
 
-    def _validate_nessus_format(self, root: ET.Element) -> None:
-        """Validate that this is a proper Nessus file"""
-        # Check for root NessusClientData_v2 element
-        if root.tag != 'NessusClientData_v2':
-            raise ValidationError("Invalid Nessus format: Root element must be 'NessusClientData_v2'")
-
-        # Check for required child elements
-        required_elements = ['Policy', 'Report']
-        for element in required_elements:
-            if root.find(element) is None:
-                raise ValidationError(f"Invalid Nessus format: Missing required element '{element}'")
-
-    def _extract_scan_metadata(self, root: ET.Element) -> Dict[str, Any]:
-        """Extract scan metadata from Nessus file"""
+    def _extract_policy_metadata(self, policy_elem: ET.Element) -> Dict[str, Any]:
+        """Extract scan metadata from the Policy element"""
         metadata = {}
 
         # Policy information
-        policy_elem = root.find('Policy')
-        if policy_elem is not None:
-            metadata['policy_name'] = policy_elem.findtext('policyName', '')
-            metadata['policy_comments'] = policy_elem.findtext('policyComments', '')
-
-            # Server preferences
-            server_preferences = {}
-            for pref in policy_elem.findall('.//preference'):
-                name = pref.findtext('name', '')
-                value = pref.findtext('value', '')
-                if name and value:
-                    server_preferences[name] = value
-            metadata['server_preferences'] = server_preferences
-
-        # Report information
-        report_elem = root.find('Report')
-        if report_elem is not None:
-            metadata['report_name'] = report_elem.get('name', '')
+        metadata['policy_name'] = policy_elem.findtext('policyName', '')
+        metadata['policy_comments'] = policy_elem.findtext('policyComments', '')
+
+        # Server preferences
+        server_preferences = {}
+        for pref in policy_elem.findall('.//preference'):
+            name = pref.findtext('name', '')
+            value = pref.findtext('value', '')
+            if name and value:
+                server_preferences[name] = value
+        metadata['server_preferences'] = server_preferences
 
         # Scanner information (from server preferences or other sources)
-        server_prefs = metadata.get('server_preferences', {})
-        metadata['scanner_version'] = server_prefs.get('sc_version', '')
-        metadata['scanner_build'] = server_prefs.get('sc_build', '')
+        metadata['scanner_version'] = server_preferences.get('sc_version', '')
+        metadata['scanner_build'] = server_preferences.get('sc_build', '')
 
         # Try to extract scan date from various sources
-        scan_date = self._extract_scan_date(root)
+        scan_date = self._extract_scan_date(policy_elem)
         if scan_date:
             metadata['scan_date'] = scan_date.isoformat()
 
         return metadata
 
-    def _extract_scan_date(self, root: ET.Element) -> Optional[datetime]:
+    def _extract_scan_date(self, policy_elem: ET.Element) -> Optional[datetime]:
         """Extract scan date from various possible locations"""
         # Try to get from server preferences
-        policy_elem = root.find('Policy')
-        if policy_elem is not None:
-            server_prefs = policy_elem.find('Preferences')
-            if server_prefs is not None:
-                for pref in server_prefs.findall('ServerPreferences/preference'):
-                    name = pref.findtext('name', '')
-                    if name == 'scan_start_timestamp':
-                        value = pref.findtext('value', '')
-                        try:
-                            # Nessus timestamp is typically Unix timestamp
-                            return datetime.fromtimestamp(int(value))
-                        except (ValueError, TypeError):
-                            pass
+        server_prefs = policy_elem.find('Preferences')
+        if server_prefs is not None:
+            for pref in server_prefs.findall('ServerPreferences/preference'):
+                name = pref.findtext('name', '')
+                if name == 'scan_start_timestamp':
+                    value = pref.findtext('value', '')
+                    try:
+                        # Nessus timestamp is typically Unix timestamp
+                        return datetime.fromtimestamp(int(value))
+                    except (ValueError, TypeError):
+                        pass
 
         # Fallback: use current time (scan might be recent)
         return None
 
-    def _extract_hosts(self, root: ET.Element) -> List[Dict[str, Any]]:
-        """Extract host information from Nessus scan"""
-        hosts = []
-
-        report_elem = root.find('Report')
-        if report_elem is None:
-            return hosts
-
-        for host_elem in report_elem.findall('ReportHost'):
-            host_data = {
-                'name': host_elem.get('name', ''),
-                'properties': {},
-                'vulnerabilities': []
-            }
-
-            # Extract host properties
-            for tag_elem in host_elem.findall('HostProperties/tag'):
-                name = tag_elem.get('name', '')
-                value = tag_elem.text or ''
-                host_data['properties'][name] = value
-
-            # Extract vulnerability summaries for this host
-            vuln_count = {}
-            for item_elem in host_elem.findall('ReportItem'):
-                severity = item_elem.get('severity', '0')
-                vuln_count[severity] = vuln_count.get(severity, 0) + 1
-
-            host_data['vulnerability_summary'] = vuln_count
-            host_data['total_vulnerabilities'] = sum(vuln_count.values())
-
-            hosts.append(host_data)
-
-        return hosts
-
-    def _extract_vulnerabilities(self, root: ET.Element) -> List[Dict[str, Any]]:
-        """Extract vulnerability findings from Nessus scan"""
-        vulnerabilities = []
-
-        report_elem = root.find('Report')
-        if report_elem is None:
-            return vulnerabilities
-
-        for host_elem in report_elem.findall('ReportHost'):
-            host_name = host_elem.get('name', '')
-
-            for item_elem in host_elem.findall('ReportItem'):
-                vuln_data = {
-                    'host_name': host_name,
-                    'plugin_id': item_elem.get('pluginID', ''),
-                    'plugin_name': item_elem.get('pluginName', ''),
-                    'plugin_family': item_elem.get('pluginFamily', ''),
-                    'severity': item_elem.get('severity', '0'),
-                    'severity_text': self._severity_to_text(item_elem.get('severity', '0')),
-                    'protocol': item_elem.get('protocol', ''),
-                    'port': item_elem.get('port', ''),
-                    'service': item_elem.get('svc_name', ''),
-                    'plugin_publication_date': item_elem.findtext('plugin_publication_date', ''),
-                    'plugin_modification_date': item_elem.findtext('plugin_modification_date', ''),
-                    'cvss_base_score': item_elem.findtext('cvss_base_score', ''),
-                    'cvss_temporal_score': item_elem.findtext('cvss_temporal_score', ''),
-                    'cvss_vector': item_elem.findtext('cvss_vector', ''),
-                    'risk_factor': item_elem.findtext('risk_factor', ''),
-                    'synopsis': item_elem.findtext('synopsis', ''),
-                    'description': item_elem.findtext('description', ''),
-                    'solution': item_elem.findtext('solution', ''),
-                    'plugin_output': item_elem.findtext('plugin_output', ''),
-                    'see_also': item_elem.findtext('see_also', ''),
-                    'cve': self._extract_cve_list(item_elem),
-                    'bid': self._extract_bid_list(item_elem),
-                    'xref': self._extract_xref_list(item_elem),
-                    'tags': {}
-                }
-
-                # Extract additional tags
-                for tag_elem in item_elem.findall('tag'):
-                    key = tag_elem.get('key', '')
-                    value = tag_elem.text or ''
-                    if key:
-                        vuln_data['tags'][key] = value
+    def _extract_host_properties(self, properties_elem: ET.Element) -> Dict[str, str]:
+        """Extract host properties from a HostProperties element"""
+        properties = {}
+        for tag_elem in properties_elem.findall('tag'):
+            name = tag_elem.get('name', '')
+            properties[name] = tag_elem.text or ''
+        return properties
+
+    def _parse_report_item(self, item_elem: ET.Element, host_name: str) -> Dict[str, Any]:
+        """Extract a vulnerability finding from a ReportItem element"""
+        vuln_data = {
+            'host_name': host_name,
+            'plugin_id': item_elem.get('pluginID', ''),
+            'plugin_name': item_elem.get('pluginName', ''),
+            'plugin_family': item_elem.get('pluginFamily', ''),
+            'severity': item_elem.get('severity', '0'),
+            'severity_text': self._severity_to_text(item_elem.get('severity', '0')),
+            'protocol': item_elem.get('protocol', ''),
+            'port': item_elem.get('port', ''),
+            'service': item_elem.get('svc_name', ''),
+            'plugin_publication_date': item_elem.findtext('plugin_publication_date', ''),
+            'plugin_modification_date': item_elem.findtext('plugin_modification_date', ''),
+            'cvss_base_score': item_elem.findtext('cvss_base_score', ''),
+            'cvss_temporal_score': item_elem.findtext('cvss_temporal_score', ''),
+            'cvss_vector': item_elem.findtext('cvss_vector', ''),
+            'risk_factor': item_elem.findtext('risk_factor', ''),
+            'synopsis': item_elem.findtext('synopsis', ''),
+            'description': item_elem.findtext('description', ''),
+            'solution': item_elem.findtext('solution', ''),
+            'plugin_output': item_elem.findtext('plugin_output', ''),
+            'see_also': item_elem.findtext('see_also', ''),
+            'cve': self._extract_cve_list(item_elem),
+            'bid': self._extract_bid_list(item_elem),
+            'xref': self._extract_xref_list(item_elem),
+            'tags': {}
+        }
 
-                vulnerabilities.append(vuln_data)
+        # Extract additional tags
+        for tag_elem in item_elem.findall('tag'):
+            key = tag_elem.get('key', '')
+            value = tag_elem.text or ''
+            if key:
+                vuln_data['tags'][key] = value
 
-        return vulnerabilities
+        return vuln_data
 
     def _severity_to_text(self, severity: str) -> str:
         """Convert Nessus severity number to text"""
@@ -258,9 +319,10 @@ class NessusParser:
             xrefs = [xref.strip() for xref in xref_elem.text.split(',') if xref.strip()]
         return xrefs
 
-    def _calculate_statistics(self, root: ET.Element) -> Dict[str, Any]:
-        """Calculate scan statistics"""
-        stats = {
+
+    def _empty_statistics(self) -> Dict[str, Any]:
+        """Scan statistics before any host is read"""
+        return {
             'total_hosts': 0,
             'total_vulnerabilities': 0,
             'severity_breakdown': {
@@ -274,26 +336,17 @@ class NessusParser:
             'scan_duration_seconds': None
         }
 
-        report_elem = root.find('Report')
-        if report_elem is not None:
-            hosts = report_elem.findall('ReportHost')
-            stats['total_hosts'] = len(hosts)
-
-            for host_elem in hosts:
-                for item_elem in host_elem.findall('ReportItem'):
-                    stats['total_vulnerabilities'] += 1
-
-                    severity = item_elem.get('severity', '0')
-                    severity_text = self._severity_to_text(severity)
-                    severity_key = severity_text.lower()
-                    if severity_key in stats['severity_breakdown']:
-                        stats['severity_breakdown'][severity_key] += 1
+    def _count_vulnerability(self, stats: Dict[str, Any], vuln_data: Dict[str, Any]) -> None:
+        """Add a vulnerability finding to the scan statistics"""
+        stats['total_vulnerabilities'] += 1
 
-                    # Count plugin families
-                    plugin_family = item_elem.get('pluginFamily', 'Unknown')
-                    stats['plugin_families'][plugin_family] = stats['plugin_families'].get(plugin_family, 0) + 1
+        severity_key = vuln_data['severity_text'].lower()
+        if severity_key in stats['severity_breakdown']:
+            stats['severity_breakdown'][severity_key] += 1
 
-        return stats
+        # Count plugin families
+        plugin_family = vuln_data['plugin_family'] or 'Unknown'
+        stats['plugin_families'][plugin_family] = stats['plugin_families'].get(plugin_family, 0) + 1
 
     def extract_scan_summary(self, scan_data: Dict[str, Any]) -> Dict[str, Any]:
         """Extract summary information from parsed scan data"""
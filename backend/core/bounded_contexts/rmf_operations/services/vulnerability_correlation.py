@@ -6,13 +6,171 @@ Nessus ACAS vulnerability scans. Provides unified vulnerability management
 and comprehensive risk assessment.
 """
 
+import math
+import re
 import uuid
 import logging
-from typing import Dict, List, Any, Optional, Tuple
-from difflib import SequenceMatcher
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Any, Optional, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
+CVE_PATTERN = re.compile(r'CVE-\d{4}-\d{4,}', re.IGNORECASE)
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+# Name similarity boost when both names mention one of these terms
+SECURITY_TERMS = ('password', 'encryption', 'authentication', 'access', 'privilege')
+SECURITY_TERM_BOOST = 0.2
+
+# Matches kept per checklist finding, to avoid noise
+MAX_MATCHES = 3
+
+
+@dataclass(frozen=True)
+class FindingKeys:
+    """Correlation keys of a finding, extracted once per correlation run"""
+    cves: FrozenSet[str]
+    id_digits: str
+    name: str
+    tokens: FrozenSet[str]
+    has_security_term: bool
+
+    @classmethod
+    def build(cls, cves: Iterable[str], vuln_id: Any, name: str) -> 'FindingKeys':
+        name = (name or '').lower()
+        return cls(
+            cves=frozenset(cves),
+            id_digits=''.join(c for c in str(vuln_id or '') if c.isdigit()),
+            name=name,
+            tokens=frozenset(TOKEN_PATTERN.findall(name)),
+            has_security_term=any(term in name for term in SECURITY_TERMS)
+        )
+
+
+class NessusFindingIndex:
+    """
+    Inverted indexes of Nessus findings on CVE, plugin id digits and name tokens.
+
+    Used to generate the candidates of a checklist finding instead of comparing
+    it with every Nessus finding. Name tokens are indexed with prefix filtering:
+    the tokens of each name are ordered from the rarest to the most frequent and
+    only the first |tokens| - ceil(t * |tokens|) + 1 are indexed, so two names
+    with a token Jaccard similarity >= t always share an indexed token while
+    frequent tokens ('windows', 'server'...) rarely produce candidates. Postings
+    keep the rank of the token in the name, which bounds the overlap two names
+    can still reach (positional filtering) before computing their similarity.
+
+    Names mentioning a security term are also indexed with the lower threshold
+    they need when the other name mentions one too (see SECURITY_TERM_BOOST).
+    """
+
+    def __init__(self, keys: List[FindingKeys], name_threshold: float, boosted_name_threshold: float):
+        self.keys = keys
+        self.name_threshold = max(name_threshold, 0.0)
+        self.boosted_name_threshold = max(boosted_name_threshold, 0.0)
+        self.by_cve: Dict[str, List[int]] = defaultdict(list)
+        self.by_id: Dict[str, List[int]] = defaultdict(list)
+        # A plugin is reported once per host: names are indexed once and
+        # their similarity computed once, whatever the number of findings
+        name_ids: Dict[FrozenSet[str], int] = {}
+        self.names: List[FrozenSet[str]] = []
+        self.name_positions: List[List[int]] = []
+        name_has_security_term: List[bool] = []
+
+        for position, k in enumerate(keys):
+            for cve in k.cves:
+                self.by_cve[cve].append(position)
+            if k.id_digits:
+                self.by_id[k.id_digits].append(position)
+            if not k.tokens:
+                continue
+            if k.tokens not in name_ids:
+                name_ids[k.tokens] = len(self.names)
+                self.names.append(k.tokens)
+                self.name_positions.append([])
+                name_has_security_term.append(False)
+            name_id = name_ids[k.tokens]
+            self.name_positions[name_id].append(position)
+            name_has_security_term[name_id] |= k.has_security_term
+
+        self._token_frequency = Counter(token for tokens in self.names for token in tokens)
+        # token -> [(name id, rank of the token in the name)]
+        self.by_token: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self.by_boosted_token: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        for name_id, tokens in enumerate(self.names):
+            ordered = self._ordered(tokens)
+            for rank, token in enumerate(self._prefix(ordered, self.name_threshold)):
+                self.by_token[token].append((name_id, rank))
+            if name_has_security_term[name_id]:
+                for rank, token in enumerate(self._prefix(ordered, self.boosted_name_threshold)):
+                    self.by_boosted_token[token].append((name_id, rank))
+
+    def _ordered(self, tokens: FrozenSet[str]) -> List[str]:
+        return sorted(tokens, key=lambda token: (self._token_frequency.get(token, 0), token))
+
+    def _prefix(self, ordered: List[str], threshold: float) -> List[str]:
+        # Epsilon: t * n computed in floating point must not round above an integer
+        length = len(ordered) - math.ceil(threshold * len(ordered) - 1e-9) + 1
+        return ordered[:length]
+
+    def _similar_names(self, tokens: FrozenSet[str], postings: Dict[str, List[Tuple[int, int]]],
+                       threshold: float, name_ids: Set[int]) -> None:
+        """Add the ids of the names with a token similarity >= threshold"""
+        ordered = self._ordered(tokens)
+        size = len(ordered)
+        # Jaccard >= t implies t * |a| <= |b| <= |a| / t and |a & b| >= t / (1 + t) * (|a| + |b|)
+        min_size = threshold * size - 1e-9
+        max_size = size / threshold + 1e-9 if threshold else math.inf
+        overlap_ratio = threshold / (1 + threshold)
+        # Common prefix tokens seen so far, -1 once the pair cannot reach the threshold
+        overlaps: Dict[int, int] = {}
+
+        for rank, token in enumerate(self._prefix(ordered, threshold)):
+            for name_id, other_rank in postings.get(token, ()):
+                overlap = overlaps.get(name_id, 0)
+                if overlap < 0:
+                    continue
+                other_size = len(self.names[name_id])
+                if not min_size <= other_size <= max_size:
+                    overlaps[name_id] = -1
+                    continue
+                reachable = overlap + 1 + min(size - rank - 1, other_size - other_rank - 1)
+                if reachable < overlap_ratio * (size + other_size) - 1e-9:
+                    overlaps[name_id] = -1
+                    continue
+                overlaps[name_id] = overlap + 1
+
+        for name_id, overlap in overlaps.items():
+            if overlap > 0 and token_similarity(tokens, self.names[name_id]) >= threshold:
+                name_ids.add(name_id)
+
+    def candidates(self, keys: FindingKeys) -> List[int]:
+        """
+        Positions of the Nessus findings sharing a CVE or an id with `keys`, or
+        whose name is similar enough to reach the low confidence threshold, in order
+        """
+        positions: Set[int] = set()
+        for cve in keys.cves:
+            positions.update(self.by_cve.get(cve, ()))
+        if keys.id_digits:
+            positions.update(self.by_id.get(keys.id_digits, ()))
+        if keys.tokens:
+            name_ids: Set[int] = set()
+            self._similar_names(keys.tokens, self.by_token, self.name_threshold, name_ids)
+            if keys.has_security_term:
+                self._similar_names(keys.tokens, self.by_boosted_token, self.boosted_name_threshold, name_ids)
+            for name_id in name_ids:
+                positions.update(self.name_positions[name_id])
+        return sorted(positions)
+
+
+def token_similarity(tokens: FrozenSet[str], other_tokens: FrozenSet[str]) -> float:
+    """Token Jaccard similarity"""
+    common = len(tokens & other_tokens)
+    union = len(tokens) + len(other_tokens) - common
+    return common / union if union else 0.0
+
 
 class VulnerabilityCorrelationService:
     """
@@ -55,21 +213,38 @@ class VulnerabilityCorrelationService:
         if not nessus_findings:
             return self._create_empty_correlation_result(checklist_id, nessus_scan_id)
 
-        # Perform correlation
+        result = self.correlate_findings(checklist_findings, nessus_findings)
+
+        # Update scan with correlation
+        self._update_scan_correlation(nessus_scan_id, checklist_id)
+
+        return {
+            'checklist_id': str(checklist_id),
+            'nessus_scan_id': str(nessus_scan_id),
+            **result
+        }
+
+    def correlate_findings(self, checklist_findings: List[Dict[str, Any]],
+                           nessus_findings: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Correlate checklist findings with Nessus findings.
+
+        Nessus findings are indexed once; each checklist finding is only scored
+        against the candidates sharing a CVE, an id or an indexed name token
+        with it, which keeps large checklists and scans close to linear time.
+        """
+        index = self.build_nessus_index(nessus_findings)
+
         correlations = []
         unmatched_ckl = []
-        unmatched_nessus = list(nessus_findings)  # Copy for tracking
+        matched_nessus: Set[int] = set()
 
         for ckl_finding in checklist_findings:
-            matches = self._find_nessus_matches(ckl_finding, nessus_findings)
+            matches = self._find_nessus_matches(self._ckl_keys(ckl_finding), index, nessus_findings)
 
             if matches:
-                # Remove matched Nessus findings from unmatched list
-                for match in matches:
-                    nessus_finding = match['nessus_finding']
-                    if nessus_finding in unmatched_nessus:
-                        unmatched_nessus.remove(nessus_finding)
-
+                matched_nessus.update(position for position, _ in matches)
+                matches = [match for _, match in matches]
                 correlations.append({
                     'ckl_finding': ckl_finding,
                     'matches': matches,
@@ -79,12 +254,12 @@ class VulnerabilityCorrelationService:
             else:
                 unmatched_ckl.append(ckl_finding)
 
-        # Update scan with correlation
-        self._update_scan_correlation(nessus_scan_id, checklist_id)
+        unmatched_nessus = [
+            finding for position, finding in enumerate(nessus_findings)
+            if position not in matched_nessus
+        ]
 
         return {
-            'checklist_id': str(checklist_id),
-            'nessus_scan_id': str(nessus_scan_id),
             'total_ckl_findings': len(checklist_findings),
             'total_nessus_findings': len(nessus_findings),
             'correlations_found': len(correlations),
@@ -97,10 +272,51 @@ class VulnerabilityCorrelationService:
             'summary': self._generate_correlation_summary(correlations, unmatched_ckl, unmatched_nessus)
         }
 
-    def _find_nessus_matches(self, ckl_finding: Dict[str, Any],
-                           nessus_findings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def build_nessus_index(self, nessus_findings: List[Dict[str, Any]]) -> NessusFindingIndex:
+        """Index Nessus findings for candidate generation"""
+        low_confidence = self.correlation_thresholds['low_confidence']
+        # The same plugin is reported on many hosts, extract its keys once
+        keys_cache: Dict[Tuple, FindingKeys] = {}
+        keys = []
+        for finding in nessus_findings:
+            cache_key = (
+                tuple(finding.get('cve', [])),
+                finding.get('plugin_id', ''),
+                finding.get('plugin_name', '')
+            )
+            if cache_key not in keys_cache:
+                keys_cache[cache_key] = self._nessus_keys(finding)
+            keys.append(keys_cache[cache_key])
+        return NessusFindingIndex(
+            keys,
+            name_threshold=low_confidence,
+            boosted_name_threshold=low_confidence - SECURITY_TERM_BOOST
+        )
+
+    def _ckl_keys(self, ckl_finding: Dict[str, Any]) -> FindingKeys:
+        """Correlation keys of a CKL finding"""
+        ckl_cves = set()
+        # Extract CVEs from CKL finding (may be in various fields)
+        for field in ['cve', 'discussion', 'check_content']:
+            content = ckl_finding.get(field, '')
+            if content:
+                if not isinstance(content, str):
+                    content = ' '.join(content)
+                ckl_cves.update(cve.upper() for cve in CVE_PATTERN.findall(content))
+        return FindingKeys.build(ckl_cves, ckl_finding.get('vuln_id', ''), ckl_finding.get('rule_title', ''))
+
+    def _nessus_keys(self, nessus_finding: Dict[str, Any]) -> FindingKeys:
+        """Correlation keys of a Nessus finding"""
+        return FindingKeys.build(
+            nessus_finding.get('cve', []),
+            nessus_finding.get('plugin_id', ''),
+            nessus_finding.get('plugin_name', '')
+        )
+
+    def _find_nessus_matches(self, ckl_keys: FindingKeys, index: NessusFindingIndex,
+                             nessus_findings: List[Dict[str, Any]]) -> List[Tuple[int, Dict[str, Any]]]:
         """
-        Find matching Nessus findings for a CKL finding.
+        Find matching Nessus findings for a CKL finding, as (position, match) pairs.
 
         Uses multiple correlation methods:
         1. CVE matching (highest confidence)
@@ -109,42 +325,42 @@ class VulnerabilityCorrelationService:
         """
         matches = []
 
-        for nessus_finding in nessus_findings:
-            correlation_result = self._correlate_single_finding(ckl_finding, nessus_finding)
+        for position in index.candidates(ckl_keys):
+            correlation_result = self._correlate_single_finding(ckl_keys, index.keys[position])
 
             if correlation_result['confidence'] >= self.correlation_thresholds['low_confidence']:
-                matches.append({
-                    'nessus_finding': nessus_finding,
+                matches.append((position, {
+                    'nessus_finding': nessus_findings[position],
                     'confidence': correlation_result['confidence'],
                     'match_type': correlation_result['match_type'],
                     'match_details': correlation_result['details']
-                })
+                }))
 
         # Sort by confidence (highest first)
-        matches.sort(key=lambda x: x['confidence'], reverse=True)
+        matches.sort(key=lambda x: x[1]['confidence'], reverse=True)
 
         # Return only top matches to avoid noise
-        return matches[:3]
+        return matches[:MAX_MATCHES]
 
-    def _correlate_single_finding(self, ckl_finding: Dict[str, Any],
-                                nessus_finding: Dict[str, Any]) -> Dict[str, Any]:
+    def _correlate_single_finding(self, ckl_keys: FindingKeys,
+                                  nessus_keys: FindingKeys) -> Dict[str, Any]:
         """
         Correlate a single CKL finding with a Nessus finding.
 
         Returns correlation result with confidence score and match details.
         """
         # Method 1: CVE matching (highest confidence)
-        cve_confidence = self._correlate_by_cve(ckl_finding, nessus_finding)
+        cve_confidence = self._correlate_by_cve(ckl_keys, nessus_keys)
         if cve_confidence['confidence'] >= self.correlation_thresholds['high_confidence']:
             return cve_confidence
 
         # Method 2: Plugin name similarity
-        name_confidence = self._correlate_by_name_similarity(ckl_finding, nessus_finding)
+        name_confidence = self._correlate_by_name_similarity(ckl_keys, nessus_keys)
         if name_confidence['confidence'] >= self.correlation_thresholds['medium_confidence']:
             return name_confidence
 
         # Method 3: Vulnerability ID patterns
-        id_confidence = self._correlate_by_vuln_id(ckl_finding, nessus_finding)
+        id_confidence = self._correlate_by_vuln_id(ckl_keys, nessus_keys)
         if id_confidence['confidence'] > name_confidence['confidence']:
             return id_confidence
 
@@ -154,30 +370,18 @@ class VulnerabilityCorrelationService:
 
         return best_match
 
-    def _correlate_by_cve(self, ckl_finding: Dict[str, Any],
-                         nessus_finding: Dict[str, Any]) -> Dict[str, Any]:
+    def _correlate_by_cve(self, ckl_keys: FindingKeys,
+                         nessus_keys: FindingKeys) -> Dict[str, Any]:
         """Correlate by CVE references"""
-        ckl_cves = set()
-        nessus_cves = set(nessus_finding.get('cve', []))
-
-        # Extract CVEs from CKL finding (may be in various fields)
-        for field in ['cve', 'discussion', 'check_content']:
-            content = ckl_finding.get(field, '')
-            if content:
-                # Simple CVE extraction (can be enhanced)
-                import re
-                cves = re.findall(r'CVE-\d{4}-\d{4,}', content, re.IGNORECASE)
-                ckl_cves.update(cve.upper() for cve in cves)
-
         # Find intersection
-        common_cves = ckl_cves.intersection(nessus_cves)
+        common_cves = ckl_keys.cves & nessus_keys.cves
 
         if common_cves:
             confidence = min(1.0, len(common_cves) * 0.5 + 0.5)  # High confidence for CVE matches
             return {
                 'confidence': confidence,
                 'match_type': 'cve',
-                'details': f"Common CVEs: {', '.join(common_cves)}"
+                'details': f"Common CVEs: {', '.join(sorted(common_cves))}"
             }
 
         return {
@@ -186,29 +390,21 @@ class VulnerabilityCorrelationService:
             'details': 'No CVE matches found'
         }
 
-    def _correlate_by_name_similarity(self, ckl_finding: Dict[str, Any],
-                                    nessus_finding: Dict[str, Any]) -> Dict[str, Any]:
+    def _correlate_by_name_similarity(self, ckl_keys: FindingKeys,
+                                    nessus_keys: FindingKeys) -> Dict[str, Any]:
         """Correlate by plugin/vulnerability name similarity"""
-        ckl_name = ckl_finding.get('rule_title', '').lower()
-        nessus_name = nessus_finding.get('plugin_name', '').lower()
-
-        if not ckl_name or not nessus_name:
+        if not ckl_keys.name or not nessus_keys.name:
             return {
                 'confidence': 0.0,
                 'match_type': 'name_similarity',
                 'details': 'Missing name data'
             }
 
-        # Calculate similarity ratio
-        similarity = SequenceMatcher(None, ckl_name, nessus_name).ratio()
+        similarity = token_similarity(ckl_keys.tokens, nessus_keys.tokens)
 
         # Boost confidence if key security terms match
-        security_terms = ['password', 'encryption', 'authentication', 'access', 'privilege']
-        ckl_has_security = any(term in ckl_name for term in security_terms)
-        nessus_has_security = any(term in nessus_name for term in security_terms)
-
-        if ckl_has_security and nessus_has_security:
-            similarity = min(1.0, similarity + 0.2)
+        if ckl_keys.has_security_term and nessus_keys.has_security_term:
+            similarity = min(1.0, similarity + SECURITY_TERM_BOOST)
 
         return {
             'confidence': similarity,
@@ -216,21 +412,15 @@ class VulnerabilityCorrelationService:
             'details': f"Name similarity: {similarity:.2%}"
         }
 
-    def _correlate_by_vuln_id(self, ckl_finding: Dict[str, Any],
-                             nessus_finding: Dict[str, Any]) -> Dict[str, Any]:
+    def _correlate_by_vuln_id(self, ckl_keys: FindingKeys,
+                             nessus_keys: FindingKeys) -> Dict[str, Any]:
         """Correlate by vulnerability ID patterns"""
-        ckl_vuln_id = ckl_finding.get('vuln_id', '')
-        nessus_plugin_id = str(nessus_finding.get('plugin_id', ''))
-
         # Look for numerical ID patterns
-        ckl_numbers = ''.join(c for c in ckl_vuln_id if c.isdigit())
-        nessus_numbers = ''.join(c for c in nessus_plugin_id if c.isdigit())
-
-        if ckl_numbers and nessus_numbers and ckl_numbers == nessus_numbers:
+        if ckl_keys.id_digits and ckl_keys.id_digits == nessus_keys.id_digits:
             return {
                 'confidence': 0.8,  # High confidence for ID matches
                 'match_type': 'vulnerability_id',
-                'details': f"Matching ID numbers: {ckl_numbers}"
+                'details': f"Matching ID numbers: {ckl_keys.id_digits}"
             }
 
         return {
@@ -8,6 +8,7 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from django.core.exceptions import ValidationError
+from django.db import transaction
 from django.http import HttpResponse
 import uuid
 import logging
@@ -37,6 +38,24 @@ from .serializers import (
 )
 
 
+def _ckl_data_from_import(results):
+    """CKL structure expected by StigChecklist.import_from_ckl, from a streamed import"""
+    asset = {}
+    for key, value in results['asset'].items():
+        if key == 'inferred_asset_type':
+            continue
+        if isinstance(value, bool):
+            value = 'true' if value else 'false'
+        elif isinstance(value, list):
+            value = ','.join(value)
+        asset[key.upper()] = value
+    si_data = [
+        {'SID_NAME': item['sid_name'], 'SID_DATA': item['sid_data']}
+        for item in results['stig_info']
+    ]
+    return {'ASSET': asset, 'STIGS': {'iSTIG': {'STIG_INFO': {'SI_DATA': si_data}}}}
+
+
 class SystemGroupViewSet(viewsets.ModelViewSet):
     """ViewSet for SystemGroup aggregates"""
 
@@ -277,22 +296,39 @@ class StigChecklistViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=['post'])
     def import_ckl(self, request, pk=None):
-        """Import CKL data into checklist"""
+        """
+        Import a CKL file into checklist.
+
+        An uploaded `file` is streamed: its findings are upserted batch by batch
+        and its asset and STIG information update the checklist. `ckl_data`
+        (CKL structure as JSON) only updates the checklist information.
+        """
         checklist = self.get_object()
+        ckl_file = request.FILES.get('file')
         ckl_data = request.data.get('ckl_data')
 
-        if not ckl_data:
+        if not ckl_file and not ckl_data:
             return Response(
-                {'error': 'ckl_data is required'},
+                {'error': 'file or ckl_data is required'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
         try:
-            checklist.import_from_ckl(ckl_data)
-            checklist.save()
-
-            serializer = self.get_serializer(checklist)
-            return Response(serializer.data)
+            with transaction.atomic():
+                results = None
+                if ckl_file:
+                    repo = VulnerabilityFindingRepository()
+                    results = repo.import_from_ckl(checklist.id, ckl_file)
+                    ckl_data = _ckl_data_from_import(results)
+                checklist.import_from_ckl(ckl_data)
+                checklist.save()
+
+            data = self.get_serializer(checklist).data
+            if results is not None:
+                data['import_results'] = {
+                    key: results[key] for key in ('imported', 'skipped', 'statistics')
+                }
+            return Response(data)
         except ValidationError as e:
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -36,6 +36,14 @@ class NodeCriticality(str, Enum):
     INFORMATIONAL = 'informational'
 
 
+ASSET_CRITICALITY_MAP = {
+    'critical': NodeCriticality.CRITICAL,
+    'high': NodeCriticality.HIGH,
+    'medium': NodeCriticality.MEDIUM,
+    'low': NodeCriticality.LOW,
+}
+
+
 @dataclass
 class SecurityNode:
     """
@@ -161,23 +169,41 @@ class SecurityNode:
             'risk_score': self.blast_radius_score,
         }
 
+    @classmethod
+    def from_values(
+        cls,
+        node_type: NodeType,
+        source_type: str,
+        id: UUID,
+        name: str,
+        description: Optional[str] = None,
+        criticality: NodeCriticality = NodeCriticality.MEDIUM,
+    ) -> 'SecurityNode':
+        """Create a SecurityNode from raw column values (e.g. a values_list row)."""
+        return cls(
+            id=id,
+            name=name,
+            node_type=node_type,
+            criticality=criticality,
+            source_type=source_type,
+            source_id=id,
+            description=description,
+        )
+
+    @staticmethod
+    def asset_criticality(business_value: Optional[str]) -> NodeCriticality:
+        """Map an Asset business value to a node criticality."""
+        return ASSET_CRITICALITY_MAP.get(business_value, NodeCriticality.MEDIUM)
+
     @classmethod
     def from_asset(cls, asset) -> 'SecurityNode':
         """Create a SecurityNode from an Asset model instance."""
-        criticality_map = {
-            'critical': NodeCriticality.CRITICAL,
-            'high': NodeCriticality.HIGH,
-            'medium': NodeCriticality.MEDIUM,
-            'low': NodeCriticality.LOW,
-        }
-
         return cls(
             id=asset.id,
             name=asset.name,
             node_type=NodeType.ASSET,
-            criticality=criticality_map.get(
-                getattr(asset, 'business_value', 'medium'),
-                NodeCriticality.MEDIUM
+            criticality=cls.asset_criticality(
+                getattr(asset, 'business_value', 'medium')
             ),
             source_type='Asset',
             source_id=asset.id,
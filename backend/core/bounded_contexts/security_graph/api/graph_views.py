@@ -87,11 +87,6 @@ class SecurityGraphFromFolderView(APIView):
             builder = get_graph_builder()
             graph = builder.build_from_folder(UUID(folder_id))
 
-            # Compute metrics
-            graph.compute_degrees()
-            graph.compute_pagerank()
-            graph.compute_betweenness_centrality()
-
             if output_format == 'vis':
                 return Response(graph.to_vis_format())
             return Response(graph.to_dict())
@@ -320,10 +315,6 @@ class CriticalPathsView(APIView):
             builder = get_graph_builder()
             graph = builder.build_from_folder(UUID(folder_id))
 
-            # Compute metrics needed for analysis
-            graph.compute_degrees()
-            graph.compute_pagerank()
-
             analyzer = get_blast_radius_analyzer()
             critical_paths = analyzer.identify_critical_paths(graph)
 
@@ -359,11 +350,6 @@ class CriticalNodesView(APIView):
             builder = get_graph_builder()
             graph = builder.build_from_folder(UUID(folder_id))
 
-            # Compute all metrics
-            graph.compute_degrees()
-            graph.compute_pagerank()
-            graph.compute_betweenness_centrality()
-
             if include_blast_radius:
                 analyzer = get_blast_radius_analyzer()
                 analyzer.calculate_node_blast_scores(graph)
@@ -444,11 +430,6 @@ class GraphStatisticsView(APIView):
             builder = get_graph_builder()
             graph = builder.build_from_folder(UUID(folder_id))
 
-            # Compute all metrics
-            graph.compute_degrees()
-            graph.compute_pagerank()
-            graph.compute_betweenness_centrality()
-
             # Calculate statistics
             node_count = len(graph.nodes)
             edge_count = len(graph.edges)
@@ -5,6 +5,7 @@ from .graph_builder import (
     SecurityGraph,
     get_graph_builder,
 )
+from .graph_index import GraphIndex
 from .blast_radius_analyzer import (
     BlastRadiusAnalyzer,
     BlastRadiusResult,
@@ -16,6 +17,7 @@ __all__ = [
     'SecurityGraphBuilder',
     'SecurityGraph',
     'get_graph_builder',
+    'GraphIndex',
     'BlastRadiusAnalyzer',
     'BlastRadiusResult',
     'AttackPath',
@@ -7,6 +7,8 @@ Analyzes potential impact propagation through the security graph.
 from dataclasses import dataclass, field
 from typing import Optional, List, Dict, Any, Set, Tuple
 from uuid import UUID
+import heapq
+import itertools
 import logging
 from collections import deque
 
@@ -16,6 +18,12 @@ from .graph_builder import SecurityGraph
 
 logger = logging.getLogger(__name__)
 
+NODE_CRITICALITY_RISK = {
+    NodeCriticality.CRITICAL: 10,
+    NodeCriticality.HIGH: 5,
+    NodeCriticality.MEDIUM: 2,
+}
+
 
 @dataclass
 class AttackPath:
@@ -123,31 +131,10 @@ class BlastRadiusAnalyzer:
                 critical_assets_affected=0,
             )
 
-        # BFS to find affected nodes
-        affected = {}  # node_id -> (hop_distance, propagation_factor)
-        queue = deque([(source_node_id, 0, 1.0)])  # (node_id, hops, propagation)
-        visited = {source_node_id}
-
-        while queue:
-            current_id, hops, propagation = queue.popleft()
-
-            if hops > 0:  # Don't include source in affected
-                affected[current_id] = (hops, propagation)
-
-            if hops >= self.max_hops:
-                continue
-
-            # Propagate to neighbors
-            for neighbor_id in graph.get_neighbors(current_id, direction='outgoing'):
-                if neighbor_id not in visited:
-                    edge = graph.get_edge(current_id, neighbor_id)
-                    new_propagation = propagation * (
-                        edge.risk_propagation_factor if edge else 0.5
-                    )
-
-                    if new_propagation >= propagation_threshold:
-                        visited.add(neighbor_id)
-                        queue.append((neighbor_id, hops + 1, new_propagation))
+        affected = graph.cached_traversal(
+            ('propagation', source_node_id, propagation_threshold, self.max_hops),
+            lambda: self._propagate(graph, source_node_id, propagation_threshold),
+        )
 
         # Build affected nodes list
         affected_nodes = []
@@ -218,7 +205,13 @@ class BlastRadiusAnalyzer:
         max_paths: int = 5,
     ) -> List[AttackPath]:
         """
-        Find potential attack paths between two nodes.
+        Find the highest-risk attack paths between two nodes.
+
+        Best-first search over partial paths ordered by an upper bound of the
+        risk any completion can reach, so complete paths are produced in
+        decreasing risk order and the search stops after ``max_paths``.
+        Partial paths that cannot reach the target within the remaining hops
+        are pruned using the (memoized) reverse reachability of the target.
 
         Args:
             graph: The security graph
@@ -227,57 +220,85 @@ class BlastRadiusAnalyzer:
             max_paths: Maximum number of paths to return
 
         Returns:
-            List of attack paths
+            List of attack paths, highest risk first
         """
+        if max_paths <= 0 or entry_point_id == target_id:
+            return []
+
+        to_target = self.get_reachable_nodes(graph, target_id, direction='incoming')
+        if entry_point_id not in to_target:
+            return []
+
+        gain_bounds = graph.cached_traversal(
+            ('completion_bounds', target_id, self.max_hops),
+            lambda: self._completion_bounds(graph, target_id, to_target),
+        )
+
+        def bound(path: Tuple[UUID, ...], score: float) -> float:
+            node_id = path[-1]
+            remaining = self.max_hops - (len(path) - 1)
+            return (
+                score
+                + gain_bounds[node_id][remaining]
+                + 10.0 / (len(path) + to_target[node_id])
+            )
+
+        counter = itertools.count()
+        start = (entry_point_id,)
+        start_score = self._node_risk(graph, entry_point_id)
+        frontier = [(-bound(start, start_score), next(counter), start, start_score)]
         paths = []
-        visited_paths = set()
-
-        def dfs(current: UUID, target: UUID, path: List[UUID], depth: int):
-            if depth > self.max_hops:
-                return
-
-            if current == target and len(path) > 1:
-                path_tuple = tuple(path)
-                if path_tuple not in visited_paths:
-                    visited_paths.add(path_tuple)
-
-                    # Build path info
-                    path_nodes = []
-                    edge_types = []
-
-                    for i, node_id in enumerate(path):
-                        node = graph.get_node(node_id)
-                        path_nodes.append(node.name if node else str(node_id))
-
-                        if i > 0:
-                            edge = graph.get_edge(path[i-1], node_id)
-                            edge_types.append(edge.edge_type.value if edge else 'unknown')
-
-                    # Calculate risk score
-                    risk_score = self._calculate_path_risk(graph, path)
-
-                    paths.append(AttackPath(
-                        path=list(path),
-                        path_nodes=path_nodes,
-                        total_length=len(path) - 1,
-                        risk_score=risk_score,
-                        entry_point=entry_point_id,
-                        target=target_id,
-                        edge_types=edge_types,
-                    ))
-                return
 
+        while frontier and len(paths) < max_paths:
+            _, _, path, score = heapq.heappop(frontier)
+            current = path[-1]
+
+            if current == target_id:
+                paths.append(self._build_attack_path(graph, list(path)))
+                continue
+
+            remaining = self.max_hops - len(path)
             for neighbor in graph.get_neighbors(current, direction='outgoing'):
-                if neighbor not in path:
-                    path.append(neighbor)
-                    dfs(neighbor, target, path, depth + 1)
-                    path.pop()
+                if to_target.get(neighbor, remaining + 1) > remaining or neighbor in path:
+                    continue
+                extended = path + (neighbor,)
+                extended_score = (
+                    score
+                    + self._edge_risk(graph.get_edge(current, neighbor))
+                    + self._node_risk(graph, neighbor)
+                )
+                heapq.heappush(
+                    frontier,
+                    (-bound(extended, extended_score), next(counter), extended, extended_score),
+                )
+
+        return paths
 
-        dfs(entry_point_id, target_id, [entry_point_id], 0)
+    def get_reachable_nodes(
+        self,
+        graph: SecurityGraph,
+        node_id: UUID,
+        direction: str = 'outgoing',
+    ) -> Dict[UUID, int]:
+        """
+        Get hop distances to all nodes reachable within ``max_hops``.
 
-        # Sort by risk score and return top paths
-        paths.sort(key=lambda p: p.risk_score, reverse=True)
-        return paths[:max_paths]
+        Results are memoized on the graph until its topology changes, so
+        repeated queries against one graph do not re-traverse it. The
+        returned mapping must not be mutated.
+
+        Args:
+            graph: The security graph
+            node_id: Node to start from (included at distance 0)
+            direction: 'outgoing' for descendants, 'incoming' for ancestors
+
+        Returns:
+            Mapping of node ID to hop distance
+        """
+        return graph.cached_traversal(
+            ('reachable', node_id, direction, self.max_hops),
+            lambda: self._bounded_bfs(graph, node_id, direction),
+        )
 
     def identify_critical_paths(
         self,
@@ -308,9 +329,12 @@ class BlastRadiusAnalyzer:
             if node.is_critical and node.node_type == NodeType.ASSET
         ]
 
-        # Find paths from entry points to critical targets
+        # Find paths from entry points to the critical targets they can reach
         for entry in entry_points:
+            reachable = self.get_reachable_nodes(graph, entry.id)
             for target in critical_targets:
+                if target.id not in reachable:
+                    continue
                 paths = self.find_attack_paths(
                     graph, entry.id, target.id, max_paths=2
                 )
@@ -384,6 +408,138 @@ class BlastRadiusAnalyzer:
             'average_blast_radius': total_risk / len(compromised_nodes) if compromised_nodes else 0,
         }
 
+    def _propagate(
+        self,
+        graph: SecurityGraph,
+        source_node_id: UUID,
+        propagation_threshold: float,
+    ) -> Dict[UUID, Tuple[int, float]]:
+        """BFS impact propagation; maps affected node ID to (hops, propagation)."""
+        affected = {}
+        queue = deque([(source_node_id, 0, 1.0)])  # (node_id, hops, propagation)
+        visited = {source_node_id}
+
+        while queue:
+            current_id, hops, propagation = queue.popleft()
+
+            if hops > 0:  # Don't include source in affected
+                affected[current_id] = (hops, propagation)
+
+            if hops >= self.max_hops:
+                continue
+
+            # Propagate to neighbors
+            for neighbor_id in graph.get_neighbors(current_id, direction='outgoing'):
+                if neighbor_id not in visited:
+                    edge = graph.get_edge(current_id, neighbor_id)
+                    new_propagation = propagation * (
+                        edge.risk_propagation_factor if edge else 0.5
+                    )
+
+                    if new_propagation >= propagation_threshold:
+                        visited.add(neighbor_id)
+                        queue.append((neighbor_id, hops + 1, new_propagation))
+
+        return affected
+
+    def _bounded_bfs(
+        self,
+        graph: SecurityGraph,
+        node_id: UUID,
+        direction: str,
+    ) -> Dict[UUID, int]:
+        """Hop distances from a node, limited to ``max_hops``."""
+        distances = {node_id: 0}
+        frontier = [node_id]
+        for hops in range(1, self.max_hops + 1):
+            next_frontier = []
+            for current in frontier:
+                for neighbor in graph.get_neighbors(current, direction=direction):
+                    if neighbor not in distances:
+                        distances[neighbor] = hops
+                        next_frontier.append(neighbor)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        return distances
+
+    def _completion_bounds(
+        self,
+        graph: SecurityGraph,
+        target_id: UUID,
+        to_target: Dict[UUID, int],
+    ) -> Dict[UUID, List[float]]:
+        """
+        Upper bounds on the node and edge risk still collectable on the way
+        to the target.
+
+        ``bounds[v][r]`` is the best node + edge risk of any walk from ``v``
+        to the target using at most ``r`` hops (excluding ``v`` itself).
+        Walks may revisit nodes, so this over-estimates simple paths, which
+        keeps it a valid bound for the best-first search.
+        """
+        unreachable = float('-inf')
+        bounds = {
+            node_id: [0.0 if node_id == target_id else unreachable]
+            for node_id in to_target
+        }
+        for hops in range(1, self.max_hops + 1):
+            for node_id, node_bounds in bounds.items():
+                best = node_bounds[hops - 1]
+                if node_id != target_id:
+                    for neighbor in graph.get_neighbors(node_id, direction='outgoing'):
+                        neighbor_bounds = bounds.get(neighbor)
+                        if neighbor_bounds is None or neighbor_bounds[hops - 1] == unreachable:
+                            continue
+                        best = max(
+                            best,
+                            neighbor_bounds[hops - 1]
+                            + self._edge_risk(graph.get_edge(node_id, neighbor))
+                            + self._node_risk(graph, neighbor),
+                        )
+                node_bounds.append(best)
+        return bounds
+
+    def _build_attack_path(self, graph: SecurityGraph, path: List[UUID]) -> AttackPath:
+        """Materialize display names and edge types for a found path."""
+        path_nodes = []
+        edge_types = []
+
+        for i, node_id in enumerate(path):
+            node = graph.get_node(node_id)
+            path_nodes.append(node.name if node else str(node_id))
+
+            if i > 0:
+                edge = graph.get_edge(path[i - 1], node_id)
+                edge_types.append(edge.edge_type.value if edge else 'unknown')
+
+        return AttackPath(
+            path=path,
+            path_nodes=path_nodes,
+            total_length=len(path) - 1,
+            risk_score=self._calculate_path_risk(graph, path),
+            entry_point=path[0],
+            target=path[-1],
+            edge_types=edge_types,
+        )
+
+    @staticmethod
+    def _node_risk(graph: SecurityGraph, node_id: UUID) -> float:
+        """Risk contributed by a node on a path, based on its criticality."""
+        node = graph.get_node(node_id)
+        return NODE_CRITICALITY_RISK.get(node.criticality, 0) if node else 0
+
+    @staticmethod
+    def _edge_risk(edge: Optional[SecurityEdge]) -> float:
+        """Risk contributed by an edge on a path (exploits and threatens are riskier)."""
+        if edge is None:
+            return 0
+        if edge.edge_type in [EdgeType.EXPLOITS, EdgeType.THREATENS]:
+            return 5
+        if edge.is_risk_relationship:
+            return 3
+        return 0
+
     def _calculate_path_risk(self, graph: SecurityGraph, path: List[UUID]) -> float:
         """Calculate risk score for a path."""
         if len(path) < 2:
@@ -396,23 +552,11 @@ class BlastRadiusAnalyzer:
 
         # Factor 2: Node criticality along path
         for node_id in path:
-            node = graph.get_node(node_id)
-            if node:
-                if node.criticality == NodeCriticality.CRITICAL:
-                    risk += 10
-                elif node.criticality == NodeCriticality.HIGH:
-                    risk += 5
-                elif node.criticality == NodeCriticality.MEDIUM:
-                    risk += 2
-
-        # Factor 3: Edge types (exploits and threatens are riskier)
+            risk += self._node_risk(graph, node_id)
+
+        # Factor 3: Edge types
         for i in range(len(path) - 1):
-            edge = graph.get_edge(path[i], path[i + 1])
-            if edge:
-                if edge.edge_type in [EdgeType.EXPLOITS, EdgeType.THREATENS]:
-                    risk += 5
-                elif edge.is_risk_relationship:
-                    risk += 3
+            risk += self._edge_risk(graph.get_edge(path[i], path[i + 1]))
 
         return risk
 
@@ -6,16 +6,26 @@ CISO Assistant entities.
 """
 
 from dataclasses import dataclass, field
-from typing import Optional, List, Dict, Any, Set, Tuple
+from typing import Optional, List, Dict, Any, Callable, Iterable, Set, Tuple
 from uuid import UUID, uuid4
+import copy
 import logging
-from collections import defaultdict
+import threading
+from collections import OrderedDict, defaultdict
+
+from django.conf import settings
+from django.db.models import Count, Max, Q
 
 from ..aggregates.security_node import SecurityNode, NodeType, NodeCriticality
 from ..aggregates.security_edge import SecurityEdge, EdgeType, EdgeDirection
+from .graph_index import GraphIndex
 
 logger = logging.getLogger(__name__)
 
+# Graphs larger than this get sampled betweenness unless pivots are given
+EXACT_BETWEENNESS_MAX_NODES = 5000
+DEFAULT_BETWEENNESS_PIVOTS = 500
+
 
 @dataclass
 class SecurityGraph:
@@ -32,13 +42,24 @@ class SecurityGraph:
     _incoming: Dict[UUID, Set[UUID]] = field(default_factory=lambda: defaultdict(set))
     _edge_index: Dict[Tuple[UUID, UUID], UUID] = field(default_factory=dict)
 
+    # Cached CSR view and traversal results, reset on every topology change
+    _index: Optional[GraphIndex] = field(default=None, repr=False, compare=False)
+    _traversals: Dict[Tuple, Any] = field(default_factory=dict, repr=False, compare=False)
+
+    def _topology_changed(self) -> None:
+        self._index = None
+        self._traversals.clear()
+
     def add_node(self, node: SecurityNode) -> None:
         """Add a node to the graph."""
+        if node.id not in self.nodes:
+            self._topology_changed()
         self.nodes[node.id] = node
 
     def add_edge(self, edge: SecurityEdge) -> None:
         """Add an edge to the graph."""
         self.edges[edge.id] = edge
+        self._topology_changed()
         self._outgoing[edge.source_id].add(edge.target_id)
         self._incoming[edge.target_id].add(edge.source_id)
         self._edge_index[(edge.source_id, edge.target_id)] = edge.id
@@ -47,6 +68,72 @@ class SecurityGraph:
             self._outgoing[edge.target_id].add(edge.source_id)
             self._incoming[edge.source_id].add(edge.target_id)
 
+    def remove_edge(self, edge_id: UUID) -> None:
+        """Remove an edge from the graph."""
+        edge = self.edges.pop(edge_id, None)
+        if edge is None:
+            return
+        self._topology_changed()
+        self._edge_index.pop((edge.source_id, edge.target_id), None)
+
+        # Adjacency is a set per node, so only drop a neighbour when no other
+        # edge still links the pair
+        self._unlink(edge.source_id, edge.target_id)
+        if edge.direction == EdgeDirection.BIDIRECTIONAL:
+            self._unlink(edge.target_id, edge.source_id)
+
+    def _unlink(self, source_id: UUID, target_id: UUID) -> None:
+        still_linked = any(
+            (other.source_id == source_id and other.target_id == target_id)
+            or (
+                other.direction == EdgeDirection.BIDIRECTIONAL
+                and other.source_id == target_id
+                and other.target_id == source_id
+            )
+            for other in self.edges_of(source_id)
+        )
+        if not still_linked:
+            self._outgoing[source_id].discard(target_id)
+            self._incoming[target_id].discard(source_id)
+
+    def remove_node(self, node_id: UUID) -> None:
+        """Remove a node and all its incident edges."""
+        for edge in self.edges_of(node_id):
+            self.remove_edge(edge.id)
+        if self.nodes.pop(node_id, None) is not None:
+            self._topology_changed()
+        self._outgoing.pop(node_id, None)
+        self._incoming.pop(node_id, None)
+
+    def edges_of(self, node_id: UUID) -> List[SecurityEdge]:
+        """Get all edges incident to a node."""
+        edges = []
+        for neighbor_id in self.get_neighbors(node_id):
+            for pair in ((node_id, neighbor_id), (neighbor_id, node_id)):
+                edge = self.get_edge(*pair)
+                if edge is not None and edge not in edges:
+                    edges.append(edge)
+        return edges
+
+    def copy(self) -> 'SecurityGraph':
+        """
+        Copy the graph with independent nodes and adjacency.
+
+        Edges are shared since they are never mutated once added.
+        """
+        graph = SecurityGraph(
+            nodes={node_id: copy.copy(node) for node_id, node in self.nodes.items()},
+            edges=dict(self.edges),
+            _edge_index=dict(self._edge_index),
+            _index=self._index,
+            _traversals=dict(self._traversals),
+        )
+        for node_id, targets in self._outgoing.items():
+            graph._outgoing[node_id] = set(targets)
+        for node_id, sources in self._incoming.items():
+            graph._incoming[node_id] = set(sources)
+        return graph
+
     def get_node(self, node_id: UUID) -> Optional[SecurityNode]:
         """Get a node by ID."""
         return self.nodes.get(node_id)
@@ -85,76 +172,73 @@ class SecurityGraph:
             node.out_degree = len(self._outgoing.get(node_id, set()))
             node.in_degree = len(self._incoming.get(node_id, set()))
 
-    def compute_pagerank(self, damping: float = 0.85, iterations: int = 100) -> None:
-        """Compute PageRank for all nodes."""
+    def to_index(self) -> GraphIndex:
+        """
+        Get the integer-indexed CSR view of the graph.
+
+        The index is cached and rebuilt after nodes or edges are added.
+        """
+        if self._index is None:
+            self._index = GraphIndex.from_adjacency(list(self.nodes.keys()), self._outgoing)
+        return self._index
+
+    def cached_traversal(self, key: Tuple, compute: Callable[[], Any]) -> Any:
+        """
+        Memoize a traversal result until the topology changes.
+
+        Cached values are shared with graph copies and must not be mutated
+        by callers.
+        """
+        if key not in self._traversals:
+            self._traversals[key] = compute()
+        return self._traversals[key]
+
+    def compute_pagerank(
+        self,
+        damping: float = 0.85,
+        iterations: int = 100,
+        tolerance: float = 1.0e-6,
+    ) -> None:
+        """
+        Compute PageRank for all nodes.
+
+        Iterates until the L1 change falls below node_count * tolerance,
+        with ``iterations`` as an upper bound.
+        """
         if not self.nodes:
             return
 
-        n = len(self.nodes)
-        node_ids = list(self.nodes.keys())
-        pagerank = {nid: 1.0 / n for nid in node_ids}
-
-        for _ in range(iterations):
-            new_pagerank = {}
-            for node_id in node_ids:
-                incoming = self._incoming.get(node_id, set())
-                rank_sum = sum(
-                    pagerank[src] / max(1, len(self._outgoing.get(src, set())))
-                    for src in incoming if src in pagerank
-                )
-                new_pagerank[node_id] = (1 - damping) / n + damping * rank_sum
-            pagerank = new_pagerank
+        index = self.to_index()
+        ranks = index.pagerank(damping=damping, max_iterations=iterations, tolerance=tolerance)
 
-        for node_id, rank in pagerank.items():
-            if node_id in self.nodes:
-                self.nodes[node_id].pagerank = rank
+        for node_id, rank in zip(index.node_ids, ranks):
+            self.nodes[node_id].pagerank = float(rank)
+
+    def compute_betweenness_centrality(
+        self,
+        pivots: Optional[int] = None,
+        seed: Optional[int] = 42,
+    ) -> None:
+        """
+        Compute betweenness centrality for all nodes.
 
-    def compute_betweenness_centrality(self) -> None:
-        """Compute betweenness centrality for all nodes (simplified)."""
+        Args:
+            pivots: Number of sampled source nodes for an approximate result.
+                Defaults to exact computation up to EXACT_BETWEENNESS_MAX_NODES
+                nodes and DEFAULT_BETWEENNESS_PIVOTS samples above.
+            seed: Random seed for pivot sampling
+        """
         if not self.nodes:
             return
 
-        centrality = {nid: 0.0 for nid in self.nodes}
-        node_ids = list(self.nodes.keys())
-
-        for source in node_ids:
-            # BFS from source
-            distances = {source: 0}
-            paths = {source: 1}
-            queue = [source]
-            order = []
-
-            while queue:
-                current = queue.pop(0)
-                order.append(current)
-
-                for neighbor in self._outgoing.get(current, set()):
-                    if neighbor not in distances:
-                        distances[neighbor] = distances[current] + 1
-                        queue.append(neighbor)
-                    if distances[neighbor] == distances[current] + 1:
-                        paths[neighbor] = paths.get(neighbor, 0) + paths[current]
-
-            # Accumulate dependencies
-            dependencies = {nid: 0.0 for nid in order}
-            while order:
-                node = order.pop()
-                for neighbor in self._incoming.get(node, set()):
-                    if neighbor in distances and distances[neighbor] == distances[node] - 1:
-                        dependencies[neighbor] += (paths[neighbor] / paths[node]) * (1 + dependencies[node])
-                if node != source:
-                    centrality[node] += dependencies[node]
-
-        # Normalize
-        n = len(self.nodes)
-        if n > 2:
-            factor = 1.0 / ((n - 1) * (n - 2))
-            for node_id in centrality:
-                centrality[node_id] *= factor
-
-        for node_id, value in centrality.items():
-            if node_id in self.nodes:
-                self.nodes[node_id].betweenness_centrality = value
+        if pivots is None and len(self.nodes) > EXACT_BETWEENNESS_MAX_NODES:
+            pivots = DEFAULT_BETWEENNESS_PIVOTS
+
+        index = self.to_index()
+        centrality = index.betweenness_centrality(pivots=pivots, seed=seed)
+
+        for node_id, value in zip(index.node_ids, centrality):
+            self.nodes[node_id].betweenness_centrality = float(value)
 
     def find_critical_nodes(self, top_n: int = 10) -> List[SecurityNode]:
         """Find the most critical nodes based on multiple factors."""
@@ -210,66 +294,337 @@ class SecurityGraph:
         return dict(counts)
 
 
+@dataclass
+class _CachedFolderGraph:
+    """Built folder graph with the fingerprint of the rows it was built from."""
+    fingerprint: Tuple
+    graph: SecurityGraph
+    metrics_fresh: bool = True
+    # Incremented by each patch of the graph
+    version: int = 0
+    # Assets whose pending change was checked against the fingerprint
+    verified_assets: Set[UUID] = field(default_factory=set)
+
+
 class SecurityGraphBuilder:
     """
     Builds security graphs from CISO Assistant data.
+
+    Folder graphs are loaded with a fixed number of ``values_list`` queries
+    and cached per folder together with their centralities. A cached graph is
+    reused while the folder fingerprint (max ``updated_at`` and row count of
+    assets, controls and threats, plus link counts) is unchanged, and patched
+    in place by ``refresh_asset`` when a single asset changes. At most
+    SECURITY_GRAPH_CACHED_FOLDERS graphs are kept, least recently used first
+    out.
     """
 
+    # (model name, M2M field, edge type): an edge goes from the model row to
+    # the related row. Fields missing on a model are skipped.
+    _FOLDER_LINKS = (
+        ('Asset', 'parent_assets', EdgeType.DEPENDS_ON),
+        ('AppliedControl', 'assets', EdgeType.PROTECTS),
+        ('Threat', 'assets', EdgeType.THREATENS),
+    )
+
+    # Extra attributes of edges created from links
+    _EDGE_DEFAULTS = {
+        EdgeType.THREATENS: {'risk_propagation_factor': 0.7},
+    }
+
     def __init__(self):
         """Initialize the graph builder."""
         self.graph = SecurityGraph()
+        self._folder_cache: 'OrderedDict[UUID, _CachedFolderGraph]' = OrderedDict()
+        self._cache_lock = threading.RLock()
+        self.max_cached_folders = getattr(settings, 'SECURITY_GRAPH_CACHED_FOLDERS', 32)
 
-    def build_from_folder(self, folder_id: UUID) -> SecurityGraph:
+    def build_from_folder(self, folder_id: UUID, use_cache: bool = True) -> SecurityGraph:
         """
         Build a security graph from all entities in a folder.
 
         Args:
             folder_id: The folder UUID to build graph from
+            use_cache: Reuse the cached graph when the folder is unchanged
 
         Returns:
-            SecurityGraph with all entities and relationships
+            SecurityGraph with all entities, relationships and metrics.
+            The returned graph is a copy and may be mutated by the caller.
         """
         self.graph = SecurityGraph()
 
         try:
-            # Import models here to avoid circular imports
-            from core.models import Asset, AppliedControl, Threat, Vulnerability
             from iam.models import Folder
 
-            folder = Folder.objects.get(id=folder_id)
+            if not Folder.objects.filter(id=folder_id).exists():
+                raise Folder.DoesNotExist(f"Folder {folder_id} does not exist")
+
+            fingerprint = self._folder_fingerprint(folder_id)
+
+            with self._cache_lock:
+                cached = self._folder_cache.get(folder_id) if use_cache else None
+                if cached is None or cached.fingerprint != fingerprint:
+                    cached = None
+                else:
+                    self._folder_cache.move_to_end(folder_id)
+                    if cached.metrics_fresh:
+                        self.graph = cached.graph.copy()
+                        return self.graph
+                    graph, version = cached.graph.copy(), cached.version
+
+            # Loads and centralities are computed outside the lock
+            if cached is None:
+                graph = self._load_folder_graph(folder_id)
+            self._compute_metrics(graph)
+
+            with self._cache_lock:
+                if cached is None:
+                    self._store(folder_id, _CachedFolderGraph(fingerprint=fingerprint, graph=graph))
+                elif self._folder_cache.get(folder_id) is cached and cached.version == version:
+                    # Not patched meanwhile
+                    cached.graph = graph
+                    cached.metrics_fresh = True
+                self.graph = graph.copy()
 
-            # Add assets
-            assets = Asset.objects.filter(folder=folder)
-            for asset in assets:
-                node = SecurityNode.from_asset(asset)
-                self.graph.add_node(node)
+        except Exception as e:
+            logger.error(f"Error building graph from folder: {e}")
+
+        return self.graph
+
+    def verify_asset_change(self, asset_id: UUID, folder_id: Optional[UUID] = None) -> None:
+        """
+        Check, before an asset changes, that the cached graphs it touches are
+        up to date: ``refresh_asset`` only patches and re-stamps those, since
+        the new fingerprint would also cover any other change. Stale graphs
+        are dropped.
+        """
+        with self._cache_lock:
+            involved = self._involved_folders(asset_id, folder_id)
+        fingerprints = {fid: self._folder_fingerprint(fid) for fid, _ in involved}
+
+        with self._cache_lock:
+            for fid, cached in involved:
+                if self._folder_cache.get(fid) is not cached:
+                    continue
+                if cached.fingerprint == fingerprints[fid]:
+                    cached.verified_assets.add(asset_id)
+                else:
+                    del self._folder_cache[fid]
+
+    def refresh_asset(self, asset_id: UUID) -> None:
+        """
+        Incrementally update cached folder graphs after an asset change.
 
-            # Add controls
-            controls = AppliedControl.objects.filter(folder=folder)
-            for control in controls:
-                node = SecurityNode.from_control(control)
-                self.graph.add_node(node)
+        The asset node and its dependency/protection edges are reloaded with
+        a fixed number of queries; centralities are recomputed lazily on the
+        next ``build_from_folder`` call. Deleted assets are removed. Graphs
+        the change was not verified against (see ``verify_asset_change``) are
+        dropped instead.
+        """
+        if not self._folder_cache:
+            return
 
-            # Add threats
-            threats = Threat.objects.filter(folder=folder)
-            for threat in threats:
-                node = SecurityNode.from_threat(threat)
-                self.graph.add_node(node)
+        from core.models import Asset
+
+        row = (
+            Asset.objects.filter(id=asset_id)
+            .values_list('folder_id', 'name', 'description', 'business_value')
+            .first()
+        )
+        asset_folder_id = row[0] if row else None
+
+        with self._cache_lock:
+            verified = []
+            for fid, cached in self._involved_folders(asset_id, asset_folder_id):
+                if asset_id in cached.verified_assets:
+                    verified.append((fid, cached))
+                else:
+                    del self._folder_cache[fid]
+        if not verified:
+            return
 
-            # Build relationships
-            self._build_asset_relationships(assets)
-            self._build_control_relationships(controls)
-            self._build_threat_relationships(threats, assets)
+        links = self._asset_links(asset_id) if row else []
+        fingerprints = {fid: self._folder_fingerprint(fid) for fid, _ in verified}
+
+        with self._cache_lock:
+            for fid, cached in verified:
+                if self._folder_cache.get(fid) is not cached:
+                    continue
+                graph = cached.graph
+                graph.remove_node(asset_id)
+
+                if fid == asset_folder_id:
+                    _, name, description, business_value = row
+                    graph.add_node(SecurityNode.from_values(
+                        NodeType.ASSET, 'Asset', asset_id, name, description,
+                        SecurityNode.asset_criticality(business_value),
+                    ))
+                    for edge_type, pairs in links:
+                        self._add_links(graph, pairs, edge_type)
+
+                cached.fingerprint = fingerprints[fid]
+                cached.verified_assets.discard(asset_id)
+                cached.metrics_fresh = False
+                cached.version += 1
+
+    def invalidate_assets(self, assets: Iterable[Tuple[UUID, Optional[UUID]]]) -> None:
+        """Drop the cached graphs holding any of the (asset id, folder id) pairs."""
+        with self._cache_lock:
+            for asset_id, folder_id in assets:
+                for fid, _ in self._involved_folders(asset_id, folder_id):
+                    del self._folder_cache[fid]
+
+    def invalidate_folder(self, folder_id: Optional[UUID] = None) -> None:
+        """Drop the cached graph of a folder, or of all folders when None."""
+        with self._cache_lock:
+            if folder_id is None:
+                self._folder_cache.clear()
+            else:
+                self._folder_cache.pop(folder_id, None)
+
+    def _involved_folders(
+        self, asset_id: UUID, folder_id: Optional[UUID]
+    ) -> List[Tuple[UUID, _CachedFolderGraph]]:
+        """Cached graphs holding the asset, or of its folder. Call with the lock held."""
+        return [
+            (fid, cached)
+            for fid, cached in self._folder_cache.items()
+            if fid == folder_id or asset_id in cached.graph.nodes
+        ]
+
+    def _store(self, folder_id: UUID, cached: _CachedFolderGraph) -> None:
+        """Cache a folder graph, evicting the least recently used ones. Call with the lock held."""
+        self._folder_cache[folder_id] = cached
+        self._folder_cache.move_to_end(folder_id)
+        while len(self._folder_cache) > self.max_cached_folders:
+            self._folder_cache.popitem(last=False)
+
+    def _compute_metrics(self, graph: SecurityGraph) -> None:
+        graph.compute_degrees()
+        graph.compute_pagerank()
+        graph.compute_betweenness_centrality()
+
+    def _folder_fingerprint(self, folder_id: UUID) -> Tuple:
+        """
+        Cheap aggregate signature of everything a folder graph is built from.
 
-            # Compute metrics
-            self.graph.compute_degrees()
-            self.graph.compute_pagerank()
-            self.graph.compute_betweenness_centrality()
+        Row counts catch deletions and link counts catch M2M edits, neither of
+        which moves ``updated_at``.
+        """
+        from core.models import Asset, AppliedControl, Threat
 
-        except Exception as e:
-            logger.error(f"Error building graph from folder: {e}")
+        fingerprint = []
+        for model in (Asset, AppliedControl, Threat):
+            aggregate = model.objects.filter(folder_id=folder_id).aggregate(
+                last_updated=Max('updated_at'), count=Count('id')
+            )
+            fingerprint.append((aggregate['last_updated'], aggregate['count']))
+
+        for model_name, field_name, _ in self._FOLDER_LINKS:
+            links = self._folder_links(model_name, field_name, folder_id)
+            if links is not None:
+                fingerprint.append(links.count())
+
+        return tuple(fingerprint)
+
+    def _load_folder_graph(self, folder_id: UUID) -> SecurityGraph:
+        """Load folder nodes and edges with one query per table."""
+        from core.models import Asset, AppliedControl, Threat
+
+        graph = SecurityGraph()
+
+        for asset_id, name, description, business_value in Asset.objects.filter(
+            folder_id=folder_id
+        ).values_list('id', 'name', 'description', 'business_value'):
+            graph.add_node(SecurityNode.from_values(
+                NodeType.ASSET, 'Asset', asset_id, name, description,
+                SecurityNode.asset_criticality(business_value),
+            ))
+
+        for control_id, name, description in AppliedControl.objects.filter(
+            folder_id=folder_id
+        ).values_list('id', 'name', 'description'):
+            graph.add_node(SecurityNode.from_values(
+                NodeType.CONTROL, 'AppliedControl', control_id, name, description,
+            ))
+
+        for threat_id, name, description in Threat.objects.filter(
+            folder_id=folder_id
+        ).values_list('id', 'name', 'description'):
+            graph.add_node(SecurityNode.from_values(
+                NodeType.THREAT, 'Threat', threat_id, name, description,
+                NodeCriticality.HIGH,
+            ))
+
+        for model_name, field_name, edge_type in self._FOLDER_LINKS:
+            links = self._folder_links(model_name, field_name, folder_id)
+            if links is not None:
+                self._add_links(graph, links, edge_type)
+
+        return graph
+
+    @staticmethod
+    def _m2m_field(model_name: str, field_name: str):
+        from django.apps import apps
+        from django.core.exceptions import FieldDoesNotExist
+
+        model = apps.get_model('core', model_name)
+        try:
+            field = model._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            return None
+        return field if field.many_to_many and not field.auto_created else None
 
-        return self.graph
+    def _folder_links(self, model_name: str, field_name: str, folder_id: UUID):
+        """
+        (source_id, target_id) through-table rows whose source object lives
+        in the folder, or None when the model has no such relation.
+        """
+        field = self._m2m_field(model_name, field_name)
+        if field is None:
+            return None
+        source, target = field.m2m_field_name(), field.m2m_reverse_field_name()
+        return field.remote_field.through.objects.filter(
+            **{f"{source}__folder_id": folder_id}
+        ).values_list(f"{source}_id", f"{target}_id")
+
+    def _asset_links(self, asset_id: UUID) -> List[Tuple[EdgeType, List[Tuple[UUID, UUID]]]]:
+        """Every folder-link pair touching one asset, one query per relation."""
+        from core.models import Asset
+
+        links = []
+        for model_name, field_name, edge_type in self._FOLDER_LINKS:
+            field = self._m2m_field(model_name, field_name)
+            if field is None:
+                continue
+            source, target = field.m2m_field_name(), field.m2m_reverse_field_name()
+            condition = Q()
+            if model_name == 'Asset':
+                condition |= Q(**{f"{source}_id": asset_id})
+            if field.related_model is Asset:
+                condition |= Q(**{f"{target}_id": asset_id})
+            if not condition:
+                continue
+            links.append((edge_type, list(
+                field.remote_field.through.objects.filter(condition).values_list(
+                    f"{source}_id", f"{target}_id"
+                )
+            )))
+        return links
+
+    @classmethod
+    def _add_links(cls, graph: SecurityGraph, links, edge_type: EdgeType) -> None:
+        """Add an edge per (source, target) pair whose endpoints are both in the graph."""
+        defaults = cls._EDGE_DEFAULTS.get(edge_type, {})
+        for source_id, target_id in links:
+            if source_id in graph.nodes and target_id in graph.nodes:
+                graph.add_edge(SecurityEdge(
+                    id=uuid4(),
+                    source_id=source_id,
+                    target_id=target_id,
+                    edge_type=edge_type,
+                    **defaults,
+                ))
 
     def build_from_assets(self, asset_ids: List[UUID]) -> SecurityGraph:
         """
@@ -286,32 +641,34 @@ class SecurityGraphBuilder:
         try:
             from core.models import Asset, AppliedControl
 
-            assets = Asset.objects.filter(id__in=asset_ids)
-
-            # Add assets
-            for asset in assets:
-                node = SecurityNode.from_asset(asset)
-                self.graph.add_node(node)
+            for asset_id, name, description, business_value in Asset.objects.filter(
+                id__in=asset_ids
+            ).values_list('id', 'name', 'description', 'business_value'):
+                self.graph.add_node(SecurityNode.from_values(
+                    NodeType.ASSET, 'Asset', asset_id, name, description,
+                    SecurityNode.asset_criticality(business_value),
+                ))
 
             # Add related controls
-            for asset in assets:
-                if hasattr(asset, 'applied_controls'):
-                    for control in asset.applied_controls.all():
-                        if control.id not in self.graph.nodes:
-                            node = SecurityNode.from_control(control)
-                            self.graph.add_node(node)
-
-                        # Create protection edge
-                        edge = SecurityEdge(
-                            id=uuid4(),
-                            source_id=control.id,
-                            target_id=asset.id,
-                            edge_type=EdgeType.PROTECTS,
-                        )
-                        self.graph.add_edge(edge)
+            control_through = AppliedControl.assets.through
+            protection_links = list(
+                control_through.objects.filter(
+                    asset_id__in=self.graph.nodes.keys()
+                ).values_list('appliedcontrol_id', 'asset_id')
+            )
+            for control_id, name, description in AppliedControl.objects.filter(
+                id__in={control_id for control_id, _ in protection_links}
+            ).values_list('id', 'name', 'description'):
+                self.graph.add_node(SecurityNode.from_values(
+                    NodeType.CONTROL, 'AppliedControl', control_id, name, description,
+                ))
+            self._add_links(self.graph, protection_links, EdgeType.PROTECTS)
 
             # Build asset relationships
-            self._build_asset_relationships(assets)
+            dependency_links = Asset.parent_assets.through.objects.filter(
+                from_asset_id__in=self.graph.nodes.keys()
+            ).values_list('from_asset_id', 'to_asset_id')
+            self._add_links(self.graph, dependency_links, EdgeType.DEPENDS_ON)
 
             # Compute metrics
             self.graph.compute_degrees()
@@ -388,52 +745,6 @@ class SecurityGraphBuilder:
 
         return self.graph
 
-    def _build_asset_relationships(self, assets) -> None:
-        """Build relationships between assets."""
-        # Check for parent-child relationships
-        for asset in assets:
-            if hasattr(asset, 'parent_assets'):
-                for parent in asset.parent_assets.all():
-                    if parent.id in self.graph.nodes:
-                        edge = SecurityEdge(
-                            id=uuid4(),
-                            source_id=asset.id,
-                            target_id=parent.id,
-                            edge_type=EdgeType.DEPENDS_ON,
-                        )
-                        self.graph.add_edge(edge)
-
-    def _build_control_relationships(self, controls) -> None:
-        """Build relationships for controls."""
-        for control in controls:
-            # Link controls to assets they protect
-            if hasattr(control, 'assets'):
-                for asset in control.assets.all():
-                    if asset.id in self.graph.nodes:
-                        edge = SecurityEdge(
-                            id=uuid4(),
-                            source_id=control.id,
-                            target_id=asset.id,
-                            edge_type=EdgeType.PROTECTS,
-                        )
-                        self.graph.add_edge(edge)
-
-    def _build_threat_relationships(self, threats, assets) -> None:
-        """Build relationships for threats."""
-        for threat in threats:
-            # Link threats to vulnerable assets
-            if hasattr(threat, 'assets'):
-                for asset in threat.assets.all():
-                    if asset.id in self.graph.nodes:
-                        edge = SecurityEdge(
-                            id=uuid4(),
-                            source_id=threat.id,
-                            target_id=asset.id,
-                            edge_type=EdgeType.THREATENS,
-                            risk_propagation_factor=0.7,
-                        )
-                        self.graph.add_edge(edge)
-
 
 # Singleton instance
 _graph_builder: Optional[SecurityGraphBuilder] = None
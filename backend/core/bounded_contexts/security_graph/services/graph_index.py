@@ -0,0 +1,227 @@
+"""
+Security Graph Index
+
+Integer-indexed CSR (compressed sparse row) view of a SecurityGraph used
+by the vectorized centrality algorithms.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from uuid import UUID
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse import csgraph
+
+
+@dataclass(frozen=True)
+class GraphIndex:
+    """
+    Immutable CSR snapshot of the graph topology.
+
+    Node UUIDs are mapped to contiguous integer positions; ``adjacency`` is a
+    binary n x n matrix where row i holds the successors of node i.
+    Edges pointing to nodes that are not part of the graph are dropped.
+    """
+
+    node_ids: List[UUID]
+    positions: Dict[UUID, int]
+    adjacency: sparse.csr_matrix
+
+    @classmethod
+    def from_adjacency(
+        cls, node_ids: List[UUID], outgoing: Dict[UUID, set]
+    ) -> "GraphIndex":
+        """Build the index from UUID-keyed outgoing adjacency sets."""
+        positions = {node_id: i for i, node_id in enumerate(node_ids)}
+        n = len(node_ids)
+
+        rows: List[int] = []
+        cols: List[int] = []
+        for source_id, targets in outgoing.items():
+            source = positions.get(source_id)
+            if source is None:
+                continue
+            for target_id in targets:
+                target = positions.get(target_id)
+                if target is not None:
+                    rows.append(source)
+                    cols.append(target)
+
+        adjacency = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float64), (rows, cols)), shape=(n, n)
+        )
+        adjacency.sum_duplicates()
+        adjacency.data[:] = 1.0
+        return cls(node_ids=node_ids, positions=positions, adjacency=adjacency)
+
+    @property
+    def node_count(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def edge_count(self) -> int:
+        return int(self.adjacency.nnz)
+
+    def out_degrees(self) -> np.ndarray:
+        return np.diff(self.adjacency.indptr)
+
+    def in_degrees(self) -> np.ndarray:
+        return np.bincount(self.adjacency.indices, minlength=self.node_count)
+
+    def successors(self, position: int) -> np.ndarray:
+        """Integer positions of the successors of a node."""
+        adjacency = self.adjacency
+        return adjacency.indices[
+            adjacency.indptr[position] : adjacency.indptr[position + 1]
+        ]
+
+    def pagerank(
+        self,
+        damping: float = 0.85,
+        max_iterations: int = 100,
+        tolerance: float = 1.0e-6,
+    ) -> np.ndarray:
+        """
+        Vectorized PageRank power iteration.
+
+        Stops once the L1 change between iterations drops below
+        ``node_count * tolerance`` or after ``max_iterations``. Rank held by
+        nodes without successors is not redistributed, matching the
+        historical dict-based implementation.
+        """
+        n = self.node_count
+        if n == 0:
+            return np.zeros(0)
+
+        out_degrees = np.maximum(self.out_degrees(), 1).astype(np.float64)
+        transposed = self.adjacency.T.tocsr()
+        teleport = (1 - damping) / n
+        ranks = np.full(n, 1.0 / n)
+
+        for _ in range(max_iterations):
+            new_ranks = teleport + damping * transposed.dot(ranks / out_degrees)
+            converged = np.abs(new_ranks - ranks).sum() < n * tolerance
+            ranks = new_ranks
+            if converged:
+                break
+
+        return ranks
+
+    def bfs_distances(self, source: int) -> np.ndarray:
+        """
+        Hop distance from ``source`` to every node (inf when unreachable).
+
+        Depths are recovered from the BFS predecessor tree by pointer
+        jumping, which takes log2(depth) vectorized steps.
+        """
+        n = self.node_count
+        _, predecessors = csgraph.breadth_first_order(
+            self.adjacency, source, directed=True, return_predecessors=True
+        )
+        reached = predecessors >= 0
+        ancestors = np.where(reached, predecessors, np.arange(n))
+        depths = reached.astype(np.int64)
+        while True:
+            jumped = ancestors[ancestors]
+            if np.array_equal(jumped, ancestors):
+                break
+            depths += depths[ancestors]
+            ancestors = jumped
+
+        distances = depths.astype(np.float64)
+        distances[~reached] = np.inf
+        distances[source] = 0.0
+        return distances
+
+    def betweenness_centrality(
+        self,
+        pivots: Optional[int] = None,
+        seed: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Brandes betweenness centrality on directed, unweighted edges.
+
+        BFS runs in scipy's compiled routine; path counting and dependency
+        accumulation then run over the shortest-path DAG edges grouped by
+        level, so the Python loop is per BFS level rather than per edge.
+
+        Args:
+            pivots: If set and smaller than the node count, only this many
+                randomly sampled sources are used and the result is scaled by
+                n / pivots (Brandes-Pich approximation).
+            seed: Random seed for pivot sampling
+
+        Returns:
+            Centrality per node position, normalized by (n - 1)(n - 2)
+        """
+        n = self.node_count
+        centrality = np.zeros(n)
+        if n == 0:
+            return centrality
+
+        if pivots is not None and 0 < pivots < n:
+            rng = np.random.default_rng(seed)
+            sources = np.sort(rng.choice(n, size=pivots, replace=False))
+            scale = n / pivots
+        else:
+            sources = np.arange(n)
+            scale = 1.0
+
+        edge_sources = np.repeat(np.arange(n), self.out_degrees())
+        edge_targets = self.adjacency.indices
+
+        for source in sources:
+            centrality += self._source_dependencies(
+                source, self.bfs_distances(source), edge_sources, edge_targets
+            )
+
+        centrality *= scale
+        if n > 2:
+            centrality /= (n - 1) * (n - 2)
+        return centrality
+
+    def _source_dependencies(
+        self,
+        source: int,
+        distances: np.ndarray,
+        edge_sources: np.ndarray,
+        edge_targets: np.ndarray,
+    ) -> np.ndarray:
+        """Brandes path counting and dependency accumulation for one source."""
+        n = self.node_count
+        source_levels = distances[edge_sources]
+        target_levels = distances[edge_targets]
+        on_dag = np.isfinite(source_levels) & (target_levels == source_levels + 1)
+
+        parents = edge_sources[on_dag]
+        children = edge_targets[on_dag]
+        # BFS depths are small integers, so a stable sort on int32 is a
+        # linear-time radix sort
+        levels = target_levels[on_dag].astype(np.int32)
+        order = np.argsort(levels, kind="stable")
+        parents, children, levels = parents[order], children[order], levels[order]
+
+        depth = int(levels[-1]) if len(levels) else 0
+        bounds = np.searchsorted(levels, np.arange(1, depth + 2))
+
+        sigma = np.zeros(n)
+        sigma[source] = 1.0
+        for level in range(depth):
+            span = slice(bounds[level], bounds[level + 1])
+            np.add.at(sigma, children[span], sigma[parents[span]])
+
+        delta = np.zeros(n)
+        for level in range(depth - 1, -1, -1):
+            span = slice(bounds[level], bounds[level + 1])
+            level_parents, level_children = parents[span], children[span]
+            np.add.at(
+                delta,
+                level_parents,
+                sigma[level_parents]
+                / sigma[level_children]
+                * (1.0 + delta[level_children]),
+            )
+
+        delta[source] = 0.0
+        return delta
@@ -0,0 +1,147 @@
+"""
+Security Graph cache maintenance
+
+Keeps the folder graphs cached by the graph builder in sync with asset
+changes. Connected from CoreConfig.ready().
+
+Cached graphs are checked against the database before an asset changes and
+patched once the change is committed, see SecurityGraphBuilder.refresh_asset.
+Inside batched_graph_refresh() blocks, the graphs holding the changed assets
+are dropped once instead.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+
+from .services.graph_builder import get_graph_builder
+
+_M2M_PRE_ACTIONS = {"pre_add", "pre_remove", "pre_clear"}
+_M2M_ACTIONS = {"post_add", "post_remove", "post_clear"}
+
+# (asset id, folder id) of the assets changed inside batched_graph_refresh()
+_batch: ContextVar[set | None] = ContextVar("security_graph_batch", default=None)
+
+
+@contextmanager
+def batched_graph_refresh():
+    """
+    Drop the cached graphs holding the assets changed inside the block once its
+    changes are committed, rather than verifying and patching them asset by
+    asset. Used by bulk writes. Nested blocks are merged into the outermost one.
+    """
+    if _batch.get() is not None:
+        yield
+        return
+    changed = set()
+    token = _batch.set(changed)
+    try:
+        yield
+    finally:
+        _batch.reset(token)
+        if changed:
+            transaction.on_commit(
+                lambda: get_graph_builder().invalidate_assets(changed)
+            )
+
+
+def _refresh_on_commit(asset_id):
+    transaction.on_commit(lambda: get_graph_builder().refresh_asset(asset_id))
+
+
+def _asset_changing(sender, instance, **kwargs):
+    folder_id = getattr(instance, "folder_id", None)
+    batch = _batch.get()
+    if batch is not None:
+        batch.add((instance.id, folder_id))
+        return
+    get_graph_builder().verify_asset_change(instance.id, folder_id)
+
+
+def _asset_changed(sender, instance, **kwargs):
+    batch = _batch.get()
+    if batch is not None:
+        batch.add((instance.id, getattr(instance, "folder_id", None)))
+        return
+    _refresh_on_commit(instance.id)
+
+
+def _asset_links_changed(sender, instance, action, pk_set, model, **kwargs):
+    """
+    Refreshing one endpoint reloads every link touching it, so it is enough
+    to refresh the asset side of the changed rows.
+    """
+    if action not in _M2M_PRE_ACTIONS and action not in _M2M_ACTIONS:
+        return
+
+    from core.models import Asset
+
+    builder = get_graph_builder()
+    if isinstance(instance, Asset):
+        asset_ids = [instance.id]
+    elif pk_set:
+        asset_ids = list(pk_set)
+    else:
+        # Cleared from the non-asset side: the removed assets are unknown
+        if action == "post_clear":
+            builder.invalidate_folder(getattr(instance, "folder_id", None))
+        return
+
+    batch = _batch.get()
+    if batch is not None:
+        batch.update((asset_id, None) for asset_id in asset_ids)
+        return
+    for asset_id in asset_ids:
+        if action in _M2M_PRE_ACTIONS:
+            builder.verify_asset_change(asset_id)
+        else:
+            _refresh_on_commit(asset_id)
+
+
+def connect_signals():
+    from core.models import AppliedControl, Asset
+
+    pre_save.connect(
+        _asset_changing,
+        sender=Asset,
+        dispatch_uid="security_graph.asset.pre_save.verify_graph_cache",
+        weak=False,
+    )
+    post_save.connect(
+        _asset_changed,
+        sender=Asset,
+        dispatch_uid="security_graph.asset.post_save.refresh_graph_cache",
+        weak=False,
+    )
+    pre_delete.connect(
+        _asset_changing,
+        sender=Asset,
+        dispatch_uid="security_graph.asset.pre_delete.verify_graph_cache",
+        weak=False,
+    )
+    post_delete.connect(
+        _asset_changed,
+        sender=Asset,
+        dispatch_uid="security_graph.asset.post_delete.refresh_graph_cache",
+        weak=False,
+    )
+    m2m_changed.connect(
+        _asset_links_changed,
+        sender=Asset.parent_assets.through,
+        dispatch_uid="security_graph.asset.parent_assets.m2m.refresh_graph_cache",
+        weak=False,
+    )
+    m2m_changed.connect(
+        _asset_links_changed,
+        sender=AppliedControl.assets.through,
+        dispatch_uid="security_graph.appliedcontrol.assets.m2m.refresh_graph_cache",
+        weak=False,
+    )
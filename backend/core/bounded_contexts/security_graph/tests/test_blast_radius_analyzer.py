@@ -0,0 +1,168 @@
+"""
+Tests for Blast Radius Analyzer.
+"""
+
+import random
+from uuid import uuid4
+
+import pytest
+
+from core.bounded_contexts.security_graph.aggregates.security_node import (
+    SecurityNode,
+    NodeType,
+    NodeCriticality,
+)
+from core.bounded_contexts.security_graph.aggregates.security_edge import (
+    SecurityEdge,
+    EdgeType,
+)
+from core.bounded_contexts.security_graph.services.graph_builder import SecurityGraph
+from core.bounded_contexts.security_graph.services.blast_radius_analyzer import (
+    BlastRadiusAnalyzer,
+)
+
+
+def _random_graph(size, edge_count, seed):
+    rng = random.Random(seed)
+    criticalities = list(NodeCriticality)
+    edge_types = [
+        EdgeType.DEPENDS_ON,
+        EdgeType.THREATENS,
+        EdgeType.AFFECTS,
+        EdgeType.PROTECTS,
+    ]
+    graph = SecurityGraph()
+    nodes = [
+        SecurityNode(
+            id=uuid4(),
+            name=f"Node {i}",
+            node_type=NodeType.ASSET,
+            criticality=rng.choice(criticalities),
+        )
+        for i in range(size)
+    ]
+    for node in nodes:
+        graph.add_node(node)
+    for _ in range(edge_count):
+        source, target = rng.sample(nodes, 2)
+        if graph.get_edge(source.id, target.id) is None:
+            graph.add_edge(
+                SecurityEdge(
+                    id=uuid4(),
+                    source_id=source.id,
+                    target_id=target.id,
+                    edge_type=rng.choice(edge_types),
+                )
+            )
+    return graph, nodes
+
+
+def _all_path_risks(analyzer, graph, entry_id, target_id):
+    """Exhaustive simple-path enumeration, as done before the best-first search."""
+    risks = []
+
+    def dfs(path):
+        if len(path) - 1 > analyzer.max_hops:
+            return
+        if path[-1] == target_id and len(path) > 1:
+            risks.append(analyzer._calculate_path_risk(graph, path))
+            return
+        for neighbor in graph.get_neighbors(path[-1], direction="outgoing"):
+            if neighbor not in path:
+                dfs(path + [neighbor])
+
+    dfs([entry_id])
+    return sorted(risks, reverse=True)
+
+
+class TestFindAttackPaths:
+    """Tests for the best-first attack path search."""
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_exhaustive_top_paths(self, seed):
+        graph, nodes = _random_graph(size=12, edge_count=50, seed=seed)
+        analyzer = BlastRadiusAnalyzer(max_hops=4)
+
+        for entry, target in [(nodes[0], nodes[-1]), (nodes[1], nodes[7])]:
+            expected = _all_path_risks(analyzer, graph, entry.id, target.id)[:5]
+
+            paths = analyzer.find_attack_paths(graph, entry.id, target.id, max_paths=5)
+
+            assert [p.risk_score for p in paths] == pytest.approx(expected)
+            for path in paths:
+                assert path.path[0] == entry.id
+                assert path.path[-1] == target.id
+                assert len(set(path.path)) == len(path.path)
+                assert path.total_length <= analyzer.max_hops
+                assert len(path.edge_types) == path.total_length
+
+    def test_unreachable_target_returns_no_paths(self):
+        graph, nodes = _random_graph(size=5, edge_count=0, seed=1)
+        analyzer = BlastRadiusAnalyzer()
+
+        assert analyzer.find_attack_paths(graph, nodes[0].id, nodes[1].id) == []
+
+    def test_respects_max_hops(self):
+        graph = SecurityGraph()
+        chain = [
+            SecurityNode(id=uuid4(), name=str(i), node_type=NodeType.ASSET)
+            for i in range(4)
+        ]
+        for node in chain:
+            graph.add_node(node)
+        for source, target in zip(chain, chain[1:]):
+            graph.add_edge(
+                SecurityEdge(
+                    id=uuid4(),
+                    source_id=source.id,
+                    target_id=target.id,
+                    edge_type=EdgeType.DEPENDS_ON,
+                )
+            )
+
+        assert (
+            BlastRadiusAnalyzer(max_hops=2).find_attack_paths(
+                graph, chain[0].id, chain[3].id
+            )
+            == []
+        )
+        paths = BlastRadiusAnalyzer(max_hops=3).find_attack_paths(
+            graph, chain[0].id, chain[3].id
+        )
+        assert [p.path for p in paths] == [[n.id for n in chain]]
+
+
+class TestReachability:
+    """Tests for memoized reachability queries."""
+
+    def test_reachable_nodes_are_memoized_until_topology_changes(self):
+        graph, nodes = _random_graph(size=10, edge_count=20, seed=3)
+        analyzer = BlastRadiusAnalyzer(max_hops=3)
+
+        first = analyzer.get_reachable_nodes(graph, nodes[0].id)
+        assert analyzer.get_reachable_nodes(graph, nodes[0].id) is first
+        assert first[nodes[0].id] == 0
+        assert all(hops <= 3 for hops in first.values())
+
+        extra = SecurityNode(id=uuid4(), name="Extra", node_type=NodeType.ASSET)
+        graph.add_node(extra)
+        graph.add_edge(
+            SecurityEdge(
+                id=uuid4(),
+                source_id=nodes[0].id,
+                target_id=extra.id,
+                edge_type=EdgeType.DEPENDS_ON,
+            )
+        )
+
+        assert analyzer.get_reachable_nodes(graph, nodes[0].id)[extra.id] == 1
+
+    def test_blast_radius_is_reused_for_repeated_queries(self):
+        graph, nodes = _random_graph(size=10, edge_count=25, seed=4)
+        analyzer = BlastRadiusAnalyzer()
+
+        first = analyzer.analyze_blast_radius(graph, nodes[0].id)
+        second = analyzer.analyze_blast_radius(graph, nodes[0].id)
+
+        assert second.affected_nodes == first.affected_nodes
+        assert len(graph._traversals) == 1
@@ -505,3 +505,272 @@ class TestSecurityGraphAlgorithms:
         for node in graph.nodes.values():
             if node.id != nodes[1].id:
                 assert bridge_node.betweenness_centrality >= node.betweenness_centrality
+
+    def test_betweenness_centrality_exact_values(self):
+        """Bridge node lies on all four shortest paths between its neighbours."""
+        graph = SecurityGraph()
+        nodes = [
+            SecurityNode(id=uuid4(), name=f"Node {i}", node_type=NodeType.ASSET)
+            for i in range(5)
+        ]
+        for node in nodes:
+            graph.add_node(node)
+        for source, target in [(0, 1), (1, 2), (3, 1), (1, 4)]:
+            graph.add_edge(SecurityEdge(
+                id=uuid4(),
+                source_id=nodes[source].id,
+                target_id=nodes[target].id,
+                edge_type=EdgeType.DEPENDS_ON,
+            ))
+
+        graph.compute_betweenness_centrality()
+
+        # 4 pairs routed through B, normalized by (n - 1)(n - 2) = 12
+        assert graph.nodes[nodes[1].id].betweenness_centrality == pytest.approx(4 / 12)
+        assert graph.nodes[nodes[0].id].betweenness_centrality == 0
+
+    def test_sampled_betweenness_approximates_exact(self):
+        """Pivot sampling stays close to the exact centrality."""
+        graph = SecurityGraph()
+        # Star: hub routes every leaf-to-leaf path
+        hub = SecurityNode(id=uuid4(), name="Hub", node_type=NodeType.ASSET)
+        graph.add_node(hub)
+        for i in range(40):
+            leaf = SecurityNode(id=uuid4(), name=f"Leaf {i}", node_type=NodeType.ASSET)
+            graph.add_node(leaf)
+            graph.add_edge(SecurityEdge(
+                id=uuid4(),
+                source_id=leaf.id,
+                target_id=hub.id,
+                edge_type=EdgeType.CONNECTS_TO,
+                direction=EdgeDirection.BIDIRECTIONAL,
+            ))
+
+        graph.compute_betweenness_centrality()
+        exact = graph.nodes[hub.id].betweenness_centrality
+        graph.compute_betweenness_centrality(pivots=20, seed=1)
+        sampled = graph.nodes[hub.id].betweenness_centrality
+
+        assert exact == pytest.approx(1.0)
+        assert sampled == pytest.approx(exact, rel=0.1)
+
+    def test_pagerank_stops_on_tolerance(self):
+        """PageRank sums to one on a cycle and matches the stationary value."""
+        graph = SecurityGraph()
+        nodes = [
+            SecurityNode(id=uuid4(), name=f"Node {i}", node_type=NodeType.ASSET)
+            for i in range(4)
+        ]
+        for node in nodes:
+            graph.add_node(node)
+        for i in range(4):
+            graph.add_edge(SecurityEdge(
+                id=uuid4(),
+                source_id=nodes[i].id,
+                target_id=nodes[(i + 1) % 4].id,
+                edge_type=EdgeType.DEPENDS_ON,
+            ))
+
+        graph.compute_pagerank(tolerance=1e-10)
+
+        for node in graph.nodes.values():
+            assert node.pagerank == pytest.approx(0.25)
+
+    def test_index_is_rebuilt_after_topology_change(self):
+        """The cached CSR index follows added nodes and edges."""
+        graph = SecurityGraph()
+        first = SecurityNode(id=uuid4(), name="A", node_type=NodeType.ASSET)
+        second = SecurityNode(id=uuid4(), name="B", node_type=NodeType.ASSET)
+        graph.add_node(first)
+        graph.add_node(second)
+
+        index = graph.to_index()
+        assert graph.to_index() is index
+        assert index.edge_count == 0
+
+        graph.add_edge(SecurityEdge(
+            id=uuid4(),
+            source_id=first.id,
+            target_id=second.id,
+            edge_type=EdgeType.DEPENDS_ON,
+        ))
+
+        rebuilt = graph.to_index()
+        assert rebuilt is not index
+        assert rebuilt.edge_count == 1
+        assert list(rebuilt.successors(rebuilt.positions[first.id])) == [
+            rebuilt.positions[second.id]
+        ]
+
+
+@pytest.mark.django_db
+class TestFolderGraphCache:
+    """Tests for set-based folder loading and the per-folder graph cache."""
+
+    @pytest.fixture
+    def folder_data(self):
+        from core.models import AppliedControl, Asset
+        from iam.models import Folder
+
+        folder = Folder.objects.create(name="Graph folder")
+        parent = Asset.objects.create(name="Parent", folder=folder, type="PR")
+        children = [
+            Asset.objects.create(name=f"Child {i}", folder=folder, type="SP")
+            for i in range(5)
+        ]
+        for child in children:
+            child.parent_assets.add(parent)
+        control = AppliedControl.objects.create(name="Firewall", folder=folder)
+        control.assets.add(parent, *children)
+        return folder, parent, children, control
+
+    def test_build_uses_fixed_number_of_queries(self, folder_data, django_assert_max_num_queries):
+        folder, parent, children, control = folder_data
+        builder = SecurityGraphBuilder()
+
+        # folder check + fingerprint (5) + nodes (3) + links (2)
+        with django_assert_max_num_queries(11):
+            graph = builder.build_from_folder(folder.id)
+
+        assert len(graph.nodes) == 7
+        assert len(graph.edges) == 5 + 6
+        edge = graph.get_edge(children[0].id, parent.id)
+        assert edge.edge_type == EdgeType.DEPENDS_ON
+        assert graph.get_edge(control.id, parent.id).edge_type == EdgeType.PROTECTS
+        assert graph.nodes[parent.id].betweenness_centrality >= 0
+
+    def test_unchanged_folder_is_served_from_cache(self, folder_data, django_assert_max_num_queries):
+        folder, *_ = folder_data
+        builder = SecurityGraphBuilder()
+        first = builder.build_from_folder(folder.id)
+
+        # folder check + fingerprint only
+        with django_assert_max_num_queries(6):
+            second = builder.build_from_folder(folder.id)
+
+        assert second is not first
+        assert second.nodes.keys() == first.nodes.keys()
+        assert len(second.edges) == len(first.edges)
+
+    def test_returned_graph_does_not_alter_cache(self, folder_data):
+        folder, parent, *_ = folder_data
+        builder = SecurityGraphBuilder()
+        graph = builder.build_from_folder(folder.id)
+        graph.nodes[parent.id].pagerank = -1.0
+        graph.remove_node(parent.id)
+
+        again = builder.build_from_folder(folder.id)
+
+        assert again.nodes[parent.id].pagerank >= 0
+
+    def test_refresh_asset_updates_edges_incrementally(self, folder_data):
+        folder, parent, children, control = folder_data
+        builder = SecurityGraphBuilder()
+        builder.build_from_folder(folder.id)
+
+        builder.verify_asset_change(children[0].id)
+        children[0].parent_assets.remove(parent)
+        children[0].name = "Renamed child"
+        children[0].save()
+        builder.refresh_asset(children[0].id)
+
+        cached = builder._folder_cache[folder.id]
+        assert not cached.metrics_fresh
+        assert cached.graph.get_edge(children[0].id, parent.id) is None
+        assert cached.graph.get_edge(control.id, children[0].id) is not None
+        assert cached.graph.nodes[children[0].id].name == "Renamed child"
+
+        graph = builder.build_from_folder(folder.id)
+
+        assert builder._folder_cache[folder.id] is cached
+        assert cached.metrics_fresh
+        assert len(graph.edges) == 4 + 6
+
+    def test_deleted_asset_is_removed_from_cache(self, folder_data):
+        folder, parent, children, _ = folder_data
+        builder = SecurityGraphBuilder()
+        builder.build_from_folder(folder.id)
+
+        deleted_id = children[1].id
+        builder.verify_asset_change(deleted_id)
+        children[1].delete()
+        builder.refresh_asset(deleted_id)
+
+        graph = builder.build_from_folder(folder.id)
+        assert deleted_id not in graph.nodes
+        assert len(graph.nodes) == 6
+
+    def test_refresh_asset_does_not_absorb_other_changes(self, folder_data):
+        from core.models import Threat
+
+        folder, parent, children, _ = folder_data
+        builder = SecurityGraphBuilder()
+        builder.build_from_folder(folder.id)
+
+        Threat.objects.create(name="Ransomware", folder=folder)
+        builder.verify_asset_change(parent.id)
+        parent.name = "Renamed parent"
+        parent.save()
+        builder.refresh_asset(parent.id)
+
+        assert folder.id not in builder._folder_cache
+        graph = builder.build_from_folder(folder.id)
+        assert "Ransomware" in {node.name for node in graph.nodes.values()}
+
+    def test_unverified_refresh_drops_the_graph(self, folder_data):
+        folder, parent, *_ = folder_data
+        builder = SecurityGraphBuilder()
+        builder.build_from_folder(folder.id)
+
+        builder.refresh_asset(parent.id)
+
+        assert folder.id not in builder._folder_cache
+
+    def test_invalidate_assets_drops_the_graphs_holding_them(self, folder_data):
+        from iam.models import Folder
+
+        folder, parent, *_ = folder_data
+        other = Folder.objects.create(name="Other")
+        builder = SecurityGraphBuilder()
+        builder.build_from_folder(folder.id)
+        builder.build_from_folder(other.id)
+
+        builder.invalidate_assets([(parent.id, None)])
+        assert list(builder._folder_cache) == [other.id]
+
+        builder.invalidate_assets([(uuid4(), other.id)])
+        assert not builder._folder_cache
+
+    def test_cache_keeps_the_most_recently_used_folders(self, folder_data):
+        from iam.models import Folder
+
+        folder, *_ = folder_data
+        others = [Folder.objects.create(name=f"Other {i}") for i in range(2)]
+        builder = SecurityGraphBuilder()
+        builder.max_cached_folders = 2
+
+        builder.build_from_folder(folder.id)
+        builder.build_from_folder(others[0].id)
+        builder.build_from_folder(folder.id)
+        builder.build_from_folder(others[1].id)
+
+        assert list(builder._folder_cache) == [folder.id, others[1].id]
+
+    def test_remove_edge_keeps_other_links(self):
+        graph = SecurityGraph()
+        first = SecurityNode(id=uuid4(), name="A", node_type=NodeType.ASSET)
+        second = SecurityNode(id=uuid4(), name="B", node_type=NodeType.ASSET)
+        graph.add_node(first)
+        graph.add_node(second)
+        edge = SecurityEdge(
+            id=uuid4(),
+            source_id=first.id,
+            target_id=second.id,
+            edge_type=EdgeType.DEPENDS_ON,
+        )
+        graph.add_edge(edge)
+
+        graph.remove_edge(edge.id)
+
+        assert graph.get_neighbors(first.id) == set()
+        assert graph.get_edge(first.id, second.id) is None
@@ -0,0 +1,278 @@
+"""
+Tests for the streaming Nessus and CKL parsers of the RMF Operations bounded context
+"""
+
+import io
+
+import pytest
+import uuid
+from django.core.exceptions import ValidationError
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.bounded_contexts.rmf_operations.aggregates.nessus_scan import NessusScan
+from core.bounded_contexts.rmf_operations.aggregates.stig_checklist import StigChecklist
+from core.bounded_contexts.rmf_operations.aggregates.vulnerability_finding import (
+    VulnerabilityFinding,
+)
+from core.bounded_contexts.rmf_operations.repositories.nessus_scan_repository import (
+    NessusScanRepository,
+    RawXmlReader,
+)
+from core.bounded_contexts.rmf_operations.repositories.vulnerability_finding_repository import (
+    VulnerabilityFindingRepository,
+)
+from core.bounded_contexts.rmf_operations.services.ckl_parser import CKLParser
+from core.bounded_contexts.rmf_operations.services.nessus_parser import NessusParser
+from core.bounded_contexts.rmf_operations.views import StigChecklistViewSet
+
+
+def nessus_xml(hosts):
+    """Nessus export with `hosts` = [(name, [(plugin_id, severity, family), ...]), ...]"""
+    report_hosts = []
+    for name, items in hosts:
+        report_items = "".join(
+            f'<ReportItem pluginID="{plugin_id}" pluginName="Plugin {plugin_id}" '
+            f'pluginFamily="{family}" severity="{severity}" port="443" protocol="tcp">'
+            f"<cve>CVE-2024-{plugin_id}</cve></ReportItem>"
+            for plugin_id, severity, family in items
+        )
+        report_hosts.append(
+            f'<ReportHost name="{name}"><HostProperties>'
+            f'<tag name="host-ip">10.0.0.{len(report_hosts) + 1}</tag>'
+            f"</HostProperties>{report_items}</ReportHost>"
+        )
+    return (
+        '<?xml version="1.0" ?><NessusClientData_v2><Policy><policyName>Weekly</policyName>'
+        "<Preferences><ServerPreferences><preference><name>scan_start_timestamp</name>"
+        "<value>1700000000</value></preference></ServerPreferences></Preferences></Policy>"
+        f'<Report name="Weekly scan">{"".join(report_hosts)}</Report></NessusClientData_v2>'
+    )
+
+
+def ckl_xml(vulns, version="1.0"):
+    """CKL checklist with `vulns` = [(vuln_num, severity, status), ...]"""
+    vuln_elements = "".join(
+        "<VULN>"
+        f"<STIG_DATA><VULN_ATTRIBUTE>Vuln_Num</VULN_ATTRIBUTE><ATTRIBUTE_DATA>{vuln_num}</ATTRIBUTE_DATA></STIG_DATA>"
+        f"<STIG_DATA><VULN_ATTRIBUTE>Severity</VULN_ATTRIBUTE><ATTRIBUTE_DATA>{severity}</ATTRIBUTE_DATA></STIG_DATA>"
+        f"<STIG_DATA><VULN_ATTRIBUTE>Rule_ID</VULN_ATTRIBUTE><ATTRIBUTE_DATA>SV-{vuln_num}_rule</ATTRIBUTE_DATA></STIG_DATA>"
+        f"<STIG_DATA><VULN_ATTRIBUTE>Rule_Ver</VULN_ATTRIBUTE><ATTRIBUTE_DATA>WN-{vuln_num}</ATTRIBUTE_DATA></STIG_DATA>"
+        f"<STIG_DATA><VULN_ATTRIBUTE>Rule_Title</VULN_ATTRIBUTE><ATTRIBUTE_DATA>Rule {vuln_num}</ATTRIBUTE_DATA></STIG_DATA>"
+        "<STIG_DATA><VULN_ATTRIBUTE>CCI_REF</VULN_ATTRIBUTE><ATTRIBUTE_DATA>CCI-000366</ATTRIBUTE_DATA></STIG_DATA>"
+        "<STIG_DATA><VULN_ATTRIBUTE>CCI_REF</VULN_ATTRIBUTE><ATTRIBUTE_DATA>CCI-000213</ATTRIBUTE_DATA></STIG_DATA>"
+        f"<STATUS>{status}</STATUS><FINDING_DETAILS /><COMMENTS />"
+        "</VULN>"
+        for vuln_num, severity, status in vulns
+    )
+    return (
+        "<CHECKLIST><ASSET><HOST_NAME>web01</HOST_NAME><ASSET_TYPE>Computing</ASSET_TYPE></ASSET>"
+        "<STIGS><iSTIG><STIG_INFO>"
+        f"<SI_DATA><SID_NAME>version</SID_NAME><SID_DATA>{version}</SID_DATA></SI_DATA>"
+        "<SI_DATA><SID_NAME>title</SID_NAME><SID_DATA>Windows 10 STIG</SID_DATA></SI_DATA>"
+        f"</STIG_INFO>{vuln_elements}</iSTIG></STIGS></CHECKLIST>"
+    )
+
+
+class TestNessusParser:
+    """Tests for NessusParser"""
+
+    def test_stream_yields_batches_and_statistics(self):
+        """Records come in batches, statistics are computed while reading"""
+        xml = nessus_xml(
+            [
+                ("web01", [(1, "4", "Web"), (2, "2", "Web"), (3, "0", "General")]),
+                ("db01", [(4, "3", "Databases")]),
+            ]
+        )
+        stream = NessusParser().stream_nessus_file(
+            io.BytesIO(xml.encode()), batch_size=2
+        )
+
+        batches = list(stream)
+
+        assert [len(batch["vulnerabilities"]) for batch in batches] == [2, 2, 0]
+        # A host is emitted in the batch in which it ends
+        assert [[host["name"] for host in batch["hosts"]] for batch in batches] == [
+            [],
+            ["web01"],
+            ["db01"],
+        ]
+        web01 = batches[1]["hosts"][0]
+        assert web01["properties"] == {"host-ip": "10.0.0.1"}
+        assert web01["vulnerability_summary"] == {"4": 1, "2": 1, "0": 1}
+        assert batches[1]["vulnerabilities"][1]["host_name"] == "db01"
+        assert stream.metadata["policy_name"] == "Weekly"
+        assert stream.metadata["report_name"] == "Weekly scan"
+        assert stream.statistics["total_hosts"] == 2
+        assert stream.statistics["total_vulnerabilities"] == 4
+        assert stream.statistics["severity_breakdown"] == {
+            "critical": 1,
+            "high": 1,
+            "medium": 1,
+            "low": 0,
+            "info": 1,
+        }
+        assert stream.statistics["plugin_families"] == {
+            "Web": 2,
+            "General": 1,
+            "Databases": 1,
+        }
+
+    def test_parse_nessus_file_keeps_its_result(self):
+        """The string API returns the whole scan, built from the stream"""
+        xml = nessus_xml([("web01", [(1, "4", "Web")])])
+
+        scan_data = NessusParser().parse_nessus_file(xml)
+
+        assert [host["name"] for host in scan_data["hosts"]] == ["web01"]
+        assert scan_data["vulnerabilities"][0]["cve"] == ["CVE-2024-1"]
+        assert scan_data["statistics"]["total_vulnerabilities"] == 1
+        assert "scan_date" in scan_data["metadata"]
+        assert scan_data["parsing_info"]["xml_size"] == len(xml)
+
+    @pytest.mark.parametrize(
+        "xml",
+        [
+            "<NessusClientData><Report /></NessusClientData>",
+            "<NessusClientData_v2><Report /></NessusClientData_v2>",
+            "<NessusClientData_v2><Policy>",
+        ],
+    )
+    def test_invalid_files_are_rejected(self, xml):
+        with pytest.raises(ValidationError):
+            NessusParser().parse_nessus_file(xml)
+
+
+class TestCKLParser:
+    """Tests for CKLParser"""
+
+    def test_stream_yields_batches_and_statistics(self):
+        xml = ckl_xml(
+            [
+                ("V-1", "high", "Open"),
+                ("V-2", "low", "NotAFinding"),
+                ("V-3", "medium", "Open"),
+            ]
+        )
+        stream = CKLParser().stream_ckl_file(io.BytesIO(xml.encode()), batch_size=2)
+
+        batches = list(stream)
+
+        assert [len(batch) for batch in batches] == [2, 1]
+        assert stream.version == "1.0"
+        assert stream.asset["host_name"] == "web01"
+        assert stream.statistics["total_vulnerabilities"] == 3
+        assert stream.statistics["open_findings"] == 2
+        checklist_data = CKLParser().parse_ckl_file(xml)
+        assert (
+            CKLParser().extract_checklist_summary(checklist_data)["stig_type"]
+            == "Windows 10 STIG"
+        )
+
+    def test_unsupported_version_is_rejected(self):
+        with pytest.raises(ValidationError):
+            CKLParser().parse_ckl_file(
+                ckl_xml([("V-1", "high", "Open")], version="3.0")
+            )
+
+
+@pytest.mark.django_db
+class TestCKLImport:
+    """Tests for VulnerabilityFindingRepository.import_from_ckl"""
+
+    def test_import_upserts_findings(self, tmp_path):
+        checklist_id = uuid.uuid4()
+        path = tmp_path / "web01.ckl"
+        path.write_text(
+            ckl_xml([("V-1", "high", "Open"), ("V-2", "low", "Not_Applicable")])
+        )
+        repository = VulnerabilityFindingRepository()
+
+        result = repository.import_from_ckl(checklist_id, str(path), batch_size=1)
+
+        assert result["imported"] == 2
+        findings = {
+            f.vulnId: f
+            for f in VulnerabilityFinding.objects.filter(checklistId=checklist_id)
+        }
+        assert findings["V-1"].severity_category == "cat1"
+        assert findings["V-1"].stigId == "WN-V-1"
+        assert findings["V-1"].cciIds == ["CCI-000366", "CCI-000213"]
+        assert findings["V-1"].vulnerability_status.status == "open"
+        assert findings["V-2"].vulnerability_status.status == "not_applicable"
+
+        # Importing again updates the existing findings
+        path.write_text(ckl_xml([("V-1", "high", "NotAFinding")]))
+        repository.import_from_ckl(checklist_id, str(path))
+
+        assert (
+            VulnerabilityFinding.objects.filter(checklistId=checklist_id).count() == 2
+        )
+        finding = VulnerabilityFinding.objects.get(
+            checklistId=checklist_id, vulnId="V-1"
+        )
+        assert finding.id == findings["V-1"].id
+        assert finding.vulnerability_status.status == "not_a_finding"
+
+    def test_view_streams_uploaded_file(self, test_user):
+        checklist = StigChecklist.objects.create(
+            hostName="", stigType="Windows 10", stigRelease="R1", version="1"
+        )
+        upload = SimpleUploadedFile(
+            "web01.ckl", ckl_xml([("V-1", "high", "Open")]).encode()
+        )
+        request = APIRequestFactory().post("/", {"file": upload}, format="multipart")
+        force_authenticate(request, user=test_user)
+        view = StigChecklistViewSet.as_view(
+            {"post": "import_ckl"}, permission_classes=[]
+        )
+
+        response = view(request, pk=checklist.id)
+
+        assert response.status_code == 200, response.data
+        assert response.data["import_results"]["imported"] == 1
+        assert VulnerabilityFinding.objects.filter(
+            checklistId=checklist.id, vulnId="V-1"
+        ).exists()
+        checklist.refresh_from_db()
+        assert checklist.hostName == "web01"
+        assert checklist.version == "1.0"
+
+
+@pytest.mark.django_db
+class TestNessusScanProcessing:
+    """Tests for NessusScanRepository reading scans from the database"""
+
+    @pytest.fixture
+    def scan(self):
+        return NessusScan.objects.create(
+            systemGroupId=uuid.uuid4(),
+            filename="weekly.nessus",
+            processing_status="uploaded",
+            raw_xml_content=nessus_xml(
+                [
+                    ("web01", [(10001, 4, "Web Servers"), (10002, 2, "General")]),
+                    ("db01", [(10003, 3, "Databases")]),
+                ]
+            ),
+        )
+
+    def test_reader_returns_the_content_in_chunks(self, scan):
+        reader = RawXmlReader(scan.id, chunk_size=7)
+
+        chunks = iter(lambda: reader.read(5), "")
+
+        assert "".join(chunks) == scan.raw_xml_content
+
+    def test_process_scan_file(self, scan):
+        repository = NessusScanRepository()
+
+        assert repository.process_scan_file(scan.id)
+
+        scan.refresh_from_db()
+        assert scan.processing_status == "completed"
+        assert scan.total_hosts == 2
+        assert scan.total_vulnerabilities == 3
+        assert repository.validate_scan_data(scan.id)["valid"]
@@ -823,6 +823,73 @@ class TestVulnerabilityCorrelation:
             pytest.skip("VulnerabilityCorrelationService not available")
 
 
+class TestVulnerabilityCorrelationMatching:
+    """Tests for the indexed CKL/Nessus correlation."""
+
+    def test_correlate_findings(self):
+        """CVE, id and name matches are found, the rest is reported unmatched."""
+        from core.bounded_contexts.rmf_operations.services.vulnerability_correlation import (
+            VulnerabilityCorrelationService,
+        )
+
+        checklist_findings = [
+            {'vuln_id': 'V-1', 'rule_title': 'Outdated OpenSSL', 'discussion': 'See cve-2024-0001.'},
+            {'vuln_id': 'V-97861', 'rule_title': 'Something else entirely'},
+            {'vuln_id': 'V-2', 'rule_title': 'SMB signing must be required'},
+            {'vuln_id': 'V-3', 'rule_title': 'Unrelated rule'},
+        ]
+        nessus_findings = [
+            {'plugin_id': '11111', 'plugin_name': 'OpenSSL multiple issues', 'cve': ['CVE-2024-0001']},
+            {'plugin_id': '97861', 'plugin_name': 'Plugin 97861', 'cve': []},
+            {'plugin_id': '57608', 'plugin_name': 'SMB signing not required', 'cve': []},
+            {'plugin_id': '10180', 'plugin_name': 'Ping the remote host', 'cve': []},
+        ]
+
+        result = VulnerabilityCorrelationService().correlate_findings(checklist_findings, nessus_findings)
+
+        match_types = {
+            c['ckl_finding']['vuln_id']: (c['best_match']['nessus_finding']['plugin_id'], c['best_match']['match_type'])
+            for c in result['correlations']
+        }
+        assert match_types == {
+            'V-1': ('11111', 'cve'),
+            'V-97861': ('97861', 'vulnerability_id'),
+            'V-2': ('57608', 'name_similarity'),
+        }
+        assert result['unmatched_ckl'] == [checklist_findings[3]]
+        assert result['unmatched_nessus'] == [nessus_findings[3]]
+
+    def test_candidates_match_exhaustive_comparison(self):
+        """Indexed candidates find every pair an all-pairs comparison finds."""
+        import random
+
+        from core.bounded_contexts.rmf_operations.services.vulnerability_correlation import (
+            VulnerabilityCorrelationService,
+        )
+
+        rng = random.Random(7)
+        words = ['password', 'access', 'windows', 'server', 'policy', 'audit', 'ssl', 'smb', 'update', 'kernel']
+        checklist_findings = [
+            {'vuln_id': f'V-{rng.randint(1, 60)}', 'rule_title': ' '.join(rng.sample(words, rng.randint(1, 6)))}
+            for _ in range(80)
+        ]
+        nessus_findings = [
+            {'plugin_id': str(rng.randint(1, 60)), 'plugin_name': ' '.join(rng.sample(words, rng.randint(1, 6)))}
+            for _ in range(200)
+        ]
+        service = VulnerabilityCorrelationService()
+        index = service.build_nessus_index(nessus_findings)
+
+        for finding in checklist_findings:
+            keys = service._ckl_keys(finding)
+            expected = [
+                position for position, nessus_keys in enumerate(index.keys)
+                if service._correlate_single_finding(keys, nessus_keys)['confidence']
+                >= service.correlation_thresholds['low_confidence']
+            ]
+            assert set(expected) <= set(index.candidates(keys))
+
+
 # =============================================================================
 # Integration Tests
 # =============================================================================
@@ -89,6 +89,54 @@ class TestVersionService:
             pytest.skip("VersionService not available")
 
 
+class TestVersionDeltas:
+    """Tests for delta-encoded version snapshots."""
+
+    def test_next_version_alternates_keyframes_and_deltas(self):
+        from core.bounded_contexts.version_history.models import (
+            KEYFRAME_INTERVAL,
+            VersionCounter,
+            VersionHistory,
+            reconstruct_states,
+        )
+        from core.bounded_contexts.version_history.services import VersionService
+
+        counter = VersionCounter(object_id='1')
+        states = [
+            {'name': f'name {i}', 'description': 'same', **({'extra': i} if i % 3 else {})}
+            for i in range(KEYFRAME_INTERVAL + 5)
+        ]
+        versions = []
+        for state in states:
+            version_number, is_keyframe, snapshot_data = VersionService._next_version(counter, state)
+            versions.append(VersionHistory(
+                object_id='1',
+                version_number=version_number,
+                is_keyframe=is_keyframe,
+                snapshot_data=snapshot_data,
+            ))
+
+        assert [v.version_number for v in versions] == list(range(1, len(states) + 1))
+        assert [v.version_number for v in versions if v.is_keyframe] == [1, KEYFRAME_INTERVAL + 1]
+        assert versions[1].snapshot_data == {'set': {'name': 'name 1', 'extra': 1}, 'unset': []}
+        assert versions[3].snapshot_data == {'set': {'name': 'name 3'}, 'unset': ['extra']}
+        reconstructed = reconstruct_states(versions)
+        assert [reconstructed[v.version_number] for v in versions] == states
+        # Versions preceding the first keyframe of a window cannot be reconstructed
+        assert list(reconstruct_states(versions[2:])) == list(range(KEYFRAME_INTERVAL + 1, len(states) + 1))
+
+    def test_counter_continues_existing_history(self):
+        from core.bounded_contexts.version_history.models import VersionCounter
+        from core.bounded_contexts.version_history.services import VersionService
+
+        counter = VersionCounter(object_id='1', last_version=7)
+
+        assert VersionService._next_version(counter, {'name': 'a'}) == (8, True, {'name': 'a'})
+        assert VersionService._next_version(counter, {'name': 'b'}) == (
+            9, False, {'set': {'name': 'b'}, 'unset': []}
+        )
+
+
 # =============================================================================
 # Snapshot Service Tests
 # =============================================================================
@@ -6,9 +6,12 @@ Tests cover:
 - WorkflowExecution model and API
 - WorkflowSchedule model and API
 - WorkflowWebhook model and API
+- WorkflowExecutionEngine DAG execution
+- WorkflowScheduler dispatch of due schedules
 """
 
 import pytest
+import threading
 import uuid
 from datetime import datetime, timedelta
 from django.utils import timezone
@@ -22,6 +25,11 @@ from core.bounded_contexts.workflow_engine.models import (
     WorkflowSchedule,
     WorkflowWebhook,
 )
+from core.bounded_contexts.workflow_engine.services import (
+    WorkflowExecutionEngine,
+    WorkflowScheduler,
+    WorkflowService,
+)
 
 
 User = get_user_model()
@@ -310,6 +318,233 @@ class TestWorkflowExecutionAPI:
         assert execution.status == 'cancelled'
 
 
+# =============================================================================
+# Workflow Execution Engine Tests
+# =============================================================================
+
+def build_workflow(nodes, connections):
+    """Workflow with `nodes` = [(id, type, config), ...] and `connections` = [(source, port, target), ...]"""
+    workflow = Workflow.objects.create(name='Engine Workflow', status='active')
+    return WorkflowService().update_workflow(
+        workflow,
+        nodes=[
+            {'id': node_id, 'type': node_type, 'name': node_id, 'config': config}
+            for node_id, node_type, config in nodes
+        ],
+        connections=[
+            {
+                'id': f'{source}-{target}',
+                'sourceNodeId': source,
+                'sourcePort': port,
+                'targetNodeId': target,
+                'targetPort': 'in',
+            }
+            for source, port, target in connections
+        ],
+    )
+
+
+@pytest.mark.django_db
+class TestWorkflowExecutionEngine:
+    """Tests for WorkflowExecutionEngine"""
+
+    def test_parallel_branches_run_concurrently_and_join(self):
+        """logic_parallel fans out to all its branches, the join node waits for them"""
+        workflow = build_workflow(
+            nodes=[
+                ('start', 'trigger_manual', {}),
+                ('fork', 'logic_parallel', {}),
+                ('call_a', 'action_http', {'url': 'https://a.example'}),
+                ('call_b', 'action_http', {'url': 'https://b.example'}),
+                ('join', 'action_assign', {'assignee': '{{call_a.url}} {{call_b.url}}'}),
+                ('done', 'end_success', {}),
+            ],
+            connections=[
+                ('start', 'out', 'fork'),
+                ('fork', 'branch_1', 'call_a'),
+                ('fork', 'branch_2', 'call_b'),
+                ('call_a', 'out', 'join'),
+                ('call_b', 'out', 'join'),
+                ('join', 'out', 'done'),
+            ],
+        )
+        barrier = threading.Barrier(2, timeout=5)
+
+        def slow_http(node, context, execution):
+            # Both branches must be running at the same time to pass the barrier
+            barrier.wait()
+            return {'output': {'url': node.config['url']}}
+
+        engine = WorkflowExecutionEngine(max_workers=2)
+        engine.node_handlers['action_http'] = slow_http
+
+        execution = engine.execute(workflow)
+
+        assert execution.status == WorkflowExecution.Status.COMPLETED
+        steps = {step.node_id: step for step in execution.steps.all()}
+        assert set(steps) == {'start', 'fork', 'call_a', 'call_b', 'join', 'done'}
+        assert sorted(steps['fork'].next_node_ids) == ['call_a', 'call_b']
+        assert steps['join'].sequence > max(steps['call_a'].sequence, steps['call_b'].sequence)
+        assert steps['join'].output_data == {
+            'assigned': True,
+            'assignee': 'https://a.example https://b.example',
+        }
+        assert all(step.duration_ms is not None for step in steps.values())
+
+    def test_branches_not_taken_are_skipped(self):
+        """A join reached by a single branch runs once, the other branch is skipped"""
+        workflow = build_workflow(
+            nodes=[
+                ('start', 'trigger_manual', {}),
+                ('check', 'logic_condition', {'condition': '{{trigger_data.level}} > 3'}),
+                ('escalate', 'action_notify', {}),
+                ('log', 'action_assign', {}),
+                ('done', 'end_success', {}),
+            ],
+            connections=[
+                ('start', 'out', 'check'),
+                ('check', 'true', 'escalate'),
+                ('check', 'false', 'log'),
+                ('escalate', 'out', 'done'),
+                ('log', 'out', 'done'),
+            ],
+        )
+
+        execution = WorkflowExecutionEngine().execute(workflow, trigger_data={'level': 1})
+
+        assert execution.status == WorkflowExecution.Status.COMPLETED
+        assert list(execution.steps.values_list('node_id', flat=True)) == [
+            'start', 'check', 'log', 'done',
+        ]
+
+    def test_interrupted_execution_resumes_from_completed_steps(self):
+        workflow = build_workflow(
+            nodes=[
+                ('start', 'trigger_manual', {}),
+                ('assign', 'action_assign', {'assignee': '{{trigger_data.owner}}'}),
+                ('done', 'end_success', {}),
+            ],
+            connections=[('start', 'out', 'assign'), ('assign', 'out', 'done')],
+        )
+        execution = WorkflowExecution.objects.create(
+            workflow=workflow,
+            triggered_by='manual',
+            trigger_data={'owner': 'alice'},
+            status=WorkflowExecution.Status.RUNNING,
+            started_at=timezone.now(),
+        )
+        trigger_step = execution.steps.create(
+            node_id='start', node_type='trigger_manual', node_name='start', sequence=0,
+            status='completed', output_data={'owner': 'alice'}, next_node_ids=['assign'],
+        )
+        execution.steps.create(
+            node_id='assign', node_type='action_assign', node_name='assign', sequence=1,
+            status='running',
+        )
+
+        WorkflowExecutionEngine().run(execution)
+
+        assert execution.status == WorkflowExecution.Status.COMPLETED
+        steps = list(execution.steps.all())
+        assert [(step.node_id, step.sequence, step.status) for step in steps] == [
+            ('start', 0, 'completed'),
+            ('assign', 2, 'completed'),
+            ('done', 3, 'completed'),
+        ]
+        assert steps[0].id == trigger_step.id
+        assert steps[1].output_data == {'assigned': True, 'assignee': 'alice'}
+
+    def test_cycles_fail_the_execution(self):
+        workflow = build_workflow(
+            nodes=[
+                ('start', 'trigger_manual', {}),
+                ('a', 'action_assign', {}),
+                ('b', 'action_assign', {}),
+            ],
+            connections=[('start', 'out', 'a'), ('a', 'out', 'b'), ('b', 'out', 'a')],
+        )
+
+        execution = WorkflowExecutionEngine().execute(workflow)
+
+        assert execution.status == WorkflowExecution.Status.FAILED
+        assert 'cycle' in execution.error
+
+
+# =============================================================================
+# Workflow Scheduler Tests
+# =============================================================================
+
+@pytest.mark.django_db
+class TestWorkflowScheduler:
+    """Tests for WorkflowScheduler"""
+
+    def test_due_schedules_are_queued_in_batches(self, monkeypatch, django_capture_on_commit_callbacks):
+        """Executions of due schedules are queued, not run, and the schedules advanced"""
+        from core.bounded_contexts.workflow_engine import tasks
+
+        queued = []
+        monkeypatch.setattr(tasks, 'run_workflow_execution', queued.append)
+        workflow = Workflow.objects.create(name='Scheduled Workflow', status='active')
+        past = timezone.now() - timedelta(minutes=5)
+        interval = [
+            WorkflowSchedule.objects.create(
+                workflow=workflow, name=f'Interval {i}', schedule_type='interval',
+                interval_minutes=30, next_run_at=past,
+            )
+            for i in range(3)
+        ]
+        once = WorkflowSchedule.objects.create(
+            workflow=workflow, name='Once', schedule_type='once', next_run_at=past,
+        )
+        exhausted = WorkflowSchedule.objects.create(
+            workflow=workflow, name='Exhausted', schedule_type='interval',
+            next_run_at=past, run_count=2, max_runs=2,
+        )
+        later = WorkflowSchedule.objects.create(
+            workflow=workflow, name='Later', schedule_type='interval',
+            next_run_at=timezone.now() + timedelta(hours=1),
+        )
+
+        with django_capture_on_commit_callbacks(execute=True):
+            count = WorkflowScheduler().process_schedules(batch_size=2)
+
+        assert count == 4
+        executions = WorkflowExecution.objects.filter(workflow=workflow)
+        assert sorted(queued) == sorted(executions.values_list('id', flat=True))
+        assert set(executions.values_list('status', flat=True)) == {WorkflowExecution.Status.PENDING}
+
+        for schedule in interval:
+            schedule.refresh_from_db()
+            assert schedule.run_count == 1
+            assert schedule.next_run_at > timezone.now() + timedelta(minutes=29)
+        once.refresh_from_db()
+        assert once.run_count == 1
+        assert once.next_run_at is None
+        exhausted.refresh_from_db()
+        assert exhausted.is_active is False
+        assert exhausted.run_count == 2
+        later.refresh_from_db()
+        assert later.run_count == 0
+
+    def test_failed_schedule_is_left_due(self, monkeypatch):
+        workflow = Workflow.objects.create(name='Scheduled Workflow', status='active')
+        schedule = WorkflowSchedule.objects.create(
+            workflow=workflow, name='Failing', schedule_type='interval',
+            next_run_at=timezone.now() - timedelta(minutes=5),
+        )
+        scheduler = WorkflowScheduler()
+
+        def fail(**kwargs):
+            raise RuntimeError('queue unavailable')
+
+        monkeypatch.setattr(scheduler.engine, 'execute', fail)
+
+        assert scheduler.process_schedules() == 0
+        schedule.refresh_from_db()
+        assert schedule.run_count == 0
+        assert schedule.next_run_at < timezone.now()
+
+
 # =============================================================================
 # Integration Tests
 # =============================================================================
@@ -16,6 +16,7 @@ Features:
 from .models import (
     VersionedModel,
     VersionHistory,
+    VersionCounter,
     VersionSnapshot,
     VersionDiff,
     VersionComment,
@@ -31,6 +32,7 @@ from .mixins import VersionedModelMixin
 __all__ = [
     'VersionedModel',
     'VersionHistory',
+    'VersionCounter',
     'VersionSnapshot',
     'VersionDiff',
     'VersionComment',
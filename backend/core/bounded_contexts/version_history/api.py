@@ -23,6 +23,7 @@ class VersionHistorySerializer(serializers.ModelSerializer):
 
     content_type_name = serializers.SerializerMethodField()
     created_by_name = serializers.SerializerMethodField()
+    snapshot_data = serializers.SerializerMethodField()
 
     class Meta:
         model = VersionHistory
@@ -41,6 +42,10 @@ class VersionHistorySerializer(serializers.ModelSerializer):
     def get_created_by_name(self, obj):
         return str(obj.created_by) if obj.created_by else None
 
+    def get_snapshot_data(self, obj):
+        # Complete state, also for the versions stored as deltas
+        return obj.get_state()
+
 
 class VersionSnapshotSerializer(serializers.ModelSerializer):
     """Serializer for version snapshots."""
@@ -4,7 +4,7 @@ Version History Mixins
 Mixins for adding automatic version tracking to Django models.
 """
 
-from django.db import models
+from django.db import models, transaction
 from django.db.models.signals import post_save, pre_delete
 from django.dispatch import receiver
 from typing import List, Optional
@@ -237,14 +237,34 @@ class VersionedModelMixin(models.Model):
         """
         Bulk save instances with a single version entry per instance.
 
-        More efficient than saving one by one.
+        More efficient than saving one by one: the version entries are
+        written together (see VersionService.create_versions).
         """
-        set_version_context(user=user, reason=reason)
-        try:
-            for instance in instances:
-                instance.save()
-        finally:
-            clear_version_context()
+        changes = {'create': {}, 'update': {}}
+        with transaction.atomic():
+            set_version_context(user=user, reason=reason, skip_versioning=True)
+            try:
+                for instance in instances:
+                    is_new = instance.pk is None
+                    changed_fields, previous_values = instance._get_changed_fields()
+                    instance.save()
+                    if instance._version_tracking_enabled and (is_new or changed_fields):
+                        changes['create' if is_new else 'update'][str(instance.pk)] = (
+                            instance, changed_fields, previous_values
+                        )
+            finally:
+                clear_version_context()
+
+            for change_type, changed in changes.items():
+                if changed:
+                    VersionService.create_versions(
+                        [instance for instance, _, _ in changed.values()],
+                        change_type=change_type,
+                        change_reason=reason,
+                        user=user,
+                        changed_fields={pk: fields for pk, (_, fields, _) in changed.items()},
+                        previous_values={pk: values for pk, (_, _, values) in changed.items()},
+                    )
 
 
 class VersionContextMiddleware:
@@ -13,12 +13,60 @@ import json
 import uuid
 
 
+# Every KEYFRAME_INTERVAL versions, a version stores the complete state of the
+# object; the versions in between store the changes from the previous one.
+KEYFRAME_INTERVAL = 20
+
+
+def compute_delta(old_state, new_state):
+    """Changes turning `old_state` into `new_state`."""
+    return {
+        'set': {
+            key: value for key, value in new_state.items()
+            if key not in old_state or old_state[key] != value
+        },
+        'unset': [key for key in old_state if key not in new_state],
+    }
+
+
+def apply_delta(state, delta):
+    """State resulting from applying `delta` (see compute_delta) to `state`."""
+    state = {**state, **delta.get('set', {})}
+    for key in delta.get('unset', []):
+        state.pop(key, None)
+    return state
+
+
+def reconstruct_states(versions):
+    """
+    States of consecutive versions of an object: {version_number: state}.
+
+    `versions` must be in ascending order; the versions preceding the first
+    keyframe cannot be reconstructed and are left out.
+    """
+    states = {}
+    state = None
+    previous_number = None
+    for version in versions:
+        if version.is_keyframe:
+            state = version.snapshot_data
+        elif state is not None and version.version_number == previous_number + 1:
+            state = apply_delta(state, version.snapshot_data)
+        else:
+            state = None
+        if state is not None:
+            states[version.version_number] = state
+        previous_number = version.version_number
+    return states
+
+
 class VersionHistory(models.Model):
     """
     Tracks all versions of any versioned model.
 
-    Stores complete snapshots of the model state at each version,
-    along with metadata about who made the change and why.
+    Stores the model state at each version, along with metadata about who
+    made the change and why. Keyframes hold complete snapshots, the other
+    versions the changes from the previous version (see get_state).
     """
 
     class ChangeType(models.TextChoices):
@@ -53,8 +101,9 @@ class VersionHistory(models.Model):
     change_summary = models.CharField(max_length=500, blank=True)
     change_reason = models.TextField(blank=True)
 
-    # Complete state snapshot (JSON)
+    # Complete state snapshot (keyframe) or delta from the previous version (JSON)
     snapshot_data = models.JSONField()
+    is_keyframe = models.BooleanField(default=True)
 
     # Changed fields (JSON list)
     changed_fields = models.JSONField(default=list)
@@ -87,6 +136,8 @@ class VersionHistory(models.Model):
             models.Index(fields=['content_type', 'object_id']),
             models.Index(fields=['content_type', 'object_id', 'version_number']),
             models.Index(fields=['created_at']),
+            # Audit trail of a model, most recent changes first
+            models.Index(fields=['content_type', '-created_at']),
             models.Index(fields=['created_by']),
             models.Index(fields=['change_type']),
         ]
@@ -97,18 +148,34 @@ class VersionHistory(models.Model):
     def __str__(self):
         return f"{self.content_type.model} #{self.object_id} v{self.version_number}"
 
+    def get_state(self):
+        """Complete state of the object at this version."""
+        if self.is_keyframe:
+            return self.snapshot_data
+        return self.get_states(self.version_number).get(self.version_number, {})
+
+    def get_states(self, from_version_number):
+        """States from `from_version_number` to this version: {version_number: state}."""
+        if self.is_keyframe and from_version_number >= self.version_number:
+            return {self.version_number: self.snapshot_data}
+        # The keyframe of a version is less than KEYFRAME_INTERVAL versions before it
+        chain = VersionHistory.objects.filter(
+            content_type_id=self.content_type_id,
+            object_id=self.object_id,
+            version_number__gt=min(from_version_number, self.version_number) - KEYFRAME_INTERVAL,
+            version_number__lte=self.version_number,
+        ).only('version_number', 'is_keyframe', 'snapshot_data').order_by('version_number')
+        return reconstruct_states(chain)
+
     def get_diff_from_previous(self):
         """Get the diff from the previous version."""
-        previous = VersionHistory.objects.filter(
-            content_type=self.content_type,
-            object_id=self.object_id,
-            version_number=self.version_number - 1
-        ).first()
+        states = self.get_states(self.version_number - 1)
+        previous_state = states.get(self.version_number - 1)
 
-        if not previous:
-            return {'added': self.snapshot_data, 'removed': {}, 'changed': {}}
+        if previous_state is None:
+            return {'added': states.get(self.version_number, {}), 'removed': {}, 'changed': {}}
 
-        return self._compute_diff(previous.snapshot_data, self.snapshot_data)
+        return self._compute_diff(previous_state, states.get(self.version_number, {}))
 
     def _compute_diff(self, old_data, new_data):
         """Compute detailed diff between two snapshots."""
@@ -130,6 +197,38 @@ class VersionHistory(models.Model):
         return diff
 
 
+class VersionCounter(models.Model):
+    """
+    Last version of a versioned object.
+
+    Locked and incremented by VersionService for each new version, so that
+    concurrent changes get distinct version numbers without looking up the
+    latest version. The last state is the base of the delta of the next
+    version.
+    """
+
+    content_type = models.ForeignKey(
+        ContentType,
+        on_delete=models.CASCADE,
+        related_name='version_counters'
+    )
+    object_id = models.CharField(max_length=255)
+
+    last_version = models.PositiveIntegerField(default=0)
+    keyframe_version = models.PositiveIntegerField(default=0)
+    last_state = models.JSONField(null=True)
+
+    class Meta:
+        verbose_name = 'Version Counter'
+        verbose_name_plural = 'Version Counters'
+        unique_together = [
+            ['content_type', 'object_id']
+        ]
+
+    def __str__(self):
+        return f"{self.content_type_id} #{self.object_id} v{self.last_version}"
+
+
 class VersionSnapshot(models.Model):
     """
     Named snapshots for point-in-time recovery.
@@ -346,7 +445,7 @@ class VersionedModel(models.Model):
             raise ValueError(f"Version {version_number} not found")
 
         # Apply the snapshot data
-        for field, value in version.snapshot_data.items():
+        for field, value in version.get_state().items():
             if hasattr(self, field):
                 setattr(self, field, value)
 
@@ -376,4 +475,4 @@ class VersionedModel(models.Model):
             return cached.diff_data
 
         # Compute diff
-        return v2._compute_diff(v1.snapshot_data, v2.snapshot_data)
+        return v2._compute_diff(v1.get_state(), v2.get_state())
@@ -5,7 +5,8 @@ Services for managing version history, snapshots, diffs, and auditing.
 """
 
 from django.contrib.contenttypes.models import ContentType
-from django.db import transaction
+from django.db import models, transaction
+from django.db.models import Max
 from django.utils import timezone
 from django.core.serializers.json import DjangoJSONEncoder
 from typing import Any, Dict, List, Optional, Type
@@ -13,7 +14,16 @@ from datetime import datetime, timedelta
 import json
 import difflib
 
-from .models import VersionHistory, VersionSnapshot, VersionDiff, VersionComment
+from .models import (
+    KEYFRAME_INTERVAL,
+    VersionCounter,
+    VersionHistory,
+    VersionSnapshot,
+    VersionDiff,
+    VersionComment,
+    compute_delta,
+    reconstruct_states,
+)
 
 
 class VersionService:
@@ -48,18 +58,43 @@ class VersionService:
             changed_fields: List of field names that changed
             previous_values: Dict of previous field values
         """
-        content_type = ContentType.objects.get_for_model(instance)
-
-        # Get current version number
-        last_version = VersionHistory.objects.filter(
-            content_type=content_type,
-            object_id=str(instance.pk)
-        ).order_by('-version_number').first()
+        object_id = str(instance.pk)
+        return cls.create_versions(
+            [instance],
+            change_type=change_type,
+            change_summary=change_summary,
+            change_reason=change_reason,
+            user=user,
+            request=request,
+            changed_fields={object_id: changed_fields} if changed_fields else None,
+            previous_values={object_id: previous_values} if previous_values else None,
+        )[0]
 
-        version_number = (last_version.version_number + 1) if last_version else 1
+    @classmethod
+    def create_versions(
+        cls,
+        instances: List[Any],
+        change_type: str = 'bulk',
+        change_summary: str = '',
+        change_reason: str = '',
+        user=None,
+        request=None,
+        changed_fields: Dict[str, List[str]] = None,
+        previous_values: Dict[str, Dict] = None,
+    ) -> List[VersionHistory]:
+        """
+        Create a new version entry for each instance (bulk edits). Version
+        numbers, versions and counters are written with a fixed number of
+        queries per model.
 
-        # Create snapshot of current state
-        snapshot_data = cls._serialize_instance(instance)
+        Args:
+            instances: The model instances to version
+            changed_fields: Field names that changed, by instance pk
+            previous_values: Previous field values, by instance pk
+            (other arguments: see create_version)
+        """
+        changed_fields = changed_fields or {}
+        previous_values = previous_values or {}
 
         # Extract request info
         ip_address = None
@@ -70,29 +105,117 @@ class VersionService:
             user_agent = request.META.get('HTTP_USER_AGENT', '')[:500]
             request_id = request.META.get('HTTP_X_REQUEST_ID', '')
 
-        version = VersionHistory.objects.create(
-            content_type=content_type,
-            object_id=str(instance.pk),
-            version_number=version_number,
-            change_type=change_type,
-            change_summary=change_summary or cls._generate_change_summary(change_type, changed_fields),
-            change_reason=change_reason,
-            snapshot_data=snapshot_data,
-            changed_fields=changed_fields or [],
-            previous_values=previous_values or {},
-            created_by=user,
-            ip_address=ip_address,
-            user_agent=user_agent,
-            request_id=request_id,
-        )
+        instances_by_model = {}
+        for instance in instances:
+            instances_by_model.setdefault(type(instance), []).append(instance)
 
-        # Update instance version number if it has the field
-        if hasattr(instance, 'current_version'):
-            instance.current_version = version_number
-            # Use update to avoid recursion
-            type(instance).objects.filter(pk=instance.pk).update(current_version=version_number)
+        versions = {}
+        with transaction.atomic():
+            for model, model_instances in instances_by_model.items():
+                content_type = ContentType.objects.get_for_model(model)
+                counters = cls._lock_counters(
+                    content_type, {str(instance.pk) for instance in model_instances}
+                )
+
+                model_versions = []
+                for instance in model_instances:
+                    object_id = str(instance.pk)
+                    counter = counters[object_id]
+                    version_number, is_keyframe, snapshot_data = cls._next_version(
+                        counter, cls._serialize_instance(instance)
+                    )
+                    fields = changed_fields.get(object_id) or []
+                    model_versions.append(VersionHistory(
+                        content_type=content_type,
+                        object_id=object_id,
+                        version_number=version_number,
+                        change_type=change_type,
+                        change_summary=change_summary or cls._generate_change_summary(change_type, fields),
+                        change_reason=change_reason,
+                        snapshot_data=snapshot_data,
+                        is_keyframe=is_keyframe,
+                        changed_fields=fields,
+                        previous_values={
+                            field: cls._to_json(value)
+                            for field, value in (previous_values.get(object_id) or {}).items()
+                        },
+                        created_by=user,
+                        ip_address=ip_address,
+                        user_agent=user_agent,
+                        request_id=request_id,
+                    ))
+                    # Update instance version number if it has the field
+                    if hasattr(instance, 'current_version'):
+                        instance.current_version = version_number
+
+                VersionHistory.objects.bulk_create(model_versions)
+                VersionCounter.objects.bulk_update(
+                    counters.values(), ['last_version', 'keyframe_version', 'last_state']
+                )
+                if hasattr(model, 'current_version'):
+                    # Use update to avoid recursion
+                    model.objects.bulk_update(
+                        list({instance.pk: instance for instance in model_instances}.values()),
+                        ['current_version'],
+                    )
+                for instance, version in zip(model_instances, model_versions):
+                    versions[id(instance)] = version
+
+        return [versions[id(instance)] for instance in instances]
 
-        return version
+    @classmethod
+    def _lock_counters(cls, content_type: ContentType, object_ids) -> Dict[str, VersionCounter]:
+        """Version counters of the objects, locked until the end of the transaction."""
+        counters = {
+            counter.object_id: counter
+            for counter in VersionCounter.objects.select_for_update().filter(
+                content_type=content_type, object_id__in=object_ids
+            )
+        }
+        missing = [object_id for object_id in object_ids if object_id not in counters]
+        if missing:
+            # Objects versioned before their counter existed continue their numbering
+            last_versions = dict(
+                VersionHistory.objects.filter(content_type=content_type, object_id__in=missing)
+                .values('object_id')
+                .annotate(last_version=Max('version_number'))
+                .values_list('object_id', 'last_version')
+            )
+            # Counters created concurrently are kept
+            VersionCounter.objects.bulk_create(
+                [
+                    VersionCounter(
+                        content_type=content_type,
+                        object_id=object_id,
+                        last_version=last_versions.get(object_id, 0),
+                    )
+                    for object_id in missing
+                ],
+                ignore_conflicts=True,
+            )
+            counters.update({
+                counter.object_id: counter
+                for counter in VersionCounter.objects.select_for_update().filter(
+                    content_type=content_type, object_id__in=missing
+                )
+            })
+        return counters
+
+    @classmethod
+    def _next_version(cls, counter: VersionCounter, state: Dict) -> tuple:
+        """
+        Number and snapshot data of the next version of the counter's object:
+        a keyframe (complete state) every KEYFRAME_INTERVAL versions, otherwise
+        the delta from the previous version.
+        """
+        counter.last_version += 1
+        if counter.last_state is None or counter.last_version - counter.keyframe_version >= KEYFRAME_INTERVAL:
+            counter.keyframe_version = counter.last_version
+            is_keyframe, snapshot_data = True, state
+        else:
+            is_keyframe, snapshot_data = False, compute_delta(counter.last_state, state)
+        counter.last_state = state
+        return counter.last_version, is_keyframe, snapshot_data
 
     @classmethod
     def get_history(
@@ -162,7 +285,7 @@ class VersionService:
 
         with transaction.atomic():
             # Apply snapshot data
-            cls._deserialize_to_instance(instance, version.snapshot_data)
+            cls._deserialize_to_instance(instance, version.get_state())
             instance.save()
 
             # Create restoration version entry
@@ -194,14 +317,18 @@ class VersionService:
             elif field.concrete:
                 value = getattr(instance, field.name, None)
                 # Convert to JSON-serializable format
-                try:
-                    json.dumps(value, cls=DjangoJSONEncoder)
-                    data[field.name] = value
-                except (TypeError, ValueError):
-                    data[field.name] = str(value)
+                data[field.name] = cls._to_json(value)
 
         return data
 
+    @classmethod
+    def _to_json(cls, value: Any) -> Any:
+        """Value as stored in a JSON field (dates, UUIDs... as strings)."""
+        try:
+            return json.loads(json.dumps(value, cls=DjangoJSONEncoder))
+        except (TypeError, ValueError):
+            return str(value)
+
     @classmethod
     def _deserialize_to_instance(cls, instance: Any, data: Dict):
         """Apply snapshot data to an instance."""
@@ -358,7 +485,7 @@ class DiffService:
             if cached:
                 return cached.diff_data
 
-        diff = cls._compute_diff(from_version.snapshot_data, to_version.snapshot_data)
+        diff = cls._compute_diff(from_version.get_state(), to_version.get_state())
 
         # Cache the result
         VersionDiff.objects.create(
@@ -380,8 +507,8 @@ class DiffService:
         field_name: str,
     ) -> str:
         """Get unified text diff for a specific field."""
-        old_value = str(from_version.snapshot_data.get(field_name, ''))
-        new_value = str(to_version.snapshot_data.get(field_name, ''))
+        old_value = str(from_version.get_state().get(field_name, ''))
+        new_value = str(to_version.get_state().get(field_name, ''))
 
         diff = difflib.unified_diff(
             old_value.splitlines(keepends=True),
@@ -399,16 +526,35 @@ class DiffService:
         from_version: int = None,
         to_version: int = None,
     ) -> List[Dict]:
-        """Get a timeline of all changes between versions."""
-        history = VersionService.get_history(instance)
+        """
+        Get a timeline of all changes between versions (the 100 most recent).
 
+        States are reconstructed in a single pass from the keyframe preceding
+        the oldest version of the timeline.
+        """
+        content_type = ContentType.objects.get_for_model(instance)
+        queryset = VersionHistory.objects.filter(
+            content_type=content_type,
+            object_id=str(instance.pk)
+        )
+        history = queryset.select_related('created_by')
         if from_version:
-            history = [v for v in history if v.version_number >= from_version]
+            history = history.filter(version_number__gte=from_version)
         if to_version:
-            history = [v for v in history if v.version_number <= to_version]
+            history = history.filter(version_number__lte=to_version)
+        history = list(reversed(history.order_by('-version_number')[:100]))
+
+        chain = []
+        if history and not history[0].is_keyframe:
+            oldest = history[0].version_number
+            chain = list(queryset.filter(
+                version_number__gt=oldest - KEYFRAME_INTERVAL,
+                version_number__lt=oldest,
+            ).only('version_number', 'is_keyframe', 'snapshot_data').order_by('version_number'))
+        states = reconstruct_states(chain + history)
 
         timeline = []
-        for i, version in enumerate(reversed(history)):
+        for i, version in enumerate(history):
             entry = {
                 'version': version.version_number,
                 'change_type': version.change_type,
@@ -419,8 +565,11 @@ class DiffService:
             }
 
             if i > 0:
-                prev = history[-(i)]
-                entry['diff'] = cls._compute_diff(prev.snapshot_data, version.snapshot_data)
+                prev = history[i - 1]
+                entry['diff'] = cls._compute_diff(
+                    states.get(prev.version_number, {}),
+                    states.get(version.version_number, {}),
+                )
 
             timeline.append(entry)
 
@@ -467,7 +616,7 @@ class AuditService:
         limit: int = 1000,
     ) -> List[Dict]:
         """Get audit trail for compliance reporting."""
-        queryset = VersionHistory.objects.all()
+        queryset = VersionHistory.objects.select_related('content_type', 'created_by')
 
         if model_class:
             content_type = ContentType.objects.get_for_model(model_class)
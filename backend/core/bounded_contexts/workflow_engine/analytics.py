@@ -244,32 +244,24 @@ class WorkflowAnalyticsService:
         if end_date:
             filters &= Q(completed_at__lte=end_date)
 
-        # Aggregate by node
+        # Aggregate by node, with the latency recorded for each step
+        completed = Q(status=WorkflowStep.Status.COMPLETED)
         step_data = WorkflowStep.objects.filter(filters).values(
             'node_id', 'node_name', 'node_type'
         ).annotate(
             total=Count('id'),
-            successful=Count('id', filter=Q(status=WorkflowStep.Status.COMPLETED)),
+            successful=Count('id', filter=completed),
             failed=Count('id', filter=Q(status=WorkflowStep.Status.FAILED)),
+            avg_duration_ms=Avg('duration_ms', filter=completed),
+            max_duration_ms=Max('duration_ms', filter=completed),
         )
 
         performances = []
         avg_durations = []
 
         for data in step_data:
-            steps = WorkflowStep.objects.filter(
-                filters,
-                node_id=data['node_id'],
-                status=WorkflowStep.Status.COMPLETED,
-            ).exclude(started_at__isnull=True).exclude(completed_at__isnull=True)
-
-            durations = [
-                (s.completed_at - s.started_at).total_seconds()
-                for s in steps
-            ]
-
-            avg_duration = sum(durations) / len(durations) if durations else 0
-            max_duration = max(durations) if durations else 0
+            avg_duration = (data['avg_duration_ms'] or 0) / 1000
+            max_duration = (data['max_duration_ms'] or 0) / 1000
             failure_rate = (data['failed'] / data['total'] * 100) if data['total'] > 0 else 0
 
             avg_durations.append((data['node_id'], avg_duration))
@@ -189,6 +189,7 @@ class WorkflowViewSet(viewsets.ModelViewSet):
             trigger_type='manual',
             trigger_data=trigger_data,
             executed_by=request.user,
+            run_async=bool(request.data.get('async', False)),
         )
 
         return Response({
@@ -314,6 +315,7 @@ class WorkflowExecutionViewSet(viewsets.ReadOnlyModelViewSet):
                     'status': s.status,
                     'started_at': s.started_at.isoformat() if s.started_at else None,
                     'completed_at': s.completed_at.isoformat() if s.completed_at else None,
+                    'duration_ms': s.duration_ms,
                     'input_data': s.input_data,
                     'output_data': s.output_data,
                     'error': s.error,
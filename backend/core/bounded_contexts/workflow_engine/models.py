@@ -252,6 +252,8 @@ class WorkflowExecution(models.Model):
     # Timing
     started_at = models.DateTimeField(null=True, blank=True)
     completed_at = models.DateTimeField(null=True, blank=True)
+    # Last sign of progress of a running execution (see resume_stalled_workflow_executions)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
 
     # Context and variables during execution
     context = models.JSONField(default=dict)
@@ -274,6 +276,9 @@ class WorkflowExecution(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'heartbeat_at']),
+        ]
 
     def __str__(self):
         return f"{self.workflow.name} - Execution #{self.execution_number}"
@@ -282,6 +287,7 @@ class WorkflowExecution(models.Model):
         """Start the execution."""
         self.status = self.Status.RUNNING
         self.started_at = timezone.now()
+        self.heartbeat_at = self.started_at
         self.save()
 
     def complete(self, output=None):
@@ -361,10 +367,14 @@ class WorkflowStep(models.Model):
     # Timing
     started_at = models.DateTimeField(null=True, blank=True)
     completed_at = models.DateTimeField(null=True, blank=True)
+    # Time spent in the node handler
+    duration_ms = models.FloatField(null=True, blank=True)
 
     # Input/Output
     input_data = models.JSONField(default=dict)
     output_data = models.JSONField(default=dict)
+    # Nodes activated by this step, to resume the execution
+    next_node_ids = models.JSONField(default=list)
 
     # Error info
     error = models.TextField(blank=True)
@@ -455,6 +465,13 @@ class WorkflowSchedule(models.Model):
 
     class Meta:
         ordering = ['next_run_at']
+        indexes = [
+            # Due schedules, see WorkflowScheduler.process_schedules
+            models.Index(
+                fields=['is_active', 'next_run_at'],
+                name='core_workflowschedule_due_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.workflow.name}"
@@ -7,10 +7,15 @@ Business logic for workflow management and execution.
 import logging
 import json
 import re
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 from datetime import datetime, timedelta
+from django.conf import settings
 from django.utils import timezone
-from django.db import transaction
+from django.db import connections, transaction
 
 from .models import (
     Workflow,
@@ -238,12 +243,45 @@ class WorkflowService:
         )
 
 
+# Node types whose handlers wait on the network or sleep. They run in worker
+# threads, so that the independent branches of a workflow wait concurrently.
+CONCURRENT_NODE_TYPES = {
+    'action_notify',
+    'action_email',
+    'action_http',
+    'logic_delay',
+    'integration_connector',
+    'integration_api',
+}
+
+
+class WorkflowCancelled(Exception):
+    """The execution was cancelled while it was running."""
+
+
+@dataclass
+class NodeOutcome:
+    """Result of a node handler, with its timing."""
+    result: Optional[Dict]
+    error: Optional[Exception]
+    started_at: datetime
+    completed_at: datetime
+    duration_ms: float
+
+
 class WorkflowExecutionEngine:
     """
     Engine for executing workflows.
+
+    Workflows run as DAGs: a node runs once all the branches leading to it
+    are resolved, and independent branches run concurrently, handlers of
+    CONCURRENT_NODE_TYPES in a pool of `max_workers` threads. Each node is
+    persisted as a WorkflowStep when it starts and when it ends, so that an
+    interrupted execution resumes from its completed nodes (see run).
     """
 
-    def __init__(self):
+    def __init__(self, max_workers: int = None):
+        self.max_workers = max_workers or getattr(settings, 'WORKFLOW_MAX_PARALLEL_NODES', 4)
         self.node_handlers = {
             # Triggers
             'trigger_manual': self._handle_trigger,
@@ -284,8 +322,12 @@ class WorkflowExecutionEngine:
         trigger_type: str = 'manual',
         trigger_data: Dict = None,
         executed_by=None,
+        run_async: bool = False,
     ) -> WorkflowExecution:
-        """Execute a workflow."""
+        """
+        Execute a workflow. With `run_async`, the execution is left pending
+        and run by a Huey worker once the current transaction commits.
+        """
         # Create execution record
         execution = WorkflowExecution.objects.create(
             workflow=workflow,
@@ -296,10 +338,28 @@ class WorkflowExecutionEngine:
             variables={v['name']: v.get('defaultValue') for v in workflow.variables},
         )
 
+        if run_async:
+            from .tasks import run_workflow_execution
+
+            transaction.on_commit(lambda: run_workflow_execution(execution.id))
+            return execution
+
+        return self.run(execution)
+
+    def run(self, execution: WorkflowExecution) -> WorkflowExecution:
+        """
+        Run a pending execution, or resume a running one whose run was
+        interrupted: its completed steps are kept, the nodes that were
+        running are run again.
+        """
         try:
-            execution.start()
+            if execution.status == WorkflowExecution.Status.PENDING:
+                execution.start()
             self._run_workflow(execution)
             execution.complete()
+        except WorkflowCancelled:
+            logger.info(f"Workflow execution {execution.id} was cancelled")
+            execution.refresh_from_db(fields=['status', 'completed_at'])
         except Exception as e:
             logger.error(f"Workflow execution failed: {e}")
             execution.fail(str(e))
@@ -307,104 +367,231 @@ class WorkflowExecutionEngine:
         return execution
 
     def _run_workflow(self, execution: WorkflowExecution):
-        """Run the workflow execution."""
+        """
+        Run the workflow execution.
+
+        A node runs once all its incoming connections are resolved, if at
+        least one of them was followed: the branches leaving a node join on
+        the nodes where they meet. A node none of whose incoming connections
+        was followed is skipped, and so are the nodes only it leads to.
+        """
         workflow = execution.workflow
         nodes = {n.node_id: n for n in workflow.nodes.all()}
-        connections = list(workflow.connections.all())
 
         # Find trigger nodes
         trigger_nodes = [n for n in nodes.values() if n.node_type.startswith('trigger_')]
         if not trigger_nodes:
             raise ValueError("No trigger nodes found")
 
-        # Build adjacency list
-        adjacency = {}
-        for conn in connections:
-            if conn.source_node_id not in adjacency:
-                adjacency[conn.source_node_id] = []
+        # Build adjacency list and count the incoming connections of nodes
+        adjacency = defaultdict(list)
+        pending = dict.fromkeys(nodes, 0)
+        for conn in workflow.connections.all():
+            target = nodes.get(conn.target_node_id)
+            if conn.source_node_id not in nodes or target is None:
+                continue
+            if target.node_type.startswith('trigger_'):
+                continue
             adjacency[conn.source_node_id].append({
                 'target': conn.target_node_id,
                 'port': conn.target_port,
                 'source_port': conn.source_port,
                 'condition': conn.condition,
             })
+            pending[conn.target_node_id] += 1
+        self._check_acyclic(adjacency, pending)
 
-        # Execute from trigger
-        sequence = 0
         context = {
             'trigger_data': execution.trigger_data,
             'variables': execution.variables,
         }
+        followed = set()
+        resolved = set()
+        ready = deque(trigger.node_id for trigger in trigger_nodes)
+
+        def resolve(node_id, next_node_ids):
+            resolved.add(node_id)
+            for next_info in adjacency.get(node_id, []):
+                target = next_info['target']
+                if target in next_node_ids:
+                    followed.add(target)
+                pending[target] -= 1
+                if pending[target] == 0:
+                    if target in followed:
+                        ready.append(target)
+                    else:
+                        resolve(target, ())
+
+        # Resume from the persisted steps
+        steps = list(execution.steps.all())
+        sequence = max((step.sequence for step in steps), default=-1) + 1
+        interrupted = [step.id for step in steps if step.status != WorkflowStep.Status.COMPLETED]
+        if interrupted:
+            WorkflowStep.objects.filter(id__in=interrupted).delete()
+        completed = [step for step in steps if step.status == WorkflowStep.Status.COMPLETED]
+        for step in completed:
+            if step.output_data:
+                context[step.node_id] = step.output_data
+        for step in completed:
+            resolve(step.node_id, set(step.next_node_ids))
+
+        running = {}
+        error = None
+        cancelled = False
+        with ThreadPoolExecutor(self.max_workers, thread_name_prefix='workflow') as pool:
+            while ready or running:
+                while ready and error is None and not cancelled:
+                    node = nodes[ready.popleft()]
+                    if node.node_id in resolved:
+                        continue
+                    # Handlers get the outputs of the nodes completed so far
+                    node_context = dict(context)
+                    step = WorkflowStep.objects.create(
+                        execution=execution,
+                        node_id=node.node_id,
+                        node_type=node.node_type,
+                        node_name=node.name,
+                        sequence=sequence,
+                        status=WorkflowStep.Status.RUNNING,
+                        started_at=timezone.now(),
+                        input_data=node_context,
+                    )
+                    sequence += 1
+                    resolved.add(node.node_id)
+                    if node.node_type in CONCURRENT_NODE_TYPES and self.max_workers > 1:
+                        future = pool.submit(self._run_node, node, node_context, execution, True)
+                    else:
+                        future = Future()
+                        future.set_result(self._run_node(node, node_context, execution))
+                    running[future] = (node, step)
+
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node, step = running.pop(future)
+                    outcome = future.result()
+                    if outcome.error is not None:
+                        self._save_step(step, outcome, WorkflowStep.Status.FAILED)
+                        error = error or outcome.error
+                        continue
 
-        for trigger in trigger_nodes:
-            sequence = self._execute_node(
-                execution, trigger, context, adjacency, nodes, sequence
-            )
+                    # Update context
+                    output = outcome.result.get('output', {})
+                    if output:
+                        context[node.node_id] = output
+                    next_node_ids = self._get_next_node_ids(node, outcome.result, adjacency, context)
+                    self._save_step(step, outcome, WorkflowStep.Status.COMPLETED, next_node_ids)
+                    resolved.discard(node.node_id)
+                    resolve(node.node_id, next_node_ids)
+
+                if not cancelled and not self._heartbeat(execution):
+                    cancelled = True
+
+        if error is not None:
+            raise error
+        if cancelled:
+            raise WorkflowCancelled()
 
         execution.context = context
         execution.save()
 
-    def _execute_node(
+    def _run_node(
         self,
-        execution: WorkflowExecution,
         node: WorkflowNode,
         context: Dict,
-        adjacency: Dict,
-        all_nodes: Dict,
-        sequence: int,
-    ) -> int:
-        """Execute a single node and its successors."""
-        # Create step record
-        step = WorkflowStep.objects.create(
-            execution=execution,
-            node_id=node.node_id,
-            node_type=node.node_type,
-            node_name=node.name,
-            sequence=sequence,
-            input_data=context,
-        )
-
+        execution: WorkflowExecution,
+        in_worker: bool = False,
+    ) -> NodeOutcome:
+        """Run the handler of a node, catching its error."""
+        started_at = timezone.now()
+        started = time.perf_counter()
+        result = None
+        error = None
         try:
-            step.start()
-
-            # Get handler
             handler = self.node_handlers.get(node.node_type)
             if not handler:
                 raise ValueError(f"Unknown node type: {node.node_type}")
-
-            # Execute handler
             result = handler(node, context, execution)
-            step.complete(result.get('output', {}))
-
-            # Update context
-            if result.get('output'):
-                context[node.node_id] = result['output']
-
-            # Get next nodes
-            next_nodes = adjacency.get(node.node_id, [])
-            next_port = result.get('next_port', 'out')
+        except Exception as e:
+            error = e
+        finally:
+            if in_worker:
+                # Connections opened by the handler belong to the worker thread
+                connections.close_all()
+        return NodeOutcome(
+            result=result,
+            error=error,
+            started_at=started_at,
+            completed_at=timezone.now(),
+            duration_ms=(time.perf_counter() - started) * 1000,
+        )
 
-            for next_info in next_nodes:
-                # Check if this connection matches the output port
-                if next_info['source_port'] != next_port:
+    def _get_next_node_ids(
+        self,
+        node: WorkflowNode,
+        result: Dict,
+        adjacency: Dict,
+        context: Dict,
+    ) -> List[str]:
+        """Targets of the outgoing connections of a node that are followed."""
+        next_port = result.get('next_port', 'out')
+        fan_out = result.get('fan_out', False)
+
+        next_node_ids = []
+        for next_info in adjacency.get(node.node_id, []):
+            # Check if this connection matches the output port
+            if not fan_out and next_info['source_port'] != next_port:
+                continue
+
+            # Check condition if present
+            if next_info['condition']:
+                if not self._evaluate_condition(next_info['condition'], context):
                     continue
 
-                # Check condition if present
-                if next_info['condition']:
-                    if not self._evaluate_condition(next_info['condition'], context):
-                        continue
-
-                next_node = all_nodes.get(next_info['target'])
-                if next_node:
-                    sequence = self._execute_node(
-                        execution, next_node, context, adjacency, all_nodes, sequence + 1
-                    )
+            next_node_ids.append(next_info['target'])
+        return next_node_ids
 
-        except Exception as e:
-            step.fail(str(e))
-            raise
-
-        return sequence
+    def _save_step(
+        self,
+        step: WorkflowStep,
+        outcome: NodeOutcome,
+        status: str,
+        next_node_ids: List[str] = None,
+    ):
+        """Persist the end of a step, timed from its handler."""
+        step.status = status
+        step.started_at = outcome.started_at
+        step.completed_at = outcome.completed_at
+        step.duration_ms = outcome.duration_ms
+        if outcome.error is not None:
+            step.error = str(outcome.error)
+        elif outcome.result.get('output'):
+            step.output_data = outcome.result['output']
+        step.next_node_ids = next_node_ids or []
+        step.save()
+
+    def _heartbeat(self, execution: WorkflowExecution) -> bool:
+        """Record the progress of the execution, False if it was cancelled meanwhile."""
+        return WorkflowExecution.objects.filter(
+            pk=execution.pk,
+            status=WorkflowExecution.Status.RUNNING,
+        ).update(heartbeat_at=timezone.now()) > 0
+
+    def _check_acyclic(self, adjacency: Dict, pending: Dict):
+        """Raise a ValueError if the connections form a cycle."""
+        remaining = dict(pending)
+        queue = [node_id for node_id, count in remaining.items() if count == 0]
+        visited = 0
+        while queue:
+            node_id = queue.pop()
+            visited += 1
+            for next_info in adjacency.get(node_id, []):
+                remaining[next_info['target']] -= 1
+                if remaining[next_info['target']] == 0:
+                    queue.append(next_info['target'])
+        if visited < len(remaining):
+            raise ValueError("Workflow connections form a cycle")
 
     def _evaluate_condition(self, condition: str, context: Dict) -> bool:
         """Evaluate a condition expression."""
@@ -596,8 +783,11 @@ class WorkflowExecutionEngine:
         return {'output': {'delayed': True, 'duration': duration, 'unit': unit}}
 
     def _handle_logic_parallel(self, node: WorkflowNode, context: Dict, execution: WorkflowExecution) -> Dict:
-        """Handle parallel logic (placeholder)."""
-        return {'output': {'parallel': True}}
+        """
+        Handle parallel logic: all outgoing connections are followed, whatever
+        their port, and the branches run concurrently until they join.
+        """
+        return {'output': {'parallel': True}, 'fan_out': True}
 
     def _handle_data_query(self, node: WorkflowNode, context: Dict, execution: WorkflowExecution) -> Dict:
         """Handle data query."""
@@ -670,56 +860,91 @@ class WorkflowScheduler:
     def __init__(self):
         self.engine = WorkflowExecutionEngine()
 
-    def process_schedules(self):
-        """Process due workflow schedules."""
-        now = timezone.now()
+    def process_schedules(self, batch_size: int = 100) -> int:
+        """
+        Process due workflow schedules, returns the number of executions queued.
 
-        # Find due schedules
-        due_schedules = WorkflowSchedule.objects.filter(
-            is_active=True,
-            next_run_at__lte=now,
-            workflow__status=Workflow.Status.ACTIVE,
-        )
+        Due schedules are claimed in batches with SELECT ... FOR UPDATE SKIP
+        LOCKED, so that several workers can process them concurrently. Their
+        executions are run by Huey workers once the batch is committed.
+        """
+        now = timezone.now()
+        queued = 0
+        failed = set()
+
+        while True:
+            with transaction.atomic():
+                batch = list(
+                    WorkflowSchedule.objects.select_for_update(skip_locked=True, of=('self',))
+                    .select_related('workflow')
+                    .filter(
+                        is_active=True,
+                        next_run_at__lte=now,
+                        workflow__status=Workflow.Status.ACTIVE,
+                    )
+                    .exclude(id__in=failed)
+                    .order_by('next_run_at')[:batch_size]
+                )
+                if not batch:
+                    return queued
+
+                claimed = []
+                for schedule in batch:
+                    try:
+                        if self._execute_schedule(schedule, now):
+                            queued += 1
+                        claimed.append(schedule)
+                    except Exception as e:
+                        # Left due, it is retried by the next run
+                        failed.add(schedule.id)
+                        logger.error(f"Failed to execute schedule {schedule.id}: {e}")
+
+                WorkflowSchedule.objects.bulk_update(
+                    claimed,
+                    ['is_active', 'run_count', 'last_run_at', 'next_run_at', 'updated_at'],
+                )
 
-        for schedule in due_schedules:
-            try:
-                self._execute_schedule(schedule)
-            except Exception as e:
-                logger.error(f"Failed to execute schedule {schedule.id}: {e}")
+    def _execute_schedule(self, schedule: WorkflowSchedule, now: datetime) -> bool:
+        """
+        Queue the execution of a scheduled workflow and advance the schedule,
+        which the caller saves. Returns False if the schedule ran out of runs.
+        """
+        schedule.updated_at = now
 
-    def _execute_schedule(self, schedule: WorkflowSchedule):
-        """Execute a scheduled workflow."""
         # Check max runs
         if schedule.max_runs and schedule.run_count >= schedule.max_runs:
             schedule.is_active = False
-            schedule.save()
-            return
+            return False
 
         # Execute workflow
-        self.engine.execute(
-            workflow=schedule.workflow,
-            trigger_type='schedule',
-            trigger_data={'schedule_id': str(schedule.id)},
-        )
+        with transaction.atomic():
+            self.engine.execute(
+                workflow=schedule.workflow,
+                trigger_type='schedule',
+                trigger_data={'schedule_id': str(schedule.id)},
+                run_async=True,
+            )
 
         # Update schedule
         schedule.run_count += 1
-        schedule.last_run_at = timezone.now()
-        schedule.next_run_at = self._calculate_next_run(schedule)
-        schedule.save()
+        schedule.last_run_at = now
+        schedule.next_run_at = self._calculate_next_run(schedule, now)
+        return True
 
-    def _calculate_next_run(self, schedule: WorkflowSchedule) -> Optional[datetime]:
+    def _calculate_next_run(self, schedule: WorkflowSchedule, now: datetime = None) -> Optional[datetime]:
         """Calculate next run time for a schedule."""
+        now = now or timezone.now()
+
         if schedule.schedule_type == 'once':
             return None
 
         if schedule.schedule_type == 'interval':
-            return timezone.now() + timedelta(minutes=schedule.interval_minutes or 60)
+            return now + timedelta(minutes=schedule.interval_minutes or 60)
 
         if schedule.schedule_type == 'cron':
             # In production, use croniter library
             # For now, default to next hour
-            return timezone.now() + timedelta(hours=1)
+            return now + timedelta(hours=1)
 
         return None
 
@@ -0,0 +1,80 @@
+"""
+Workflow Engine Background Tasks
+
+- Running workflow executions in Huey workers
+- Resuming the executions interrupted by a worker restart
+- Queuing the executions of due schedules
+"""
+
+from datetime import timedelta
+from huey import crontab
+from huey.contrib.djhuey import db_periodic_task, db_task
+from django.utils import timezone
+
+import structlog
+
+logger = structlog.getLogger(__name__)
+
+# A running execution whose heartbeat is older than this is considered
+# interrupted. Node handlers are capped at 30 seconds (HTTP timeout, delay).
+STALLED_EXECUTION_DELAY = timedelta(minutes=15)
+
+
+@db_task()
+def run_workflow_execution(execution_id):
+    """Run a pending workflow execution, or resume a running one."""
+    from .models import WorkflowExecution
+    from .services import WorkflowExecutionEngine
+
+    execution = (
+        WorkflowExecution.objects.select_related("workflow")
+        .filter(
+            id=execution_id,
+            status__in=[
+                WorkflowExecution.Status.PENDING,
+                WorkflowExecution.Status.RUNNING,
+            ],
+        )
+        .first()
+    )
+    if execution is None:
+        return
+
+    WorkflowExecutionEngine().run(execution)
+    logger.info(
+        "Workflow execution finished",
+        execution=str(execution.id),
+        status=execution.status,
+    )
+
+
+# @db_periodic_task(crontab(minute="*/1"))  # for testing
+@db_periodic_task(crontab(minute="*/10"))
+def resume_stalled_workflow_executions():
+    """Resume the running executions that stopped making progress."""
+    from .models import WorkflowExecution
+
+    now = timezone.now()
+    stalled = WorkflowExecution.objects.filter(
+        status=WorkflowExecution.Status.RUNNING,
+        heartbeat_at__lt=now - STALLED_EXECUTION_DELAY,
+    )
+    execution_ids = list(stalled.values_list("id", flat=True))
+    # Claim them, so that the next run does not resume them again
+    WorkflowExecution.objects.filter(id__in=execution_ids).update(heartbeat_at=now)
+
+    for execution_id in execution_ids:
+        logger.warning(
+            "Resuming stalled workflow execution", execution=str(execution_id)
+        )
+        run_workflow_execution(execution_id)
+
+
+@db_periodic_task(crontab(minute="*/1"))
+def process_workflow_schedules():
+    """Queue the executions of the due workflow schedules."""
+    from .services import WorkflowScheduler
+
+    queued = WorkflowScheduler().process_schedules()
+    if queued:
+        logger.info("Queued scheduled workflow executions", count=queued)
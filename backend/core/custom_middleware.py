@@ -1,7 +1,16 @@
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
 from auditlog import middleware
+from auditlog.context import auditlog_value
+from auditlog.models import LogEntry, LogEntryManager
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.db import router, transaction
 from django.utils.functional import SimpleLazyObject
-from auditlog.models import LogEntry
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
 
 import structlog
@@ -18,9 +27,29 @@ class AuditlogMiddleware(middleware.AuditlogMiddleware):
             lambda: middleware.AuditlogMiddleware._get_actor(request)
         )
 
+    def __call__(self, request):
+        if not getattr(settings, "AUDITLOG_BUFFERED", False):
+            return super().__call__(request)
+        with buffered_audit_log():
+            return super().__call__(request)
+
+
+def get_log_entry_user_info(instance, obj) -> dict:
+    """additional_data of a log entry: its actor and the folder path of `obj`."""
+    return {
+        "user_uuid": str(instance.actor_id),
+        "user_email": instance.actor.email,
+        "folder": (
+            "/".join([f.name for f in obj.get_folder_full_path()])
+            if obj and hasattr(obj, "get_folder_full_path")
+            else None
+        ),
+    }
+
 
 # Add a post-save signal to add the additional info after the log entry is saved
 # Think about the potential perf overhead of this
+# (buffered log entries are enriched in bulk instead, see AuditLogBuffer)
 @receiver(post_save, sender=LogEntry)
 def add_user_info_to_log_entry(sender, instance, created, **kwargs):
     if not created or not instance.actor_id:
@@ -37,22 +66,157 @@ def add_user_info_to_log_entry(sender, instance, created, **kwargs):
 
     # Only update if this is a new log entry and it has an actor
     try:
-        user_uuid = str(instance.actor_id)
-        user_email = instance.actor.email
-        folder = (
-            "/".join([f.name for f in obj.get_folder_full_path()])
-            if obj and hasattr(obj, "get_folder_full_path")
-            else None
-        )
-
         LogEntry.objects.filter(pk=instance.pk).update(
-            additional_data={
-                "user_uuid": user_uuid,
-                "user_email": user_email,
-                "folder": folder,
-            }
+            additional_data=get_log_entry_user_info(instance, obj)
         )
     except Exception:
         # Fail silently if there's any issue
         logger.debug("audit log enrichment with actor failed.")
         pass
+
+
+class AuditLogBuffer:
+    """
+    Collects the log entries created by auditlog instead of saving them one by
+    one (an INSERT, then an UPDATE by add_user_info_to_log_entry).
+
+    An entry is kept once the transaction that created it commits, and dropped
+    if it rolls back, as a saved entry would be. Kept entries are enriched in
+    memory and inserted with a single bulk_create when the buffer is flushed,
+    in the order in which they were created. Their timestamp and actor are
+    those of their creation, ids are assigned when they are flushed.
+    """
+
+    def __init__(self, max_size: int = None):
+        self.max_size = max_size or getattr(settings, "AUDITLOG_BUFFER_SIZE", 1000)
+        self.entries = []
+        # Entries committed after the end of the block are written at once
+        self.closed = False
+
+    def add(self, entry: LogEntry) -> LogEntry:
+        self._set_context_data(entry)
+        using = router.db_for_write(LogEntry, instance=entry)
+        transaction.on_commit(lambda: self._keep(entry), using=using)
+        return entry
+
+    @staticmethod
+    def _set_context_data(entry: LogEntry) -> None:
+        """
+        The actor, remote address and extra data of the current set_actor or
+        set_extra_data block, which auditlog sets on the entry when it is saved.
+        """
+        try:
+            context_data = auditlog_value.get()
+        except LookupError:
+            return
+        # auditlog leaves the value of a block set once it has exited, but
+        # disconnects the LogEntry pre_save receiver that the block connected.
+        if not pre_save.has_listeners(LogEntry):
+            return
+        for key, value in context_data.items():
+            if key == "signal_duid":
+                continue
+            if key == "actor":
+                if isinstance(value, get_user_model()) and entry.actor is None:
+                    entry.actor = value
+                    entry.actor_email = getattr(value, "email", None)
+            elif hasattr(LogEntry, key):
+                setattr(entry, key, value() if callable(value) else value)
+
+    def _keep(self, entry: LogEntry) -> None:
+        self.entries.append(entry)
+        if self.closed or len(self.entries) >= self.max_size:
+            self.flush()
+
+    def flush(self) -> list:
+        entries, self.entries = self.entries, []
+        if not entries:
+            return []
+        self._enrich(entries)
+        return LogEntry.objects.bulk_create(entries)
+
+    @staticmethod
+    def _enrich(entries: list) -> None:
+        """What add_user_info_to_log_entry does, with one query per model."""
+        entries = [entry for entry in entries if entry.actor_id]
+        object_pks = defaultdict(set)
+        for entry in entries:
+            entry.object_pk = str(entry.object_pk)
+            object_pks[entry.content_type_id].add(entry.object_pk)
+
+        objects = {}
+        for content_type_id, pks in object_pks.items():
+            model_class = ContentType.objects.get_for_id(content_type_id).model_class()
+            if model_class is None:
+                continue
+            try:
+                for obj in model_class.objects.filter(pk__in=pks):
+                    objects[content_type_id, str(obj.pk)] = obj
+            except Exception:
+                logger.debug("audit log enrichment failed: objects not found.")
+
+        for entry in entries:
+            try:
+                entry.additional_data = get_log_entry_user_info(
+                    entry, objects.get((entry.content_type_id, entry.object_pk))
+                )
+            except Exception:
+                logger.debug("audit log enrichment with actor failed.")
+
+
+_audit_log_buffer: ContextVar[AuditLogBuffer | None] = ContextVar(
+    "audit_log_buffer", default=None
+)
+
+
+@contextmanager
+def buffered_audit_log(max_size: int = None):
+    """
+    Buffer the log entries created inside the block (see AuditLogBuffer) and
+    flush them when leaving it. Nested blocks share the outermost buffer.
+    Entries are only buffered once install_audit_log_buffer has been called.
+    """
+    buffer = _audit_log_buffer.get()
+    if buffer is not None:
+        yield buffer
+        return
+    buffer = AuditLogBuffer(max_size)
+    token = _audit_log_buffer.set(buffer)
+    try:
+        yield buffer
+    finally:
+        _audit_log_buffer.reset(token)
+        buffer.closed = True
+        pending = len(buffer.entries)
+        try:
+            buffer.flush()
+        except Exception:
+            logger.exception(
+                "failed to write buffered audit log entries", entries=pending
+            )
+
+
+class BufferedLogEntryManager(LogEntryManager):
+    """Adds the log entries created in buffered_audit_log blocks to their buffer."""
+
+    def create(self, **kwargs):
+        # log_create and log_m2m_changes end with self.create(...)
+        buffer = _audit_log_buffer.get()
+        if buffer is None:
+            return super().create(**kwargs)
+        return buffer.add(self.model(**kwargs))
+
+
+def install_audit_log_buffer() -> None:
+    """
+    Make BufferedLogEntryManager the manager of LogEntry, which auditlog uses
+    to create the entries. Called when the core app is ready if AUDITLOG_BUFFERED
+    is set.
+    """
+    if isinstance(LogEntry.objects, BufferedLogEntryManager):
+        return
+    options = LogEntry._meta
+    options.local_managers = [
+        manager for manager in options.local_managers if manager.name != "objects"
+    ]
+    LogEntry.add_to_class("objects", BufferedLogEntryManager())
@@ -46,7 +46,8 @@ class AggregateRoot(models.Model):
         Events are collected and published when the aggregate is saved.
         """
         event.aggregate_id = self.id
-        event.aggregate_version = self.version
+        if isinstance(self.version, int):
+            event.aggregate_version = self.version
         self._domain_events.append(event)
     
     def _apply_event(self, event: DomainEvent):
@@ -69,7 +70,8 @@ class AggregateRoot(models.Model):
     def save(self, *args, **kwargs):
         """Override save to publish domain events"""
         # Increment version for optimistic locking
-        if self.pk:
+        # (skipped when a subclass redefines `version` as domain data)
+        if self.pk and isinstance(self.version, int):
             self.version += 1
         
         # Save the aggregate
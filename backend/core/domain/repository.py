@@ -91,7 +91,7 @@ class BaseRepository(Repository[T]):
 
         # Store old values for audit logging (for updates)
         old_values = None
-        if not is_new:
+        if not is_new and user_id and username:
             try:
                 # Get the existing instance from database
                 existing = self.model_class.objects.get(id=aggregate.id)
@@ -0,0 +1,106 @@
+import time
+from uuid import uuid4
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from core.bounded_contexts.security_graph.aggregates.security_edge import (
+    EdgeType,
+    SecurityEdge,
+)
+from core.bounded_contexts.security_graph.aggregates.security_node import (
+    NodeType,
+    SecurityNode,
+)
+from core.bounded_contexts.security_graph.services.graph_builder import SecurityGraph
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks security graph centrality computations on synthetic graphs "
+        "(no database access)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            nargs="+",
+            type=int,
+            default=[1_000, 10_000, 100_000],
+            help="Node counts to benchmark",
+        )
+        parser.add_argument(
+            "--avg-degree",
+            type=float,
+            default=3.0,
+            help="Average number of outgoing edges per node",
+        )
+        parser.add_argument(
+            "--pivots",
+            type=int,
+            default=256,
+            help="Sampled sources for approximate betweenness on graphs larger than --exact-limit",
+        )
+        parser.add_argument(
+            "--exact-limit",
+            type=int,
+            default=2_000,
+            help="Largest graph on which exact betweenness is computed",
+        )
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(options["seed"])
+        self.stdout.write(
+            "nodes\tedges\tbuild_s\tindex_s\tpagerank_s\tbetweenness_s\tpivots"
+        )
+
+        for size in options["sizes"]:
+            started = time.perf_counter()
+            graph = self._synthetic_graph(size, options["avg_degree"], rng)
+            build_time = time.perf_counter() - started
+
+            started = time.perf_counter()
+            index = graph.to_index()
+            index_time = time.perf_counter() - started
+
+            started = time.perf_counter()
+            graph.compute_pagerank()
+            pagerank_time = time.perf_counter() - started
+
+            pivots = size if size <= options["exact_limit"] else options["pivots"]
+            started = time.perf_counter()
+            graph.compute_betweenness_centrality(pivots=pivots, seed=options["seed"])
+            betweenness_time = time.perf_counter() - started
+
+            self.stdout.write(
+                f"{size}\t{index.edge_count}\t{build_time:.3f}\t{index_time:.3f}\t"
+                f"{pagerank_time:.3f}\t{betweenness_time:.3f}\t{'exact' if pivots >= size else pivots}"
+            )
+
+    def _synthetic_graph(self, size, avg_degree, rng):
+        """Random directed graph mixing asset, control and threat nodes."""
+        node_types = [NodeType.ASSET, NodeType.CONTROL, NodeType.THREAT]
+        graph = SecurityGraph()
+        node_ids = []
+        for i in range(size):
+            node = SecurityNode(
+                id=uuid4(), name=f"Node {i}", node_type=node_types[i % 3]
+            )
+            graph.add_node(node)
+            node_ids.append(node.id)
+
+        edge_count = int(size * avg_degree)
+        sources = rng.integers(0, size, edge_count)
+        targets = rng.integers(0, size, edge_count)
+        for source, target in zip(sources, targets):
+            if source != target:
+                graph.add_edge(
+                    SecurityEdge(
+                        id=uuid4(),
+                        source_id=node_ids[source],
+                        target_id=node_ids[target],
+                        edge_type=EdgeType.DEPENDS_ON,
+                    )
+                )
+        return graph
@@ -0,0 +1,113 @@
+import random
+import time
+from uuid import uuid4
+
+from django.core.management.base import BaseCommand
+
+from core.bounded_contexts.rmf_operations.services.vulnerability_correlation import (
+    VulnerabilityCorrelationService,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks CKL/Nessus vulnerability correlation on synthetic findings "
+        "(no database access)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rules",
+            type=int,
+            default=3_000,
+            help="Number of checklist findings",
+        )
+        parser.add_argument(
+            "--items",
+            nargs="+",
+            type=int,
+            default=[1_000, 10_000, 80_000],
+            help="Nessus finding counts to benchmark",
+        )
+        parser.add_argument(
+            "--plugins",
+            type=int,
+            default=10_000,
+            help="Number of distinct plugins reported across the hosts of a scan",
+        )
+        parser.add_argument(
+            "--vocabulary",
+            type=int,
+            default=5_000,
+            help="Number of distinct words in finding names",
+        )
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        words = [f"term{i}" for i in range(options["vocabulary"])]
+        # Zipf-like word frequencies, as in real plugin and rule titles
+        weights = [1 / (rank + 1) for rank in range(len(words))]
+        service = VulnerabilityCorrelationService()
+
+        checklist_findings = [
+            self._ckl_finding(i, rng, words, weights) for i in range(options["rules"])
+        ]
+        self.stdout.write(
+            "rules\titems\tindex_s\tcorrelate_s\tcandidates_avg\tcorrelations"
+        )
+
+        plugins = [
+            self._nessus_finding(i, rng, words, weights)
+            for i in range(options["plugins"])
+        ]
+        for size in options["items"]:
+            # Each item is a plugin reported on a host
+            nessus_findings = [
+                {**rng.choice(plugins), "host_name": f"host{i // 50}"}
+                for i in range(size)
+            ]
+
+            started = time.perf_counter()
+            index = service.build_nessus_index(nessus_findings)
+            index_time = time.perf_counter() - started
+
+            candidates = sum(
+                len(index.candidates(service._ckl_keys(finding)))
+                for finding in checklist_findings
+            )
+
+            started = time.perf_counter()
+            result = service.correlate_findings(checklist_findings, nessus_findings)
+            correlate_time = time.perf_counter() - started
+
+            self.stdout.write(
+                f"{len(checklist_findings)}\t{size}\t{index_time:.3f}\t"
+                f"{correlate_time:.3f}\t{candidates / max(len(checklist_findings), 1):.1f}\t"
+                f"{result['correlations_found']}"
+            )
+
+    def _name(self, rng, words, weights):
+        return " ".join(rng.choices(words, weights, k=rng.randint(4, 10)))
+
+    def _cves(self, rng, count):
+        return [
+            f"CVE-20{rng.randint(10, 25)}-{rng.randint(1000, 99999)}"
+            for _ in range(count)
+        ]
+
+    def _ckl_finding(self, position, rng, words, weights):
+        cves = self._cves(rng, 1) if rng.random() < 0.1 else []
+        return {
+            "id": str(uuid4()),
+            "vuln_id": f"V-{200_000 + position}",
+            "rule_title": self._name(rng, words, weights),
+            "discussion": " ".join(cves),
+        }
+
+    def _nessus_finding(self, position, rng, words, weights):
+        return {
+            "plugin_id": str(rng.randint(10_000, 300_000)),
+            "plugin_name": self._name(rng, words, weights),
+            "cve": self._cves(rng, rng.randint(0, 3)),
+        }
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.auditlog_retention import (
+    PARTITIONS_AHEAD,
+    create_partitions,
+    is_partitioned,
+    partition_table,
+)
+
+
+class Command(BaseCommand):
+    """
+    Converts the auditlog entry table into monthly partitions (PostgreSQL only),
+    so that the retention task drops expired months instead of deleting rows.
+    The table is locked while its rows are copied, run it during maintenance.
+
+    Once the table is partitioned, running the command again creates the
+    partitions of the coming months (prune_auditlog --before-date does it too).
+    """
+
+    help = "Partitions the auditlog entry table by month (PostgreSQL only)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=PARTITIONS_AHEAD,
+            help=f"Number of months partitioned in advance (default: {PARTITIONS_AHEAD})",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            if is_partitioned():
+                created = create_partitions(months_ahead=options["months_ahead"])
+            else:
+                created = partition_table(options["months_ahead"])
+        except NotImplementedError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Audit log partitioned, {len(created)} partitions created"
+            )
+        )
@@ -1,35 +1,47 @@
-from django.core.management.base import BaseCommand
-from auditlog.models import LogEntry
+from datetime import date, datetime, time
 
 from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.auditlog_retention import (
+    get_batch_size,
+    prune_before,
+    prune_to_max_records,
+)
 
 
 class Command(BaseCommand):
-    help = "Prunes auditlog entries to maintain maximum count"
+    help = (
+        "Prunes auditlog entries to maintain maximum count, "
+        "or deletes the entries older than a date"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--before-date",
+            type=date.fromisoformat,
+            help="Delete the entries logged before this date (YYYY-MM-DD) "
+            "instead of keeping the most recent ones",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=get_batch_size(),
+            help="Number of ids deleted per transaction",
+        )
 
     def handle(self, *args, **options):
-        MAX_RECORDS = getattr(settings, "AUDITLOG_MAX_RECORDS", 50000) + 1000
-
-        # Count all records
-        count = LogEntry.objects.count()
-
-        # If we exceed the limit, delete the oldest record(s)
-        if count > MAX_RECORDS:
-            # Get IDs of oldest records to delete
-            ids_to_delete = LogEntry.objects.order_by("timestamp")[
-                : count - MAX_RECORDS
-            ].values_list("id", flat=True)
-
-            # Delete in chunks to avoid memory issues
-            deleted_count = 0
-            chunk_size = 1000
-            total_to_delete = len(ids_to_delete)
-
-            for i in range(0, total_to_delete, chunk_size):
-                chunk = ids_to_delete[i : i + chunk_size]
-                result = LogEntry.objects.filter(id__in=chunk).delete()
-                deleted_count += result[0]
+        if options["before_date"]:
+            before = timezone.make_aware(
+                datetime.combine(options["before_date"], time.min)
+            )
+            deleted_count = prune_before(before, options["batch_size"])
+        else:
+            MAX_RECORDS = getattr(settings, "AUDITLOG_MAX_RECORDS", 50000) + 1000
+            deleted_count = prune_to_max_records(MAX_RECORDS, options["batch_size"])
 
+        if deleted_count:
             self.stdout.write(
                 self.style.SUCCESS(f"Successfully pruned {deleted_count} log entries")
             )
@@ -0,0 +1,35 @@
+from django.db import migrations
+
+# Serves the per-object history of the audit log (LogEntry.objects.get_for_object
+# ordered by timestamp), see core.auditlog_retention
+INDEX_NAME = "auditlog_logentry_object_history_idx"
+
+
+def create_object_history_index(apps, schema_editor):
+    LogEntry = apps.get_model("auditlog", "LogEntry")
+    concurrently = (
+        "CONCURRENTLY " if schema_editor.connection.vendor == "postgresql" else ""
+    )
+    schema_editor.execute(
+        f"CREATE INDEX {concurrently}IF NOT EXISTS {INDEX_NAME} "
+        f"ON {schema_editor.quote_name(LogEntry._meta.db_table)} "
+        '("content_type_id", "object_pk", "timestamp" DESC)'
+    )
+
+
+def drop_object_history_index(apps, schema_editor):
+    schema_editor.execute(f"DROP INDEX IF EXISTS {INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+    # The index is built concurrently on PostgreSQL, outside of a transaction
+    atomic = False
+
+    dependencies = [
+        ("auditlog", "0001_initial"),
+        ("core", "0133_dataasset_estimated_data_subjects_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_object_history_index, drop_object_history_index),
+    ]
@@ -0,0 +1,47 @@
+from django.db import migrations, models
+
+
+def backfill_step_durations(apps, schema_editor):
+    WorkflowStep = apps.get_model("core", "WorkflowStep")
+    steps = WorkflowStep.objects.filter(
+        started_at__isnull=False, completed_at__isnull=False
+    ).only("started_at", "completed_at")
+    batch = []
+    for step in steps.iterator(chunk_size=2000):
+        step.duration_ms = (step.completed_at - step.started_at).total_seconds() * 1000
+        batch.append(step)
+        if len(batch) >= 2000:
+            WorkflowStep.objects.bulk_update(batch, ["duration_ms"])
+            batch = []
+    WorkflowStep.objects.bulk_update(batch, ["duration_ms"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0134_auditlog_object_history_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="workflowexecution",
+            name="heartbeat_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="workflowexecution",
+            index=models.Index(
+                fields=["status", "heartbeat_at"], name="core_workfl_status_7ea0f4_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="workflowstep",
+            name="duration_ms",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="workflowstep",
+            name="next_node_ids",
+            field=models.JSONField(default=list),
+        ),
+        migrations.RunPython(backfill_step_durations, migrations.RunPython.noop),
+    ]
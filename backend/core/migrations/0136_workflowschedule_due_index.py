@@ -0,0 +1,17 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0135_workflow_execution_node_state"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="workflowschedule",
+            index=models.Index(
+                fields=["is_active", "next_run_at"],
+                name="core_workflowschedule_due_idx",
+            ),
+        ),
+    ]
@@ -38,6 +38,7 @@ from library.helpers import (
     update_translations_in_object,
 )
 
+from global_settings.cache import get_global_setting
 from global_settings.models import GlobalSettings
 
 from .base_models import (
@@ -59,6 +60,7 @@ from .validators import (
     JSONSchemaInstanceValidator,
 )
 from . import dora
+from .asset_graph_cache import copy_objectives, get_asset_graph_state
 from collections import defaultdict, deque
 
 logger = get_logger(__name__)
@@ -2645,339 +2647,34 @@ class Asset(
 
     def ancestors_plus_self(self) -> set[Self]:
         """
-        Returns a set containing the asset itself and all its ancestors using a
-        constant number of queries (2).
+        Returns a set containing the asset itself and all its ancestors, using
+        the cached asset graph snapshot and a single asset query.
         """
-        all_links = self.__class__.parent_assets.through.objects.values_list(
-            "from_asset_id", "to_asset_id"
-        )
-        child_to_parents_map = {}
-        for child_id, parent_id in all_links:
-            if child_id not in child_to_parents_map:
-                child_to_parents_map[child_id] = set()
-            child_to_parents_map[child_id].add(parent_id)
-        ancestor_ids = {self.pk}
-        queue = deque([self.pk])  # NOTE: using deque rather than list for O(1) pops
-        while queue:
-            current_id = queue.popleft()
-            parent_ids = child_to_parents_map.get(current_id, set())
-            for parent_id in parent_ids:
-                if parent_id not in ancestor_ids:
-                    ancestor_ids.add(parent_id)
-                    queue.append(parent_id)
-        return set(self.__class__.objects.filter(pk__in=ancestor_ids))
+        ancestor_ids = get_asset_graph_state().ancestors.get(self.pk, frozenset())
+        return set(self.__class__.objects.filter(pk__in=ancestor_ids | {self.pk}))
 
     def get_children(self):
         return self.child_assets.all()
 
     def get_descendants(self) -> set[Self]:
         """
-        Returns a set of all descendant assets using a constant number of
-        queries (2).
+        Returns a set of all descendant assets, using the cached asset graph
+        snapshot and a single asset query.
         """
-        all_links = self.__class__.parent_assets.through.objects.values_list(
-            "from_asset_id", "to_asset_id"
-        )
-        parent_to_children_map = {}
-        for child_id, parent_id in all_links:
-            if parent_id not in parent_to_children_map:
-                parent_to_children_map[parent_id] = set()
-            parent_to_children_map[parent_id].add(child_id)
-        descendant_ids = set()
-        visited_ids = {
-            self.pk
-        }  # NOTE: keeping track of visited ids as a guardrail in the unlikely event of cycles in the assets graph
-        queue = deque([self.pk])  # NOTE: using deque rather than list for O(1) pops
-        while queue:
-            current_id = queue.popleft()
-            child_ids = parent_to_children_map.get(current_id, set())
-            for child_id in child_ids:
-                if child_id not in visited_ids:
-                    visited_ids.add(child_id)
-                    descendant_ids.add(child_id)
-                    queue.append(child_id)
+        descendant_ids = get_asset_graph_state().descendants.get(self.pk, frozenset())
         return set(self.__class__.objects.filter(pk__in=descendant_ids))
 
     @property
     def children_assets(self):
-        descendants = self.get_descendants()
-        descendant_ids = [d.id for d in descendants]
+        descendant_ids = get_asset_graph_state().descendants.get(self.pk, frozenset())
         return Asset.objects.filter(id__in=descendant_ids).exclude(id=self.id)
 
-    @classmethod
-    def _prefetch_graph_data(cls, initial_assets: list) -> dict:
-        """
-        Finds all ancestors and descendants of the initial assets using a constant
-        number of database queries (3), ideal for deep or complex hierarchies.
-
-        This method pre-fetches all parent-child links into memory to build a
-        complete graph, then traverses it without any further database calls to
-        identify the relevant subgraph.
-        """
-        if not initial_assets:
-            return {"child_to_parents": {}, "parent_to_children": {}}
-
-        # First query: fetch all parent-child relationships in the entire table
-        all_links = cls.parent_assets.through.objects.values_list(
-            "from_asset_id", "to_asset_id"
-        )
-
-        # Build in-memory maps of the entire graph
-        child_to_parents_map = {}
-        parent_to_children_map = {}
-        for child_id, parent_id in all_links:
-            child_to_parents_map.setdefault(child_id, set()).add(parent_id)
-            parent_to_children_map.setdefault(parent_id, set()).add(child_id)
-
-        # find all relevant IDs (ancestors and descendants).
-        initial_ids = {asset.id for asset in initial_assets}
-        all_relevant_ids = set(initial_ids)
-
-        # find all ancestors
-        queue = deque(initial_ids)
-        visited_ancestors = set(initial_ids)
-        while queue:
-            current_id = queue.popleft()
-            parent_ids = child_to_parents_map.get(current_id, set())
-            for parent_id in parent_ids:
-                if parent_id not in visited_ancestors:
-                    visited_ancestors.add(parent_id)
-                    all_relevant_ids.add(parent_id)
-                    queue.append(parent_id)
-
-        # find all descendants
-        queue = deque(initial_ids)
-        visited_descendants = set(initial_ids)
-        while queue:
-            current_id = queue.popleft()
-            child_ids = parent_to_children_map.get(current_id, set())
-            for child_id in child_ids:
-                if child_id not in visited_descendants:
-                    visited_descendants.add(child_id)
-                    all_relevant_ids.add(child_id)
-                    queue.append(child_id)
-
-        # Second query: fetch all the actual assets
-        asset_map = {a.id: a for a in cls.objects.filter(id__in=all_relevant_ids)}
-
-        # Third query: fetch only the links connecting the relevant assets
-        # This ensures we only build the subgraph we care about.
-        relevant_links = cls.parent_assets.through.objects.filter(
-            from_asset_id__in=all_relevant_ids, to_asset_id__in=all_relevant_ids
-        ).values_list("from_asset_id", "to_asset_id")
-
-        # Build the final object maps for in-memory traversal by the caller
-        obj_child_to_parents = {}
-        obj_parent_to_children = {}
-        for child_id, parent_id in relevant_links:
-            child_obj = asset_map.get(child_id)
-            parent_obj = asset_map.get(parent_id)
-            if child_obj and parent_obj:
-                obj_child_to_parents.setdefault(child_obj, set()).add(parent_obj)
-                obj_parent_to_children.setdefault(parent_obj, set()).add(child_obj)
-
-        return {
-            "child_to_parents": obj_child_to_parents,
-            "parent_to_children": obj_parent_to_children,
-        }
-
-    @classmethod
-    def _get_all_descendants(cls, start_asset, parent_to_children: dict) -> set:
-        """Performs an in-memory BFS to find all descendants."""
-        descendants = set()
-        queue = deque([start_asset])
-        visited = {start_asset}
-        while queue:
-            current = queue.popleft()
-            for child in parent_to_children.get(current, set()):
-                if child not in visited:
-                    visited.add(child)
-                    descendants.add(child)
-                    queue.append(child)
-        return descendants
-
-    @classmethod
-    def _get_all_ancestors(cls, start_asset, child_to_parents: dict) -> set:
-        """Performs an in-memory BFS to find all ancestors."""
-        ancestors = set()
-        queue = deque([start_asset])
-        visited = {start_asset}
-        while queue:
-            current = queue.popleft()
-            for parent in child_to_parents.get(current, set()):
-                if parent not in visited:
-                    visited.add(parent)
-                    ancestors.add(parent)
-                    queue.append(parent)
-        return ancestors
-
-    @classmethod
-    def _aggregate_security_objectives(cls, primary_ancestors: set) -> dict:
-        """Aggregates security objectives from primary ancestors (highest value wins)."""
-        agg_obj = {}
-        for asset in primary_ancestors:
-            objectives = asset.security_objectives.get("objectives", {})
-            for key, content in objectives.items():
-                if not content.get("is_enabled", False):
-                    continue
-
-                value = content.get("value", 0)
-                if key not in agg_obj or value > agg_obj[key].get("value", 0):
-                    agg_obj[key] = content.copy()
-        return agg_obj
-
-    @classmethod
-    def _aggregate_dro_objectives(cls, primary_ancestors: set) -> dict:
-        """Aggregates DRO objectives from primary ancestors (lowest non-zero value wins)."""
-        agg_obj = {}
-        for asset in primary_ancestors:
-            objectives = asset.disaster_recovery_objectives.get("objectives", {})
-            for key, content in objectives.items():
-                value = content.get("value")
-                # Skip None or 0 values (treat as "not set")
-                if not value:
-                    continue
-
-                current_value = agg_obj.get(key, {}).get("value")
-                if current_value is None or value < current_value:
-                    agg_obj[key] = content.copy()
-        return agg_obj
-
-    @classmethod
-    def _aggregate_security_capabilities(
-        cls, supporting_descendants: set, parent_asset=None
-    ) -> dict:
-        """
-        Aggregates security capabilities from supporting descendants (lowest value wins - worst case).
-        Supporting assets can override capabilities - when overridden, the overriding asset's value is used directly,
-        and its descendants are excluded for that capability only (not globally).
-        """
-        # Build descendant map with constant DB queries using prefetched graph data
-        descendants_map = {}
-        if parent_asset is not None:
-            graph = cls._prefetch_graph_data([parent_asset])
-            parent_to_children = graph["parent_to_children"]
-            for asset in supporting_descendants:
-                descendants_map[asset.id] = cls._get_all_descendants(
-                    asset, parent_to_children
-                )
-        else:
-            # Fallback for when parent_asset is not provided
-            for asset in supporting_descendants:
-                descendants_map[asset.id] = asset.get_descendants()
-
-        # Track which capabilities are overridden by which assets
-        overrides = {}  # {cap_name: [list of assets that override it]}
-        for asset in supporting_descendants:
-            overridden = asset.overridden_children_capabilities.values_list(
-                "name", flat=True
-            )
-            for cap_name in overridden:
-                if cap_name not in overrides:
-                    overrides[cap_name] = []
-                overrides[cap_name].append(asset)
-
-        agg_cap = {}
-        for asset in supporting_descendants:
-            capabilities = asset.security_capabilities.get("objectives", {})
-            for key, content in capabilities.items():
-                if not content.get("is_enabled", False):
-                    continue
-
-                value = content.get("value")
-                if value is None:
-                    continue
-
-                # Check if this asset should be skipped due to an ancestor's override
-                skip = False
-                if key in overrides:
-                    for overriding_asset in overrides[key]:
-                        # Skip if this asset is a descendant of an overriding asset
-                        if asset != overriding_asset and asset in descendants_map.get(
-                            overriding_asset.id, set()
-                        ):
-                            skip = True
-                            break
-
-                if skip:
-                    continue
-
-                if key not in agg_cap or value < agg_cap.get(key, {}).get(
-                    "value", float("inf")
-                ):
-                    agg_cap[key] = content.copy()
-
-        return agg_cap
-
-    @classmethod
-    def _aggregate_recovery_capabilities(
-        cls, supporting_descendants: set, parent_asset=None
-    ) -> dict:
-        """
-        Aggregates recovery capabilities from supporting descendants (highest value wins - worst case).
-        Supporting assets can override capabilities - when overridden, the overriding asset's value is used directly,
-        and its descendants are excluded for that capability only (not globally).
-        """
-        # Build descendant map with constant DB queries using prefetched graph data
-        descendants_map = {}
-        if parent_asset is not None:
-            graph = cls._prefetch_graph_data([parent_asset])
-            parent_to_children = graph["parent_to_children"]
-            for asset in supporting_descendants:
-                descendants_map[asset.id] = cls._get_all_descendants(
-                    asset, parent_to_children
-                )
-        else:
-            # Fallback for when parent_asset is not provided
-            for asset in supporting_descendants:
-                descendants_map[asset.id] = asset.get_descendants()
-
-        # Track which capabilities are overridden by which assets
-        overrides = {}  # {cap_name: [list of assets that override it]}
-        for asset in supporting_descendants:
-            overridden = asset.overridden_children_capabilities.values_list(
-                "name", flat=True
-            )
-            for cap_name in overridden:
-                if cap_name not in overrides:
-                    overrides[cap_name] = []
-                overrides[cap_name].append(asset)
-
-        agg_cap = {}
-        for asset in supporting_descendants:
-            capabilities = asset.recovery_capabilities.get("objectives", {})
-            for key, content in capabilities.items():
-                value = content.get("value")
-                if value is None:
-                    continue
-
-                # Check if this asset should be skipped due to an ancestor's override
-                skip = False
-                if key in overrides:
-                    for overriding_asset in overrides[key]:
-                        # Skip if this asset is a descendant of an overriding asset
-                        if asset != overriding_asset and asset in descendants_map.get(
-                            overriding_asset.id, set()
-                        ):
-                            skip = True
-                            break
-
-                if skip:
-                    continue
-
-                current_value = agg_cap.get(key, {}).get("value")
-                if current_value is None or value > current_value:
-                    agg_cap[key] = content.copy()
-
-        return agg_cap
-
     @classmethod
     def _get_security_objective_scale(cls) -> str:
         """Fetches the global setting for the security objective scale."""
-        settings = GlobalSettings.objects.filter(name="general").first()
-        if settings:
-            return settings.value.get("security_objective_scale", "1-4")
-        return "1-4"
+        return get_global_setting(GlobalSettings.Names.GENERAL, {}).get(
+            "security_objective_scale", "1-4"
+        )
 
     def get_security_objectives(self) -> dict[str, dict[str, dict[str, int | bool]]]:
         """
@@ -2996,23 +2693,11 @@ class Asset(
         if self.is_primary:
             return self.security_objectives
 
-        ancestors = self.ancestors_plus_self()
-        primary_assets = {asset for asset in ancestors if asset.is_primary}
-        if not primary_assets:
+        security_objectives = copy_objectives(
+            get_asset_graph_state().security_objectives.get(self.pk)
+        )
+        if security_objectives is None:
             return {}
-
-        security_objectives = {}
-        for asset in primary_assets:
-            for key, content in asset.security_objectives.get("objectives", {}).items():
-                if not content.get("is_enabled", False):
-                    continue
-                if key not in security_objectives:
-                    security_objectives[key] = content
-                else:
-                    security_objectives[key]["value"] = max(
-                        security_objectives[key].get("value", 0),
-                        content.get("value", 0),
-                    )
         return {"objectives": security_objectives}
 
     def get_disaster_recovery_objectives(self) -> dict[str, dict[str, dict[str, int]]]:
@@ -3025,27 +2710,11 @@ class Asset(
         if self.is_primary:
             return self.disaster_recovery_objectives
 
-        ancestors = self.ancestors_plus_self()
-        primary_assets = {asset for asset in ancestors if asset.is_primary}
-        if not primary_assets:
+        disaster_recovery_objectives = copy_objectives(
+            get_asset_graph_state().disaster_recovery_objectives.get(self.pk)
+        )
+        if disaster_recovery_objectives is None:
             return {}
-
-        disaster_recovery_objectives = {}
-        for asset in primary_assets:
-            for key, content in asset.disaster_recovery_objectives.get(
-                "objectives", {}
-            ).items():
-                value = content.get("value")
-                # Skip None or 0 values (treat as "not set")
-                if not value:
-                    continue
-                if key not in disaster_recovery_objectives:
-                    disaster_recovery_objectives[key] = content.copy()
-                else:
-                    current_value = disaster_recovery_objectives[key].get("value")
-                    if current_value is None or value < current_value:
-                        disaster_recovery_objectives[key]["value"] = value
-
         return {"objectives": disaster_recovery_objectives}
 
     def get_security_capabilities(self) -> dict[str, dict[str, dict[str, int | bool]]]:
@@ -3066,15 +2735,13 @@ class Asset(
         if not self.is_primary:
             return self.security_capabilities
 
-        # For primary assets, delegate to class method for aggregation
-        # Use prefetch pattern to avoid N+1 queries even in detail views
-        graph = self._prefetch_graph_data([self])
-        descendants = self._get_all_descendants(self, graph["parent_to_children"])
-        supporting_assets = {asset for asset in descendants if not asset.is_primary}
-        if not supporting_assets:
+        # For primary assets, capabilities are rolled up from supporting
+        # descendants in the cached asset graph snapshot
+        aggregated = copy_objectives(
+            get_asset_graph_state().security_capabilities.get(self.pk)
+        )
+        if aggregated is None:
             return {}
-
-        aggregated = self._aggregate_security_capabilities(supporting_assets, self)
         return {"objectives": aggregated}
 
     def get_recovery_capabilities(self) -> dict[str, dict[str, dict[str, int]]]:
@@ -3088,15 +2755,13 @@ class Asset(
         if not self.is_primary:
             return self.recovery_capabilities
 
-        # For primary assets, delegate to class method for aggregation
-        # Use prefetch pattern to avoid N+1 queries even in detail views
-        graph = self._prefetch_graph_data([self])
-        descendants = self._get_all_descendants(self, graph["parent_to_children"])
-        supporting_assets = {asset for asset in descendants if not asset.is_primary}
-        if not supporting_assets:
+        # For primary assets, capabilities are rolled up from supporting
+        # descendants in the cached asset graph snapshot
+        aggregated = copy_objectives(
+            get_asset_graph_state().recovery_capabilities.get(self.pk)
+        )
+        if aggregated is None:
             return {}
-
-        aggregated = self._aggregate_recovery_capabilities(supporting_assets, self)
         return {"objectives": aggregated}
 
     def get_security_objectives_display(self) -> list[dict[str, int]]:
@@ -3106,11 +2771,8 @@ class Asset(
         security_objectives = self.get_security_objectives()
         if len(security_objectives) == 0:
             return []
-        general_settings = GlobalSettings.objects.filter(name="general").first()
-        scale = (
-            general_settings.value.get("security_objective_scale", "1-4")
-            if general_settings
-            else "1-4"
+        scale = get_global_setting(GlobalSettings.Names.GENERAL, {}).get(
+            "security_objective_scale", "1-4"
         )
         return [
             {key: self.SECURITY_OBJECTIVES_SCALES[scale][content.get("value", 0)]}
@@ -3159,11 +2821,8 @@ class Asset(
         security_capabilities = self.get_security_capabilities()
         if len(security_capabilities) == 0:
             return []
-        general_settings = GlobalSettings.objects.filter(name="general").first()
-        scale = (
-            general_settings.value.get("security_objective_scale", "1-4")
-            if general_settings
-            else "1-4"
+        scale = get_global_setting(GlobalSettings.Names.GENERAL, {}).get(
+            "security_objective_scale", "1-4"
         )
         return [
             {key: self.SECURITY_OBJECTIVES_SCALES[scale][content.get("value", 0)]}
@@ -4324,12 +3983,7 @@ class AppliedControl(
         if old_instance:
             changed_fields = self._get_changed_fields(old_instance)
 
-        if self.reference_control and self.category is None:
-            self.category = self.reference_control.category
-        if self.reference_control and self.csf_function is None:
-            self.csf_function = self.reference_control.csf_function
-        if self.status == "active":
-            self.progress_field = 100
+        self.update_derived_fields()
 
         # Save first
         is_new = self.pk is None
@@ -4343,6 +3997,15 @@ class AppliedControl(
             )
             self._trigger_sync(is_new=is_new, changed_fields=changed_fields)
 
+    def update_derived_fields(self):
+        """Fill fields inherited from the reference control and the status"""
+        if self.reference_control and self.category is None:
+            self.category = self.reference_control.category
+        if self.reference_control and self.csf_function is None:
+            self.csf_function = self.reference_control.csf_function
+        if self.status == "active":
+            self.progress_field = 100
+
     def _get_changed_fields(self, old_instance):
         """Detect which fields changed"""
         changed = []
@@ -4433,9 +4096,8 @@ class AppliedControl(
         amortization_period = self.cost.get("amortization_period", 1)
 
         # Get daily rate from global settings
-        general_settings = GlobalSettings.objects.filter(name="general").first()
-        daily_rate = (
-            general_settings.value.get("daily_rate", 500) if general_settings else 500
+        daily_rate = get_global_setting(GlobalSettings.Names.GENERAL, {}).get(
+            "daily_rate", 500
         )
 
         # Calculate annual cost
@@ -5532,9 +5194,15 @@ class RiskScenario(NameDescriptionMixin, FilteringLabelMixin):
         return self.risk_assessment.is_locked
 
     @classmethod
-    def get_default_ref_id(cls, risk_assessment: RiskAssessment):
+    def get_default_ref_id(
+        cls, risk_assessment: RiskAssessment, used_ref_ids: set | None = None
+    ):
         """return associated risk assessment id"""
-        scenarios_ref_ids = [x.ref_id for x in risk_assessment.risk_scenarios.all()]
+        scenarios_ref_ids = (
+            used_ref_ids
+            if used_ref_ids is not None
+            else [x.ref_id for x in risk_assessment.risk_scenarios.all()]
+        )
         nb_scenarios = len(scenarios_ref_ids) + 1
         candidates = [f"R.{i:02d}" for i in range(1, nb_scenarios + 1)]
         return next(x for x in candidates if x not in scenarios_ref_ids)
@@ -5692,6 +5360,16 @@ class RiskScenario(NameDescriptionMixin, FilteringLabelMixin):
         return result
 
     def save(self, *args, **kwargs):
+        self.update_risk_levels()
+        super(RiskScenario, self).save(*args, **kwargs)
+        # Update parent risk assessment's updated_at timestamp (bypass save to avoid recursion)
+        RiskAssessment.objects.filter(id=self.risk_assessment.id).update(
+            updated_at=timezone.now()
+        )
+        self.risk_assessment.upsert_daily_metrics()
+
+    def update_risk_levels(self):
+        """Compute inherent, current and residual levels from the risk matrix"""
         if self.inherent_proba >= 0 and self.inherent_impact >= 0:
             self.inherent_level = risk_scoring(
                 self.inherent_proba,
@@ -5716,12 +5394,6 @@ class RiskScenario(NameDescriptionMixin, FilteringLabelMixin):
             )
         else:
             self.residual_level = -1
-        super(RiskScenario, self).save(*args, **kwargs)
-        # Update parent risk assessment's updated_at timestamp (bypass save to avoid recursion)
-        RiskAssessment.objects.filter(id=self.risk_assessment.id).update(
-            updated_at=timezone.now()
-        )
-        self.risk_assessment.upsert_daily_metrics()
 
 
 class Campaign(NameDescriptionMixin, ETADueDateMixin, FolderMixin):
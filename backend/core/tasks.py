@@ -13,6 +13,7 @@ from django.core.mail import send_mail
 from django.conf import settings
 from django.db import models
 import logging
+from global_settings.cache import get_global_setting
 from global_settings.models import GlobalSettings
 
 import logging.config
@@ -21,6 +22,9 @@ import structlog
 
 from django.core.management import call_command
 
+# Registers the tasks of the workflow engine with the consumer
+import core.bounded_contexts.workflow_engine.tasks  # noqa: F401
+
 logging.config.dictConfig(settings.LOGGING)
 logger = structlog.getLogger(__name__)
 
@@ -310,9 +314,9 @@ def send_notification_email(subject, message, owner_email):
 
 @task()
 def check_email_configuration(owner_email, controls):
-    notifications_enable_mailing = GlobalSettings.objects.get(name="general").value.get(
-        "notifications_enable_mailing", False
-    )
+    notifications_enable_mailing = get_global_setting(
+        GlobalSettings.Names.GENERAL, {}
+    ).get("notifications_enable_mailing", False)
     if not notifications_enable_mailing:
         logger.warning(
             "Email notification is disabled. You can enable it under Extra/Settings. Skipping for now."
@@ -345,7 +349,7 @@ def auditlog_retention_cleanup():
     before_date = date.today() - timedelta(days=retention_days)
 
     try:
-        call_command("auditlogflush", "--before-date", before_date.isoformat(), "--yes")
+        call_command("prune_auditlog", "--before-date", before_date.isoformat())
         logger.info(f"Successfully cleaned up audit logs before {before_date}")
     except Exception as e:
         logger.error(f"Failed to clean up audit logs: {str(e)}")
@@ -0,0 +1,106 @@
+import pytest
+
+from core.asset_graph_cache import _transitive_closure, get_asset_graph_state
+from core.models import Asset, AssetCapability
+from iam.models import Folder
+
+
+def test_transitive_closure_on_dag():
+    links = {"a": {"b", "c"}, "b": {"d"}, "c": {"d"}, "d": set()}
+
+    closure = _transitive_closure(links, links)
+
+    assert closure == {
+        "a": {"b", "c", "d"},
+        "b": {"d"},
+        "c": {"d"},
+        "d": frozenset(),
+    }
+
+
+def test_transitive_closure_tolerates_cycles():
+    links = {"a": {"b"}, "b": {"c"}, "c": {"a"}}
+
+    closure = _transitive_closure(links, links)
+
+    assert closure == {"a": {"b", "c"}, "b": {"a", "c"}, "c": {"a", "b"}}
+
+
+@pytest.mark.django_db
+class TestAssetGraphCache:
+    @pytest.fixture
+    def hierarchy(self):
+        root_folder = Folder.objects.get(content_type=Folder.ContentType.ROOT)
+        primary = Asset.objects.create(
+            name="Primary",
+            type=Asset.Type.PRIMARY,
+            folder=root_folder,
+            security_objectives={
+                "objectives": {"integrity": {"value": 2, "is_enabled": True}}
+            },
+            disaster_recovery_objectives={"objectives": {"rto": {"value": 3600}}},
+        )
+        support = Asset.objects.create(
+            name="Support",
+            type=Asset.Type.SUPPORT,
+            folder=root_folder,
+            security_capabilities={
+                "objectives": {"integrity": {"value": 3, "is_enabled": True}}
+            },
+        )
+        leaf = Asset.objects.create(
+            name="Leaf",
+            type=Asset.Type.SUPPORT,
+            folder=root_folder,
+            security_capabilities={
+                "objectives": {"integrity": {"value": 1, "is_enabled": True}}
+            },
+        )
+        support.parent_assets.add(primary)
+        leaf.parent_assets.add(support)
+        return primary, support, leaf
+
+    def test_closures_and_rollups(self, hierarchy):
+        primary, support, leaf = hierarchy
+
+        state = get_asset_graph_state()
+
+        assert state.descendants[primary.id] == {support.id, leaf.id}
+        assert state.ancestors[leaf.id] == {primary.id, support.id}
+        assert state.security_objectives[leaf.id]["integrity"]["value"] == 2
+        assert state.disaster_recovery_objectives[leaf.id]["rto"]["value"] == 3600
+        assert state.security_capabilities[primary.id]["integrity"]["value"] == 1
+
+    def test_capability_override_is_applied(self, hierarchy):
+        primary, support, leaf = hierarchy
+        integrity, _ = AssetCapability.objects.get_or_create(name="integrity")
+
+        support.overridden_children_capabilities.add(integrity)
+
+        capabilities = primary.get_security_capabilities()
+        assert capabilities["objectives"]["integrity"]["value"] == 3
+
+    def test_snapshot_is_reused_until_invalidated(
+        self, hierarchy, django_assert_num_queries
+    ):
+        primary, support, leaf = hierarchy
+        state = get_asset_graph_state()
+
+        # Only the CacheVersion lookup
+        with django_assert_num_queries(1):
+            assert get_asset_graph_state() is state
+
+        leaf.parent_assets.remove(support)
+        leaf.parent_assets.add(primary)
+
+        state = get_asset_graph_state()
+        assert state.ancestors[leaf.id] == {primary.id}
+        assert leaf.get_security_objectives()["objectives"]["integrity"]["value"] == 2
+
+    def test_returned_objectives_do_not_alter_snapshot(self, hierarchy):
+        primary, support, leaf = hierarchy
+
+        objectives = leaf.get_security_objectives()
+        objectives["objectives"]["integrity"]["value"] = 4
+
+        assert leaf.get_security_objectives()["objectives"]["integrity"]["value"] == 2
@@ -0,0 +1,93 @@
+import pytest
+from auditlog.context import set_actor
+from auditlog.models import LogEntry
+from django.db import transaction
+
+from core.custom_middleware import buffered_audit_log, install_audit_log_buffer
+from core.models import Threat
+from iam.models import Folder, User
+
+
+@pytest.mark.django_db
+class TestAuditLogBuffer:
+    @pytest.fixture(autouse=True)
+    def buffered_manager(self):
+        # Done when the core app is ready if AUDITLOG_BUFFERED is set
+        options = LogEntry._meta
+        # auditlog may declare the manager on an abstract base of LogEntry
+        manager, local_managers = vars(LogEntry).get("objects"), options.local_managers
+        install_audit_log_buffer()
+        yield
+        if manager is None:
+            del LogEntry.objects
+        else:
+            LogEntry.objects = manager
+        options.local_managers = local_managers
+        options._expire_cache()
+
+    @pytest.fixture
+    def user(self):
+        return User.objects.create_user(
+            email="audit_buffer_user@example.com", password="password"
+        )
+
+    def test_entries_are_written_in_bulk_when_leaving_the_block(
+        self, user, django_capture_on_commit_callbacks
+    ):
+        folder = Folder.objects.create(
+            name="Audited", parent_folder=Folder.get_root_folder()
+        )
+        with set_actor(user), buffered_audit_log() as buffer:
+            with django_capture_on_commit_callbacks(execute=True):
+                threats = [
+                    Threat.objects.create(name=f"threat {i}", folder=folder)
+                    for i in range(3)
+                ]
+                threats[0].name = "renamed"
+                threats[0].save()
+            assert len(buffer.entries) == 4
+            assert not LogEntry.objects.filter(
+                object_pk__in=[str(threat.id) for threat in threats]
+            ).exists()
+
+        entries = list(
+            LogEntry.objects.filter(
+                object_pk__in=[str(threat.id) for threat in threats]
+            ).order_by("id")
+        )
+        assert [(entry.object_pk, entry.action) for entry in entries] == [
+            *[(str(threat.id), LogEntry.Action.CREATE) for threat in threats],
+            (str(threats[0].id), LogEntry.Action.UPDATE),
+        ]
+        for entry in entries:
+            assert entry.actor == user
+            assert entry.additional_data == {
+                "user_uuid": str(user.id),
+                "user_email": user.email,
+                "folder": "/".join(f.name for f in threats[0].get_folder_full_path()),
+            }
+
+    def test_entries_of_rolled_back_transactions_are_dropped(
+        self, django_capture_on_commit_callbacks
+    ):
+        with buffered_audit_log() as buffer:
+            with django_capture_on_commit_callbacks(execute=True):
+                with pytest.raises(RuntimeError), transaction.atomic():
+                    Threat.objects.create(
+                        name="rolled back", folder=Folder.get_root_folder()
+                    )
+                    raise RuntimeError
+                kept = Threat.objects.create(
+                    name="kept", folder=Folder.get_root_folder()
+                )
+            assert [entry.object_pk for entry in buffer.entries] == [kept.id]
+
+        assert LogEntry.objects.filter(object_pk=str(kept.id)).count() == 1
+        assert not LogEntry.objects.filter(object_repr="rolled back").exists()
+
+    def test_entries_outside_a_block_are_saved(self):
+        threat = Threat.objects.create(
+            name="not buffered", folder=Folder.get_root_folder()
+        )
+
+        assert LogEntry.objects.filter(object_pk=str(threat.id)).count() == 1
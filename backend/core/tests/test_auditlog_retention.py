@@ -0,0 +1,84 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from auditlog.models import LogEntry
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.utils import timezone
+
+from core.auditlog_retention import (
+    _next_month,
+    partition_name,
+    prune_before,
+    prune_to_max_records,
+)
+from iam.models import Folder
+
+
+def test_partition_months():
+    assert _next_month(date(2026, 1, 1)) == date(2026, 2, 1)
+    assert _next_month(date(2026, 12, 1)) == date(2027, 1, 1)
+    assert partition_name(date(2026, 3, 1)) == "auditlog_logentry_p202603"
+
+
+@pytest.mark.django_db
+class TestAuditlogPruning:
+    @pytest.fixture
+    def entries(self):
+        """Ten entries, one per day, the oldest one logged ten days ago."""
+        content_type = ContentType.objects.get_for_model(Folder)
+        now = timezone.now()
+        LogEntry.objects.all().delete()
+        return [
+            LogEntry.objects.create(
+                content_type=content_type,
+                object_pk=str(i),
+                object_repr=f"folder {i}",
+                action=LogEntry.Action.UPDATE,
+                timestamp=now - timedelta(days=10 - i),
+            )
+            for i in range(10)
+        ]
+
+    def test_prune_to_max_records_keeps_the_latest_entries(self, entries):
+        deleted = prune_to_max_records(4, batch_size=3)
+
+        assert deleted == 6
+        assert set(LogEntry.objects.values_list("id", flat=True)) == {
+            entry.id for entry in entries[-4:]
+        }
+        assert prune_to_max_records(4) == 0
+
+    def test_prune_before_deletes_expired_entries(self, entries):
+        deleted = prune_before(timezone.now() - timedelta(days=5, hours=12), 2)
+
+        assert deleted == 5
+        assert set(LogEntry.objects.values_list("object_pk", flat=True)) == {
+            str(i) for i in range(5, 10)
+        }
+
+    def test_prune_before_ignores_id_order(self, entries):
+        # Buffered entries are written after entries logged later
+        late = LogEntry.objects.create(
+            content_type=entries[0].content_type,
+            object_pk="late",
+            object_repr="late folder",
+            action=LogEntry.Action.UPDATE,
+            timestamp=timezone.now() - timedelta(days=20),
+        )
+
+        deleted = prune_before(timezone.now() - timedelta(days=5, hours=12), 2)
+
+        assert deleted == 6
+        assert not LogEntry.objects.filter(id=late.id).exists()
+
+    def test_command_before_date(self, entries):
+        before = (timezone.now() - timedelta(days=3)).date()
+
+        call_command("prune_auditlog", "--before-date", before.isoformat())
+
+        cutoff = timezone.make_aware(datetime.combine(before, datetime.min.time()))
+        assert not LogEntry.objects.filter(timestamp__lt=cutoff).exists()
+        assert LogEntry.objects.filter(timestamp__gte=cutoff).count() == sum(
+            entry.timestamp >= cutoff for entry in entries
+        )
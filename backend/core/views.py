@@ -2,6 +2,7 @@ from django.db.utils import OperationalError, ProgrammingError
 from openpyxl import Workbook
 from openpyxl.utils import get_column_letter
 from openpyxl.styles import Alignment
+import copy
 import csv
 import json
 import mimetypes
@@ -64,7 +65,9 @@ from django.db.models.functions import Lower
 from docxtpl import DocxTemplate
 from integrations.models import SyncMapping
 from integrations.tasks import sync_object_to_integrations
-from webhooks.service import dispatch_webhook_event
+from webhooks.service import dispatch_webhook_event, webhook_batch
+from iam.snapshot_cache import deferred_invalidations
+from core.bounded_contexts.security_graph.signals import batched_graph_refresh
 from .generators import gen_audit_context
 from .serializer_fields import FieldsRelatedField
 
@@ -82,7 +85,8 @@ from django.conf import settings
 from django.core.exceptions import FieldDoesNotExist
 from django.core.files.storage import default_storage
 
-from django.db import models, transaction
+from django.db import IntegrityError, models, transaction
+from django.db.models.signals import m2m_changed, post_save, pre_save
 from django.forms import ValidationError
 from django.http import FileResponse, HttpResponse, StreamingHttpResponse
 from django.middleware import csrf
@@ -90,8 +94,21 @@ from django.template.loader import render_to_string
 from django.utils.functional import Promise
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
-from iam.models import Folder, RoleAssignment, User, UserGroup
-from rest_framework import filters, generics, permissions, status, viewsets
+from iam.models import (
+    Folder,
+    PublishInRootFolderMixin,
+    RoleAssignment,
+    User,
+    UserGroup,
+)
+from rest_framework import (
+    filters,
+    generics,
+    permissions,
+    serializers,
+    status,
+    viewsets,
+)
 from django.utils.translation import gettext_lazy as _
 from rest_framework.decorators import (
     action,
@@ -113,6 +130,7 @@ from rest_framework.exceptions import NotFound, PermissionDenied
 from weasyprint import HTML
 
 from core.helpers import *
+from core.asset_graph_cache import get_asset_graph_state
 from core.models import (
     AppliedControl,
     ComplianceAssessment,
@@ -158,6 +176,7 @@ from serdes.utils import (
 from serdes.serializers import ExportSerializer
 from django.contrib.admin.utils import NestedObjects
 from django.db import router
+from global_settings.cache import get_global_setting
 from global_settings.models import GlobalSettings
 from global_settings.utils import ff_is_enabled
 
@@ -233,10 +252,10 @@ def add_unset_option(choices):
 def get_mapping_max_depth():
     """Get mapping max depth from general settings at runtime; safe during migrations."""
     try:
-        gs = GlobalSettings.objects.filter(name="general").only("value").first()
-        if not gs or not isinstance(getattr(gs, "value", None), dict):
+        general = get_global_setting(GlobalSettings.Names.GENERAL)
+        if not isinstance(general, dict):
             return MAPPING_MAX_DEPTH
-        raw = gs.value.get("mapping_max_depth", MAPPING_MAX_DEPTH)
+        raw = general.get("mapping_max_depth", MAPPING_MAX_DEPTH)
         try:
             val = int(raw)
         except (TypeError, ValueError):
@@ -606,6 +625,484 @@ class GenericFilterSet(df.FilterSet):
         }
 
 
+class BulkWriteMixin:
+    """
+    Bulk create/update/upsert endpoint for model viewsets.
+    Items are validated with the write serializer, then written with
+    bulk_create/bulk_update in a single transaction. Items touching fields that
+    only the serializer knows how to save (reverse relations, write-only fields,
+    bulk_serializer_fields) go through perform_create/perform_update instead.
+    """
+
+    bulk_max_items = 5000
+    bulk_batch_size = 500
+    bulk_modes = ("create", "update", "upsert")
+    bulk_match_fields = ("id", "ref_id")
+    # Parent fields that, when sent with an item, narrow its ref_id match
+    bulk_match_scope: tuple[str, ...] = ("folder",)
+    # Fields whose side effects live in the serializer or perform_* hooks
+    bulk_serializer_fields: tuple[str, ...] = ()
+    bulk_select_related: tuple[str, ...] = ()
+
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        """
+        Create, update or upsert up to bulk_max_items objects.
+        Payload: {"mode": "create" | "update" | "upsert", "match_on": "id" | "ref_id",
+        "atomic": false, "items": [...]}
+        Returns one result per item, in the order of the payload.
+        """
+        mode = request.data.get("mode", "create")
+        match_on = request.data.get("match_on", "id")
+        items = request.data.get("items")
+        if mode not in self.bulk_modes:
+            return Response(
+                {"error": f"mode must be one of {', '.join(self.bulk_modes)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if (
+            match_on not in self.bulk_match_fields
+            or match_on not in self._bulk_concrete_fields()
+        ):
+            return Response(
+                {
+                    "error": f"Cannot match {self.model._meta.verbose_name} on {match_on}"
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not isinstance(items, list) or not items:
+            return Response(
+                {"error": "items must be a non-empty list"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(items) > self.bulk_max_items:
+            return Response(
+                {"error": f"At most {self.bulk_max_items} items can be sent at once"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        # Scratch space for bulk_prepare_instance/bulk_after_write overrides
+        self.bulk_context = {}
+        results = [None] * len(items)
+        view_ids, change_ids, _ = RoleAssignment.get_accessible_object_ids(
+            Folder.get_root_folder(), request.user, self.model
+        )
+        existing = (
+            self._bulk_find_existing(items, match_on, set(view_ids), set(change_ids))
+            if mode != "create"
+            else {}
+        )
+        can_add = self._bulk_add_permission_checker(request.user)
+
+        prepared = []
+        unique_keys = set()
+        for index, item in enumerate(items):
+            try:
+                if not isinstance(item, dict):
+                    raise serializers.ValidationError("Expected an object")
+                instance = (
+                    self._bulk_match(item, match_on, existing, mode)
+                    if mode != "create"
+                    else None
+                )
+                item = self._bulk_process_item_data(item)
+                entry = self._bulk_prepare_item(request, item, instance, can_add)
+                key = self._bulk_unique_key(entry[1])
+                if key is not None:
+                    if key in unique_keys:
+                        raise ValidationError(
+                            {
+                                field: "This value is used by another item of the batch."
+                                for field in entry[1].fields_to_check
+                            }
+                        )
+                    unique_keys.add(key)
+                prepared.append((index, *entry))
+            except Exception as e:
+                results[index] = self._bulk_error(index, self._bulk_error_detail(e))
+
+        atomic = bool(request.data.get("atomic", False))
+        if atomic and any(results):
+            return self._bulk_response(results)
+
+        try:
+            # Caches are invalidated once for the batch, after it is committed
+            with (
+                webhook_batch(),
+                deferred_invalidations(),
+                batched_graph_refresh(),
+                transaction.atomic(),
+            ):
+                self._bulk_write(
+                    [entry for entry in prepared if entry[2] is not None], results
+                )
+                for index, serializer, obj, _, _ in prepared:
+                    if obj is None:
+                        self._bulk_save_with_serializer(
+                            index, serializer, results, atomic
+                        )
+        except (serializers.ValidationError, PermissionDenied) as e:
+            # Only raised in atomic mode, the whole batch is rolled back
+            return Response({"error": e.detail}, status=status.HTTP_400_BAD_REQUEST)
+        except IntegrityError as e:
+            logger.error("Bulk write failed", model=self.model.__name__, error=e)
+            return Response(
+                {"error": "Bulk write failed, no object was saved"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return self._bulk_response(results)
+
+    def bulk_prepare_instance(self, instance, previous=None) -> None:
+        """
+        Run model-level validation and derived fields on an unsaved instance.
+        previous is a copy of the instance before the update, None on creation.
+        """
+        instance.clean()
+
+    def bulk_after_write(self, created: list, updated: list) -> None:
+        """Run the side effects of Model.save once for the whole batch."""
+
+    def bulk_requires_serializer(self, instance, validated_data) -> bool:
+        """Whether an item must be saved through the serializer."""
+        return bool(set(validated_data) & set(self.bulk_serializer_fields))
+
+    def _bulk_process_item_data(self, item: dict) -> dict:
+        """Preprocess an item like create/update do with the request data."""
+        item = dict(item)
+        self._process_data(item)
+        if item.get("filtering_labels"):
+            item["filtering_labels"] = self._process_labels(item["filtering_labels"])
+        return item
+
+    def _bulk_concrete_fields(self) -> set[str]:
+        return {f.name for f in self.model._meta.concrete_fields}
+
+    def _bulk_m2m_fields(self) -> set[str]:
+        return {
+            f.name
+            for f in self.model._meta.many_to_many
+            if f.remote_field.through._meta.auto_created
+        }
+
+    def _bulk_add_permission_checker(self, user):
+        perm = Permission.objects.get(
+            codename=f"add_{self.model._meta.model_name}",
+            content_type__app_label=self.model._meta.app_label,
+            content_type__model=self.model._meta.model_name,
+        )
+        allowed = {}
+
+        def can_add(folder) -> bool:
+            if folder.id not in allowed:
+                allowed[folder.id] = RoleAssignment.is_access_allowed(
+                    user=user, perm=perm, folder=folder
+                )
+            return allowed[folder.id]
+
+        return can_add
+
+    @staticmethod
+    def _bulk_key(value, match_on):
+        if value in (None, ""):
+            return None
+        if match_on == "id":
+            try:
+                return str(UUID(str(value)))
+            except ValueError:
+                return None
+        return str(value)
+
+    def _bulk_find_existing(self, items, match_on, view_ids, change_ids) -> dict:
+        """
+        Load every object targeted by the batch with a single query. Objects the
+        user cannot view are left out, as if they did not exist.
+        """
+        keys = {
+            self._bulk_key(item.get(match_on), match_on)
+            for item in items
+            if isinstance(item, dict)
+        }
+        keys.discard(None)
+        queryset = self.model.objects.filter(**{f"{match_on}__in": keys})
+        if self.bulk_select_related:
+            queryset = queryset.select_related(*self.bulk_select_related)
+        existing = defaultdict(list)
+        for obj in queryset:
+            if obj.id in view_ids:
+                existing[str(getattr(obj, match_on))].append(obj)
+        # Objects the user cannot change are reported as such, not created again
+        return {
+            key: [(obj, obj.id in change_ids) for obj in objs]
+            for key, objs in existing.items()
+        }
+
+    def _bulk_match(self, item, match_on, existing, mode):
+        key = self._bulk_key(item.get(match_on), match_on)
+        candidates = existing.get(key, []) if key else []
+        if match_on != "id":
+            # ref_ids are only unique within their folder or parent object
+            for field in self.bulk_match_scope:
+                scope = self._bulk_key(item.get(field), "id")
+                if scope is not None:
+                    candidates = [
+                        (obj, can_change)
+                        for obj, can_change in candidates
+                        if str(getattr(obj, f"{field}_id")) == scope
+                    ]
+        if len(candidates) > 1:
+            raise serializers.ValidationError(
+                {match_on: f"Several objects match {key}, use id instead"}
+            )
+        if not candidates:
+            if mode == "update":
+                raise NotFound({match_on: f"No object matches {item.get(match_on)}"})
+            return None
+        instance, can_change = candidates[0]
+        if not can_change:
+            raise PermissionDenied("You do not have permission to change this object")
+        return instance
+
+    def _bulk_prepare_item(self, request, item, instance, can_add):
+        """
+        Validate one item. Returns (serializer, obj, update_fields, m2m) where obj
+        is the unsaved instance to bulk write, or None if the serializer must save it.
+        """
+        if instance is not None:
+            if getattr(instance, "urn", None):
+                raise PermissionDenied({"urn": "Imported objects cannot be modified"})
+            self._validate_parent_field_change(request, instance, data=item)
+        action = "partial_update" if instance is not None else "create"
+        serializer = self.get_serializer_class(action=action)(
+            instance,
+            data={k: v for k, v in item.items() if k != "id"},
+            partial=instance is not None,
+            context={**self.get_serializer_context(), "action": action},
+        )
+        serializer.is_valid(raise_exception=True)
+        validated_data = serializer.validated_data
+
+        if instance is None:
+            folder = Folder.get_folder(validated_data) or Folder.get_root_folder()
+        else:
+            folder = validated_data.get("folder")
+            if folder and folder.id == instance.folder_id:
+                folder = None
+        if folder and not can_add(folder):
+            raise PermissionDenied(
+                {
+                    "folder": "You do not have permission to create objects in this folder"
+                }
+            )
+
+        concrete_fields = self._bulk_concrete_fields()
+        m2m_fields = self._bulk_m2m_fields()
+        sent = {
+            serializer.fields[name].source for name in item if name in serializer.fields
+        }
+        # Extra fields the client did not send only carry serializer defaults
+        extra = set(validated_data) - concrete_fields - m2m_fields
+        if extra & sent or self.bulk_requires_serializer(instance, validated_data):
+            return serializer, None, None, None
+
+        previous = copy.copy(instance) if instance is not None else None
+        obj = instance if instance is not None else self.model()
+        m2m = {}
+        for name, value in validated_data.items():
+            if name in m2m_fields:
+                m2m[name] = value
+            elif name in concrete_fields:
+                setattr(obj, name, value)
+        self.bulk_prepare_instance(obj, previous)
+        if isinstance(obj, PublishInRootFolderMixin):
+            # Done by PublishInRootFolderMixin.save
+            obj.publish_in_root_folder()
+        update_fields = set(validated_data) & concrete_fields
+        if previous is not None:
+            # Include the fields derived by bulk_prepare_instance
+            update_fields |= {
+                f.name
+                for f in self.model._meta.concrete_fields
+                if getattr(obj, f.attname) != getattr(previous, f.attname)
+            }
+        return serializer, obj, update_fields, m2m
+
+    @staticmethod
+    def _bulk_unique_key(obj):
+        """Key mirroring AbstractBaseModel.clean uniqueness, to catch duplicates within a batch."""
+        if obj is None or not hasattr(obj, "get_scope"):
+            return None
+        fields = getattr(obj, "fields_to_check", None)
+        if not fields:
+            return None
+        values = tuple(str(getattr(obj, field, "")).lower() for field in fields)
+        return str(obj.get_scope().query), values
+
+    def _bulk_write(self, entries, results) -> None:
+        """Write prepared objects with bulk queries, firing the model signals."""
+        if not entries:
+            return
+        using = router.db_for_write(self.model)
+        created = [obj for _, _, obj, _, _ in entries if obj._state.adding]
+        updated = [obj for _, _, obj, _, _ in entries if not obj._state.adding]
+        update_fields = {"updated_at"}
+        now = timezone.now()
+        for _, _, obj, fields, _ in entries:
+            if not obj._state.adding:
+                obj.updated_at = now
+                update_fields |= fields
+
+        for obj in created + updated:
+            pre_save.send(
+                sender=self.model,
+                instance=obj,
+                raw=False,
+                using=using,
+                update_fields=None,
+            )
+        self.model.objects.bulk_create(created, batch_size=self.bulk_batch_size)
+        if updated:
+            self.model.objects.bulk_update(
+                updated, sorted(update_fields), batch_size=self.bulk_batch_size
+            )
+        created_ids = {obj.pk for obj in created}
+        for obj in created + updated:
+            post_save.send(
+                sender=self.model,
+                instance=obj,
+                created=obj.pk in created_ids,
+                update_fields=None,
+                raw=False,
+                using=using,
+            )
+        self._bulk_write_m2m(
+            [(obj, m2m) for _, _, obj, _, m2m in entries if m2m], using
+        )
+        self.bulk_after_write(created, updated)
+
+        for index, serializer, obj, _, _ in entries:
+            action = "created" if obj.pk in created_ids else "updated"
+            serializer.instance = obj
+            dispatch_webhook_event(obj, action, serializer=serializer)
+            results[index] = {"index": index, "status": action, "id": str(obj.pk)}
+
+    def _bulk_write_m2m(self, entries, using) -> None:
+        """Replace many-to-many links like RelatedManager.set, one field at a time."""
+        links_by_field = defaultdict(list)
+        for obj, m2m in entries:
+            for name, values in m2m.items():
+                links_by_field[name].append((obj, {value.pk for value in values}))
+
+        for name, links in links_by_field.items():
+            field = self.model._meta.get_field(name)
+            through = field.remote_field.through
+            source = f"{field.m2m_field_name()}_id"
+            target = f"{field.m2m_reverse_field_name()}_id"
+            current = defaultdict(set)
+            for source_id, target_id in through.objects.filter(
+                **{f"{source}__in": [obj.pk for obj, _ in links]}
+            ).values_list(source, target):
+                current[source_id].add(target_id)
+
+            new_rows = []
+            for obj, pks in links:
+                removed = current[obj.pk] - pks
+                if removed:
+                    through.objects.filter(
+                        **{source: obj.pk, f"{target}__in": removed}
+                    ).delete()
+                    m2m_changed.send(
+                        sender=through,
+                        instance=obj,
+                        action="post_remove",
+                        reverse=False,
+                        model=field.related_model,
+                        pk_set=removed,
+                        using=using,
+                    )
+                new_rows.extend(
+                    through(**{source: obj.pk, target: pk})
+                    for pk in pks - current[obj.pk]
+                )
+            through.objects.bulk_create(new_rows, batch_size=self.bulk_batch_size)
+            for obj, pks in links:
+                added = pks - current[obj.pk]
+                if added:
+                    m2m_changed.send(
+                        sender=through,
+                        instance=obj,
+                        action="post_add",
+                        reverse=False,
+                        model=field.related_model,
+                        pk_set=added,
+                        using=using,
+                    )
+
+    def _bulk_save_with_serializer(self, index, serializer, results, atomic) -> None:
+        is_update = serializer.instance is not None
+        try:
+            with transaction.atomic():
+                if is_update:
+                    self.perform_update(serializer)
+                else:
+                    self.perform_create(serializer)
+        except Exception as e:
+            errors = self._bulk_error_detail(e)
+            if atomic:
+                raise serializers.ValidationError(errors) from e
+            results[index] = self._bulk_error(index, errors)
+            return
+        results[index] = {
+            "index": index,
+            "status": "updated" if is_update else "created",
+            "id": str(serializer.instance.pk),
+        }
+
+    @staticmethod
+    def _bulk_error(index, errors) -> dict:
+        return {"index": index, "status": "error", "errors": errors}
+
+    def _bulk_error_detail(self, error: Exception):
+        """Errors reported for an item that could not be validated or saved."""
+        if isinstance(error, (serializers.ValidationError, PermissionDenied, NotFound)):
+            return error.detail
+        if isinstance(error, ValidationError):
+            return (
+                error.message_dict if hasattr(error, "error_dict") else error.messages
+            )
+        logger.error(
+            "Bulk item failed",
+            model=self.model.__name__,
+            error=error,
+            exc_info=error,
+        )
+        if isinstance(error, IntegrityError):
+            return ["This item conflicts with existing data"]
+        return ["This item could not be saved"]
+
+    @staticmethod
+    def _bulk_response(results) -> Response:
+        results = [result for result in results if result is not None]
+        counts = {"created": 0, "updated": 0, "error": 0}
+        for result in results:
+            counts[result["status"]] += 1
+        if counts["created"] + counts["updated"] == 0:
+            response_status = status.HTTP_400_BAD_REQUEST
+        elif counts["created"]:
+            response_status = status.HTTP_201_CREATED
+        else:
+            response_status = status.HTTP_200_OK
+        return Response(
+            {
+                "created": counts["created"],
+                "updated": counts["updated"],
+                "errors": counts["error"],
+                "results": results,
+            },
+            status=response_status,
+        )
+
+
 class FolderOrderingFilter(filters.OrderingFilter):
     def get_ordering(self, request, queryset, view):
         ordering = super().get_ordering(request, queryset, view)
@@ -712,19 +1209,23 @@ class BaseModelViewSet(viewsets.ModelViewSet):
         Process the request data to split comma-separated UUIDs into a list
         and handle empty list scenarios.
         """
-        for field in request.data:
+        self._process_data(request.data)
+
+    def _process_data(self, data) -> None:
+        """_process_request_data on a payload, in place."""
+        for field in data:
             # NOTE: This is due to sveltekit-superforms not coercing the value into a list when
             # the form's dataType is "form", rather than "json".
             # Typically, dataType is "form" when the form contains a file input (e.g. for evidence attachments).
             # I am not ruling out the possibility that I am doing something wrong in the frontend. (Nassim)
             # TODO: Come back to this once superForms v2 is out of alpha. https://github.com/ciscoheat/sveltekit-superforms/releases
-            if isinstance(request.data[field], list) and len(request.data[field]) == 1:
-                if isinstance(request.data[field][0], str) and re.match(
-                    self.COMMA_SEPARATED_UUIDS_REGEX, request.data[field][0]
+            if isinstance(data[field], list) and len(data[field]) == 1:
+                if isinstance(data[field][0], str) and re.match(
+                    self.COMMA_SEPARATED_UUIDS_REGEX, data[field][0]
                 ):
-                    request.data[field] = request.data[field][0].split(",")
-                elif not request.data[field][0]:
-                    request.data[field] = []
+                    data[field] = data[field][0].split(",")
+                elif not data[field][0]:
+                    data[field] = []
 
     def _process_labels(self, labels):
         """
@@ -957,18 +1458,21 @@ class BaseModelViewSet(viewsets.ModelViewSet):
                 }
             )
 
-    def _validate_parent_field_change(self, request: Request, instance) -> None:
+    def _validate_parent_field_change(
+        self, request: Request, instance, data=None
+    ) -> None:
         """Block updates to immutable parent fields on indirect-parent models."""
+        data = request.data if data is None else data
         parent_fields = {
             "RiskScenario": "risk_assessment",
             "Representative": "entity",
             "Solution": "provider_entity",
         }
         parent_field_name = parent_fields.get(instance.__class__.__name__)
-        if not parent_field_name or parent_field_name not in request.data:
+        if not parent_field_name or parent_field_name not in data:
             return
 
-        new_parent_value = request.data.get(parent_field_name)
+        new_parent_value = data.get(parent_field_name)
         if isinstance(new_parent_value, list):
             new_parent_value = new_parent_value[0] if new_parent_value else None
         if isinstance(new_parent_value, dict):
@@ -1563,12 +2067,12 @@ class AssetFilter(GenericFilterSet):
     )
 
     def filter_exclude_children(self, queryset, name, value):
-        descendants = value.get_descendants()
-        return queryset.exclude(id__in=[descendant.id for descendant in descendants])
+        descendant_ids = get_asset_graph_state().descendants.get(value.id, frozenset())
+        return queryset.exclude(id__in=descendant_ids)
 
     def filter_exclude_parents(self, queryset, name, value):
-        ancestors = value.ancestors_plus_self()
-        return queryset.exclude(id__in=[ancestor.id for ancestor in ancestors])
+        ancestor_ids = get_asset_graph_state().ancestors.get(value.id, frozenset())
+        return queryset.exclude(id__in=ancestor_ids | {value.id})
 
     class Meta:
         model = Asset
@@ -1595,7 +2099,7 @@ class AssetCapabilityViewSet(BaseModelViewSet):
     search_fields = ["name"]
 
 
-class AssetViewSet(ExportMixin, BaseModelViewSet):
+class AssetViewSet(BulkWriteMixin, ExportMixin, BaseModelViewSet):
     """
     API endpoint that allows assets to be viewed or edited.
     """
@@ -1605,6 +2109,10 @@ class AssetViewSet(ExportMixin, BaseModelViewSet):
     search_fields = ["name", "description", "ref_id"]
     ordering = ["folder__name", "name"]
 
+    def bulk_prepare_instance(self, instance, previous=None) -> None:
+        # Asset.save runs full_clean rather than clean
+        instance.full_clean()
+
     def get_queryset(self) -> models.query.QuerySet:
         return (
             super()
@@ -1630,9 +2138,7 @@ class AssetViewSet(ExportMixin, BaseModelViewSet):
         if not initial_assets:
             return optimized_data
 
-        graph_data = Asset._prefetch_graph_data(initial_assets)
-        child_to_parents = graph_data["child_to_parents"]
-        parent_to_children = graph_data["parent_to_children"]
+        graph_state = get_asset_graph_state()
 
         scale = Asset._get_security_objective_scale()
         sec_obj_results = {}
@@ -1642,30 +2148,22 @@ class AssetViewSet(ExportMixin, BaseModelViewSet):
         descendant_results = {}
 
         for asset in initial_assets:
-            # Calculate and store descendants.
-            descendants = Asset._get_all_descendants(asset, parent_to_children)
+            # Descendants and rolled-up objectives come from the cached snapshot
             descendant_results[asset.id] = [
-                {"id": str(d.id), "str": str(d)} for d in descendants
+                {"id": str(descendant_id), "str": graph_state.names[descendant_id]}
+                for descendant_id in graph_state.descendants.get(asset.id, ())
             ]
 
-            # Calculate and store objectives.
             if asset.is_primary:
                 sec_obj = asset.security_objectives.get("objectives", {})
                 dro_obj = asset.disaster_recovery_objectives.get("objectives", {})
 
-                # For primary assets, aggregate capabilities from supporting descendants
-                supporting_descendants = {d for d in descendants if not d.is_primary}
-                sec_cap = Asset._aggregate_security_capabilities(
-                    supporting_descendants, asset
-                )
-                rec_cap = Asset._aggregate_recovery_capabilities(
-                    supporting_descendants, asset
-                )
+                # For primary assets, capabilities are aggregated from supporting descendants
+                sec_cap = graph_state.security_capabilities.get(asset.id, {})
+                rec_cap = graph_state.recovery_capabilities.get(asset.id, {})
             else:
-                ancestors = Asset._get_all_ancestors(asset, child_to_parents)
-                primary_ancestors = {anc for anc in ancestors if anc.is_primary}
-                sec_obj = Asset._aggregate_security_objectives(primary_ancestors)
-                dro_obj = Asset._aggregate_dro_objectives(primary_ancestors)
+                sec_obj = graph_state.security_objectives.get(asset.id, {})
+                dro_obj = graph_state.disaster_recovery_objectives.get(asset.id, {})
 
                 # For supporting assets, use stored capabilities
                 sec_cap = asset.security_capabilities.get("objectives", {})
@@ -1770,11 +2268,8 @@ class AssetViewSet(ExportMixin, BaseModelViewSet):
         serializer_class = self.get_serializer_class(action="update")
         asset_data = serializer_class(super().get_object()).data
 
-        general_settings = GlobalSettings.objects.filter(name="general").first()
-        scale_key = (
-            general_settings.value.get("security_objective_scale", "1-4")
-            if general_settings
-            else "1-4"
+        scale_key = get_global_setting(GlobalSettings.Names.GENERAL, {}).get(
+            "security_objective_scale", "1-4"
         )
         objective_scale = Asset.SECURITY_OBJECTIVES_SCALES[scale_key]
 
@@ -3319,22 +3814,14 @@ class RiskAssessmentViewSet(BaseModelViewSet):
                 scenario.strength_of_knowledge = RiskScenario.DEFAULT_SOK_OPTIONS[
                     scenario.strength_of_knowledge
                 ]["name"]
-            general_settings = GlobalSettings.objects.filter(name="general").first()
-            swap_axes = general_settings.value.get("risk_matrix_swap_axes", False)
-            flip_vertical = general_settings.value.get(
-                "risk_matrix_flip_vertical", False
-            )
+            general_settings = get_global_setting(GlobalSettings.Names.GENERAL, {})
+            swap_axes = general_settings.get("risk_matrix_swap_axes", False)
+            flip_vertical = general_settings.get("risk_matrix_flip_vertical", False)
             matrix_settings = {
                 "swap_axes": "_swapaxes" if swap_axes else "",
                 "flip_vertical": "_vflip" if flip_vertical else "",
             }
-            ff_settings = GlobalSettings.objects.filter(
-                name=GlobalSettings.Names.FEATURE_FLAGS
-            ).first()
-            if ff_settings is None:
-                feature_flags = {}
-            else:
-                feature_flags = ff_settings.value
+            feature_flags = get_global_setting(GlobalSettings.Names.FEATURE_FLAGS, {})
             data = {
                 "context": context,
                 "risk_assessment": risk_assessment,
@@ -3951,7 +4438,7 @@ class AppliedControlFilterSet(GenericFilterSet):
         }
 
 
-class AppliedControlViewSet(ExportMixin, BaseModelViewSet):
+class AppliedControlViewSet(BulkWriteMixin, ExportMixin, BaseModelViewSet):
     """
     API endpoint that allows applied controls to be viewed or edited.
     """
@@ -3959,6 +4446,26 @@ class AppliedControlViewSet(ExportMixin, BaseModelViewSet):
     model = AppliedControl
     filterset_class = AppliedControlFilterSet
     search_fields = ["name", "description", "ref_id"]
+    # Owner assignments send notifications from the serializer
+    bulk_serializer_fields = ("owner",)
+    bulk_select_related = ("reference_control",)
+
+    def bulk_prepare_instance(self, instance, previous=None) -> None:
+        instance.update_derived_fields()
+        super().bulk_prepare_instance(instance, previous)
+        if previous is not None:
+            self.bulk_context.setdefault("changed_fields", {})[instance.pk] = (
+                instance._get_changed_fields(previous)
+            )
+
+    def bulk_after_write(self, created, updated) -> None:
+        changed_fields = self.bulk_context.get("changed_fields", {})
+        for control in created:
+            control._trigger_sync(is_new=True, changed_fields=[])
+        for control in updated:
+            control._trigger_sync(
+                is_new=False, changed_fields=changed_fields.get(control.pk, [])
+            )
 
     @staticmethod
     def _extract_cost_field(control, *path):
@@ -5111,7 +5618,7 @@ class RiskScenarioFilter(GenericFilterSet):
         }
 
 
-class RiskScenarioViewSet(ExportMixin, BaseModelViewSet):
+class RiskScenarioViewSet(BulkWriteMixin, ExportMixin, BaseModelViewSet):
     """
     API endpoint that allows risk scenarios to be viewed or edited.
     """
@@ -5120,6 +5627,35 @@ class RiskScenarioViewSet(ExportMixin, BaseModelViewSet):
     filterset_class = RiskScenarioFilter
     ordering = ["ref_id"]
     search_fields = ["name", "description", "ref_id"]
+    bulk_match_scope = ("risk_assessment",)
+    bulk_select_related = ("risk_assessment__risk_matrix",)
+
+    def bulk_prepare_instance(self, instance, previous=None) -> None:
+        if not instance.ref_id:
+            used_ref_ids = self.bulk_context.setdefault("ref_ids", {})
+            if instance.risk_assessment_id not in used_ref_ids:
+                used_ref_ids[instance.risk_assessment_id] = set(
+                    RiskScenario.objects.filter(
+                        risk_assessment_id=instance.risk_assessment_id
+                    ).values_list("ref_id", flat=True)
+                )
+            ref_ids = used_ref_ids[instance.risk_assessment_id]
+            instance.ref_id = RiskScenario.get_default_ref_id(
+                instance.risk_assessment, used_ref_ids=ref_ids
+            )
+            ref_ids.add(instance.ref_id)
+        instance.update_risk_levels()
+        super().bulk_prepare_instance(instance, previous)
+
+    def bulk_after_write(self, created, updated) -> None:
+        assessment_ids = {
+            scenario.risk_assessment_id for scenario in chain(created, updated)
+        }
+        RiskAssessment.objects.filter(id__in=assessment_ids).update(
+            updated_at=timezone.now()
+        )
+        for risk_assessment in RiskAssessment.objects.filter(id__in=assessment_ids):
+            risk_assessment.upsert_daily_metrics()
 
     export_config = {
         "fields": {
@@ -5791,10 +6327,8 @@ class ActorViewSet(BaseModelViewSet):
             ),
         )
 
-        allow_entities = (
-            GlobalSettings.objects.filter(name=GlobalSettings.Names.GENERAL)
-            .values_list("value__allow_assignments_to_entities", flat=True)
-            .first()
+        allow_entities = get_global_setting(GlobalSettings.Names.GENERAL, {}).get(
+            "allow_assignments_to_entities"
         )
         if not allow_entities:
             queryset = queryset.filter(entity__isnull=True)
@@ -7724,7 +8258,7 @@ class RequirementViewSet(BaseModelViewSet):
         )
 
 
-class EvidenceViewSet(BaseModelViewSet):
+class EvidenceViewSet(BulkWriteMixin, BaseModelViewSet):
     """
     API endpoint that allows evidences to be viewed or edited.
     """
@@ -7746,6 +8280,27 @@ class EvidenceViewSet(BaseModelViewSet):
         "contracts",
     ]
 
+    def bulk_after_write(self, created, updated) -> None:
+        EvidenceRevision.objects.bulk_create(
+            [
+                EvidenceRevision(
+                    evidence=evidence,
+                    folder=evidence.folder,
+                    is_published=evidence.is_published,
+                )
+                for evidence in created
+            ],
+            batch_size=self.bulk_batch_size,
+        )
+        # Keep revisions in the folder and publication state of their evidence
+        revisions = defaultdict(list)
+        for evidence in updated:
+            revisions[(evidence.folder_id, evidence.is_published)].append(evidence.pk)
+        for (folder_id, is_published), evidence_ids in revisions.items():
+            EvidenceRevision.objects.filter(evidence_id__in=evidence_ids).update(
+                folder_id=folder_id, is_published=is_published
+            )
+
     @action(detail=False, name="Get all evidences owners")
     def owner(self, request):
         return Response(
@@ -9392,12 +9947,16 @@ class ComplianceAssessmentViewSet(BaseModelViewSet):
         return Response(analytics_data, status=status.HTTP_200_OK)
 
 
-class RequirementAssessmentViewSet(BaseModelViewSet):
+class RequirementAssessmentViewSet(BulkWriteMixin, BaseModelViewSet):
     """
     API endpoint that allows requirement assessments to be viewed or edited.
     """
 
     model = RequirementAssessment
+    # Requirement assessments are created along with their compliance assessment
+    bulk_modes = ("update",)
+    bulk_select_related = ("requirement", "compliance_assessment")
+    bulk_serializer_fields = ("answers",)
     filterset_fields = [
         "folder",
         "folder__name",
@@ -9445,6 +10004,26 @@ class RequirementAssessmentViewSet(BaseModelViewSet):
         cache.clear()
         return response
 
+    def bulk_requires_serializer(self, instance, validated_data) -> bool:
+        # The serializer recomputes score and result from the questions
+        return super().bulk_requires_serializer(instance, validated_data) or bool(
+            instance.requirement.questions
+        )
+
+    def bulk_after_write(self, created, updated) -> None:
+        assessment_ids = {
+            requirement_assessment.compliance_assessment_id
+            for requirement_assessment in updated
+        }
+        ComplianceAssessment.objects.filter(id__in=assessment_ids).update(
+            updated_at=timezone.now()
+        )
+        for compliance_assessment in ComplianceAssessment.objects.filter(
+            id__in=assessment_ids
+        ):
+            compliance_assessment.upsert_daily_metrics()
+        cache.clear()
+
     @action(detail=False, name="Get updatable measures")
     def updatables(self, request):
         (_, object_ids_change, _) = RoleAssignment.get_accessible_object_ids(
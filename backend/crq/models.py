@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 
@@ -11,10 +12,13 @@ from core.models import (
     Threat,
     Vulnerability,
 )
+from global_settings.cache import get_global_setting
 from global_settings.models import GlobalSettings
 from iam.models import FolderMixin, User
 from .utils import (
     simulate_scenario_annual_loss,
+    simulate_scenario_annual_loss_adaptive,
+    estimate_simulation_precision,
     create_loss_exceedance_curve,
     calculate_risk_insights,
     risk_tolerance_curve,
@@ -23,6 +27,21 @@ from .utils import (
 from auditlog.registry import auditlog
 
 
+def get_adaptive_simulation_options():
+    """
+    Return the adaptive Monte Carlo options from settings, or None when
+    simulations should run with a fixed number of iterations.
+    """
+    if not getattr(settings, "CRQ_ADAPTIVE_SIMULATION", False):
+        return None
+    return {
+        "relative_tolerance": settings.CRQ_SIMULATION_RELATIVE_TOLERANCE,
+        "batch_size": settings.CRQ_SIMULATION_BATCH_SIZE,
+        "min_simulations": settings.CRQ_SIMULATION_MIN_ITERATIONS,
+        "max_simulations": settings.CRQ_SIMULATION_MAX_ITERATIONS,
+    }
+
+
 class QuantitativeRiskStudy(NameDescriptionMixin, ETADueDateMixin, FolderMixin):
     class Status(models.TextChoices):
         PLANNED = "planned", _("Planned")
@@ -91,9 +110,8 @@ class QuantitativeRiskStudy(NameDescriptionMixin, ETADueDateMixin, FolderMixin):
             return "Not configured"
 
         # Get currency from global settings
-        general_settings = GlobalSettings.objects.filter(name="general").first()
-        currency = (
-            general_settings.value.get("currency", "€") if general_settings else "€"
+        currency = get_global_setting(GlobalSettings.Names.GENERAL, {}).get(
+            "currency", "€"
         )
 
         points = self.risk_tolerance["points"]
@@ -141,9 +159,8 @@ class QuantitativeRiskStudy(NameDescriptionMixin, ETADueDateMixin, FolderMixin):
             return "Not set"
 
         # Get currency from global settings
-        general_settings = GlobalSettings.objects.filter(name="general").first()
-        currency = (
-            general_settings.value.get("currency", "€") if general_settings else "€"
+        currency = get_global_setting(GlobalSettings.Names.GENERAL, {}).get(
+            "currency", "€"
         )
 
         return f"{self.loss_threshold:,.0f} {currency}"
@@ -194,6 +211,8 @@ class QuantitativeRiskStudy(NameDescriptionMixin, ETADueDateMixin, FolderMixin):
             },
         }
 
+        adaptive_options = get_adaptive_simulation_options()
+
         # Generate current portfolio simulation
         current_scenarios_params = {}
         current_scenarios_info = []
@@ -241,6 +260,7 @@ class QuantitativeRiskStudy(NameDescriptionMixin, ETADueDateMixin, FolderMixin):
                     n_simulations=100_000,
                     random_seed=42,
                     loss_threshold=self.loss_threshold,
+                    adaptive_options=adaptive_options,
                 )
                 if "Portfolio_Total" in current_results:
                     portfolio_result = current_results["Portfolio_Total"]
@@ -248,6 +268,7 @@ class QuantitativeRiskStudy(NameDescriptionMixin, ETADueDateMixin, FolderMixin):
                         "loss": portfolio_result["loss"],
                         "probability": portfolio_result["probability"],
                         "metrics": portfolio_result.get("metrics", {}),
+                        "precision": portfolio_result.get("precision"),
                         "scenarios": current_scenarios_info,
                         "total_scenarios": len(current_scenarios_info),
                         "method": "direct_simulation",
@@ -305,6 +326,7 @@ class QuantitativeRiskStudy(NameDescriptionMixin, ETADueDateMixin, FolderMixin):
                     n_simulations=100_000,
                     random_seed=43,
                     loss_threshold=self.loss_threshold,
+                    adaptive_options=adaptive_options,
                 )
                 if "Portfolio_Total" in residual_results:
                     portfolio_result = residual_results["Portfolio_Total"]
@@ -312,6 +334,7 @@ class QuantitativeRiskStudy(NameDescriptionMixin, ETADueDateMixin, FolderMixin):
                         "loss": portfolio_result["loss"],
                         "probability": portfolio_result["probability"],
                         "metrics": portfolio_result.get("metrics", {}),
+                        "precision": portfolio_result.get("precision"),
                         "scenarios": residual_scenarios_info,
                         "total_scenarios": len(residual_scenarios_info),
                         "method": "direct_simulation",
@@ -473,9 +496,8 @@ class QuantitativeRiskScenario(NameDescriptionMixin, FolderMixin):
     def _format_currency(self, value):
         """Helper method to format currency values."""
         # Get currency from global settings
-        general_settings = GlobalSettings.objects.filter(name="general").first()
-        currency = (
-            general_settings.value.get("currency", "€") if general_settings else "€"
+        currency = get_global_setting(GlobalSettings.Names.GENERAL, {}).get(
+            "currency", "€"
         )
 
         if value >= 1_000_000:
@@ -636,18 +658,34 @@ class QuantitativeRiskHypothesis(
         if upper_bound <= lower_bound:
             raise ValueError("Upper bound must be greater than lower bound")
 
-        # Simulation configuration (can be made configurable later)
+        # Simulation configuration, adaptive mode is enabled through settings
         n_simulations = 50_000
         random_seed = 42
+        adaptive_options = get_adaptive_simulation_options()
 
         # 1. Run the simulation using actual parameters
-        losses = simulate_scenario_annual_loss(
-            probability=probability,
-            lower_bound=lower_bound,
-            upper_bound=upper_bound,
-            n_simulations=n_simulations,
-            random_seed=random_seed,
-        )
+        if adaptive_options is not None:
+            losses, precision = simulate_scenario_annual_loss_adaptive(
+                probability=probability,
+                lower_bound=lower_bound,
+                upper_bound=upper_bound,
+                random_seed=random_seed,
+                **adaptive_options,
+            )
+            n_simulations = precision["n_simulations"]
+        else:
+            losses = simulate_scenario_annual_loss(
+                probability=probability,
+                lower_bound=lower_bound,
+                upper_bound=upper_bound,
+                n_simulations=n_simulations,
+                random_seed=random_seed,
+            )
+            precision = {
+                "mode": "fixed",
+                "n_simulations": n_simulations,
+                "metrics": estimate_simulation_precision(losses),
+            }
 
         # 2. Generate Loss Exceedance Curve
         loss_values, exceedance_probs = create_loss_exceedance_curve(losses)
@@ -675,6 +713,7 @@ class QuantitativeRiskHypothesis(
                 "distribution": distribution,
                 "n_simulations": n_simulations,
             },
+            "precision": precision,
             "simulation_timestamp": str(self.updated_at),
         }
 
@@ -738,9 +777,8 @@ class QuantitativeRiskHypothesis(
     def _format_currency(self, value):
         """Helper method to format currency values."""
         # Get currency from global settings
-        general_settings = GlobalSettings.objects.filter(name="general").first()
-        currency = (
-            general_settings.value.get("currency", "€") if general_settings else "€"
+        currency = get_global_setting(GlobalSettings.Names.GENERAL, {}).get(
+            "currency", "€"
         )
 
         if value >= 1_000_000:
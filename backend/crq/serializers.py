@@ -368,10 +368,9 @@ class QuantitativeRiskHypothesisReadSerializer(BaseModelSerializer):
 
     def get_currency(self, obj):
         """Return currency symbol from global settings"""
-        from global_settings.models import GlobalSettings
+        from global_settings.cache import get_global_setting
 
-        general_settings = GlobalSettings.objects.filter(name="general").first()
-        return general_settings.value.get("currency", "€") if general_settings else "€"
+        return get_global_setting("general", {}).get("currency", "€")
 
     loss_threshold = serializers.SerializerMethodField()
     loss_threshold_display = serializers.SerializerMethodField()
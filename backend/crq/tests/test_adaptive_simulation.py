@@ -0,0 +1,137 @@
+"""
+Tests for the adaptive-precision Monte Carlo simulation.
+"""
+
+import numpy as np
+import pytest
+
+from crq.utils import (
+    estimate_simulation_precision,
+    is_precision_reached,
+    run_adaptive_simulation,
+    run_combined_simulation,
+    simulate_portfolio_annual_losses_adaptive,
+    simulate_scenario_annual_loss_adaptive,
+)
+
+
+class TestSimulationPrecision:
+    def test_mean_standard_error(self):
+        rng = np.random.default_rng(0)
+        losses = rng.lognormal(10, 1, 100_000)
+
+        precision = estimate_simulation_precision(losses)
+
+        expected = np.std(losses, ddof=1) / np.sqrt(len(losses))
+        assert precision["mean_annual_loss"]["standard_error"] == pytest.approx(
+            expected
+        )
+        assert 0 < precision["var_99"]["relative_half_width"] < 0.05
+
+    def test_percentile_on_zero_mass_has_no_relative_precision(self):
+        losses = np.zeros(10_000)
+        losses[:10] = 1_000.0
+
+        precision = estimate_simulation_precision(losses)
+
+        assert precision["var_95"]["estimate"] == 0
+        assert precision["var_95"]["relative_half_width"] is None
+        assert is_precision_reached(
+            {"var_95": precision["var_95"]}, relative_tolerance=0.05
+        )
+
+    def test_zero_ale_never_converges(self):
+        precision = estimate_simulation_precision(np.zeros(10_000))
+
+        assert not is_precision_reached(precision, relative_tolerance=0.05)
+
+
+class TestAdaptiveSimulation:
+    def test_scenario_stops_when_tolerance_reached(self):
+        losses, report = simulate_scenario_annual_loss_adaptive(
+            probability=0.3,
+            lower_bound=10_000,
+            upper_bound=1_000_000,
+            relative_tolerance=0.05,
+        )
+
+        assert report["converged"]
+        assert report["n_simulations"] == len(losses)
+        assert report["n_simulations"] < 1_000_000
+        for name in ("mean_annual_loss", "var_95", "var_99"):
+            assert report["metrics"][name]["relative_half_width"] <= 0.05
+
+    def test_scenario_is_capped_by_max_simulations(self):
+        losses, report = simulate_scenario_annual_loss_adaptive(
+            probability=0.001,
+            lower_bound=10_000,
+            upper_bound=1_000_000,
+            relative_tolerance=0.01,
+            max_simulations=50_000,
+        )
+
+        assert not report["converged"]
+        assert len(losses) == 50_000
+
+    def test_unconverged_report_covers_all_simulations(self):
+        calls = []
+
+        def sample_batch(rng, size):
+            # Precise ALE with a wide 99th percentile, then a volatile tail
+            calls.append(size)
+            losses = np.full(size, 1_000.0)
+            tail = rng.random(size) < 0.03
+            sigma = 1.5 if len(calls) <= 2 else 4.0
+            losses[tail] = rng.lognormal(8, sigma, tail.sum())
+            return {"losses": losses}
+
+        results, report = run_adaptive_simulation(
+            sample_batch,
+            target="losses",
+            relative_tolerance=0.05,
+            max_simulations=50_000,
+            random_seed=1,
+        )
+
+        assert not report["converged"]
+        assert report["metrics"] == estimate_simulation_precision(results["losses"])
+
+    def test_scenario_is_reproducible(self):
+        kwargs = dict(probability=0.2, lower_bound=1_000, upper_bound=100_000)
+
+        first, _ = simulate_scenario_annual_loss_adaptive(**kwargs)
+        second, _ = simulate_scenario_annual_loss_adaptive(**kwargs)
+
+        np.testing.assert_array_equal(first, second)
+
+    def test_portfolio_total_is_sum_of_scenarios(self):
+        scenarios = [
+            {"name": "a", "probability": 0.2, "lower_bound": 1e3, "upper_bound": 1e5},
+            {"name": "b", "probability": 0.5, "lower_bound": 1e4, "upper_bound": 1e6},
+        ]
+
+        results, report = simulate_portfolio_annual_losses_adaptive(
+            scenarios, random_seed=1
+        )
+
+        np.testing.assert_allclose(
+            results["Portfolio_Total"], results["a"] + results["b"]
+        )
+        assert report["converged"]
+
+    def test_combined_simulation_reports_precision(self):
+        scenarios = {
+            "a": {"probability": 0.4, "lower_bound": 1e3, "upper_bound": 1e5},
+        }
+
+        results = run_combined_simulation(
+            scenarios,
+            random_seed=1,
+            adaptive_options={"relative_tolerance": 0.05},
+        )
+
+        precision = results["Portfolio_Total"]["precision"]
+        assert precision["mode"] == "adaptive"
+        assert precision["n_simulations"] == len(
+            results["Portfolio_Total"]["raw_losses"]
+        )
@@ -1,6 +1,6 @@
 import numpy as np
 from scipy.stats import norm, lognorm
-from typing import Dict, Tuple, List, Optional
+from typing import Callable, Dict, Tuple, List, Optional
 
 
 def mu_sigma_from_lognorm_90pct(lower_bound: float, upper_bound: float):
@@ -58,6 +58,302 @@ def simulate_scenario_annual_loss(
     return losses
 
 
+# Percentiles whose precision drives the adaptive stopping rule, keyed by the
+# metric name used in calculate_risk_insights
+ADAPTIVE_TRACKED_PERCENTILES = {"var_95": 95, "var_99": 99}
+
+
+def estimate_simulation_precision(
+    losses: np.ndarray,
+    percentiles: Optional[Dict[str, float]] = None,
+    confidence_level: float = 0.95,
+) -> Dict[str, Dict[str, float]]:
+    """
+    Estimate the Monte Carlo precision of the ALE and of tail percentiles.
+
+    The ALE uses the standard error of the mean. Percentiles use the
+    distribution-free order-statistic confidence interval, which stays valid
+    for the heavy-tailed, zero-inflated losses produced by the simulation.
+
+    Args:
+        losses: Array of simulated annual losses
+        percentiles: Mapping of metric name to percentile (0-100)
+        confidence_level: Confidence level of the reported half-widths
+
+    Returns:
+        Dictionary keyed by metric name with estimate, half_width and
+        relative_half_width (None when the interval touches the zero-loss mass,
+        where a relative precision is meaningless)
+    """
+    if percentiles is None:
+        percentiles = ADAPTIVE_TRACKED_PERCENTILES
+
+    n = len(losses)
+    if n == 0:
+        return {}
+
+    z = float(norm.ppf(0.5 + confidence_level / 2))
+
+    mean = float(np.mean(losses))
+    standard_error = float(np.std(losses, ddof=1) / np.sqrt(n)) if n > 1 else 0.0
+    half_width = z * standard_error
+    precision = {
+        "mean_annual_loss": {
+            "estimate": mean,
+            "standard_error": standard_error,
+            "half_width": half_width,
+            "relative_half_width": half_width / mean if mean > 0 else None,
+        }
+    }
+
+    # Only the order statistics bounding each interval are needed, so a single
+    # partial sort is enough
+    bounds = {}
+    for name, percentile in percentiles.items():
+        p = percentile / 100
+        spread = z * np.sqrt(n * p * (1 - p))
+        bounds[name] = (
+            int(np.clip(np.floor(n * p - spread), 0, n - 1)),
+            int(np.clip(np.ceil(n * p + spread), 0, n - 1)),
+        )
+    ranks = sorted({rank for pair in bounds.values() for rank in pair})
+    partitioned = np.partition(losses, ranks)
+
+    for name, percentile in percentiles.items():
+        lower_rank, upper_rank = bounds[name]
+        lower, upper = float(partitioned[lower_rank]), float(partitioned[upper_rank])
+        estimate = float(np.percentile(losses, percentile))
+        half_width = (upper - lower) / 2
+        precision[name] = {
+            "estimate": estimate,
+            "half_width": half_width,
+            "relative_half_width": half_width / estimate if lower > 0 else None,
+        }
+
+    return precision
+
+
+def is_precision_reached(
+    precision: Dict[str, Dict[str, float]], relative_tolerance: float
+) -> bool:
+    """
+    Check whether every tracked metric is within the relative tolerance.
+
+    Percentiles whose interval touches the zero-loss mass have no meaningful
+    relative precision and do not hold the simulation back. A zero ALE (no
+    event drawn yet) never counts as converged.
+    """
+    if not precision:
+        return False
+    for name, metric in precision.items():
+        relative = metric["relative_half_width"]
+        if relative is None:
+            if name == "mean_annual_loss":
+                return False
+        elif relative > relative_tolerance:
+            return False
+    return True
+
+
+def run_adaptive_simulation(
+    sample_batch: Callable[[np.random.Generator, int], Dict[str, np.ndarray]],
+    target: str,
+    relative_tolerance: float = 0.05,
+    batch_size: int = 10_000,
+    min_simulations: int = 10_000,
+    max_simulations: int = 1_000_000,
+    random_seed: Optional[int] = None,
+    confidence_level: float = 0.95,
+    percentiles: Optional[Dict[str, float]] = None,
+) -> Tuple[Dict[str, np.ndarray], Dict]:
+    """
+    Run a Monte Carlo simulation in batches until the target series converges.
+
+    Args:
+        sample_batch: Callable drawing one batch, returning loss arrays by name
+        target: Name of the loss array whose precision drives the stopping rule
+        relative_tolerance: Maximum relative half-width for ALE and tracked VaRs
+        batch_size: Number of iterations per batch
+        min_simulations: Iterations always run before testing convergence
+        max_simulations: Hard cap on the number of iterations
+        random_seed: Random seed for reproducibility
+        confidence_level: Confidence level of the precision estimates
+        percentiles: Tracked percentiles, defaults to ADAPTIVE_TRACKED_PERCENTILES
+
+    Returns:
+        (losses_by_name, precision_report)
+    """
+    if batch_size <= 0:
+        raise ValueError("Batch size must be positive")
+    if relative_tolerance <= 0:
+        raise ValueError("Relative tolerance must be positive")
+
+    rng = np.random.default_rng(random_seed)
+    z = float(norm.ppf(0.5 + confidence_level / 2))
+    batches: Dict[str, List[np.ndarray]] = {}
+    n_simulations = 0
+    n_batches = 0
+    target_sum = 0.0
+    target_sum_squares = 0.0
+    precision: Dict[str, Dict[str, float]] = {}
+    converged = False
+
+    while n_simulations < max_simulations:
+        size = min(batch_size, max_simulations - n_simulations)
+        for name, losses in sample_batch(rng, size).items():
+            batches.setdefault(name, []).append(losses)
+        target_losses = batches[target][-1]
+        target_sum += float(np.sum(target_losses))
+        target_sum_squares += float(np.sum(np.square(target_losses)))
+        n_simulations += size
+        n_batches += 1
+
+        if n_simulations < min_simulations:
+            continue
+
+        # Cheap gate on the ALE from running moments: the percentile intervals
+        # need the full sample and are only evaluated once the ALE is precise
+        mean = target_sum / n_simulations
+        variance = max(target_sum_squares / n_simulations - mean**2, 0.0)
+        if mean <= 0 or z * np.sqrt(variance / n_simulations) > (
+            relative_tolerance * mean
+        ):
+            continue
+
+        precision = estimate_simulation_precision(
+            np.concatenate(batches[target]), percentiles, confidence_level
+        )
+        if is_precision_reached(precision, relative_tolerance):
+            converged = True
+            break
+
+    results = {name: np.concatenate(arrays) for name, arrays in batches.items()}
+    if not converged:
+        # The last checkpoint may predate the final batches
+        precision = estimate_simulation_precision(
+            results[target], percentiles, confidence_level
+        )
+
+    report = {
+        "mode": "adaptive",
+        "converged": converged,
+        "n_simulations": n_simulations,
+        "n_batches": n_batches,
+        "relative_tolerance": relative_tolerance,
+        "confidence_level": confidence_level,
+        "metrics": precision,
+    }
+    return results, report
+
+
+def simulate_scenario_annual_loss_adaptive(
+    probability: float,
+    lower_bound: float,
+    upper_bound: float,
+    relative_tolerance: float = 0.05,
+    batch_size: int = 10_000,
+    min_simulations: int = 10_000,
+    max_simulations: int = 1_000_000,
+    random_seed: int = 42,
+) -> Tuple[np.ndarray, Dict]:
+    """
+    Simulate annual losses for a single scenario until the ALE and tail
+    percentiles reach the requested relative precision.
+
+    Returns:
+        (losses, precision_report)
+    """
+    mu, sigma = mu_sigma_from_lognorm_90pct(lower_bound, upper_bound)
+
+    def sample_batch(rng, size):
+        events_occur = rng.random(size) < probability
+        losses = np.zeros(size)
+        n_events = np.sum(events_occur)
+        if n_events > 0:
+            losses[events_occur] = rng.lognormal(mu, sigma, n_events)
+        return {"losses": losses}
+
+    results, report = run_adaptive_simulation(
+        sample_batch,
+        target="losses",
+        relative_tolerance=relative_tolerance,
+        batch_size=batch_size,
+        min_simulations=min_simulations,
+        max_simulations=max_simulations,
+        random_seed=random_seed,
+    )
+    return results["losses"], report
+
+
+def simulate_portfolio_annual_losses_adaptive(
+    scenario_params: List[Dict[str, float]],
+    relative_tolerance: float = 0.05,
+    batch_size: int = 10_000,
+    min_simulations: int = 10_000,
+    max_simulations: int = 1_000_000,
+    random_seed: Optional[int] = None,
+) -> Tuple[Dict[str, np.ndarray], Dict]:
+    """
+    Adaptive counterpart of simulate_portfolio_annual_losses.
+
+    Scenarios are drawn independently and vectorized per batch; the stopping
+    rule is evaluated on 'Portfolio_Total'.
+
+    Returns:
+        (losses_by_scenario, precision_report)
+    """
+    if not scenario_params:
+        return {}, {}
+
+    scenario_distributions = []
+    for scenario in scenario_params:
+        if scenario["upper_bound"] <= scenario["lower_bound"]:
+            raise ValueError(
+                f"Upper bound must be greater than lower bound for scenario {scenario.get('name', 'unnamed')}"
+            )
+        if scenario["lower_bound"] <= 0:
+            raise ValueError(
+                f"Lower bound must be positive for scenario {scenario.get('name', 'unnamed')}"
+            )
+        mu, sigma = mu_sigma_from_lognorm_90pct(
+            scenario["lower_bound"], scenario["upper_bound"]
+        )
+        scenario_distributions.append(
+            {
+                "name": scenario["name"],
+                "probability": scenario["probability"],
+                "mu": mu,
+                "sigma": sigma,
+            }
+        )
+
+    def sample_batch(rng, size):
+        batch = {}
+        portfolio_losses = np.zeros(size)
+        for scenario_dist in scenario_distributions:
+            events_occur = rng.random(size) < scenario_dist["probability"]
+            losses = np.zeros(size)
+            n_events = np.sum(events_occur)
+            if n_events > 0:
+                losses[events_occur] = rng.lognormal(
+                    scenario_dist["mu"], scenario_dist["sigma"], n_events
+                )
+            batch[scenario_dist["name"]] = losses
+            portfolio_losses += losses
+        batch["Portfolio_Total"] = portfolio_losses
+        return batch
+
+    return run_adaptive_simulation(
+        sample_batch,
+        target="Portfolio_Total",
+        relative_tolerance=relative_tolerance,
+        batch_size=batch_size,
+        min_simulations=min_simulations,
+        max_simulations=max_simulations,
+        random_seed=random_seed,
+    )
+
+
 def create_loss_exceedance_curve(losses: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
     """
     Create Loss Exceedance Curve from loss data.
@@ -317,6 +613,7 @@ def run_combined_simulation(
     correlation_matrix: Optional[np.ndarray] = None,
     random_seed: Optional[int] = None,
     loss_threshold: Optional[float] = None,
+    adaptive_options: Optional[Dict] = None,
 ) -> Dict[str, Dict]:
     """
     Run combined Monte Carlo simulation for multiple scenarios with consistent aggregation.
@@ -328,9 +625,15 @@ def run_combined_simulation(
         correlation_matrix: Optional correlation matrix for scenarios
         random_seed: Random seed for reproducibility
         loss_threshold: Optional loss threshold for probability calculations
+        adaptive_options: Optional keyword arguments for
+                          simulate_portfolio_annual_losses_adaptive. When set
+                          (and no correlation matrix is given), the simulation
+                          stops once the portfolio ALE and VaRs reach the
+                          requested precision instead of running n_simulations.
 
     Returns:
         Dictionary with scenario results and combined portfolio metrics.
+        'Portfolio_Total' includes a 'precision' report.
     """
     if not scenarios_params:
         return {}
@@ -350,15 +653,27 @@ def run_combined_simulation(
         )
 
     # Run simulation
+    precision = None
     if correlation_matrix is not None:
         loss_results = simulate_portfolio_with_correlation(
             scenario_list, correlation_matrix, n_simulations, random_seed
         )
+    elif adaptive_options is not None:
+        loss_results, precision = simulate_portfolio_annual_losses_adaptive(
+            scenario_list, random_seed=random_seed, **adaptive_options
+        )
     else:
         loss_results = simulate_portfolio_annual_losses(
             scenario_list, n_simulations, random_seed
         )
 
+    if precision is None and "Portfolio_Total" in loss_results:
+        precision = {
+            "mode": "fixed",
+            "n_simulations": n_simulations,
+            "metrics": estimate_simulation_precision(loss_results["Portfolio_Total"]),
+        }
+
     # Process results for each scenario + portfolio
     results = {}
 
@@ -386,6 +701,8 @@ def run_combined_simulation(
             "metrics": metrics,
             "raw_losses": losses,  # Keep for further analysis if needed
         }
+        if name == "Portfolio_Total":
+            results[name]["precision"] = precision
 
     return results
 
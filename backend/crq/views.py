@@ -9,6 +9,7 @@ from django.db import transaction
 
 from core.views import BaseModelViewSet as AbstractBaseModelViewSet, ActionPlanList
 from core.models import AppliedControl
+from global_settings.cache import get_global_setting
 from global_settings.models import GlobalSettings
 
 from .models import (
@@ -59,9 +60,8 @@ class QuantitativeRiskStudyViewSet(BaseModelViewSet):
         study: QuantitativeRiskStudy = self.get_object()  # type: ignore[unreachable]
 
         # Get currency from global settings
-        general_settings = GlobalSettings.objects.filter(name="general").first()
-        currency = (
-            general_settings.value.get("currency", "€") if general_settings else "€"
+        currency = get_global_setting(GlobalSettings.Names.GENERAL, {}).get(
+            "currency", "€"
         )
 
         # Initialize totals
@@ -163,9 +163,8 @@ class QuantitativeRiskStudyViewSet(BaseModelViewSet):
         study: QuantitativeRiskStudy = self.get_object()
 
         # Get currency from global settings
-        general_settings = GlobalSettings.objects.filter(name="general").first()
-        currency = (
-            general_settings.value.get("currency", "€") if general_settings else "€"
+        currency = get_global_setting(GlobalSettings.Names.GENERAL, {}).get(
+            "currency", "€"
         )
 
         curves = []
@@ -328,9 +327,8 @@ class QuantitativeRiskStudyViewSet(BaseModelViewSet):
         study: QuantitativeRiskStudy = self.get_object()
 
         # Get currency from global settings
-        general_settings = GlobalSettings.objects.filter(name="general").first()
-        currency = (
-            general_settings.value.get("currency", "€") if general_settings else "€"
+        currency = get_global_setting(GlobalSettings.Names.GENERAL, {}).get(
+            "currency", "€"
         )
 
         # Get all selected scenarios regardless of status, ordered by priority then ref_id
@@ -669,9 +667,8 @@ class QuantitativeRiskStudyViewSet(BaseModelViewSet):
         study: QuantitativeRiskStudy = self.get_object()
 
         # Get currency from global settings
-        general_settings = GlobalSettings.objects.filter(name="general").first()
-        currency = (
-            general_settings.value.get("currency", "€") if general_settings else "€"
+        currency = get_global_setting(GlobalSettings.Names.GENERAL, {}).get(
+            "currency", "€"
         )
 
         scenarios_data = []
@@ -776,9 +773,8 @@ class QuantitativeRiskStudyViewSet(BaseModelViewSet):
         study: QuantitativeRiskStudy = self.get_object()
 
         # Get currency from global settings
-        general_settings = GlobalSettings.objects.filter(name="general").first()
-        currency = (
-            general_settings.value.get("currency", "€") if general_settings else "€"
+        currency = get_global_setting(GlobalSettings.Names.GENERAL, {}).get(
+            "currency", "€"
         )
 
         scenarios_data = []
@@ -1202,9 +1198,8 @@ class QuantitativeRiskScenarioViewSet(BaseModelViewSet):
                     )
 
         # Get currency from global settings
-        general_settings = GlobalSettings.objects.filter(name="general").first()
-        currency = (
-            general_settings.value.get("currency", "€") if general_settings else "€"
+        currency = get_global_setting(GlobalSettings.Names.GENERAL, {}).get(
+            "currency", "€"
         )
 
         # Return the combined curves data
@@ -1,6 +1,7 @@
 from django.db.models.query import QuerySet
 import math
 import random
+from global_settings.cache import get_global_setting
 from global_settings.models import GlobalSettings
 from .models import (
     AttackPath,
@@ -32,7 +33,9 @@ def ecosystem_circular_chart_data(stakeholders_queryset: QuerySet):
     }
     """
     qs = stakeholders_queryset
-    max_val = GlobalSettings.objects.get(name="general").value.get("ebios_radar_max", 6)
+    max_val = get_global_setting(GlobalSettings.Names.GENERAL, {}).get(
+        "ebios_radar_max", 6
+    )
 
     def get_maturity_group(reliability_value):
         """Group by cyber reliability (maturity * trust)"""
@@ -238,7 +241,9 @@ def ecosystem_radar_chart_data(stakeholders_queryset: QuerySet):
     r_data = {"clst1": [], "clst2": [], "clst3": [], "clst4": []}
     angle_offset = {"client": 135, "partner": 225, "supplier": 45}
 
-    max_val = GlobalSettings.objects.get(name="general").value.get("ebios_radar_max", 6)
+    max_val = get_global_setting(GlobalSettings.Names.GENERAL, {}).get(
+        "ebios_radar_max", 6
+    )
 
     for sh in qs:
         # current
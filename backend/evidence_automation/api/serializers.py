@@ -84,9 +84,10 @@ class EvidenceCollectionRuleSerializer(serializers.ModelSerializer):
             'id', 'source', 'source_name', 'name', 'description',
             'collection_type', 'collection_type_display', 'query', 'parameters',
             'target_controls', 'target_requirements', 'enabled', 'schedule',
-            'retention_days', 'last_run', 'created_at', 'updated_at', 'folder'
+            'retention_days', 'last_verified_at', 'last_run', 'created_at',
+            'updated_at', 'folder'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'last_verified_at', 'created_at', 'updated_at']
 
     def get_last_run(self, obj):
         last_run = obj.runs.order_by('-created_at').first()
@@ -96,6 +97,7 @@ class EvidenceCollectionRuleSerializer(serializers.ModelSerializer):
                 'status': last_run.status,
                 'started_at': last_run.started_at.isoformat() if last_run.started_at else None,
                 'items_collected': last_run.items_collected,
+                'delta': last_run.delta,
             }
         return None
 
@@ -111,7 +113,8 @@ class EvidenceCollectionRunSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'rule', 'rule_name', 'status', 'status_display',
             'started_at', 'completed_at', 'evidence_created',
-            'items_collected', 'error_message', 'run_log', 'created_at'
+            'items_collected', 'delta', 'error_message', 'run_log', 'timings',
+            'created_at'
         ]
         read_only_fields = '__all__'
 
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("evidence_automation", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="evidencecollectionrun",
+            name="timings",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text="Duration in seconds of the connect, collect and store steps",
+                verbose_name="Timings",
+            ),
+        ),
+    ]
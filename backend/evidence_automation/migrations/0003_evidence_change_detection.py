@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("evidence_automation", "0002_evidencecollectionrun_timings"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="evidencecollectionrule",
+            name="last_verified_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Last collection that stored or confirmed the evidence",
+                null=True,
+                verbose_name="Last Verified",
+            ),
+        ),
+        migrations.AddField(
+            model_name="evidencecollectionrun",
+            name="delta",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text="New, changed and removed items since the last stored collection",
+                verbose_name="Delta",
+            ),
+        ),
+        migrations.AddField(
+            model_name="evidencecollectionrun",
+            name="item_hashes",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                help_text="Content hash of each collected item, by item name",
+                verbose_name="Item Hashes",
+            ),
+        ),
+    ]
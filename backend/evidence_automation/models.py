@@ -176,6 +176,12 @@ class EvidenceCollectionRule(AbstractBaseModel, FolderMixin):
         default=365,
         verbose_name=_('Retention Days')
     )
+    last_verified_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name=_('Last Verified'),
+        help_text=_('Last collection that stored or confirmed the evidence')
+    )
 
     class Meta:
         verbose_name = _('Evidence Collection Rule')
@@ -244,6 +250,24 @@ class EvidenceCollectionRun(AbstractBaseModel):
         blank=True,
         verbose_name=_('Run Log')
     )
+    item_hashes = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name=_('Item Hashes'),
+        help_text=_('Content hash of each collected item, by item name')
+    )
+    delta = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name=_('Delta'),
+        help_text=_('New, changed and removed items since the last stored collection')
+    )
+    timings = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name=_('Timings'),
+        help_text=_('Duration in seconds of the connect, collect and store steps')
+    )
 
     class Meta:
         verbose_name = _('Evidence Collection Run')
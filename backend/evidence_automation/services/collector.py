@@ -5,19 +5,55 @@ Orchestrates automated evidence collection from configured sources.
 """
 
 from typing import Dict, Any, List, Optional
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from django.conf import settings
 from django.utils import timezone
-from django.db import transaction
+from django.db import connections, transaction
 from django.core.files.base import ContentFile
+import hashlib
 import json
+import threading
+import time
 import structlog
 
 from ..models import EvidenceSource, EvidenceCollectionRule, EvidenceCollectionRun
-from .connectors import get_connector, CollectedEvidence
+from .connectors import BaseConnector, get_connector, CollectedEvidence
 
 logger = structlog.get_logger(__name__)
 
 
+class _RateLimiter:
+    """Spaces calls to at most `rate` per second, shared by threads."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_call_at = 0.0
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            call_at = max(now, self._next_call_at)
+            self._next_call_at = call_at + self.interval
+        if call_at > now:
+            time.sleep(call_at - now)
+
+
+def _in_worker_thread(func, *args, **kwargs):
+    """Run func in a pool thread, closing the DB connections the thread opened."""
+    try:
+        return func(*args, **kwargs)
+    finally:
+        connections.close_all()
+
+
+def _elapsed(started: float) -> float:
+    return round(time.monotonic() - started, 3)
+
+
 class EvidenceCollector:
     """
     Service for automated evidence collection.
@@ -76,7 +112,9 @@ class EvidenceCollector:
     def collect_evidence(
         self,
         rule: EvidenceCollectionRule,
-        dry_run: bool = False
+        dry_run: bool = False,
+        connector: Optional[BaseConnector] = None,
+        update_source: bool = True,
     ) -> EvidenceCollectionRun:
         """
         Execute evidence collection for a rule.
@@ -84,6 +122,10 @@ class EvidenceCollector:
         Args:
             rule: The collection rule to execute
             dry_run: If True, don't actually store evidence
+            connector: Connected connector of the rule source, shared by the
+                rules of a scheduled run. If None, a connector is created and
+                connected for this rule only.
+            update_source: If True, record the outcome on the source
 
         Returns:
             EvidenceCollectionRun with results
@@ -96,24 +138,32 @@ class EvidenceCollector:
             status=EvidenceCollectionRun.Status.RUNNING,
             started_at=timezone.now(),
         )
+        timings = {}
+        started = time.monotonic()
+        owns_connector = connector is None
 
         try:
             source = rule.source
-            connector = get_connector(source.source_type, source.config)
+            if owns_connector:
+                connector = get_connector(source.source_type, source.config)
 
-            if not connector:
-                raise ValueError(f'Unsupported source type: {source.source_type}')
+                if not connector:
+                    raise ValueError(f'Unsupported source type: {source.source_type}')
 
-            # Connect
-            if not connector.connect():
-                raise ConnectionError(f'Failed to connect to {source.name}')
+                # Connect
+                step_started = time.monotonic()
+                if not connector.connect():
+                    raise ConnectionError(f'Failed to connect to {source.name}')
+                timings['connect'] = _elapsed(step_started)
 
             # Build parameters
             parameters = dict(rule.parameters)
             parameters['collection_type'] = rule.collection_type
 
             # Collect evidence
+            step_started = time.monotonic()
             collected_items = connector.collect(rule.query or '', parameters)
+            timings['collect'] = _elapsed(step_started)
 
             run.items_collected = len(collected_items)
             run.run_log.append({
@@ -121,19 +171,43 @@ class EvidenceCollector:
                 'message': f'Collected {len(collected_items)} items',
             })
 
-            if not dry_run and collected_items:
+            # Compare with the last stored collection
+            run.item_hashes = self._item_hashes(collected_items)
+            previous_run = self._previous_run(rule, run)
+            run.delta = self._compute_delta(
+                previous_run.item_hashes if previous_run else {}, run.item_hashes
+            )
+            unchanged = previous_run is not None and not any(
+                run.delta[key] for key in ('new', 'changed', 'removed')
+            )
+            run.run_log.append({
+                'timestamp': timezone.now().isoformat(),
+                'message': 'Unchanged since last collection' if unchanged else (
+                    f"{len(run.delta['new'])} new, {len(run.delta['changed'])} changed, "
+                    f"{len(run.delta['removed'])} removed items"
+                ),
+            })
+
+            if not dry_run and unchanged:
+                # Keep the stored evidence, only record that it is still valid
+                run.evidence_created_id = previous_run.evidence_created_id
+                rule.last_verified_at = timezone.now()
+                rule.save(update_fields=['last_verified_at'])
+            elif not dry_run and collected_items:
                 # Store evidence
+                step_started = time.monotonic()
                 evidence = self._store_evidence(rule, collected_items, run)
+                timings['store'] = _elapsed(step_started)
                 run.evidence_created = evidence
+                rule.last_verified_at = timezone.now()
+                rule.save(update_fields=['last_verified_at'])
 
             run.status = EvidenceCollectionRun.Status.SUCCESS
             run.completed_at = timezone.now()
 
             # Update source last collection
-            source.last_collection_at = timezone.now()
-            source.last_collection_status = 'success'
-            source.last_error = None
-            source.save()
+            if update_source:
+                self._update_source(source)
 
         except Exception as e:
             logger.error(
@@ -150,20 +224,196 @@ class EvidenceCollector:
             })
 
             # Update source error status
-            rule.source.last_collection_status = 'error'
-            rule.source.last_error = str(e)
-            rule.source.save()
+            if update_source:
+                self._update_source(rule.source, error=str(e))
 
         finally:
             try:
-                if connector:
+                if owns_connector and connector:
                     connector.disconnect()
             except:
                 pass
 
+        timings['total'] = _elapsed(started)
+        run.timings = timings
         run.save()
         return run
 
+    def collect_source(
+        self,
+        source: EvidenceSource,
+        rules: List[EvidenceCollectionRule],
+        dry_run: bool = False,
+    ) -> List[EvidenceCollectionRun]:
+        """
+        Execute evidence collection for rules of a single source.
+
+        The rules share one connector session. Up to the source max_concurrency
+        rules are collected at the same time, started at most rate_limit times
+        per second (see _source_limits).
+
+        Returns:
+            One EvidenceCollectionRun per rule, in the order of the rules
+        """
+        started = time.monotonic()
+        connector = None
+        try:
+            connector = get_connector(source.source_type, source.config)
+            if not connector:
+                raise ValueError(f'Unsupported source type: {source.source_type}')
+            if not connector.connect():
+                raise ConnectionError(f'Failed to connect to {source.name}')
+        except Exception as e:
+            logger.error(
+                "Evidence source connection failed",
+                source=source.name,
+                error=str(e)
+            )
+            runs = [self._failed_run(rule, str(e)) for rule in rules]
+            self._update_source(source, error=str(e))
+            return runs
+        connect_time = _elapsed(started)
+
+        concurrency, rate_limit = self._source_limits(source)
+        limiter = _RateLimiter(rate_limit)
+
+        def collect(rule):
+            limiter.wait()
+            return self.collect_evidence(
+                rule, dry_run=dry_run, connector=connector, update_source=False
+            )
+
+        try:
+            if concurrency > 1 and len(rules) > 1:
+                with ThreadPoolExecutor(
+                    max_workers=min(concurrency, len(rules))
+                ) as executor:
+                    runs = list(executor.map(
+                        lambda rule: _in_worker_thread(collect, rule), rules
+                    ))
+            else:
+                runs = [collect(rule) for rule in rules]
+        finally:
+            try:
+                connector.disconnect()
+            except:
+                pass
+
+        if runs:
+            # The session is opened once for all the rules of the source
+            runs[0].timings['connect'] = connect_time
+            runs[0].save(update_fields=['timings'])
+
+        errors = [
+            run.error_message for run in runs
+            if run.status == EvidenceCollectionRun.Status.FAILED
+        ]
+        self._update_source(source, error=errors[-1] if errors else None)
+        logger.info(
+            "Evidence source collected",
+            source=source.name,
+            rules=len(rules),
+            failed=len(errors),
+            duration=_elapsed(started),
+        )
+        return runs
+
+    @staticmethod
+    def _content_hash(item: CollectedEvidence) -> str:
+        """
+        SHA-256 of the canonical form of an item: its content type and data.
+        JSON data is serialized with sorted keys so that key order does not
+        matter. Descriptions and metadata hold collection timestamps and are
+        not part of the hash.
+        """
+        if item.content_type == 'json':
+            content = json.dumps(
+                item.data, sort_keys=True, separators=(',', ':'), default=str
+            ).encode('utf-8')
+        elif isinstance(item.data, bytes):
+            content = item.data
+        else:
+            content = str(item.data).encode('utf-8')
+        return hashlib.sha256(
+            item.content_type.encode('utf-8') + b'\0' + content
+        ).hexdigest()
+
+    def _item_hashes(self, collected_items: List[CollectedEvidence]) -> Dict[str, str]:
+        """Content hash of each item, by item name (numbered when names repeat)."""
+        hashes = {}
+        for item in collected_items:
+            key = item.name
+            index = 1
+            while key in hashes:
+                index += 1
+                key = f'{item.name} ({index})'
+            hashes[key] = self._content_hash(item)
+        return hashes
+
+    @staticmethod
+    def _previous_run(
+        rule: EvidenceCollectionRule, run: EvidenceCollectionRun
+    ) -> Optional[EvidenceCollectionRun]:
+        """Last successful run of the rule whose evidence is stored."""
+        previous_run = EvidenceCollectionRun.objects.filter(
+            rule=rule,
+            status=EvidenceCollectionRun.Status.SUCCESS,
+            evidence_created__isnull=False,
+        ).exclude(pk=run.pk).order_by('-created_at').first()
+        # Runs recorded before change detection have no hashes
+        if previous_run is None or not previous_run.item_hashes:
+            return None
+        return previous_run
+
+    @staticmethod
+    def _compute_delta(
+        previous: Dict[str, str], current: Dict[str, str]
+    ) -> Dict[str, Any]:
+        return {
+            'new': sorted(key for key in current if key not in previous),
+            'changed': sorted(
+                key for key in current
+                if key in previous and previous[key] != current[key]
+            ),
+            'removed': sorted(key for key in previous if key not in current),
+            'unchanged': sum(
+                1 for key in current if previous.get(key) == current[key]
+            ),
+        }
+
+    @staticmethod
+    def _source_limits(source: EvidenceSource):
+        """Concurrency and rate limit (collections per second) of a source."""
+        config = source.config or {}
+        concurrency = config.get('max_concurrency') or settings.EVIDENCE_SOURCE_CONCURRENCY
+        rate_limit = config.get('rate_limit', settings.EVIDENCE_SOURCE_RATE_LIMIT)
+        return max(int(concurrency), 1), float(rate_limit or 0)
+
+    @staticmethod
+    def _update_source(source: EvidenceSource, error: Optional[str] = None) -> None:
+        """Record the outcome of the last collection on the source."""
+        if error is None:
+            source.last_collection_at = timezone.now()
+            source.last_collection_status = 'success'
+        else:
+            source.last_collection_status = 'error'
+        source.last_error = error
+        source.save()
+
+    @staticmethod
+    def _failed_run(
+        rule: EvidenceCollectionRule, error: str
+    ) -> EvidenceCollectionRun:
+        now = timezone.now()
+        return EvidenceCollectionRun.objects.create(
+            rule=rule,
+            status=EvidenceCollectionRun.Status.FAILED,
+            started_at=now,
+            completed_at=now,
+            error_message=error,
+            run_log=[{'timestamp': now.isoformat(), 'error': error}],
+        )
+
     def _store_evidence(
         self,
         rule: EvidenceCollectionRule,
@@ -234,13 +484,17 @@ class EvidenceCollector:
         """
         Run all enabled scheduled collections.
 
-        Called by the scheduler/celery task.
+        Called by the scheduler/celery task. Rules are grouped by source, and
+        up to EVIDENCE_COLLECTION_CONCURRENCY sources are collected at the
+        same time.
         """
+        started = time.monotonic()
         results = {
             'total': 0,
             'success': 0,
             'failed': 0,
             'runs': [],
+            'sources': [],
         }
 
         # Get all enabled rules
@@ -250,15 +504,64 @@ class EvidenceCollector:
             source__status=EvidenceSource.Status.ACTIVE,
         ).select_related('source')
 
+        sources = {}
+        rules_by_source = {}
         for rule in rules:
-            results['total'] += 1
+            sources[rule.source_id] = rule.source
+            rules_by_source.setdefault(rule.source_id, []).append(rule)
 
+        def collect(source_id):
+            source_started = time.monotonic()
             try:
-                run = self.collect_evidence(rule)
+                return self.collect_source(
+                    sources[source_id], rules_by_source[source_id]
+                ), None, _elapsed(source_started)
+            except Exception as e:
+                logger.error(
+                    "Evidence source collection failed",
+                    source=sources[source_id].name,
+                    error=str(e)
+                )
+                return None, e, _elapsed(source_started)
+
+        concurrency = max(settings.EVIDENCE_COLLECTION_CONCURRENCY, 1)
+        if concurrency > 1 and len(sources) > 1:
+            with ThreadPoolExecutor(
+                max_workers=min(concurrency, len(sources))
+            ) as executor:
+                outcomes = list(executor.map(
+                    lambda source_id: _in_worker_thread(collect, source_id), sources
+                ))
+        else:
+            outcomes = [collect(source_id) for source_id in sources]
+
+        for source_id, (runs, error, duration) in zip(sources, outcomes):
+            source_rules = rules_by_source[source_id]
+            results['total'] += len(source_rules)
+            results['sources'].append({
+                'source': sources[source_id].name,
+                'rules': len(source_rules),
+                'duration': duration,
+            })
+
+            if error is not None:
+                results['failed'] += len(source_rules)
+                results['runs'].extend(
+                    {
+                        'rule': rule.name,
+                        'status': 'error',
+                        'error': str(error),
+                    }
+                    for rule in source_rules
+                )
+                continue
+
+            for rule, run in zip(source_rules, runs):
                 results['runs'].append({
                     'rule': rule.name,
                     'status': run.status,
                     'items': run.items_collected,
+                    'duration': run.timings.get('total'),
                 })
 
                 if run.status == EvidenceCollectionRun.Status.SUCCESS:
@@ -266,14 +569,7 @@ class EvidenceCollector:
                 else:
                     results['failed'] += 1
 
-            except Exception as e:
-                results['failed'] += 1
-                results['runs'].append({
-                    'rule': rule.name,
-                    'status': 'error',
-                    'error': str(e),
-                })
-
+        results['duration'] = _elapsed(started)
         return results
 
     def get_collection_status(self, source_id: str) -> Dict[str, Any]:
@@ -745,3 +745,158 @@ class TestEvidenceCollectorIntegration:
 
         assert result['source']['name'] == 'Test Source'
         assert result['source']['status'] == 'active'
+
+    @patch('evidence_automation.services.collector.EvidenceCollectionRun')
+    @patch('evidence_automation.services.collector.get_connector')
+    def test_collect_source_shares_connector(
+        self, mock_get_connector, mock_run_model
+    ):
+        """Test that the rules of a source share one connector session."""
+        mock_connector = Mock()
+        mock_connector.connect.return_value = True
+        mock_connector.collect.return_value = []
+        mock_get_connector.return_value = mock_connector
+
+        mock_run_model.objects.create.side_effect = lambda **kwargs: Mock(run_log=[])
+        mock_run_model.objects.filter.return_value.exclude.return_value.order_by.return_value.first.return_value = None
+        mock_run_model.Status.SUCCESS = 'success'
+        mock_run_model.Status.FAILED = 'failed'
+
+        mock_source = Mock()
+        mock_source.config = {'max_concurrency': 2}
+        rules = [Mock(source=mock_source, parameters={}) for _ in range(3)]
+
+        collector = EvidenceCollector()
+        runs = collector.collect_source(mock_source, rules)
+
+        assert [run.status for run in runs] == ['success'] * 3
+        assert mock_connector.connect.call_count == 1
+        assert mock_connector.disconnect.call_count == 1
+        assert mock_connector.collect.call_count == 3
+        assert 'connect' in runs[0].timings
+        assert all('collect' in run.timings for run in runs)
+        assert mock_source.last_collection_status == 'success'
+
+    @patch('evidence_automation.services.collector.EvidenceCollectionRun')
+    @patch('evidence_automation.services.collector.get_connector')
+    def test_collect_source_connection_failed(
+        self, mock_get_connector, mock_run_model
+    ):
+        """Test that every rule of an unreachable source gets a failed run."""
+        mock_connector = Mock()
+        mock_connector.connect.return_value = False
+        mock_get_connector.return_value = mock_connector
+
+        mock_source = Mock()
+        mock_source.name = 'Test Source'
+        rules = [Mock(source=mock_source) for _ in range(2)]
+
+        collector = EvidenceCollector()
+        collector.collect_source(mock_source, rules)
+
+        assert mock_run_model.objects.create.call_count == 2
+        assert mock_connector.collect.call_count == 0
+        assert mock_source.last_collection_status == 'error'
+
+    @patch('evidence_automation.services.collector.EvidenceCollectionRule')
+    def test_run_scheduled_collections_groups_rules_by_source(self, mock_rule_model):
+        """Test that scheduled collections run once per source."""
+        rules = [Mock(source_id=source_id) for source_id in ('a', 'a', 'b')]
+        mock_rule_model.objects.filter.return_value.select_related.return_value = rules
+
+        collector = EvidenceCollector()
+        with patch.object(
+            collector,
+            'collect_source',
+            side_effect=lambda source, source_rules: [
+                Mock(status='success', items_collected=1, timings={'total': 0.1})
+                for _ in source_rules
+            ],
+        ) as mock_collect_source:
+            result = collector.run_scheduled_collections()
+
+        assert mock_collect_source.call_count == 2
+        grouped = sorted(
+            len(call.args[1]) for call in mock_collect_source.call_args_list
+        )
+        assert grouped == [1, 2]
+        assert result['total'] == 3
+        assert result['success'] == 3
+        assert len(result['sources']) == 2
+
+
+# =============================================================================
+# Change Detection Tests
+# =============================================================================
+
+class TestEvidenceChangeDetection:
+    """Tests for content-hash change detection of collected evidence."""
+
+    def _item(self, name, data, content_type='json'):
+        return CollectedEvidence(
+            name=name,
+            description=f'Collected at {datetime.now().isoformat()}',
+            content_type=content_type,
+            data=data,
+        )
+
+    def test_content_hash_is_canonical(self):
+        """Test that key order and descriptions do not change the hash."""
+        first = self._item('users', {'a': 1, 'b': [1, 2]})
+        second = self._item('users', {'b': [1, 2], 'a': 1})
+
+        assert EvidenceCollector._content_hash(first) == EvidenceCollector._content_hash(second)
+        assert EvidenceCollector._content_hash(first) != EvidenceCollector._content_hash(
+            self._item('users', {'a': 2, 'b': [1, 2]})
+        )
+
+    def test_item_hashes_numbers_repeated_names(self):
+        """Test that items sharing a name are all tracked."""
+        hashes = EvidenceCollector()._item_hashes(
+            [self._item('report', 'a', 'text'), self._item('report', 'b', 'text')]
+        )
+
+        assert list(hashes) == ['report', 'report (2)']
+
+    def test_compute_delta(self):
+        """Test the new/changed/removed report."""
+        delta = EvidenceCollector._compute_delta(
+            {'kept': '1', 'edited': '2', 'gone': '3'},
+            {'kept': '1', 'edited': '4', 'added': '5'},
+        )
+
+        assert delta == {
+            'new': ['added'],
+            'changed': ['edited'],
+            'removed': ['gone'],
+            'unchanged': 1,
+        }
+
+    @patch('evidence_automation.services.collector.EvidenceCollectionRun')
+    def test_unchanged_collection_does_not_store_evidence(self, mock_run_model):
+        """Test that an unchanged collection only bumps the verification date."""
+        collector = EvidenceCollector()
+        items = [self._item('users', {'a': 1})]
+
+        mock_run_model.objects.create.return_value = Mock(run_log=[])
+        mock_run_model.Status.SUCCESS = 'success'
+        previous_run = Mock(
+            item_hashes=collector._item_hashes(items), evidence_created_id='evidence-id'
+        )
+        mock_run_model.objects.filter.return_value.exclude.return_value.order_by.return_value.first.return_value = previous_run
+
+        mock_connector = Mock()
+        mock_connector.collect.return_value = items
+        mock_rule = Mock(parameters={}, last_verified_at=None)
+
+        with patch.object(collector, '_store_evidence') as mock_store:
+            run = collector.collect_evidence(
+                mock_rule, connector=mock_connector, update_source=False
+            )
+
+        assert run.status == 'success'
+        mock_store.assert_not_called()
+        assert run.evidence_created_id == 'evidence-id'
+        assert run.delta['unchanged'] == 1
+        assert mock_rule.last_verified_at is not None
+        mock_rule.save.assert_called_once_with(update_fields=['last_verified_at'])
@@ -6,3 +6,29 @@ from django.db.models.signals import post_migrate
 class SettingsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "global_settings"
+
+    def ready(self):
+        self._connect_global_settings_cache_signals()
+
+    def _connect_global_settings_cache_signals(self):
+        from django.db.models.signals import post_delete, post_save
+
+        from global_settings.cache import invalidate_global_settings
+
+        GlobalSettings = self.get_model("GlobalSettings")
+
+        def _global_settings_changed(sender, **kwargs):
+            invalidate_global_settings()
+
+        post_save.connect(
+            _global_settings_changed,
+            sender=GlobalSettings,
+            dispatch_uid="global_settings.globalsettings.save.invalidate_cache",
+            weak=False,
+        )
+        post_delete.connect(
+            _global_settings_changed,
+            sender=GlobalSettings,
+            dispatch_uid="global_settings.globalsettings.delete.invalidate_cache",
+            weak=False,
+        )
@@ -0,0 +1,122 @@
+"""
+cache.py
+
+Versioned in-process snapshot of the GlobalSettings rows: {name: value}.
+
+Feature flags and general settings are read on hot paths (every webhook
+dispatch, risk and quantification computations...). The snapshot is rebuilt
+only when its CacheVersion row is bumped, which happens when a GlobalSettings
+row is saved or deleted (see apps.py).
+
+Outside of a request scope, accessing the snapshot costs a single CacheVersion
+SELECT. Inside a request scope (see GlobalSettingsCacheMiddleware) the version
+is fetched once per request, so later accesses cost no query at all.
+
+Key:
+- global_settings
+"""
+
+from __future__ import annotations
+
+import copy
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+
+from django.apps import apps
+
+from iam.snapshot_cache import VersionedSnapshotCache, VersionStore
+
+GLOBAL_SETTINGS_CACHE_KEY = "global_settings"
+
+
+@dataclass(slots=True)
+class _RequestScope:
+    version: Optional[int] = None
+    # Queries run to access the snapshot: version lookups and rebuilds
+    queries: int = 0
+
+
+_request_scope: ContextVar[Optional[_RequestScope]] = ContextVar(
+    "global_settings_request_scope", default=None
+)
+
+
+def build_global_settings() -> Mapping[str, Any]:
+    GlobalSettings = apps.get_model("global_settings", "GlobalSettings")
+    scope = _request_scope.get()
+    if scope is not None:
+        scope.queries += 1
+    return MappingProxyType(dict(GlobalSettings.objects.values_list("name", "value")))
+
+
+_global_settings_cache: VersionedSnapshotCache[Mapping[str, Any]] = (
+    VersionedSnapshotCache(key=GLOBAL_SETTINGS_CACHE_KEY, builder=build_global_settings)
+)
+
+
+def get_global_settings(*, force_reload: bool = False) -> Mapping[str, Any]:
+    """
+    Read-only snapshot of all settings: {name: value}.
+    Values are shared, callers must not mutate them (see get_global_setting).
+    """
+    scope = _request_scope.get()
+    if scope is None or scope.version is None or force_reload:
+        versions = VersionStore.ensure_and_get_versions(
+            [GLOBAL_SETTINGS_CACHE_KEY]
+        ).versions
+        if scope is not None:
+            scope.queries += 1
+            scope.version = versions[GLOBAL_SETTINGS_CACHE_KEY]
+    else:
+        versions = {GLOBAL_SETTINGS_CACHE_KEY: scope.version}
+    return _global_settings_cache.get(versions, force_reload=force_reload)
+
+
+def get_global_setting(name: str, default: Any = None) -> Any:
+    """Copy of the value of a settings row, `default` if the row does not exist."""
+    value = get_global_settings().get(name)
+    if value is None:
+        return default
+    return copy.deepcopy(value)
+
+
+def invalidate_global_settings() -> Optional[int]:
+    version = _global_settings_cache.invalidate()
+    scope = _request_scope.get()
+    if scope is not None:
+        # Changes made by this request are visible to the rest of it
+        scope.version = version
+    return version
+
+
+def global_settings_queries() -> int:
+    """
+    Number of queries run by the snapshot cache in the current request scope.
+    Reads that bypass get_global_setting(s) are not counted.
+    """
+    scope = _request_scope.get()
+    return scope.queries if scope is not None else 0
+
+
+@contextmanager
+def global_settings_request_scope():
+    """Fetch the snapshot version at most once inside the block."""
+    token = _request_scope.set(_RequestScope())
+    try:
+        yield
+    finally:
+        _request_scope.reset(token)
+
+
+__all__ = [
+    "GLOBAL_SETTINGS_CACHE_KEY",
+    "build_global_settings",
+    "get_global_setting",
+    "get_global_settings",
+    "global_settings_queries",
+    "global_settings_request_scope",
+    "invalidate_global_settings",
+]
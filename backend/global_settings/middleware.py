@@ -0,0 +1,25 @@
+import structlog
+
+from .cache import global_settings_queries, global_settings_request_scope
+
+logger = structlog.get_logger(__name__)
+
+
+class GlobalSettingsCacheMiddleware:
+    """
+    Scope the global settings cache to the request: the snapshot version is
+    checked at most once per request instead of once per settings access.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with global_settings_request_scope():
+            response = self.get_response(request)
+            logger.debug(
+                "global settings cache",
+                path=request.path,
+                queries=global_settings_queries(),
+            )
+        return response
@@ -0,0 +1,85 @@
+from contextlib import contextmanager
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from core.views import get_mapping_max_depth
+from ebios_rm.helpers import ecosystem_circular_chart_data, ecosystem_radar_chart_data
+from ebios_rm.models import Stakeholder
+
+from global_settings.cache import (
+    get_global_setting,
+    get_global_settings,
+    global_settings_queries,
+    global_settings_request_scope,
+)
+from global_settings.models import GlobalSettings
+from global_settings.utils import ff_is_enabled
+from metrology.models import get_builtin_metrics_retention_days
+
+
+@contextmanager
+def count_settings_table_queries():
+    """Count the queries reading the GlobalSettings table, whoever runs them."""
+    table = GlobalSettings._meta.db_table
+    queries = []
+
+    def count(execute, sql, params, many, context):
+        if table in sql:
+            queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count):
+        yield queries
+
+
+@pytest.fixture
+def feature_flags():
+    flags, _ = GlobalSettings.objects.get_or_create(
+        name=GlobalSettings.Names.FEATURE_FLAGS
+    )
+    flags.value = {"outgoing_webhooks": False}
+    flags.save()
+    return flags
+
+
+@pytest.mark.django_db
+class TestGlobalSettingsCache:
+    def test_one_query_per_request_scope(self, feature_flags):
+        get_global_settings()
+        with (
+            global_settings_request_scope(),
+            CaptureQueriesContext(connection) as queries,
+        ):
+            for _ in range(10):
+                assert ff_is_enabled("outgoing_webhooks") is False
+                get_global_setting(GlobalSettings.Names.GENERAL)
+            assert global_settings_queries() == 1
+        assert len(queries) == 1
+
+    def test_settings_readers_go_through_the_snapshot(self, feature_flags):
+        get_global_settings()
+        with (
+            global_settings_request_scope(),
+            count_settings_table_queries() as settings_queries,
+        ):
+            for _ in range(10):
+                get_mapping_max_depth()
+                ecosystem_circular_chart_data(Stakeholder.objects.none())
+                ecosystem_radar_chart_data(Stakeholder.objects.none())
+                get_builtin_metrics_retention_days()
+        assert settings_queries == []
+
+    def test_saving_a_row_invalidates_the_snapshot(self, feature_flags):
+        with global_settings_request_scope():
+            assert ff_is_enabled("outgoing_webhooks") is False
+            feature_flags.value = {"outgoing_webhooks": True}
+            feature_flags.save()
+            assert ff_is_enabled("outgoing_webhooks") is True
+
+    def test_values_are_copied(self, feature_flags):
+        get_global_setting(GlobalSettings.Names.FEATURE_FLAGS)["outgoing_webhooks"] = (
+            True
+        )
+        assert ff_is_enabled("outgoing_webhooks") is False
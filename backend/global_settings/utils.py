@@ -1,5 +1,6 @@
 from global_settings.models import GlobalSettings
 from global_settings.serializers import FeatureFlagsSerializer
+from global_settings.cache import get_global_settings
 import structlog
 
 logger = structlog.get_logger(__name__)
@@ -13,18 +14,16 @@ def ff_is_enabled(feature_flag: str):
     Returns:
         `True` if the feature flag is enabled, `False` otherwise.
     """
-    ff_settings = GlobalSettings.objects.filter(
-        name=GlobalSettings.Names.FEATURE_FLAGS
-    ).first()
-    if ff_settings is None:
+    flags: dict[str, bool] | None = get_global_settings().get(
+        GlobalSettings.Names.FEATURE_FLAGS
+    )
+    if flags is None:
         logger.warning(
             "Feature flags settings not found, returning False",
             feature_flag=feature_flag,
         )
         return False
 
-    flags: dict[str, bool] = ff_settings.value
-
     if (flag := flags.get(feature_flag)) is None:
         logger.warning(
             "Feature flag not found, returning False", feature_flag=feature_flag
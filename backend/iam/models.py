@@ -407,6 +407,10 @@ class PublishInRootFolderMixin(models.Model):
         abstract = True
 
     def save(self, *args, **kwargs):
+        self.publish_in_root_folder()
+        super().save(*args, **kwargs)
+
+    def publish_in_root_folder(self) -> None:
         # Root folder children must be published
         if (
             getattr(self, "folder") == Folder.get_root_folder()
@@ -414,7 +418,6 @@ class PublishInRootFolderMixin(models.Model):
             and not self.is_published
         ):
             self.is_published = True
-        super().save(*args, **kwargs)
 
 
 class UserGroup(NameDescriptionMixin, FolderMixin):
@@ -6,6 +6,8 @@ Generic versioned snapshot caching logic for Django with:
 
 from __future__ import annotations
 
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
 import time
 from typing import Callable, Dict, Generic, Mapping, Optional, Sequence, Tuple, TypeVar
@@ -140,6 +142,12 @@ class VersionedSnapshotCache(Generic[T]):
         Best-effort invalidation: if the CacheVersion table isn't available yet
         (e.g. during migrations), do not crash the caller.
         """
+        deferred = _deferred_invalidations.get()
+        if deferred is not None:
+            # The version is bumped once when leaving deferred_invalidations()
+            self._snapshot = None
+            deferred[self.key] = self
+            return None
         try:
             new_v = VersionStore.bump(self.key)
         except (OperationalError, ProgrammingError):
@@ -154,6 +162,32 @@ class VersionedSnapshotCache(Generic[T]):
         self._snapshot = None
 
 
+_deferred_invalidations: ContextVar[Optional[Dict[str, VersionedSnapshotCache]]] = (
+    ContextVar("deferred_invalidations", default=None)
+)
+
+
+@contextmanager
+def deferred_invalidations():
+    """
+    Invalidate each cache invalidated inside the block once, when leaving it.
+    Used by bulk writes so that every saved object does not bump the same
+    version. Local snapshots are still dropped right away.
+    Nested blocks are merged into the outermost one.
+    """
+    if _deferred_invalidations.get() is not None:
+        yield
+        return
+    deferred: Dict[str, VersionedSnapshotCache] = {}
+    token = _deferred_invalidations.set(deferred)
+    try:
+        yield
+    finally:
+        _deferred_invalidations.reset(token)
+        for cache in deferred.values():
+            cache.invalidate()
+
+
 class CacheRegistry:
     """
     Global registry for caches.
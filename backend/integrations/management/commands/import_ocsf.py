@@ -0,0 +1,79 @@
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import FindingsAssessment
+from iam.models import Folder
+from integrations.ocsf.ocsf_ingest import OCSFIngestor
+from integrations.ocsf.ocsf_parser import DEFAULT_BATCH_SIZE, get_ocsf_parser
+
+
+class Command(BaseCommand):
+    """
+    Imports an OCSF export (JSON array or NDJSON) into a folder, reading it in
+    batches so that files of any size are ingested with bounded memory.
+
+    Example:
+    python manage.py import_ocsf findings.ndjson \
+        --folder-id "a1b2c3d4-e5f6-7890-abcd-ef1234567890" \
+        --findings-assessment-id "b2c3d4e5-f6a7-8901-bcde-f12345678901"
+    """
+
+    help = "Imports OCSF vulnerability and security findings from a file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Path of the JSON or NDJSON file.")
+        parser.add_argument(
+            "--folder-id",
+            type=uuid.UUID,
+            required=True,
+            help="The UUID of the folder receiving the vulnerabilities.",
+        )
+        parser.add_argument(
+            "--findings-assessment-id",
+            type=uuid.UUID,
+            help="The UUID of the findings assessment receiving the security findings. "
+            "Security findings are skipped without it.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"Number of events persisted at a time (default: {DEFAULT_BATCH_SIZE}).",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            folder = Folder.objects.get(pk=options["folder_id"])
+        except Folder.DoesNotExist:
+            raise CommandError(
+                f"Folder with ID '{options['folder_id']}' does not exist."
+            )
+        findings_assessment = None
+        if options["findings_assessment_id"]:
+            try:
+                findings_assessment = FindingsAssessment.objects.get(
+                    pk=options["findings_assessment_id"]
+                )
+            except FindingsAssessment.DoesNotExist:
+                raise CommandError(
+                    f"FindingsAssessment with ID '{options['findings_assessment_id']}' does not exist."
+                )
+
+        stream = get_ocsf_parser().stream_file(
+            options["path"], batch_size=options["batch_size"]
+        )
+        results = OCSFIngestor(folder, findings_assessment).ingest(stream)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {results['imported']} of {results['events']} events "
+                f"in {results['elapsed']}s ({results['events_per_second']} events/s): "
+                f"{results['vulnerabilities_created']} vulnerabilities created, "
+                f"{results['vulnerabilities_updated']} updated, "
+                f"{results['findings_created']} findings created, "
+                f"{results['findings_updated']} updated, "
+                f"{results['skipped']} skipped, "
+                f"{stream.duplicates} duplicates, {stream.errors} errors."
+            )
+        )
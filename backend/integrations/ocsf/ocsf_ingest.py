@@ -0,0 +1,216 @@
+"""
+OCSF Ingestion
+
+Persists OCSF events as CISO Assistant vulnerabilities and findings, one set
+of bulk queries per batch of events (see OCSFParser.stream_file).
+"""
+
+from typing import Optional, List, Dict, Any, Iterable
+import logging
+import time
+
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import Finding, FindingsAssessment, Severity, Vulnerability
+from iam.models import Folder
+
+from .ocsf_models import (
+    OCSFEvent,
+    OCSFSeverity,
+    OCSFStatus,
+    SecurityFinding,
+    VulnerabilityFinding,
+)
+
+logger = logging.getLogger(__name__)
+
+OCSF_SEVERITY_TO_SEVERITY = {
+    OCSFSeverity.UNKNOWN: Severity.UNDEFINED,
+    OCSFSeverity.INFORMATIONAL: Severity.INFO,
+    OCSFSeverity.LOW: Severity.LOW,
+    OCSFSeverity.MEDIUM: Severity.MEDIUM,
+    OCSFSeverity.HIGH: Severity.HIGH,
+    OCSFSeverity.CRITICAL: Severity.CRITICAL,
+    OCSFSeverity.FATAL: Severity.CRITICAL,
+}
+
+OCSF_STATUS_TO_VULNERABILITY_STATUS = {
+    OCSFStatus.NEW: Vulnerability.Status.POTENTIAL,
+    OCSFStatus.IN_PROGRESS: Vulnerability.Status.POTENTIAL,
+    OCSFStatus.SUPPRESSED: Vulnerability.Status.NOTEXPLOITABLE,
+    OCSFStatus.RESOLVED: Vulnerability.Status.FIXED,
+}
+
+OCSF_STATUS_TO_FINDING_STATUS = {
+    OCSFStatus.NEW: Finding.Status.IDENTIFIED,
+    OCSFStatus.IN_PROGRESS: Finding.Status.IN_PROGRESS,
+    OCSFStatus.SUPPRESSED: Finding.Status.DISMISSED,
+    OCSFStatus.RESOLVED: Finding.Status.RESOLVED,
+}
+
+# Fields refreshed when an event is ingested again
+UPSERT_FIELDS = ["name", "description", "severity", "status", "updated_at"]
+
+NAME_MAX_LENGTH = Vulnerability._meta.get_field("name").max_length
+REF_ID_MAX_LENGTH = Vulnerability._meta.get_field("ref_id").max_length
+
+
+class OCSFIngestor:
+    """
+    Upserts OCSF events into a folder.
+
+    Vulnerability findings become Vulnerability objects of the folder, security
+    findings become Finding objects of `findings_assessment` (skipped when no
+    assessment is given). Objects are matched on their ref_id, the OCSF
+    vulnerability or finding uid, so ingesting an export again updates the
+    objects it created instead of duplicating them.
+    """
+
+    def __init__(
+        self,
+        folder: Folder,
+        findings_assessment: Optional[FindingsAssessment] = None,
+        create_vulnerabilities: bool = True,
+        create_findings: bool = True,
+    ):
+        self.folder = folder
+        self.findings_assessment = findings_assessment
+        self.create_vulnerabilities = create_vulnerabilities
+        self.create_findings = create_findings and findings_assessment is not None
+        self.results = {
+            "events": 0,
+            "imported": 0,
+            "vulnerabilities_created": 0,
+            "vulnerabilities_updated": 0,
+            "findings_created": 0,
+            "findings_updated": 0,
+            "skipped": 0,
+        }
+        self.elapsed = 0.0
+
+    def ingest(self, batches: Iterable[List[OCSFEvent]]) -> Dict[str, Any]:
+        """
+        Ingest batches of events, each in its own transaction.
+
+        Returns:
+            Counters of the ingestion, with its duration and throughput
+        """
+        started = time.perf_counter()
+        for batch in batches:
+            self.ingest_batch(batch)
+        if self.results["findings_created"] or self.results["findings_updated"]:
+            # What Finding.save does for each finding
+            FindingsAssessment.objects.filter(id=self.findings_assessment.id).update(
+                updated_at=timezone.now()
+            )
+            self.findings_assessment.upsert_daily_metrics()
+        self.elapsed += time.perf_counter() - started
+        return {
+            **self.results,
+            "elapsed": round(self.elapsed, 3),
+            "events_per_second": round(self.results["events"] / self.elapsed, 1)
+            if self.elapsed
+            else 0.0,
+        }
+
+    def ingest_batch(self, events: List[OCSFEvent]) -> None:
+        """Upsert the vulnerabilities and findings of a batch of events."""
+        vulnerabilities = {}
+        findings = {}
+        for event in events:
+            if isinstance(event, VulnerabilityFinding) and self.create_vulnerabilities:
+                fields = self._vulnerability_fields(event)
+                vulnerabilities[fields["ref_id"]] = fields
+            elif isinstance(event, SecurityFinding) and self.create_findings:
+                fields = self._finding_fields(event)
+                findings[fields["ref_id"]] = fields
+        self.results["events"] += len(events)
+        self.results["skipped"] += len(events) - len(vulnerabilities) - len(findings)
+
+        with transaction.atomic():
+            if vulnerabilities:
+                created, updated = self._upsert(
+                    Vulnerability.objects.filter(folder=self.folder),
+                    vulnerabilities,
+                    lambda fields: Vulnerability(folder=self.folder, **fields),
+                )
+                self.results["vulnerabilities_created"] += created
+                self.results["vulnerabilities_updated"] += updated
+            if findings:
+                created, updated = self._upsert(
+                    Finding.objects.filter(
+                        findings_assessment=self.findings_assessment
+                    ),
+                    findings,
+                    lambda fields: Finding(
+                        folder_id=self.findings_assessment.folder_id,
+                        findings_assessment=self.findings_assessment,
+                        **fields,
+                    ),
+                )
+                self.results["findings_created"] += created
+                self.results["findings_updated"] += updated
+        self.results["imported"] += len(vulnerabilities) + len(findings)
+
+    def _upsert(self, scope, rows: Dict[str, Dict[str, Any]], build) -> tuple:
+        """
+        Update the objects of `scope` whose ref_id is a key of `rows`, create
+        the others. ref_id is not unique at the database level, hence no
+        bulk_create(update_conflicts=True).
+        """
+        existing = {}
+        for obj in scope.filter(ref_id__in=list(rows)).order_by("created_at"):
+            existing.setdefault(obj.ref_id, obj)
+
+        now = timezone.now()
+        to_update = []
+        to_create = []
+        for ref_id, fields in rows.items():
+            obj = existing.get(ref_id)
+            if obj is None:
+                to_create.append(build(fields))
+                continue
+            for name, value in fields.items():
+                setattr(obj, name, value)
+            # bulk_update does not apply auto_now
+            obj.updated_at = now
+            to_update.append(obj)
+
+        scope.model.objects.bulk_create(to_create)
+        scope.model.objects.bulk_update(to_update, UPSERT_FIELDS)
+        return len(to_create), len(to_update)
+
+    def _vulnerability_fields(self, event: VulnerabilityFinding) -> Dict[str, Any]:
+        vuln_data = event.vulnerabilities[0] if event.vulnerabilities else None
+        name = (
+            event.finding_title
+            or (vuln_data.title if vuln_data else "")
+            or "Unknown Vulnerability"
+        )
+        return {
+            "name": name[:NAME_MAX_LENGTH],
+            "description": event.message or (vuln_data.desc if vuln_data else "") or "",
+            "ref_id": (vuln_data.uid if vuln_data else event.finding_uid)[
+                :REF_ID_MAX_LENGTH
+            ],
+            "severity": OCSF_SEVERITY_TO_SEVERITY.get(
+                event.severity_id, Severity.UNDEFINED
+            ),
+            "status": OCSF_STATUS_TO_VULNERABILITY_STATUS.get(
+                event.status, Vulnerability.Status.UNDEFINED
+            ),
+        }
+
+    def _finding_fields(self, event: SecurityFinding) -> Dict[str, Any]:
+        return {
+            "name": (event.finding_title or "Security Finding")[:NAME_MAX_LENGTH],
+            "description": event.message or "",
+            "ref_id": event.finding_uid[:REF_ID_MAX_LENGTH],
+            "severity": OCSF_SEVERITY_TO_SEVERITY.get(
+                event.severity_id, Severity.UNDEFINED
+            ),
+            "status": OCSF_STATUS_TO_FINDING_STATUS.get(
+                event.status, Finding.Status.UNDEFINED
+            ),
+        }
@@ -5,11 +5,15 @@ Parses OCSF (Open Cybersecurity Schema Framework) events from various formats
 and converts them to CISO Assistant entities.
 """
 
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Union, Iterator, TextIO
 from datetime import datetime
 from uuid import UUID, uuid4
+import io
 import json
 import logging
+import os
+import re
+import time
 
 from .ocsf_models import (
     OCSFEvent,
@@ -29,12 +33,158 @@ from .ocsf_models import (
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_BATCH_SIZE = 1000
+# Characters read from the source at a time
+READ_CHUNK_SIZE = 1 << 20
+# Largest JSON value buffered while looking for its end
+MAX_EVENT_SIZE = 64 << 20
+
+_WHITESPACE = re.compile(r'\s*')
+# Inside a JSON array, separators are skipped along with whitespace
+_ARRAY_WHITESPACE = re.compile(r'[\s,]*')
+
 
 class OCSFParseError(Exception):
     """Error parsing OCSF event."""
     pass
 
 
+class OCSFStream:
+    """
+    Incremental reader of an OCSF export: a JSON array of events, a single
+    event, or NDJSON (any sequence of JSON values).
+
+    Iterating yields lists of at most `batch_size` parsed events, so that
+    memory stays bounded whatever the size of the source. Values that are not
+    valid JSON or not OCSF events are skipped with a warning and counted in
+    `errors`. With `dedupe`, events whose uid (metadata.uid, else
+    finding_info.uid) was already read are skipped and counted in
+    `duplicates`. A stream can be iterated only once.
+    """
+
+    def __init__(
+        self,
+        parser: 'OCSFParser',
+        source: Union[str, os.PathLike, TextIO, io.BufferedIOBase],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        dedupe: bool = True,
+    ):
+        self.parser = parser
+        self.source = source
+        self.batch_size = max(batch_size, 1)
+        self.dedupe = dedupe
+        self.events = 0
+        self.duplicates = 0
+        self.errors = 0
+        self.elapsed = 0.0
+        self._seen_uids = set()
+        self._consumed = False
+
+    @property
+    def events_per_second(self) -> float:
+        return self.events / self.elapsed if self.elapsed else 0.0
+
+    def __iter__(self) -> Iterator[List[OCSFEvent]]:
+        if self._consumed:
+            raise RuntimeError("OCSFStream can only be iterated once")
+        self._consumed = True
+        started = time.perf_counter()
+        opened = isinstance(self.source, (str, os.PathLike))
+        if opened:
+            stream = open(self.source, 'r', encoding='utf-8')
+        elif isinstance(self.source, io.TextIOBase):
+            stream = self.source
+        else:
+            # Binary file, e.g. an uploaded file
+            stream = io.TextIOWrapper(self.source, encoding='utf-8')
+        try:
+            batch = []
+            for data in self._values(stream):
+                event = self._parse(data)
+                if event is None:
+                    continue
+                batch.append(event)
+                if len(batch) >= self.batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+        finally:
+            self.elapsed = time.perf_counter() - started
+            if opened:
+                stream.close()
+            elif stream is not self.source:
+                # Leave the caller's file open
+                stream.detach()
+
+    def _parse(self, data: Any) -> Optional[OCSFEvent]:
+        if not isinstance(data, dict):
+            self._error(f"Expected an OCSF event object, got {type(data).__name__}")
+            return None
+        if self.dedupe:
+            uid = (data.get('metadata') or {}).get('uid') or (data.get('finding_info') or {}).get('uid')
+            if uid:
+                if uid in self._seen_uids:
+                    self.duplicates += 1
+                    return None
+                self._seen_uids.add(uid)
+        try:
+            event = self.parser._parse_event(data)
+        except (OCSFParseError, AttributeError, TypeError, ValueError) as e:
+            self._error(f"Failed to parse OCSF event: {e}")
+            return None
+        self.events += 1
+        return event
+
+    def _error(self, message: str) -> None:
+        self.errors += 1
+        logger.warning(message)
+
+    def _values(self, stream: TextIO) -> Iterator[Any]:
+        """Top-level JSON values of the source, the elements of an array being read one by one."""
+        decoder = json.JSONDecoder()
+        whitespace = _WHITESPACE
+        buffer, pos, eof = '', 0, False
+        # Unknown until the first value is reached
+        in_array = None
+
+        while True:
+            pos = whitespace.match(buffer, pos).end()
+            if pos == len(buffer):
+                if eof:
+                    return
+                buffer, pos, eof = self._read_more(stream, buffer, pos)
+                continue
+            if in_array is None:
+                in_array = buffer[pos] == '['
+                if in_array:
+                    pos += 1
+                    whitespace = _ARRAY_WHITESPACE
+                continue
+            if in_array and buffer[pos] == ']':
+                pos += 1
+                in_array, whitespace = False, _WHITESPACE
+                continue
+
+            try:
+                value, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                newline = buffer.find('\n', e.pos)
+                if newline == -1 and not eof and len(buffer) - pos < MAX_EVENT_SIZE:
+                    # Most likely a value cut by the end of the chunk
+                    buffer, pos, eof = self._read_more(stream, buffer, pos)
+                    continue
+                # Malformed value: resume on the next line
+                self._error(f"Failed to parse JSON value: {e}")
+                pos = len(buffer) if newline == -1 else newline + 1
+                continue
+            yield value
+
+    def _read_more(self, stream: TextIO, buffer: str, pos: int):
+        chunk = stream.read(READ_CHUNK_SIZE)
+        return buffer[pos:] + chunk, 0, not chunk
+
+
 class OCSFParser:
     """
     Parses OCSF events from various input formats.
@@ -78,34 +228,39 @@ class OCSFParser:
         """
         Parse OCSF events from a file.
 
+        Invalid events are skipped with a warning. Use stream_file to read
+        large files in batches.
+
         Args:
             file_path: Path to JSON or NDJSON file
 
         Returns:
             List of parsed OCSF events
         """
-        events = []
-        with open(file_path, 'r') as f:
-            content = f.read().strip()
+        return [
+            event
+            for batch in self.stream_file(file_path, dedupe=False)
+            for event in batch
+        ]
+
+    def stream_file(
+        self,
+        source: Union[str, os.PathLike, TextIO, io.BufferedIOBase],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        dedupe: bool = True,
+    ) -> OCSFStream:
+        """
+        Read OCSF events from a JSON or NDJSON file in batches.
 
-            # Try to parse as JSON array first
-            try:
-                data = json.loads(content)
-                if isinstance(data, list):
-                    events = self.parse(data)
-                else:
-                    events = [self._parse_event(data)]
-            except json.JSONDecodeError:
-                # Try NDJSON format
-                for line in content.split('\n'):
-                    if line.strip():
-                        try:
-                            event_data = json.loads(line)
-                            events.append(self._parse_event(event_data))
-                        except json.JSONDecodeError as e:
-                            logger.warning(f"Failed to parse NDJSON line: {e}")
-
-        return events
+        Args:
+            source: Path or file object (text or binary)
+            batch_size: Maximum number of events per batch
+            dedupe: Skip the events whose uid was already read
+
+        Returns:
+            OCSFStream yielding lists of parsed OCSF events
+        """
+        return OCSFStream(self, source, batch_size=batch_size, dedupe=dedupe)
 
     def _parse_string(self, data: str) -> List[OCSFEvent]:
         """Parse a JSON string."""
@@ -9,6 +9,7 @@ Comprehensive tests for OCSF (Open Cybersecurity Schema Framework) integration:
 """
 
 import pytest
+import io
 import json
 from datetime import datetime
 from uuid import UUID, uuid4
@@ -36,6 +37,7 @@ from integrations.ocsf.ocsf_parser import (
     OCSFParseError,
     get_ocsf_parser,
 )
+import integrations.ocsf.ocsf_parser as ocsf_parser_module
 from integrations.ocsf.ocsf_to_oscal import (
     OCSFToOSCALTranslator,
     get_ocsf_translator,
@@ -612,6 +614,160 @@ class TestOCSFParserSingleton:
         assert len(events) == 1
 
 
+def ocsf_event(uid, class_uid=2001, **fields):
+    return {
+        'class_uid': class_uid,
+        'metadata': {'uid': f'event-{uid}'},
+        'finding_info': {'uid': f'finding-{uid}', 'title': f'Finding {uid}'},
+        'time': '2024-01-15T10:00:00Z',
+        **fields,
+    }
+
+
+class TestOCSFStream:
+    """Tests for OCSFParser.stream_file."""
+
+    def test_json_array_in_batches(self, monkeypatch):
+        # Values span several chunks
+        monkeypatch.setattr(ocsf_parser_module, 'READ_CHUNK_SIZE', 16)
+        content = json.dumps([ocsf_event(i) for i in range(5)], indent=2)
+        stream = OCSFParser().stream_file(io.StringIO(content), batch_size=2)
+
+        batches = list(stream)
+
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        assert batches[2][0].finding_uid == 'finding-4'
+        assert stream.events == 5
+        assert stream.errors == 0
+
+    def test_ndjson_skips_invalid_lines_and_duplicates(self):
+        lines = [
+            json.dumps(ocsf_event(1)),
+            '{"class_uid": 2001, "broken',
+            json.dumps({'message': 'no class_uid'}),
+            json.dumps(ocsf_event(1)),
+            json.dumps(ocsf_event(2, class_uid=1001)),
+        ]
+        stream = OCSFParser().stream_file(io.BytesIO('\n'.join(lines).encode()))
+
+        events = [event for batch in stream for event in batch]
+
+        assert [event.finding_uid for event in events] == ['finding-1', 'finding-2']
+        assert isinstance(events[1], SecurityFinding)
+        assert stream.duplicates == 1
+        assert stream.errors == 2
+
+    def test_parse_file_keeps_duplicates(self, tmp_path):
+        path = tmp_path / 'events.json'
+        path.write_text(json.dumps(ocsf_event(1)) + json.dumps(ocsf_event(1)))
+
+        assert len(OCSFParser().parse_file(str(path))) == 2
+
+    def test_stream_can_only_be_iterated_once(self):
+        stream = OCSFParser().stream_file(io.StringIO('[]'))
+        assert list(stream) == []
+        with pytest.raises(RuntimeError):
+            list(stream)
+
+
+@pytest.mark.django_db
+class TestOCSFIngestor:
+    """Tests for OCSFIngestor."""
+
+    def test_ingest_upserts_vulnerabilities_and_findings(self):
+        from core.models import Finding, FindingsAssessment, Severity, Vulnerability
+        from iam.models import Folder
+        from integrations.ocsf.ocsf_ingest import OCSFIngestor
+
+        folder = Folder.objects.create(name='OCSF')
+        findings_assessment = FindingsAssessment.objects.create(name='OCSF findings', folder=folder)
+        events = [
+            ocsf_event(1, severity_id=5, status='New', vulnerabilities=[{'uid': 'CVE-2021-44228'}]),
+            ocsf_event(2, class_uid=1001, severity_id=4, status='In Progress'),
+            ocsf_event(3, class_uid=2002),
+        ]
+        stream = OCSFParser().stream_file(io.StringIO(json.dumps(events)), batch_size=2)
+
+        results = OCSFIngestor(folder, findings_assessment).ingest(stream)
+
+        assert results['events'] == 3
+        assert results['vulnerabilities_created'] == 1
+        assert results['findings_created'] == 1
+        assert results['skipped'] == 1
+        vulnerability = Vulnerability.objects.get(folder=folder)
+        assert vulnerability.ref_id == 'CVE-2021-44228'
+        assert vulnerability.severity == Severity.CRITICAL
+        assert vulnerability.status == Vulnerability.Status.POTENTIAL
+        finding = Finding.objects.get(findings_assessment=findings_assessment)
+        assert finding.ref_id == 'finding-2'
+        assert finding.severity == Severity.HIGH
+        assert finding.status == Finding.Status.IN_PROGRESS
+
+        # Ingesting again updates the objects
+        events[0]['status'] = 'Resolved'
+        results = OCSFIngestor(folder, findings_assessment).ingest(
+            OCSFParser().stream_file(io.StringIO(json.dumps(events)))
+        )
+
+        assert results['vulnerabilities_updated'] == 1
+        assert results['findings_updated'] == 1
+        assert Vulnerability.objects.filter(folder=folder).count() == 1
+        assert Vulnerability.objects.get(folder=folder).status == Vulnerability.Status.FIXED
+
+
+@pytest.mark.django_db
+class TestOCSFImportPermissions:
+    """Imports require the right to write vulnerabilities and findings in the folder."""
+
+    @pytest.fixture
+    def folder(self):
+        from core.apps import startup
+        from iam.models import Folder
+
+        startup(sender=None)
+        return Folder.objects.create(name='OCSF', parent_folder=Folder.get_root_folder())
+
+    def client_for(self, user):
+        from rest_framework.test import APIClient
+
+        api_client = APIClient()
+        api_client.force_authenticate(user=user)
+        return api_client
+
+    def import_events(self, api_client, folder):
+        return api_client.post(
+            '/api/integrations/ocsf/import/',
+            data={
+                'events': [ocsf_event(1, vulnerabilities=[{'uid': 'CVE-2021-44228'}])],
+                'folder_id': str(folder.id),
+            },
+            format='json',
+        )
+
+    def test_user_without_role_is_forbidden(self, folder):
+        from core.models import Vulnerability
+        from iam.models import User
+
+        user = User.objects.create_user(email='reader@tests.com')
+
+        response = self.import_events(self.client_for(user), folder)
+
+        assert response.status_code == 403
+        assert not Vulnerability.objects.filter(folder=folder).exists()
+
+    def test_administrator_can_import(self, folder):
+        from core.models import Vulnerability
+        from iam.models import User, UserGroup
+
+        user = User.objects.create_user(email='admin@tests.com')
+        UserGroup.objects.get(name='BI-UG-ADM').user_set.add(user)
+
+        response = self.import_events(self.client_for(user), folder)
+
+        assert response.status_code == 200
+        assert Vulnerability.objects.filter(folder=folder).count() == 1
+
+
 class TestOCSFParserConversion:
     """Tests for OCSF to CISO Assistant conversion methods."""
 
@@ -9,11 +9,12 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers import JSONParser, MultiPartParser
+from django.core.exceptions import ObjectDoesNotExist, PermissionDenied
 from uuid import UUID
 import logging
 import json
 
-from .ocsf_parser import get_ocsf_parser, OCSFParseError
+from .ocsf_parser import get_ocsf_parser, OCSFParseError, DEFAULT_BATCH_SIZE
 from .ocsf_to_oscal import get_ocsf_translator
 from .ocsf_models import (
     OCSFEventClass,
@@ -26,6 +27,47 @@ from .ocsf_models import (
 logger = logging.getLogger(__name__)
 
 
+def _check_permissions(user, folder, model_name):
+    """Raise PermissionDenied unless the user may write the model objects of the folder."""
+    from iam.models import Permission, RoleAssignment
+
+    for action in ('add', 'change'):
+        if not RoleAssignment.is_access_allowed(
+            user=user,
+            perm=Permission.objects.get(codename=f'{action}_{model_name}'),
+            folder=folder,
+        ):
+            raise PermissionDenied(f'You are not allowed to import {model_name} objects')
+
+
+def _get_ingestor(user, folder_id, findings_assessment_id, options):
+    """
+    OCSFIngestor for the folder and findings assessment given by their ids.
+    Raises PermissionDenied if the user cannot write the objects it would upsert.
+    """
+    from core.models import FindingsAssessment
+    from iam.models import Folder
+    from .ocsf_ingest import OCSFIngestor
+
+    folder = Folder.objects.get(id=UUID(str(folder_id)))
+    findings_assessment = None
+    if findings_assessment_id:
+        findings_assessment = FindingsAssessment.objects.get(
+            id=UUID(str(findings_assessment_id))
+        )
+    ingestor = OCSFIngestor(
+        folder,
+        findings_assessment=findings_assessment,
+        create_vulnerabilities=options.get('create_vulnerabilities', True),
+        create_findings=options.get('create_findings', True),
+    )
+    if ingestor.create_vulnerabilities:
+        _check_permissions(user, folder, 'vulnerability')
+    if ingestor.create_findings:
+        _check_permissions(user, findings_assessment.folder, 'finding')
+    return ingestor
+
+
 class OCSFParseView(APIView):
     """Parse and validate OCSF events."""
     permission_classes = [IsAuthenticated]
@@ -82,6 +124,7 @@ class OCSFImportView(APIView):
         {
             "events": [...],  # OCSF events
             "folder_id": "uuid",
+            "findings_assessment_id": "uuid",  # Required to import findings
             "options": {
                 "create_vulnerabilities": true,
                 "create_findings": true,
@@ -103,39 +146,16 @@ class OCSFImportView(APIView):
             parser = get_ocsf_parser()
             events = parser.parse(events_data)
 
-            results = {
-                'imported': 0,
-                'vulnerabilities_created': 0,
-                'findings_created': 0,
-                'errors': [],
-            }
-
-            folder_uuid = UUID(folder_id)
-
-            for event in events:
-                try:
-                    # Import vulnerability findings
-                    if isinstance(event, VulnerabilityFinding) and options.get('create_vulnerabilities', True):
-                        vuln_data = parser.to_ciso_vulnerability(event, folder_uuid)
-                        # Create vulnerability in database
-                        from core.models import Vulnerability
-                        Vulnerability.objects.create(**vuln_data)
-                        results['vulnerabilities_created'] += 1
-                        results['imported'] += 1
-
-                    # Import security findings
-                    elif isinstance(event, SecurityFinding) and options.get('create_findings', True):
-                        finding_data = parser.to_ciso_finding(event, folder_uuid)
-                        from core.models import Finding
-                        Finding.objects.create(**finding_data)
-                        results['findings_created'] += 1
-                        results['imported'] += 1
-
-                except Exception as e:
-                    results['errors'].append({
-                        'event_uid': event.metadata.uid,
-                        'error': str(e),
-                    })
+            ingestor = _get_ingestor(
+                request.user,
+                folder_id,
+                request.data.get('findings_assessment_id'),
+                options,
+            )
+            results = ingestor.ingest(
+                events[start:start + DEFAULT_BATCH_SIZE]
+                for start in range(0, len(events), DEFAULT_BATCH_SIZE)
+            )
 
             return Response({
                 'status': 'success',
@@ -147,6 +167,16 @@ class OCSFImportView(APIView):
                 {'error': f'Parse error: {str(e)}'},
                 status=status.HTTP_400_BAD_REQUEST
             )
+        except PermissionDenied as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        except (ObjectDoesNotExist, ValueError) as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         except Exception as e:
             logger.error(f"Error importing OCSF events: {e}")
             return Response(
@@ -295,7 +325,9 @@ class OCSFUploadView(APIView):
         """
         Upload and parse an OCSF event file.
 
-        Supports JSON and NDJSON formats.
+        Supports JSON and NDJSON formats. The file is read in batches; when
+        `folder_id` is given, its events are imported as they are read (see
+        OCSFImportView for `findings_assessment_id` and `options`).
         """
         try:
             file = request.FILES.get('file')
@@ -305,30 +337,78 @@ class OCSFUploadView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            # Read file content
-            content = file.read().decode('utf-8')
+            folder_id = request.data.get('folder_id')
+            ingestor = None
+            if folder_id:
+                options = request.data.get('options') or {}
+                if isinstance(options, str):
+                    options = json.loads(options)
+                ingestor = _get_ingestor(
+                    request.user,
+                    folder_id,
+                    request.data.get('findings_assessment_id'),
+                    options,
+                )
 
             parser = get_ocsf_parser()
-            events = parser.parse(content)
-
-            return Response({
+            stream = parser.stream_file(file)
+            summary = {
+                'security_findings': 0,
+                'vulnerability_findings': 0,
+                'compliance_findings': 0,
+                'detection_findings': 0,
+            }
+            preview = []
+
+            def read_batches():
+                for batch in stream:
+                    for event in batch:
+                        if isinstance(event, SecurityFinding):
+                            summary['security_findings'] += 1
+                        elif isinstance(event, VulnerabilityFinding):
+                            summary['vulnerability_findings'] += 1
+                        elif isinstance(event, ComplianceFinding):
+                            summary['compliance_findings'] += 1
+                        elif isinstance(event, DetectionFinding):
+                            summary['detection_findings'] += 1
+                    if len(preview) < 100:  # Limit preview
+                        preview.extend(event.to_dict() for event in batch[:100 - len(preview)])
+                    yield batch
+
+            response = {
                 'status': 'success',
                 'filename': file.name,
-                'events_count': len(events),
-                'summary': {
-                    'security_findings': sum(1 for e in events if isinstance(e, SecurityFinding)),
-                    'vulnerability_findings': sum(1 for e in events if isinstance(e, VulnerabilityFinding)),
-                    'compliance_findings': sum(1 for e in events if isinstance(e, ComplianceFinding)),
-                    'detection_findings': sum(1 for e in events if isinstance(e, DetectionFinding)),
-                },
-                'events': [event.to_dict() for event in events[:100]],  # Limit preview
+            }
+            if ingestor is not None:
+                response['results'] = ingestor.ingest(read_batches())
+            else:
+                for _ in read_batches():
+                    pass
+            response.update({
+                'events_count': stream.events,
+                'duplicates': stream.duplicates,
+                'errors_count': stream.errors,
+                'events_per_second': round(stream.events_per_second, 1),
+                'summary': summary,
+                'events': preview,
             })
+            return Response(response)
 
         except OCSFParseError as e:
             return Response(
                 {'error': f'Parse error: {str(e)}'},
                 status=status.HTTP_400_BAD_REQUEST
             )
+        except PermissionDenied as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        except (ObjectDoesNotExist, ValueError) as e:
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         except Exception as e:
             logger.error(f"Error uploading OCSF file: {e}")
             return Response(
@@ -968,11 +968,13 @@ def get_builtin_metrics_retention_days():
     Returns the retention days for builtin metric samples from global settings.
     Default is 730 days (2 years), minimum is 1 day.
     """
+    from global_settings.cache import get_global_setting
     from global_settings.models import GlobalSettings
 
     try:
-        settings = GlobalSettings.objects.get(name="general")
-        retention = settings.value.get("builtin_metrics_retention_days", 730)
+        retention = get_global_setting(GlobalSettings.Names.GENERAL, {}).get(
+            "builtin_metrics_retention_days", 730
+        )
         return max(1, int(retention))
-    except (GlobalSettings.DoesNotExist, TypeError, ValueError):
+    except (AttributeError, TypeError, ValueError):
         return 730
@@ -0,0 +1,104 @@
+import hashlib
+import io
+import json
+import struct
+import tarfile
+import zipfile
+from unittest.mock import PropertyMock, patch
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.models import Evidence, EvidenceRevision
+from iam.models import Folder, User
+from serdes.views import BatchDownloadAttachmentsView
+
+
+@pytest.fixture
+def revisions(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    folder = Folder.objects.create(name="test folder")
+    result = []
+    for i in range(3):
+        evidence = Evidence.objects.create(name=f"evidence {i}", folder=folder)
+        result.append(
+            EvidenceRevision.objects.create(
+                evidence=evidence,
+                version=1,
+                attachment=SimpleUploadedFile(f"file{i}.txt", b"content %d" % i * 100),
+            )
+        )
+    return result
+
+
+def download(revision_ids, stream_format=None):
+    user, _ = User.objects.get_or_create(email="backup@tests.com")
+    data = {"revision_ids": revision_ids}
+    if stream_format:
+        data["format"] = stream_format
+    request = APIRequestFactory().post("/", data, format="json")
+    force_authenticate(request, user=user)
+    with patch.object(
+        User, "has_backup_permission", new_callable=PropertyMock, return_value=True
+    ):
+        response = BatchDownloadAttachmentsView.as_view()(request)
+        body = b"".join(response.streaming_content)
+    return response, body
+
+
+@pytest.mark.django_db
+class TestBatchDownloadAttachments:
+    def test_stream_format(self, revisions):
+        ids = [str(r.id) for r in revisions] + ["not-an-id"]
+        response, body = download(ids)
+
+        assert response["X-Attachment-Format"] == "stream"
+        decoder = json.JSONDecoder()
+        files = {}
+        offset = 0
+        while offset < len(body):
+            (total_size,) = struct.unpack(">I", body[offset : offset + 4])
+            block = body[offset + 4 : offset + 4 + total_size]
+            header, header_end = decoder.raw_decode(block.decode("latin-1"))
+            files[header["id"]] = block[header_end:]
+            offset += 4 + total_size
+        assert files == {str(r.id): r.attachment.open("rb").read() for r in revisions}
+
+    def test_stream64_format(self, revisions):
+        response, body = download([str(revisions[0].id)], "stream64")
+
+        header_size, file_size = struct.unpack(">IQ", body[:12])
+        header = json.loads(body[12 : 12 + header_size])
+        content = body[12 + header_size :]
+        assert len(content) == file_size == header["size"]
+        assert hashlib.sha256(content).hexdigest() == header["hash"]
+
+    def test_archive_formats(self, revisions):
+        ids = [str(r.id) for r in revisions]
+        expected = {
+            f"{r.evidence_id}_v1_{r.filename()}": r.attachment.open("rb").read()
+            for r in revisions
+        }
+
+        _, body = download(ids, "tar")
+        with tarfile.open(fileobj=io.BytesIO(body)) as archive:
+            assert {
+                m.name: archive.extractfile(m).read() for m in archive.getmembers()
+            } == expected
+
+        _, body = download(ids, "zip")
+        with zipfile.ZipFile(io.BytesIO(body)) as archive:
+            assert archive.testzip() is None
+            assert {name: archive.read(name) for name in archive.namelist()} == expected
+
+    def test_revisions_are_fetched_in_one_query(self, revisions):
+        ids = [str(r.id) for r in revisions]
+        download(ids[:1])
+        with CaptureQueriesContext(connection) as single:
+            download(ids[:1])
+        with CaptureQueriesContext(connection) as many:
+            download(ids)
+        assert len(many) == len(single)
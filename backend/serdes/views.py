@@ -3,6 +3,9 @@ import io
 import json
 import struct
 import sys
+import tarfile
+import uuid
+import zipfile
 from datetime import datetime
 
 import structlog
@@ -655,11 +658,87 @@ class AttachmentMetadataView(APIView):
         return Response(response_data, status=status.HTTP_200_OK)
 
 
+ATTACHMENT_CHUNK_SIZE = 1024 * 1024
+ATTACHMENT_STREAM_FORMATS = ("stream", "stream64", "tar", "zip")
+
+
+class _ZipStreamBuffer:
+    """Unseekable file object collecting what zipfile writes, drained by the response generator."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _attachment_archive_name(header):
+    return f"{header['evidence_id']}_v{header['version']}_{header['filename']}"
+
+
+def _iter_file(f):
+    for chunk in iter(lambda: f.read(ATTACHMENT_CHUNK_SIZE), b""):
+        yield chunk
+
+
+def _stream_block(header, size, f, wide):
+    """
+    stream:   [4-byte total size][JSON header][file bytes]
+    stream64: [4-byte header size][8-byte file size][JSON header][file bytes]
+    """
+    header_bytes = json.dumps(header).encode("utf-8")
+    if wide:
+        yield struct.pack(">IQ", len(header_bytes), size)
+    else:
+        yield struct.pack(">I", len(header_bytes) + size)
+    yield header_bytes
+    yield from _iter_file(f)
+
+
+def _tar_member(header, size, f):
+    info = tarfile.TarInfo(_attachment_archive_name(header))
+    info.size = size
+    info.mtime = int(datetime.now().timestamp())
+    # PAX headers lift the 8 GB limit of ustar members
+    yield info.tobuf(format=tarfile.PAX_FORMAT)
+    yield from _iter_file(f)
+    padding = -size % tarfile.BLOCKSIZE
+    if padding:
+        yield tarfile.NUL * padding
+
+
+def _zip_member(archive, buffer, header, f):
+    with archive.open(_attachment_archive_name(header), "w", force_zip64=True) as dest:
+        for chunk in _iter_file(f):
+            dest.write(chunk)
+            yield buffer.drain()
+    yield buffer.drain()
+
+
 class BatchDownloadAttachmentsView(APIView):
     """
-    POST endpoint that streams multiple attachments in a custom binary format.
-    Request body: {"revision_ids": ["id1", "id2", ...]}
-    Response format: for each file: [4-byte length][JSON header][file bytes]
+    POST endpoint that streams multiple attachments.
+    Request body: {"revision_ids": ["id1", "id2", ...], "format": "stream"}
+    Response formats:
+    - stream (default): for each file: [4-byte length][JSON header][file bytes],
+      files that do not fit a 4-byte length are skipped
+    - stream64: for each file: [4-byte header length][8-byte file length][JSON header][file bytes]
+    - tar / zip: standard archives of {evidence_id}_v{version}_{filename} files
+    Files are read from storage chunk by chunk, nothing is buffered in memory.
     """
 
     def post(self, request, *args, **kwargs):
@@ -671,6 +750,7 @@ class BatchDownloadAttachmentsView(APIView):
             return Response(status=status.HTTP_403_FORBIDDEN)
 
         revision_ids = request.data.get("revision_ids", [])
+        stream_format = request.data.get("format", "stream")
 
         if not revision_ids:
             return Response(
@@ -678,6 +758,15 @@ class BatchDownloadAttachmentsView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        if stream_format not in ATTACHMENT_STREAM_FORMATS:
+            return Response(
+                {
+                    "error": "InvalidFormat",
+                    "message": f"Format must be one of {', '.join(ATTACHMENT_STREAM_FORMATS)}",
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
         # Check batch size limit
         max_batch_size = getattr(settings, "BACKUP_BATCH_SIZE", 200)
 
@@ -696,71 +785,86 @@ class BatchDownloadAttachmentsView(APIView):
             "Starting batch download",
             user=request.user.username,
             revision_count=len(revision_ids),
+            format=stream_format,
         )
 
+        valid_ids = []
+        for revision_id in revision_ids:
+            try:
+                valid_ids.append(uuid.UUID(str(revision_id)))
+            except ValueError:
+                logger.warning("Invalid revision id", revision_id=revision_id)
+        revisions = {
+            str(revision.id): revision
+            for revision in EvidenceRevision.objects.filter(id__in=valid_ids)
+            .exclude(attachment="")
+            .only("id", "evidence_id", "version", "attachment", "attachment_hash")
+        }
+
         def stream_attachments():
-            """Generator that yields attachment data in custom binary format."""
+            """Generator that yields the attachments in the requested format."""
             processed = 0
-            errors = 0
+            errors = len(revision_ids) - len(valid_ids)
+            archive = buffer = None
+            if stream_format == "zip":
+                buffer = _ZipStreamBuffer()
+                archive = zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED)
+
+            for revision_id in map(str, valid_ids):
+                revision = revisions.get(revision_id)
+                if revision is None or not revision.attachment:
+                    errors += 1
+                    logger.warning(
+                        "Attachment not found for revision",
+                        revision_id=revision_id,
+                    )
+                    continue
 
-            for revision_id in revision_ids:
                 try:
-                    revision = EvidenceRevision.objects.select_related("evidence").get(
-                        id=revision_id
+                    f = default_storage.open(revision.attachment.name, "rb")
+                    size = f.size
+                except Exception as e:
+                    errors += 1
+                    logger.warning(
+                        "Attachment not found for revision",
+                        revision_id=revision_id,
+                        error=str(e),
                     )
+                    continue
 
-                    if not revision.attachment or not default_storage.exists(
-                        revision.attachment.name
-                    ):
+                header = {
+                    "id": revision_id,
+                    "evidence_id": str(revision.evidence_id),
+                    "version": revision.version,
+                    "filename": revision.filename(),
+                    "hash": revision.attachment_hash,
+                    "size": size,
+                }
+                # Errors past this point cut the stream, the client retries the batch
+                with f:
+                    if stream_format == "tar":
+                        yield from _tar_member(header, size, f)
+                    elif stream_format == "zip":
+                        yield from _zip_member(archive, buffer, header, f)
+                    elif stream_format == "stream64":
+                        yield from _stream_block(header, size, f, wide=True)
+                    elif len(json.dumps(header)) + size > 0xFFFFFFFF:
                         errors += 1
                         logger.warning(
-                            "Attachment not found for revision",
+                            "Attachment too large for the stream format, use stream64",
                             revision_id=revision_id,
+                            size=size,
                         )
                         continue
+                    else:
+                        yield from _stream_block(header, size, f, wide=False)
+                processed += 1
 
-                    header = {
-                        "id": str(revision.id),
-                        "evidence_id": str(revision.evidence_id),
-                        "version": revision.version,
-                        "filename": revision.filename(),
-                        "hash": revision.attachment_hash,
-                        "size": default_storage.size(revision.attachment.name),
-                    }
-                    header_bytes = json.dumps(header).encode("utf-8")
-
-                    # Read file in chunks
-                    file_buffer = io.BytesIO()
-                    with default_storage.open(revision.attachment.name, "rb") as f:
-                        for chunk in iter(lambda: f.read(10240 * 1024), b""):
-                            file_buffer.write(chunk)
-
-                    file_bytes = file_buffer.getvalue()
-
-                    # Calculate total size: header_length + header + file
-                    total_size = len(header_bytes) + len(file_bytes)
-
-                    # Yield: [4-byte total size][header bytes][file bytes]
-                    yield struct.pack(">I", total_size)
-                    yield header_bytes
-                    yield file_bytes
-
-                    processed += 1
-
-                except EvidenceRevision.DoesNotExist:
-                    errors += 1
-                    logger.warning(
-                        "Revision not found",
-                        revision_id=revision_id,
-                    )
-                except Exception as e:
-                    errors += 1
-                    logger.error(
-                        "Error streaming attachment",
-                        revision_id=revision_id,
-                        error=str(e),
-                        exc_info=True,
-                    )
+            if stream_format == "tar":
+                yield tarfile.NUL * (2 * tarfile.BLOCKSIZE)
+            elif stream_format == "zip":
+                archive.close()
+                yield buffer.drain()
 
             logger.info(
                 "Batch download completed",
@@ -768,13 +872,17 @@ class BatchDownloadAttachmentsView(APIView):
                 errors=errors,
             )
 
+        content_type, extension = {
+            "tar": ("application/x-tar", "tar"),
+            "zip": ("application/zip", "zip"),
+        }.get(stream_format, ("application/octet-stream", "dat"))
         response = StreamingHttpResponse(
-            stream_attachments(),
-            content_type="application/octet-stream",
+            stream_attachments(), content_type=content_type
         )
         response["Content-Disposition"] = (
-            f'attachment; filename="attachments-batch-{datetime.now().strftime("%Y%m%d-%H%M%S")}.dat"'
+            f'attachment; filename="attachments-batch-{datetime.now().strftime("%Y%m%d-%H%M%S")}.{extension}"'
         )
+        response["X-Attachment-Format"] = stream_format
 
         return response
 
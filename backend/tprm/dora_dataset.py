@@ -0,0 +1,187 @@
+"""
+DORA (Digital Operational Resilience Act) dataset loading.
+
+Loads every table needed by the DORA Register of Information reports once,
+into indexed in-memory structures, so report generators never query the
+database themselves.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set
+from uuid import UUID
+
+from core.asset_graph_cache import get_asset_graph_state
+from core.models import Asset
+from tprm.models import Contract, Entity, Solution
+
+
+@dataclass
+class DoraDataset:
+    """
+    Prefetched TPRM graph used by the DORA ROI report generators.
+
+    Contracts carry their provider (with its parent), beneficiary and
+    overarching contract; solutions and business functions are indexed by
+    contract and solution respectively, preserving the models' default ordering.
+    """
+
+    main_entity: Entity
+    subsidiaries: List[Entity]
+    branches: List[Entity]
+    contracts: List[Contract]
+    solutions_by_contract: Dict[UUID, List[Solution]]
+    asset_ids_by_solution: Dict[UUID, FrozenSet[UUID]]
+    functions_by_solution: Dict[UUID, List[Asset]]
+    business_functions: List[Asset]
+    business_function_asset_ids: Set[UUID]
+
+    @classmethod
+    def load(
+        cls,
+        main_entity: Entity,
+        entity_ids: Optional[Iterable[UUID]] = None,
+        contract_ids: Optional[Iterable[UUID]] = None,
+        asset_ids: Optional[Iterable[UUID]] = None,
+    ) -> "DoraDataset":
+        """
+        Load the dataset with a fixed number of queries.
+
+        Args:
+            main_entity: The main builtin entity
+            entity_ids: Restrict subsidiaries/branches to these entities (all if None)
+            contract_ids: Restrict contracts to these contracts (all if None)
+            asset_ids: Restrict business functions to these assets (all if None)
+        """
+        # Subsidiaries: dora_provider_person_type set (legal person)
+        # Branches: dora_provider_person_type not set
+        children = Entity.objects.filter(parent_entity=main_entity).select_related(
+            "parent_entity"
+        )
+        if entity_ids is not None:
+            children = children.filter(id__in=entity_ids)
+        subsidiaries, branches = [], []
+        for entity in children:
+            if entity.dora_provider_person_type:
+                subsidiaries.append(entity)
+            else:
+                branches.append(entity)
+
+        contract_qs = Contract.objects.all()
+        if contract_ids is not None:
+            contract_qs = contract_qs.filter(id__in=contract_ids)
+        contracts = list(
+            contract_qs.select_related(
+                "provider_entity__parent_entity",
+                "beneficiary_entity",
+                "overarching_contract",
+            )
+        )
+
+        solution_qs = Solution.objects.filter(
+            id__in=Contract.solutions.through.objects.filter(
+                contract_id__in=contract_qs.values("id")
+            ).values("solution_id")
+        )
+        solutions = {solution.id: solution for solution in solution_qs}
+        solution_order = {solution_id: i for i, solution_id in enumerate(solutions)}
+
+        solution_ids_by_contract: Dict[UUID, List[UUID]] = {}
+        for contract_id, solution_id in Contract.solutions.through.objects.filter(
+            contract_id__in=contract_qs.values("id")
+        ).values_list("contract_id", "solution_id"):
+            solution_ids_by_contract.setdefault(contract_id, []).append(solution_id)
+        solutions_by_contract = {
+            contract_id: [
+                solutions[solution_id]
+                for solution_id in sorted(set(solution_ids), key=solution_order.get)
+            ]
+            for contract_id, solution_ids in solution_ids_by_contract.items()
+        }
+
+        asset_ids_by_solution: Dict[UUID, Set[UUID]] = {}
+        function_ids_by_solution: Dict[UUID, Set[UUID]] = {}
+        for (
+            solution_id,
+            asset_id,
+            is_business_function,
+        ) in Solution.assets.through.objects.filter(
+            solution_id__in=solution_qs.values("id")
+        ).values_list("solution_id", "asset_id", "asset__is_business_function"):
+            asset_ids_by_solution.setdefault(solution_id, set()).add(asset_id)
+            if is_business_function:
+                function_ids_by_solution.setdefault(solution_id, set()).add(asset_id)
+
+        functions = {
+            function.id: function
+            for function in Asset.objects.filter(
+                id__in=set().union(*function_ids_by_solution.values())
+            )
+        }
+        function_order = {function_id: i for i, function_id in enumerate(functions)}
+        functions_by_solution = {
+            solution_id: [
+                functions[function_id]
+                for function_id in sorted(ids, key=function_order.get)
+            ]
+            for solution_id, ids in function_ids_by_solution.items()
+        }
+
+        business_function_qs = Asset.objects.filter(is_business_function=True)
+        if asset_ids is not None:
+            business_function_qs = business_function_qs.filter(id__in=asset_ids)
+        business_functions = list(business_function_qs)
+
+        # Solutions linked to child assets of a business function also support it
+        descendants = get_asset_graph_state().descendants
+        business_function_asset_ids = set()
+        for function in business_functions:
+            business_function_asset_ids.add(function.id)
+            business_function_asset_ids.update(descendants.get(function.id, ()))
+
+        return cls(
+            main_entity=main_entity,
+            subsidiaries=subsidiaries,
+            branches=branches,
+            contracts=contracts,
+            solutions_by_contract=solutions_by_contract,
+            asset_ids_by_solution={
+                solution_id: frozenset(ids)
+                for solution_id, ids in asset_ids_by_solution.items()
+            },
+            functions_by_solution=functions_by_solution,
+            business_functions=business_functions,
+            business_function_asset_ids=business_function_asset_ids,
+        )
+
+    def solutions_of(self, contract: Contract) -> List[Solution]:
+        return self.solutions_by_contract.get(contract.id, [])
+
+    def supports_business_function(self, solution: Solution) -> bool:
+        """Whether the solution is linked to a business function or one of its child assets."""
+        return not self.asset_ids_by_solution.get(solution.id, frozenset()).isdisjoint(
+            self.business_function_asset_ids
+        )
+
+    @property
+    def third_party_contracts(self) -> List[Contract]:
+        return [
+            contract
+            for contract in self.contracts
+            if not contract.is_intragroup and contract.provider_entity_id is not None
+        ]
+
+    @property
+    def intragroup_contracts(self) -> List[Contract]:
+        return [contract for contract in self.contracts if contract.is_intragroup]
+
+    @property
+    def business_function_contracts(self) -> List[Contract]:
+        """Contracts with at least one solution supporting a business function."""
+        return [
+            contract
+            for contract in self.contracts
+            if any(
+                self.supports_business_function(solution)
+                for solution in self.solutions_of(contract)
+            )
+        ]
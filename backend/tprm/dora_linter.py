@@ -3,198 +3,229 @@ DORA ROI Linting Module
 
 This module provides validation functions for DORA Register of Information (ROI) exports.
 It checks for mandatory and recommended fields before generating the actual report.
+
+Checks are declared as LintRule objects evaluated over a single LintSnapshot, so a
+full lint runs a fixed number of queries regardless of the number of contracts.
+Per-object findings are remembered between runs and only recomputed for objects
+(or related objects) whose fields changed since the previous lint. The snapshot
+itself is loaded by every lint: it is what the changes are detected from.
 """
 
-from typing import List, Dict, Any
-from tprm.models import Entity, Contract, Solution
-from core.models import Asset
-from django.db.models import Q
 import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Set, Tuple
+from uuid import UUID
 
+from core.models import Asset
+from tprm.dora_dataset import DoraDataset
+from tprm.models import Contract, Entity, Solution
+
+IDENTIFIER_TYPES = ["LEI", "EUID", "VAT", "DUNS"]
+
+# Pattern for business function ref_id: F followed by one or more digits
+REF_ID_PATTERN = re.compile(r"^F\d+$")
+
+Finding = Dict[str, Any]
+
+
+def _has_identifier(entity: Entity, identifier_types=IDENTIFIER_TYPES) -> bool:
+    """Whether the entity has at least one of the given legal identifiers."""
+    if not entity.legal_identifiers:
+        return False
+    return any(entity.legal_identifiers.get(id_type) for id_type in identifier_types)
+
+
+def _finding(
+    severity: str,
+    category: str,
+    message: str,
+    field_name: Optional[str] = None,
+    object_type: Optional[str] = None,
+    obj=None,
+) -> Finding:
+    return {
+        "severity": severity,
+        "category": category,
+        "message": message,
+        "field": field_name,
+        "object_type": object_type,
+        "object_id": str(obj.id) if obj is not None else None,
+        "object_name": obj.name if obj is not None else None,
+    }
 
-def lint_provider_entities() -> List[Dict[str, Any]]:
-    """
-    Validate provider entities used in DORA ROI reports.
 
-    Checks that third-party providers have:
-    - At least one legal identifier (LEI, EUID, VAT, DUNS)
-    - Country set
-    - DORA provider person type set (mandatory for b_05.01 c0040)
-    - Parent entity with legal identifier (if parent exists)
+def _error_count(findings_by_object: Sequence[List[Finding]]) -> int:
+    return sum(
+        any(finding["severity"] == "error" for finding in findings)
+        for findings in findings_by_object
+    )
 
-    Returns:
-        List of validation results with severity levels (error, warning, ok)
-    """
-    results = []
 
-    # Get all provider entities from third-party contracts
-    provider_entities = Entity.objects.filter(
-        contracts__is_intragroup=False, contracts__isnull=False
-    ).distinct()
+def _validity_summary(
+    category: str,
+    total: int,
+    invalid: int,
+    all_valid_message: str,
+    some_valid_message: str,
+) -> List[Finding]:
+    """Success message when all (or some) checked objects are valid."""
+    valid = total - invalid
+    if valid == total:
+        return [_finding("ok", category, all_valid_message.format(total=total))]
+    if valid > 0:
+        return [
+            _finding(
+                "ok", category, some_valid_message.format(valid=valid, total=total)
+            )
+        ]
+    return []
 
-    if not provider_entities.exists():
-        return results
 
-    providers_with_errors = 0
+@dataclass
+class LintSnapshot:
+    """
+    TPRM graph prefetched for linting.
 
-    for provider in provider_entities:
-        provider_has_error = False
+    Extends the export dataset with the solutions linked to business functions
+    (whether or not they are under contract) and which of them have contracts.
+    """
 
-        # Check legal identifiers (mandatory)
-        has_legal_identifier = False
-        if provider.legal_identifiers:
-            identifier_types = ["LEI", "EUID", "VAT", "DUNS"]
-            for id_type in identifier_types:
-                if provider.legal_identifiers.get(id_type):
-                    has_legal_identifier = True
-                    break
+    dataset: DoraDataset
+    business_function_solutions: List[Solution]
+    solution_ids_with_contracts: Set[UUID]
+
+    @classmethod
+    def load(cls, main_entity: Entity) -> "LintSnapshot":
+        dataset = DoraDataset.load(main_entity)
+        business_function_solutions = list(
+            Solution.objects.filter(assets__id__in=dataset.business_function_asset_ids)
+            .distinct()
+            .select_related("provider_entity")
+        )
+        solution_ids_with_contracts = set(
+            Contract.solutions.through.objects.filter(
+                solution_id__in=[
+                    solution.id for solution in business_function_solutions
+                ]
+            ).values_list("solution_id", flat=True)
+        )
+        return cls(
+            dataset=dataset,
+            business_function_solutions=business_function_solutions,
+            solution_ids_with_contracts=solution_ids_with_contracts,
+        )
 
-        if not has_legal_identifier:
-            results.append(
-                {
-                    "severity": "error",
-                    "category": "Provider Entities",
-                    "message": f"Provider entity '{provider.name}' must have at least one legal identifier (LEI, EUID, VAT, or DUNS) for DORA reporting",
-                    "field": "legal_identifiers",
-                    "object_type": "entities",
-                    "object_id": str(provider.id),
-                    "object_name": provider.name,
-                }
-            )
-            provider_has_error = True
+    @property
+    def main_entity(self) -> Entity:
+        return self.dataset.main_entity
 
-        # Check country (mandatory)
-        if not provider.country:
-            results.append(
-                {
-                    "severity": "error",
-                    "category": "Provider Entities",
-                    "message": f"Provider entity '{provider.name}' must have a country set for DORA reporting",
-                    "field": "country",
-                    "object_type": "entities",
-                    "object_id": str(provider.id),
-                    "object_name": provider.name,
-                }
-            )
-            provider_has_error = True
+    @property
+    def provider_entities(self) -> List[Entity]:
+        """Provider entities of third-party contracts."""
+        providers = {
+            contract.provider_entity.id: contract.provider_entity
+            for contract in self.dataset.third_party_contracts
+        }
+        return sorted(providers.values(), key=lambda provider: provider.name)
 
-        # Check DORA provider person type (mandatory for b_05.01 c0040)
-        if not provider.dora_provider_person_type:
-            results.append(
-                {
-                    "severity": "error",
-                    "category": "Provider Entities",
-                    "message": f"Provider entity '{provider.name}' must have a DORA provider person type set for DORA b_05.01 reporting (c0040)",
-                    "field": "dora_provider_person_type",
-                    "object_type": "entities",
-                    "object_id": str(provider.id),
-                    "object_name": provider.name,
-                }
-            )
-            provider_has_error = True
-
-        # Check parent entity has legal identifier (if parent exists)
-        if provider.parent_entity:
-            parent_has_identifier = False
-            if provider.parent_entity.legal_identifiers:
-                identifier_types = ["LEI", "EUID", "VAT", "DUNS"]
-                for id_type in identifier_types:
-                    if provider.parent_entity.legal_identifiers.get(id_type):
-                        parent_has_identifier = True
-                        break
-
-            if not parent_has_identifier:
-                results.append(
-                    {
-                        "severity": "error",
-                        "category": "Provider Entities",
-                        "message": f"Parent entity '{provider.parent_entity.name}' of provider '{provider.name}' must have at least one legal identifier for DORA reporting",
-                        "field": "legal_identifiers",
-                        "object_type": "entities",
-                        "object_id": str(provider.parent_entity.id),
-                        "object_name": provider.parent_entity.name,
-                    }
-                )
-                provider_has_error = True
 
-        if provider_has_error:
-            providers_with_errors += 1
+def _stamp(obj) -> Optional[Tuple[UUID, str]]:
+    """
+    Identity and field values of an object. updated_at alone would miss the
+    edits made with QuerySet.update().
+    """
+    if obj is None:
+        return None
+    return (
+        obj.id,
+        repr([getattr(obj, field.attname) for field in obj._meta.concrete_fields]),
+    )
 
-    # Add success message if all providers are valid
-    valid_providers = provider_entities.count() - providers_with_errors
-    if valid_providers == provider_entities.count():
-        results.append(
-            {
-                "severity": "ok",
-                "category": "Provider Entities",
-                "message": f"All {provider_entities.count()} provider entities have required fields set",
-                "field": None,
-                "object_type": None,
-                "object_id": None,
-                "object_name": None,
-            }
-        )
-    elif valid_providers > 0:
-        results.append(
-            {
-                "severity": "ok",
-                "category": "Provider Entities",
-                "message": f"{valid_providers} of {provider_entities.count()} provider entities have all required fields set",
-                "field": None,
-                "object_type": None,
-                "object_id": None,
-                "object_name": None,
-            }
-        )
 
-    return results
+def _object_fingerprint(obj, snapshot: LintSnapshot) -> Hashable:
+    return _stamp(obj)
 
 
-def lint_main_entity(entity: Entity) -> List[Dict[str, Any]]:
+@dataclass(frozen=True)
+class LintRule:
+    """
+    A DORA ROI check applied to every object selected from the snapshot.
+
+    Attributes:
+        name: Stable identifier, used for timings and incremental results
+        category: Category reported on each finding
+        select: Objects of the snapshot the rule applies to
+        check: Findings for one object (pure function of the snapshot)
+        finalize: Turns per-object findings into the rule's results,
+            adding set-level checks and success messages
+        fingerprint: Changes whenever the object's findings may change
     """
-    Validate the main entity for DORA ROI requirements.
 
-    Args:
-        entity: The main Entity instance to validate
+    name: str
+    category: str
+    select: Callable[[LintSnapshot], Sequence[Any]]
+    check: Optional[Callable[[Any, LintSnapshot], List[Finding]]]
+    finalize: Callable[
+        [Sequence[Any], List[List[Finding]], LintSnapshot], List[Finding]
+    ]
+    fingerprint: Callable[[Any, LintSnapshot], Hashable] = _object_fingerprint
 
-    Returns:
-        List of validation results with severity levels (error, warning, ok)
+
+@dataclass
+class LintState:
+    """
+    Per-object findings of the previous lint of a main entity, keyed by rule
+    and object. Rules are evaluated with the lock held, so that a state can be
+    shared by concurrent requests.
     """
+
+    findings: Dict[Tuple[str, UUID], Tuple[Hashable, List[Finding]]] = field(
+        default_factory=dict
+    )
+    main_entity_id: Optional[UUID] = None
+    lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def bind(self, main_entity: Entity) -> None:
+        """Forget the findings of another main entity."""
+        with self.lock:
+            if self.main_entity_id != main_entity.id:
+                self.findings.clear()
+                self.main_entity_id = main_entity.id
+
+
+# Main entity
+
+
+def _check_main_entity(entity: Entity, snapshot: LintSnapshot) -> List[Finding]:
+    category = "Main Entity"
     results = []
 
     # Check legal identifiers (mandatory)
-    has_legal_identifier = False
-    if entity.legal_identifiers:
-        # Check for any of the accepted identifiers: LEI, EUID, VAT, DUNS
-        identifier_types = ["LEI", "EUID", "VAT", "DUNS"]
-        for id_type in identifier_types:
-            if entity.legal_identifiers.get(id_type):
-                has_legal_identifier = True
-                break
-
-    if has_legal_identifier:
+    if _has_identifier(entity):
         results.append(
-            {
-                "severity": "ok",
-                "category": "Main Entity",
-                "message": "Legal identifier found",
-                "field": "legal_identifiers",
-                "object_type": "entities",
-                "object_id": str(entity.id),
-                "object_name": entity.name,
-            }
+            _finding(
+                "ok",
+                category,
+                "Legal identifier found",
+                "legal_identifiers",
+                "entities",
+                entity,
+            )
         )
     else:
         results.append(
-            {
-                "severity": "error",
-                "category": "Main Entity",
-                "message": "Main entity must have at least one legal identifier (LEI, EUID, VAT, or DUNS)",
-                "field": "legal_identifiers",
-                "object_type": "entities",
-                "object_id": str(entity.id),
-                "object_name": entity.name,
-            }
+            _finding(
+                "error",
+                category,
+                "Main entity must have at least one legal identifier (LEI, EUID, VAT, or DUNS)",
+                "legal_identifiers",
+                "entities",
+                entity,
+            )
         )
 
     # Check LEI length if provided (must be exactly 20 characters)
@@ -202,1141 +233,880 @@ def lint_main_entity(entity: Entity) -> List[Dict[str, Any]]:
         lei = entity.legal_identifiers.get("LEI")
         if len(lei) != 20:
             results.append(
-                {
-                    "severity": "error",
-                    "category": "Main Entity",
-                    "message": f"LEI must be exactly 20 characters long (current: {len(lei)} characters)",
-                    "field": "legal_identifiers",
-                    "object_type": "entities",
-                    "object_id": str(entity.id),
-                    "object_name": entity.name,
-                }
+                _finding(
+                    "error",
+                    category,
+                    f"LEI must be exactly 20 characters long (current: {len(lei)} characters)",
+                    "legal_identifiers",
+                    "entities",
+                    entity,
+                )
             )
         else:
             results.append(
-                {
-                    "severity": "ok",
-                    "category": "Main Entity",
-                    "message": "LEI has correct length (20 characters)",
-                    "field": "legal_identifiers",
-                    "object_type": "entities",
-                    "object_id": str(entity.id),
-                    "object_name": entity.name,
-                }
+                _finding(
+                    "ok",
+                    category,
+                    "LEI has correct length (20 characters)",
+                    "legal_identifiers",
+                    "entities",
+                    entity,
+                )
             )
 
-    # Check country (mandatory)
-    if entity.country:
-        results.append(
-            {
-                "severity": "ok",
-                "category": "Main Entity",
-                "message": "Country is set",
-                "field": "country",
-                "object_type": "entities",
-                "object_id": str(entity.id),
-                "object_name": entity.name,
-            }
-        )
-    else:
-        results.append(
-            {
-                "severity": "error",
-                "category": "Main Entity",
-                "message": "Main entity must have a country set",
-                "field": "country",
-                "object_type": "entities",
-                "object_id": str(entity.id),
-                "object_name": entity.name,
-            }
-        )
-
-    # Check DORA entity type (mandatory)
-    if entity.dora_entity_type:
-        results.append(
-            {
-                "severity": "ok",
-                "category": "Main Entity",
-                "message": "Entity type is set",
-                "field": "dora_entity_type",
-                "object_type": "entities",
-                "object_id": str(entity.id),
-                "object_name": entity.name,
-            }
-        )
-    else:
-        results.append(
-            {
-                "severity": "error",
-                "category": "Main Entity",
-                "message": "Main entity must have a DORA entity type set",
-                "field": "dora_entity_type",
-                "object_type": "entities",
-                "object_id": str(entity.id),
-                "object_name": entity.name,
-            }
-        )
-
-    # Check DORA competent authority (mandatory)
-    if entity.dora_competent_authority:
-        results.append(
-            {
-                "severity": "ok",
-                "category": "Main Entity",
-                "message": "Competent authority is set",
-                "field": "dora_competent_authority",
-                "object_type": "entities",
-                "object_id": str(entity.id),
-                "object_name": entity.name,
-            }
-        )
-    else:
-        results.append(
-            {
-                "severity": "error",
-                "category": "Main Entity",
-                "message": "Main entity must have a DORA competent authority set",
-                "field": "dora_competent_authority",
-                "object_type": "entities",
-                "object_id": str(entity.id),
-                "object_name": entity.name,
-            }
-        )
-
-    # Check currency (mandatory)
-    if entity.currency:
-        results.append(
-            {
-                "severity": "ok",
-                "category": "Main Entity",
-                "message": "Currency is set",
-                "field": "currency",
-                "object_type": "entities",
-                "object_id": str(entity.id),
-                "object_name": entity.name,
-            }
-        )
-    else:
-        results.append(
-            {
-                "severity": "error",
-                "category": "Main Entity",
-                "message": "Main entity must have a currency set",
-                "field": "currency",
-                "object_type": "entities",
-                "object_id": str(entity.id),
-                "object_name": entity.name,
-            }
-        )
+    # Check mandatory fields
+    for field_name, label, error_message in [
+        ("country", "Country", "Main entity must have a country set"),
+        (
+            "dora_entity_type",
+            "Entity type",
+            "Main entity must have a DORA entity type set",
+        ),
+        (
+            "dora_competent_authority",
+            "Competent authority",
+            "Main entity must have a DORA competent authority set",
+        ),
+        ("currency", "Currency", "Main entity must have a currency set"),
+    ]:
+        if getattr(entity, field_name):
+            results.append(
+                _finding(
+                    "ok", category, f"{label} is set", field_name, "entities", entity
+                )
+            )
+        else:
+            results.append(
+                _finding(
+                    "error", category, error_message, field_name, "entities", entity
+                )
+            )
 
     return results
 
 
-def lint_subsidiaries(main_entity: Entity) -> List[Dict[str, Any]]:
-    """
-    Validate subsidiaries for DORA ROI requirements.
+def _flatten(objects, findings_by_object, snapshot) -> List[Finding]:
+    return [finding for findings in findings_by_object for finding in findings]
 
-    Subsidiaries are entities with the main entity as parent and dora_provider_person_type set.
 
-    Args:
-        main_entity: The main Entity instance
+# Subsidiaries
 
-    Returns:
-        List of validation results with severity levels (error, warning, ok)
-    """
+
+def _check_subsidiary(subsidiary: Entity, snapshot: LintSnapshot) -> List[Finding]:
+    category = "Subsidiaries"
     results = []
 
-    # Get all subsidiaries (entities with parent=main_entity and dora_provider_person_type set)
-    subsidiaries = Entity.objects.filter(
-        parent_entity=main_entity, dora_provider_person_type__isnull=False
-    ).exclude(dora_provider_person_type="")
-
-    if not subsidiaries.exists():
-        # No subsidiaries found - this is OK, not an error
-        return results
-
-    # Check each subsidiary
-    for subsidiary in subsidiaries:
-        # Check legal identifiers (mandatory)
-        has_legal_identifier = False
-        if subsidiary.legal_identifiers:
-            identifier_types = ["LEI", "EUID", "VAT", "DUNS"]
-            for id_type in identifier_types:
-                if subsidiary.legal_identifiers.get(id_type):
-                    has_legal_identifier = True
-                    break
-
-        if not has_legal_identifier:
-            results.append(
-                {
-                    "severity": "error",
-                    "category": "Subsidiaries",
-                    "message": f"Subsidiary '{subsidiary.name}' must have at least one legal identifier (LEI, EUID, VAT, or DUNS)",
-                    "field": "legal_identifiers",
-                    "object_type": "entities",
-                    "object_id": str(subsidiary.id),
-                    "object_name": subsidiary.name,
-                }
+    # Check legal identifiers (mandatory)
+    if not _has_identifier(subsidiary):
+        results.append(
+            _finding(
+                "error",
+                category,
+                f"Subsidiary '{subsidiary.name}' must have at least one legal identifier (LEI, EUID, VAT, or DUNS)",
+                "legal_identifiers",
+                "entities",
+                subsidiary,
             )
+        )
 
-        # Check LEI length if provided (must be exactly 20 characters)
-        if subsidiary.legal_identifiers and subsidiary.legal_identifiers.get("LEI"):
-            lei = subsidiary.legal_identifiers.get("LEI")
-            if len(lei) != 20:
-                results.append(
-                    {
-                        "severity": "error",
-                        "category": "Subsidiaries",
-                        "message": f"Subsidiary '{subsidiary.name}' has LEI with incorrect length (must be 20 characters, current: {len(lei)})",
-                        "field": "legal_identifiers",
-                        "object_type": "entities",
-                        "object_id": str(subsidiary.id),
-                        "object_name": subsidiary.name,
-                    }
-                )
-
-        # Check country (mandatory)
-        if not subsidiary.country:
+    # Check LEI length if provided (must be exactly 20 characters)
+    if subsidiary.legal_identifiers and subsidiary.legal_identifiers.get("LEI"):
+        lei = subsidiary.legal_identifiers.get("LEI")
+        if len(lei) != 20:
             results.append(
-                {
-                    "severity": "error",
-                    "category": "Subsidiaries",
-                    "message": f"Subsidiary '{subsidiary.name}' must have a country set",
-                    "field": "country",
-                    "object_type": "entities",
-                    "object_id": str(subsidiary.id),
-                    "object_name": subsidiary.name,
-                }
+                _finding(
+                    "error",
+                    category,
+                    f"Subsidiary '{subsidiary.name}' has LEI with incorrect length (must be 20 characters, current: {len(lei)})",
+                    "legal_identifiers",
+                    "entities",
+                    subsidiary,
+                )
             )
 
-        # Check DORA entity type (mandatory)
-        if not subsidiary.dora_entity_type:
+    # Check mandatory fields
+    for field_name, label in [
+        ("country", "a country"),
+        ("dora_entity_type", "a DORA entity type"),
+        ("dora_entity_hierarchy", "a DORA entity hierarchy"),
+    ]:
+        if not getattr(subsidiary, field_name):
             results.append(
-                {
-                    "severity": "error",
-                    "category": "Subsidiaries",
-                    "message": f"Subsidiary '{subsidiary.name}' must have a DORA entity type set",
-                    "field": "dora_entity_type",
-                    "object_type": "entities",
-                    "object_id": str(subsidiary.id),
-                    "object_name": subsidiary.name,
-                }
+                _finding(
+                    "error",
+                    category,
+                    f"Subsidiary '{subsidiary.name}' must have {label} set",
+                    field_name,
+                    "entities",
+                    subsidiary,
+                )
             )
 
-        # Check DORA entity hierarchy (mandatory)
-        if not subsidiary.dora_entity_hierarchy:
-            results.append(
-                {
-                    "severity": "error",
-                    "category": "Subsidiaries",
-                    "message": f"Subsidiary '{subsidiary.name}' must have a DORA entity hierarchy set",
-                    "field": "dora_entity_hierarchy",
-                    "object_type": "entities",
-                    "object_id": str(subsidiary.id),
-                    "object_name": subsidiary.name,
-                }
+    # Check currency (warning)
+    if not subsidiary.currency:
+        results.append(
+            _finding(
+                "warning",
+                category,
+                f"Subsidiary '{subsidiary.name}' should have a currency set",
+                "currency",
+                "entities",
+                subsidiary,
             )
+        )
+
+    return results
 
-        # Check currency (warning)
-        if not subsidiary.currency:
-            results.append(
-                {
-                    "severity": "warning",
-                    "category": "Subsidiaries",
-                    "message": f"Subsidiary '{subsidiary.name}' should have a currency set",
-                    "field": "currency",
-                    "object_type": "entities",
-                    "object_id": str(subsidiary.id),
-                    "object_name": subsidiary.name,
-                }
-            )
 
+def _finalize_subsidiaries(subsidiaries, findings_by_object, snapshot):
+    results = _flatten(subsidiaries, findings_by_object, snapshot)
     # If we have subsidiaries and no errors, add a success message
-    if subsidiaries.exists() and not results:
+    if subsidiaries and not results:
         results.append(
-            {
-                "severity": "ok",
-                "category": "Subsidiaries",
-                "message": f"All {subsidiaries.count()} subsidiaries have required fields set",
-                "field": None,
-                "object_type": None,
-                "object_id": None,
-                "object_name": None,
-            }
+            _finding(
+                "ok",
+                "Subsidiaries",
+                f"All {len(subsidiaries)} subsidiaries have required fields set",
+            )
         )
-
     return results
 
 
-def lint_branches(main_entity: Entity) -> List[Dict[str, Any]]:
-    """
-    Validate branches for DORA ROI requirements.
-
-    Branches are entities with the main entity as parent and without dora_provider_person_type set.
-    Each branch must have a parent entity with a legal identifier (for b_01.03 report).
+# Branches
 
-    Args:
-        main_entity: The main Entity instance
 
-    Returns:
-        List of validation results with severity levels (error, warning, ok)
-    """
-    results = []
+def _check_branch(branch: Entity, snapshot: LintSnapshot) -> List[Finding]:
+    # Check country (mandatory)
+    if not branch.country:
+        return [
+            _finding(
+                "error",
+                "Branches",
+                f"Branch '{branch.name}' must have a country set for DORA b_01.03 reporting",
+                "country",
+                "entities",
+                branch,
+            )
+        ]
+    return []
 
-    # Get all branches (entities with main entity as parent and no dora_provider_person_type)
-    branches = Entity.objects.filter(parent_entity=main_entity).filter(
-        Q(dora_provider_person_type__isnull=True) | Q(dora_provider_person_type="")
-    )
 
-    if not branches.exists():
+def _finalize_branches(branches, findings_by_object, snapshot):
+    if not branches:
         # No branches found - this is OK, not an error
-        return results
-
-    branches_with_errors = 0
+        return []
 
+    results = []
     # Check that main entity (parent of all branches) has a legal identifier
-    main_has_identifier = False
-    if main_entity.legal_identifiers:
-        identifier_types = ["LEI", "EUID", "VAT", "DUNS"]
-        for id_type in identifier_types:
-            if main_entity.legal_identifiers.get(id_type):
-                main_has_identifier = True
-                break
-
-    if not main_has_identifier and branches.exists():
+    main_entity = snapshot.main_entity
+    if not _has_identifier(main_entity):
         results.append(
-            {
-                "severity": "error",
-                "category": "Branches",
-                "message": f"Main entity '{main_entity.name}' (parent of branches) must have at least one legal identifier (LEI, EUID, VAT, or DUNS) for DORA b_01.03 reporting",
-                "field": "legal_identifiers",
-                "object_type": "entities",
-                "object_id": str(main_entity.id),
-                "object_name": main_entity.name,
-            }
+            _finding(
+                "error",
+                "Branches",
+                f"Main entity '{main_entity.name}' (parent of branches) must have at least one legal identifier (LEI, EUID, VAT, or DUNS) for DORA b_01.03 reporting",
+                "legal_identifiers",
+                "entities",
+                main_entity,
+            )
         )
+    results.extend(_flatten(branches, findings_by_object, snapshot))
+    results.extend(
+        _validity_summary(
+            "Branches",
+            len(branches),
+            _error_count(findings_by_object),
+            "All {total} branch(es) have required fields set",
+            "{valid} of {total} branch(es) have all required fields set",
+        )
+    )
+    return results
+
+
+# Unique LEIs
 
-    # Check each branch
-    for branch in branches:
-        branch_has_error = False
 
-        # Check country (mandatory)
-        if not branch.country:
+def _finalize_unique_leis(entities, findings_by_object, snapshot):
+    results = []
+
+    # Collect LEIs: lei -> list of entities with that LEI
+    lei_map = {}
+    for entity in entities:
+        if entity.legal_identifiers and entity.legal_identifiers.get("LEI"):
+            lei_map.setdefault(entity.legal_identifiers.get("LEI"), []).append(entity)
+
+    # Check for duplicates
+    for lei, lei_entities in lei_map.items():
+        if len(lei_entities) > 1:
+            entity_names = ", ".join([f"'{e.name}'" for e in lei_entities])
             results.append(
-                {
-                    "severity": "error",
-                    "category": "Branches",
-                    "message": f"Branch '{branch.name}' must have a country set for DORA b_01.03 reporting",
-                    "field": "country",
-                    "object_type": "entities",
-                    "object_id": str(branch.id),
-                    "object_name": branch.name,
-                }
+                _finding(
+                    "error",
+                    "Unique LEIs",
+                    f"LEI '{lei}' is used by multiple entities: {entity_names}. Each entity in the DORA ROI report must have a unique LEI.",
+                    "legal_identifiers",
+                )
             )
-            branch_has_error = True
 
-        if branch_has_error:
-            branches_with_errors += 1
+    if not results and lei_map:
+        results.append(_finding("ok", "Unique LEIs", "All entities have unique LEIs"))
+    return results
 
-    # If we have branches and no errors, add a success message
-    valid_branches = branches.count() - branches_with_errors
-    if valid_branches == branches.count():
+
+# Business functions
+
+
+def _check_business_function(bf: Asset, snapshot: LintSnapshot) -> List[Finding]:
+    category = "Business Functions"
+    results = []
+
+    # Check ref_id pattern
+    if not bf.ref_id or not REF_ID_PATTERN.match(bf.ref_id):
+        ref_id_display = bf.ref_id if bf.ref_id else "(empty)"
         results.append(
-            {
-                "severity": "ok",
-                "category": "Branches",
-                "message": f"All {branches.count()} branch(es) have required fields set",
-                "field": None,
-                "object_type": None,
-                "object_id": None,
-                "object_name": None,
-            }
+            _finding(
+                "warning",
+                category,
+                f"Business function '{bf.name}' has ref_id '{ref_id_display}' that doesn't match pattern 'F' + number (e.g., F1, F2)",
+                "ref_id",
+                "assets",
+                bf,
+            )
         )
-    elif valid_branches > 0:
+
+    # Check licensed activity (mandatory for DORA reporting)
+    if not bf.dora_licenced_activity:
         results.append(
-            {
-                "severity": "ok",
-                "category": "Branches",
-                "message": f"{valid_branches} of {branches.count()} branch(es) have all required fields set",
-                "field": None,
-                "object_type": None,
-                "object_id": None,
-                "object_name": None,
-            }
+            _finding(
+                "error",
+                category,
+                f"Business function '{bf.name}' must have a licensed activity set for DORA reporting",
+                "dora_licenced_activity",
+                "assets",
+                bf,
+            )
         )
 
     return results
 
 
-def lint_business_functions() -> List[Dict[str, Any]]:
-    """
-    Validate that business function assets exist in the system.
-
-    DORA ROI requires at least one asset with is_business_function flag set.
-    Additionally checks that ref_id follows the pattern 'F' + number (e.g., F1, F2, F100).
-
-    Returns:
-        List of validation results with severity levels (error, warning, ok)
-    """
-    results = []
-
-    # Check if there are any business function assets
-    business_functions = Asset.objects.filter(is_business_function=True)
+def _finalize_business_functions(business_functions, findings_by_object, snapshot):
+    category = "Business Functions"
+    if not business_functions:
+        return [
+            _finding(
+                "error",
+                category,
+                "At least one asset with 'Business Function' flag must be defined",
+                "is_business_function",
+                "assets",
+            )
+        ]
 
-    if not business_functions.exists():
+    results = _flatten(business_functions, findings_by_object, snapshot)
+    total = len(business_functions)
+    invalid_ref_ids = sum(
+        any(finding["field"] == "ref_id" for finding in findings)
+        for findings in findings_by_object
+    )
+    results.extend(
+        _validity_summary(
+            category,
+            total,
+            invalid_ref_ids,
+            "All {total} business function(s) have valid ref_id pattern",
+            "{valid} of {total} business function(s) have valid ref_id pattern",
+        )
+    )
+    # Add success message if all business functions have licensed activity
+    if not any(
+        finding["field"] == "dora_licenced_activity"
+        for findings in findings_by_object
+        for finding in findings
+    ):
         results.append(
-            {
-                "severity": "error",
-                "category": "Business Functions",
-                "message": "At least one asset with 'Business Function' flag must be defined",
-                "field": "is_business_function",
-                "object_type": "assets",
-                "object_id": None,
-                "object_name": None,
-            }
+            _finding(
+                "ok",
+                category,
+                f"All {total} business function(s) have licensed activity set",
+            )
         )
-        return results
+    return results
 
-    # Pattern for ref_id: F followed by one or more digits
-    ref_id_pattern = re.compile(r"^F\d+$")
 
-    # Check each business function's ref_id and licensed activity
-    invalid_ref_ids = []
-    missing_licensed_activity = []
-    valid_count = 0
+# Contracts
 
-    for bf in business_functions:
-        # Check ref_id pattern
-        if not bf.ref_id or not ref_id_pattern.match(bf.ref_id):
-            invalid_ref_ids.append(bf)
-        else:
-            valid_count += 1
 
-        # Check licensed activity (mandatory for DORA reporting)
-        if not bf.dora_licenced_activity:
-            missing_licensed_activity.append(bf)
+def _check_contract(contract: Contract, snapshot: LintSnapshot) -> List[Finding]:
+    category = "Contracts"
+    results = []
 
-    # Report results
-    if invalid_ref_ids:
-        for bf in invalid_ref_ids:
-            ref_id_display = bf.ref_id if bf.ref_id else "(empty)"
+    # Check mandatory fields
+    for field_name, message in [
+        ("ref_id", "must have a reference ID (ref_id) set"),
+        ("currency", "must have a currency set"),
+        (
+            "dora_contractual_arrangement",
+            "must have a DORA contractual arrangement (type) set",
+        ),
+    ]:
+        if not getattr(contract, field_name):
             results.append(
-                {
-                    "severity": "warning",
-                    "category": "Business Functions",
-                    "message": f"Business function '{bf.name}' has ref_id '{ref_id_display}' that doesn't match pattern 'F' + number (e.g., F1, F2)",
-                    "field": "ref_id",
-                    "object_type": "assets",
-                    "object_id": str(bf.id),
-                    "object_name": bf.name,
-                }
+                _finding(
+                    "error",
+                    category,
+                    f"Contract '{contract.name}' {message}",
+                    field_name,
+                    "contracts",
+                    contract,
+                )
             )
 
-    # Report missing licensed activity
-    if missing_licensed_activity:
-        for bf in missing_licensed_activity:
-            results.append(
-                {
-                    "severity": "error",
-                    "category": "Business Functions",
-                    "message": f"Business function '{bf.name}' must have a licensed activity set for DORA reporting",
-                    "field": "dora_licenced_activity",
-                    "object_type": "assets",
-                    "object_id": str(bf.id),
-                    "object_name": bf.name,
-                }
+    # Check annual expense (mandatory)
+    if contract.annual_expense is None:
+        results.append(
+            _finding(
+                "error",
+                category,
+                f"Contract '{contract.name}' must have an annual expense set",
+                "annual_expense",
+                "contracts",
+                contract,
             )
+        )
 
-    # Add success message if all business functions have valid ref_ids
-    if valid_count == business_functions.count():
+    # Check beneficiary entity (mandatory for b_02.02 reporting)
+    beneficiary = contract.beneficiary_entity
+    if not beneficiary:
         results.append(
-            {
-                "severity": "ok",
-                "category": "Business Functions",
-                "message": f"All {business_functions.count()} business function(s) have valid ref_id pattern",
-                "field": None,
-                "object_type": None,
-                "object_id": None,
-                "object_name": None,
-            }
+            _finding(
+                "error",
+                category,
+                f"Contract '{contract.name}' must have a beneficiary entity set for DORA b_02.02 reporting",
+                "beneficiary_entity",
+                "contracts",
+                contract,
+            )
         )
-    elif valid_count > 0:
+    elif not _has_identifier(beneficiary):
         results.append(
-            {
-                "severity": "ok",
-                "category": "Business Functions",
-                "message": f"{valid_count} of {business_functions.count()} business function(s) have valid ref_id pattern",
-                "field": None,
-                "object_type": None,
-                "object_id": None,
-                "object_name": None,
-            }
+            _finding(
+                "error",
+                category,
+                f"Beneficiary entity '{beneficiary.name}' of contract '{contract.name}' must have at least one legal identifier (LEI, EUID, VAT, or DUNS) for DORA b_02.02 reporting",
+                "legal_identifiers",
+                "entities",
+                beneficiary,
+            )
         )
 
-    # Add success message if all business functions have licensed activity
-    if not missing_licensed_activity:
+    # Check start_date (mandatory for b_02.02 reporting)
+    if not contract.start_date:
         results.append(
-            {
-                "severity": "ok",
-                "category": "Business Functions",
-                "message": f"All {business_functions.count()} business function(s) have licensed activity set",
-                "field": None,
-                "object_type": None,
-                "object_id": None,
-                "object_name": None,
-            }
+            _finding(
+                "error",
+                category,
+                f"Contract '{contract.name}' must have a start date set for DORA b_02.02 reporting",
+                "start_date",
+                "contracts",
+                contract,
+            )
         )
 
     return results
 
 
-def lint_contracts() -> List[Dict[str, Any]]:
-    """
-    Validate contracts for DORA ROI requirements.
-
-    Checks that contracts have required fields:
-    - ref_id
-    - currency
-    - dora_contractual_arrangement (type of contract)
-    - annual_expense
-    - beneficiary_entity (with legal identifier)
-    - start_date
-
-    Returns:
-        List of validation results with severity levels (error, warning, ok)
-    """
-    results = []
-
-    # Get all contracts
-    contracts = Contract.objects.all().select_related("beneficiary_entity")
-
-    if not contracts.exists():
+def _finalize_contracts(contracts, findings_by_object, snapshot):
+    if not contracts:
         # No contracts found - this could be OK, but let's inform the user
-        results.append(
-            {
-                "severity": "warning",
-                "category": "Contracts",
-                "message": "No contracts found in the system",
-                "field": None,
-                "object_type": None,
-                "object_id": None,
-                "object_name": None,
-            }
+        return [_finding("warning", "Contracts", "No contracts found in the system")]
+
+    results = _flatten(contracts, findings_by_object, snapshot)
+    results.extend(
+        _validity_summary(
+            "Contracts",
+            len(contracts),
+            _error_count(findings_by_object),
+            "All {total} contracts have required fields set",
+            "{valid} of {total} contracts have all required fields set",
         )
-        return results
-
-    # Track validation statistics
-    total_contracts = contracts.count()
-    contracts_with_errors = 0
-
-    # Check each contract
-    for contract in contracts:
-        contract_has_error = False
-
-        # Check ref_id (mandatory)
-        if not contract.ref_id:
-            results.append(
-                {
-                    "severity": "error",
-                    "category": "Contracts",
-                    "message": f"Contract '{contract.name}' must have a reference ID (ref_id) set",
-                    "field": "ref_id",
-                    "object_type": "contracts",
-                    "object_id": str(contract.id),
-                    "object_name": contract.name,
-                }
-            )
-            contract_has_error = True
+    )
+    return results
 
-        # Check currency (mandatory)
-        if not contract.currency:
-            results.append(
-                {
-                    "severity": "error",
-                    "category": "Contracts",
-                    "message": f"Contract '{contract.name}' must have a currency set",
-                    "field": "currency",
-                    "object_type": "contracts",
-                    "object_id": str(contract.id),
-                    "object_name": contract.name,
-                }
-            )
-            contract_has_error = True
 
-        # Check DORA contractual arrangement (mandatory)
-        if not contract.dora_contractual_arrangement:
-            results.append(
-                {
-                    "severity": "error",
-                    "category": "Contracts",
-                    "message": f"Contract '{contract.name}' must have a DORA contractual arrangement (type) set",
-                    "field": "dora_contractual_arrangement",
-                    "object_type": "contracts",
-                    "object_id": str(contract.id),
-                    "object_name": contract.name,
-                }
-            )
-            contract_has_error = True
-
-        # Check annual expense (mandatory)
-        if contract.annual_expense is None:
-            results.append(
-                {
-                    "severity": "error",
-                    "category": "Contracts",
-                    "message": f"Contract '{contract.name}' must have an annual expense set",
-                    "field": "annual_expense",
-                    "object_type": "contracts",
-                    "object_id": str(contract.id),
-                    "object_name": contract.name,
-                }
-            )
-            contract_has_error = True
+def _check_b_02_02_contract(
+    contract: Contract, snapshot: LintSnapshot
+) -> List[Finding]:
+    category = "B_02.02 Contracts"
+    results = []
 
-        # Check beneficiary entity (mandatory for b_02.02 reporting)
-        if not contract.beneficiary_entity:
-            results.append(
-                {
-                    "severity": "error",
-                    "category": "Contracts",
-                    "message": f"Contract '{contract.name}' must have a beneficiary entity set for DORA b_02.02 reporting",
-                    "field": "beneficiary_entity",
-                    "object_type": "contracts",
-                    "object_id": str(contract.id),
-                    "object_name": contract.name,
-                }
+    # Check that beneficiary entity has LEI specifically (c0020 requires LEI)
+    beneficiary = contract.beneficiary_entity
+    if not beneficiary:
+        results.append(
+            _finding(
+                "error",
+                category,
+                f"Contract '{contract.name}' (linked to business functions) must have a beneficiary entity set for DORA b_02.02 reporting (c0020)",
+                "beneficiary_entity",
+                "contracts",
+                contract,
             )
-            contract_has_error = True
-        else:
-            # Check that beneficiary entity has a legal identifier
-            beneficiary_has_identifier = False
-            if contract.beneficiary_entity.legal_identifiers:
-                identifier_types = ["LEI", "EUID", "VAT", "DUNS"]
-                for id_type in identifier_types:
-                    if contract.beneficiary_entity.legal_identifiers.get(id_type):
-                        beneficiary_has_identifier = True
-                        break
-
-            if not beneficiary_has_identifier:
-                results.append(
-                    {
-                        "severity": "error",
-                        "category": "Contracts",
-                        "message": f"Beneficiary entity '{contract.beneficiary_entity.name}' of contract '{contract.name}' must have at least one legal identifier (LEI, EUID, VAT, or DUNS) for DORA b_02.02 reporting",
-                        "field": "legal_identifiers",
-                        "object_type": "entities",
-                        "object_id": str(contract.beneficiary_entity.id),
-                        "object_name": contract.beneficiary_entity.name,
-                    }
-                )
-                contract_has_error = True
-
-        # Check start_date (mandatory for b_02.02 reporting)
-        if not contract.start_date:
-            results.append(
-                {
-                    "severity": "error",
-                    "category": "Contracts",
-                    "message": f"Contract '{contract.name}' must have a start date set for DORA b_02.02 reporting",
-                    "field": "start_date",
-                    "object_type": "contracts",
-                    "object_id": str(contract.id),
-                    "object_name": contract.name,
-                }
+        )
+    elif not _has_identifier(beneficiary, ["LEI"]):
+        results.append(
+            _finding(
+                "error",
+                category,
+                f"Beneficiary entity '{beneficiary.name}' of contract '{contract.name}' must have an LEI (not just any identifier) for DORA b_02.02 reporting (c0020 requires LEI)",
+                "legal_identifiers",
+                "entities",
+                beneficiary,
             )
-            contract_has_error = True
-
-        if contract_has_error:
-            contracts_with_errors += 1
+        )
 
-    # Add success message if all contracts are valid
-    contracts_valid = total_contracts - contracts_with_errors
-    if contracts_valid == total_contracts:
+    # Check that contract has a provider entity with a legal identifier
+    provider = contract.provider_entity
+    if not provider:
         results.append(
-            {
-                "severity": "ok",
-                "category": "Contracts",
-                "message": f"All {total_contracts} contracts have required fields set",
-                "field": None,
-                "object_type": None,
-                "object_id": None,
-                "object_name": None,
-            }
+            _finding(
+                "error",
+                category,
+                f"Contract '{contract.name}' (linked to business functions) must have a provider entity set for DORA b_02.02 reporting",
+                "provider_entity",
+                "contracts",
+                contract,
+            )
         )
-    elif contracts_valid > 0:
+    elif not _has_identifier(provider):
         results.append(
-            {
-                "severity": "ok",
-                "category": "Contracts",
-                "message": f"{contracts_valid} of {total_contracts} contracts have all required fields set",
-                "field": None,
-                "object_type": None,
-                "object_id": None,
-                "object_name": None,
-            }
+            _finding(
+                "error",
+                category,
+                f"Provider entity '{provider.name}' of contract '{contract.name}' must have at least one legal identifier (LEI, EUID, VAT, or DUNS) for DORA b_02.02 reporting",
+                "legal_identifiers",
+                "entities",
+                provider,
+            )
         )
 
     return results
 
 
-def lint_b_02_02_contracts() -> List[Dict[str, Any]]:
-    """
-    Validate contracts for DORA b_02.02 (ICT services supporting functions) requirements.
-
-    Only validates contracts with solutions linked to business function assets or their child assets,
-    as these are the ones included in b_02.02 reporting.
+def _finalize_b_02_02_contracts(contracts, findings_by_object, snapshot):
+    if not contracts:
+        # No contracts found for b_02.02
+        return []
+
+    results = _flatten(contracts, findings_by_object, snapshot)
+    results.extend(
+        _validity_summary(
+            "B_02.02 Contracts",
+            len(contracts),
+            _error_count(findings_by_object),
+            "All {total} contracts linked to business functions have provider entities with legal identifiers",
+            "{valid} of {total} contracts linked to business functions have valid provider entities",
+        )
+    )
+    return results
 
-    Checks that contracts have:
-    - beneficiary_entity has LEI specifically (c0020 requires LEI)
-    - provider_entity set
-    - provider_entity has at least one legal identifier (LEI, EUID, VAT, DUNS)
 
-    Returns:
-        List of validation results with severity levels (error, warning, ok)
-    """
-    results = []
-
-    # Get business function assets
-    business_functions = Asset.objects.filter(is_business_function=True)
-
-    # Collect all assets related to business functions (including children)
-    business_function_asset_ids = set(business_functions.values_list("id", flat=True))
-    for business_function in business_functions:
-        # Get all descendant (child) assets for each business function
-        # Note: get_descendants() returns Asset objects, not IDs
-        descendants = business_function.get_descendants()
-        business_function_asset_ids.update(asset.id for asset in descendants)
-
-    # Get contracts that will be included in b_02.02:
-    # those with solutions linked to business function assets or their children
-    b_02_02_contracts = (
-        Contract.objects.filter(
-            solutions__isnull=False,
-            solutions__assets__id__in=business_function_asset_ids,
-        )
-        .distinct()
-        .select_related("provider_entity", "beneficiary_entity")
-        .prefetch_related("solutions")
+def _contract_fingerprint(contract: Contract, snapshot: LintSnapshot) -> Hashable:
+    return (
+        _stamp(contract),
+        _stamp(contract.beneficiary_entity),
+        _stamp(contract.provider_entity),
     )
 
-    if not b_02_02_contracts.exists():
-        # No contracts found for b_02.02
-        return results
 
-    # Track validation statistics
-    total_contracts = b_02_02_contracts.count()
-    contracts_with_errors = 0
+# Solutions
 
-    # Check each contract
-    for contract in b_02_02_contracts:
-        contract_has_error = False
 
-        # Check that beneficiary entity has LEI specifically (c0020 requires LEI)
-        if not contract.beneficiary_entity:
-            results.append(
-                {
-                    "severity": "error",
-                    "category": "B_02.02 Contracts",
-                    "message": f"Contract '{contract.name}' (linked to business functions) must have a beneficiary entity set for DORA b_02.02 reporting (c0020)",
-                    "field": "beneficiary_entity",
-                    "object_type": "contracts",
-                    "object_id": str(contract.id),
-                    "object_name": contract.name,
-                }
+def _check_solution(solution: Solution, snapshot: LintSnapshot) -> List[Finding]:
+    category = "Solutions"
+    results = []
+
+    # Check ICT service type (mandatory)
+    if not solution.dora_ict_service_type:
+        results.append(
+            _finding(
+                "error",
+                category,
+                f"Solution '{solution.name}' must have ICT service type set",
+                "dora_ict_service_type",
+                "solutions",
+                solution,
             )
-            contract_has_error = True
-        else:
-            # Check that beneficiary entity has LEI specifically
-            beneficiary_has_lei = False
-            if contract.beneficiary_entity.legal_identifiers:
-                if contract.beneficiary_entity.legal_identifiers.get("LEI"):
-                    beneficiary_has_lei = True
-
-            if not beneficiary_has_lei:
-                results.append(
-                    {
-                        "severity": "error",
-                        "category": "B_02.02 Contracts",
-                        "message": f"Beneficiary entity '{contract.beneficiary_entity.name}' of contract '{contract.name}' must have an LEI (not just any identifier) for DORA b_02.02 reporting (c0020 requires LEI)",
-                        "field": "legal_identifiers",
-                        "object_type": "entities",
-                        "object_id": str(contract.beneficiary_entity.id),
-                        "object_name": contract.beneficiary_entity.name,
-                    }
-                )
-                contract_has_error = True
+        )
 
-        # Check that contract has a provider entity (mandatory for b_02.02)
-        if not contract.provider_entity:
-            results.append(
-                {
-                    "severity": "error",
-                    "category": "B_02.02 Contracts",
-                    "message": f"Contract '{contract.name}' (linked to business functions) must have a provider entity set for DORA b_02.02 reporting",
-                    "field": "provider_entity",
-                    "object_type": "contracts",
-                    "object_id": str(contract.id),
-                    "object_name": contract.name,
-                }
+    # Check data_location_storage (mandatory)
+    if not solution.data_location_storage:
+        results.append(
+            _finding(
+                "error",
+                category,
+                f"Solution '{solution.name}' must have location of data at rest (data storage location) set",
+                "data_location_storage",
+                "solutions",
+                solution,
             )
-            contract_has_error = True
-        else:
-            # Check that provider entity has a legal identifier
-            provider_has_identifier = False
-            if contract.provider_entity.legal_identifiers:
-                identifier_types = ["LEI", "EUID", "VAT", "DUNS"]
-                for id_type in identifier_types:
-                    if contract.provider_entity.legal_identifiers.get(id_type):
-                        provider_has_identifier = True
-                        break
-
-            if not provider_has_identifier:
-                results.append(
-                    {
-                        "severity": "error",
-                        "category": "B_02.02 Contracts",
-                        "message": f"Provider entity '{contract.provider_entity.name}' of contract '{contract.name}' must have at least one legal identifier (LEI, EUID, VAT, or DUNS) for DORA b_02.02 reporting",
-                        "field": "legal_identifiers",
-                        "object_type": "entities",
-                        "object_id": str(contract.provider_entity.id),
-                        "object_name": contract.provider_entity.name,
-                    }
-                )
-                contract_has_error = True
+        )
+    elif not solution.storage_of_data:
+        # Warning: if data_location_storage is set but storage_of_data flag is not set
+        results.append(
+            _finding(
+                "warning",
+                category,
+                f"Solution '{solution.name}' has data storage location set but 'Storage of data' flag is not enabled",
+                "storage_of_data",
+                "solutions",
+                solution,
+            )
+        )
 
-        if contract_has_error:
-            contracts_with_errors += 1
+    # Check data_location_processing (mandatory)
+    if not solution.data_location_processing:
+        results.append(
+            _finding(
+                "error",
+                category,
+                f"Solution '{solution.name}' must have location of data processing set",
+                "data_location_processing",
+                "solutions",
+                solution,
+            )
+        )
 
-    # Add success message if all contracts are valid
-    contracts_valid = total_contracts - contracts_with_errors
-    if contracts_valid == total_contracts:
+    # Check provider_entity country (mandatory)
+    provider = solution.provider_entity
+    if not provider:
         results.append(
-            {
-                "severity": "ok",
-                "category": "B_02.02 Contracts",
-                "message": f"All {total_contracts} contracts linked to business functions have provider entities with legal identifiers",
-                "field": None,
-                "object_type": None,
-                "object_id": None,
-                "object_name": None,
-            }
+            _finding(
+                "error",
+                category,
+                f"Solution '{solution.name}' must have a provider entity set",
+                "provider_entity",
+                "solutions",
+                solution,
+            )
         )
-    elif contracts_valid > 0:
+    elif not provider.country:
         results.append(
-            {
-                "severity": "ok",
-                "category": "B_02.02 Contracts",
-                "message": f"{contracts_valid} of {total_contracts} contracts linked to business functions have valid provider entities",
-                "field": None,
-                "object_type": None,
-                "object_id": None,
-                "object_name": None,
-            }
+            _finding(
+                "error",
+                category,
+                f"Solution '{solution.name}' has provider entity '{provider.name}' without a country set",
+                "country",
+                "entities",
+                provider,
+            )
         )
 
-    return results
-
+    # Check if solution has at least one contract (mandatory for DORA reporting)
+    if solution.id not in snapshot.solution_ids_with_contracts:
+        results.append(
+            _finding(
+                "error",
+                category,
+                f"Solution '{solution.name}' linked to business function(s) must have at least one associated contract for DORA reporting",
+                "contracts",
+                "solutions",
+                solution,
+            )
+        )
 
-def lint_solutions() -> List[Dict[str, Any]]:
-    """
-    Validate solutions for DORA ROI requirements.
+    return results
 
-    Only validates solutions that are associated with assets marked as business functions
-    or their child assets, as these are the ones relevant for DORA reporting.
 
-    Checks that solutions have required fields:
-    - dora_ict_service_type (ICT service type)
-    - data_location_storage (location of data at rest)
-    - data_location_processing (location of data at processing)
-    - provider_entity must have country set
-    - contract associated with solution (warning if missing)
+def _finalize_solutions(solutions, findings_by_object, snapshot):
+    if not solutions:
+        # No solutions found linked to business functions
+        return [
+            _finding(
+                "warning",
+                "Solutions",
+                "No solutions found linked to business function assets",
+            )
+        ]
+
+    results = _flatten(solutions, findings_by_object, snapshot)
+    results.extend(
+        _validity_summary(
+            "Solutions",
+            len(solutions),
+            _error_count(findings_by_object),
+            "All {total} solutions have required fields set",
+            "{valid} of {total} solutions have all required fields set",
+        )
+    )
+    return results
 
-    Returns:
-        List of validation results with severity levels (error, warning, ok)
-    """
-    results = []
 
-    # Get business function assets
-    business_functions = Asset.objects.filter(is_business_function=True)
-
-    # Collect all assets related to business functions (including children)
-    business_function_asset_ids = set(business_functions.values_list("id", flat=True))
-    for business_function in business_functions:
-        # Get all descendant (child) assets for each business function
-        # Note: get_descendants() returns Asset objects, not IDs
-        descendants = business_function.get_descendants()
-        business_function_asset_ids.update(asset.id for asset in descendants)
-
-    # Get solutions associated with business function assets or their children
-    solutions = (
-        Solution.objects.filter(assets__id__in=business_function_asset_ids)
-        .distinct()
-        .select_related("provider_entity")
-        .prefetch_related("contracts")
+def _solution_fingerprint(solution: Solution, snapshot: LintSnapshot) -> Hashable:
+    return (
+        _stamp(solution),
+        _stamp(solution.provider_entity),
+        solution.id in snapshot.solution_ids_with_contracts,
     )
 
-    if not solutions.exists():
-        # No solutions found linked to business functions
-        results.append(
-            {
-                "severity": "warning",
-                "category": "Solutions",
-                "message": "No solutions found linked to business function assets",
-                "field": None,
-                "object_type": None,
-                "object_id": None,
-                "object_name": None,
-            }
-        )
-        return results
-
-    # Track validation statistics
-    total_solutions = solutions.count()
-    solutions_with_errors = 0
 
-    # Check each solution
-    for solution in solutions:
-        solution_has_error = False
+# Provider entities
 
-        # Check ICT service type (mandatory)
-        if not solution.dora_ict_service_type:
-            results.append(
-                {
-                    "severity": "error",
-                    "category": "Solutions",
-                    "message": f"Solution '{solution.name}' must have ICT service type set",
-                    "field": "dora_ict_service_type",
-                    "object_type": "solutions",
-                    "object_id": str(solution.id),
-                    "object_name": solution.name,
-                }
-            )
-            solution_has_error = True
 
-        # Check data_location_storage (mandatory)
-        if not solution.data_location_storage:
-            results.append(
-                {
-                    "severity": "error",
-                    "category": "Solutions",
-                    "message": f"Solution '{solution.name}' must have location of data at rest (data storage location) set",
-                    "field": "data_location_storage",
-                    "object_type": "solutions",
-                    "object_id": str(solution.id),
-                    "object_name": solution.name,
-                }
-            )
-            solution_has_error = True
-        else:
-            # Warning: if data_location_storage is set but storage_of_data flag is not set
-            if not solution.storage_of_data:
-                results.append(
-                    {
-                        "severity": "warning",
-                        "category": "Solutions",
-                        "message": f"Solution '{solution.name}' has data storage location set but 'Storage of data' flag is not enabled",
-                        "field": "storage_of_data",
-                        "object_type": "solutions",
-                        "object_id": str(solution.id),
-                        "object_name": solution.name,
-                    }
-                )
+def _check_provider_entity(provider: Entity, snapshot: LintSnapshot) -> List[Finding]:
+    category = "Provider Entities"
+    results = []
 
-        # Check data_location_processing (mandatory)
-        if not solution.data_location_processing:
-            results.append(
-                {
-                    "severity": "error",
-                    "category": "Solutions",
-                    "message": f"Solution '{solution.name}' must have location of data processing set",
-                    "field": "data_location_processing",
-                    "object_type": "solutions",
-                    "object_id": str(solution.id),
-                    "object_name": solution.name,
-                }
-            )
-            solution_has_error = True
-
-        # Check provider_entity country (mandatory)
-        if solution.provider_entity:
-            if not solution.provider_entity.country:
-                results.append(
-                    {
-                        "severity": "error",
-                        "category": "Solutions",
-                        "message": f"Solution '{solution.name}' has provider entity '{solution.provider_entity.name}' without a country set",
-                        "field": "country",
-                        "object_type": "entities",
-                        "object_id": str(solution.provider_entity.id),
-                        "object_name": solution.provider_entity.name,
-                    }
-                )
-                solution_has_error = True
-        else:
-            # No provider entity - this is also an error
-            results.append(
-                {
-                    "severity": "error",
-                    "category": "Solutions",
-                    "message": f"Solution '{solution.name}' must have a provider entity set",
-                    "field": "provider_entity",
-                    "object_type": "solutions",
-                    "object_id": str(solution.id),
-                    "object_name": solution.name,
-                }
+    # Check legal identifiers (mandatory)
+    if not _has_identifier(provider):
+        results.append(
+            _finding(
+                "error",
+                category,
+                f"Provider entity '{provider.name}' must have at least one legal identifier (LEI, EUID, VAT, or DUNS) for DORA reporting",
+                "legal_identifiers",
+                "entities",
+                provider,
             )
-            solution_has_error = True
+        )
 
-        # Check if solution has at least one contract (mandatory for DORA reporting)
-        if not solution.contracts.exists():
-            results.append(
-                {
-                    "severity": "error",
-                    "category": "Solutions",
-                    "message": f"Solution '{solution.name}' linked to business function(s) must have at least one associated contract for DORA reporting",
-                    "field": "contracts",
-                    "object_type": "solutions",
-                    "object_id": str(solution.id),
-                    "object_name": solution.name,
-                }
+    # Check country (mandatory)
+    if not provider.country:
+        results.append(
+            _finding(
+                "error",
+                category,
+                f"Provider entity '{provider.name}' must have a country set for DORA reporting",
+                "country",
+                "entities",
+                provider,
             )
-            solution_has_error = True
-
-        if solution_has_error:
-            solutions_with_errors += 1
+        )
 
-    # Add success message if all solutions are valid
-    solutions_valid = total_solutions - solutions_with_errors
-    if solutions_valid == total_solutions:
+    # Check DORA provider person type (mandatory for b_05.01 c0040)
+    if not provider.dora_provider_person_type:
         results.append(
-            {
-                "severity": "ok",
-                "category": "Solutions",
-                "message": f"All {total_solutions} solutions have required fields set",
-                "field": None,
-                "object_type": None,
-                "object_id": None,
-                "object_name": None,
-            }
+            _finding(
+                "error",
+                category,
+                f"Provider entity '{provider.name}' must have a DORA provider person type set for DORA b_05.01 reporting (c0040)",
+                "dora_provider_person_type",
+                "entities",
+                provider,
+            )
         )
-    elif solutions_valid > 0:
+
+    # Check parent entity has legal identifier (if parent exists)
+    parent = provider.parent_entity
+    if parent and not _has_identifier(parent):
         results.append(
-            {
-                "severity": "ok",
-                "category": "Solutions",
-                "message": f"{solutions_valid} of {total_solutions} solutions have all required fields set",
-                "field": None,
-                "object_type": None,
-                "object_id": None,
-                "object_name": None,
-            }
+            _finding(
+                "error",
+                category,
+                f"Parent entity '{parent.name}' of provider '{provider.name}' must have at least one legal identifier for DORA reporting",
+                "legal_identifiers",
+                "entities",
+                parent,
+            )
         )
 
     return results
 
 
-def lint_unique_leis(main_entity: Entity) -> List[Dict[str, Any]]:
-    """
-    Validate that LEIs are unique across entities included in DORA ROI report.
+def _finalize_provider_entities(providers, findings_by_object, snapshot):
+    if not providers:
+        return []
 
-    The b_01.02 report includes main entity + subsidiaries, and each must have a unique LEI.
+    results = _flatten(providers, findings_by_object, snapshot)
+    results.extend(
+        _validity_summary(
+            "Provider Entities",
+            len(providers),
+            _error_count(findings_by_object),
+            "All {total} provider entities have required fields set",
+            "{valid} of {total} provider entities have all required fields set",
+        )
+    )
+    return results
 
-    Args:
-        main_entity: The main Entity instance
 
-    Returns:
-        List of validation results with severity levels (error, warning, ok)
+# Rules, in reporting order
+DORA_LINT_RULES = [
+    LintRule(
+        name="main_entity",
+        category="Main Entity",
+        select=lambda snapshot: [snapshot.main_entity],
+        check=_check_main_entity,
+        finalize=_flatten,
+    ),
+    LintRule(
+        name="subsidiaries",
+        category="Subsidiaries",
+        select=lambda snapshot: snapshot.dataset.subsidiaries,
+        check=_check_subsidiary,
+        finalize=_finalize_subsidiaries,
+    ),
+    LintRule(
+        name="branches",
+        category="Branches",
+        select=lambda snapshot: snapshot.dataset.branches,
+        check=_check_branch,
+        finalize=_finalize_branches,
+    ),
+    LintRule(
+        name="unique_leis",
+        category="Unique LEIs",
+        select=lambda snapshot: [snapshot.main_entity] + snapshot.dataset.subsidiaries,
+        check=None,
+        finalize=_finalize_unique_leis,
+    ),
+    LintRule(
+        name="business_functions",
+        category="Business Functions",
+        select=lambda snapshot: snapshot.dataset.business_functions,
+        check=_check_business_function,
+        finalize=_finalize_business_functions,
+    ),
+    LintRule(
+        name="contracts",
+        category="Contracts",
+        select=lambda snapshot: snapshot.dataset.contracts,
+        check=_check_contract,
+        finalize=_finalize_contracts,
+        fingerprint=_contract_fingerprint,
+    ),
+    LintRule(
+        name="b_02_02_contracts",
+        category="B_02.02 Contracts",
+        select=lambda snapshot: snapshot.dataset.business_function_contracts,
+        check=_check_b_02_02_contract,
+        finalize=_finalize_b_02_02_contracts,
+        fingerprint=_contract_fingerprint,
+    ),
+    LintRule(
+        name="solutions",
+        category="Solutions",
+        select=lambda snapshot: snapshot.business_function_solutions,
+        check=_check_solution,
+        finalize=_finalize_solutions,
+        fingerprint=_solution_fingerprint,
+    ),
+    LintRule(
+        name="provider_entities",
+        category="Provider Entities",
+        select=lambda snapshot: snapshot.provider_entities,
+        check=_check_provider_entity,
+        finalize=_finalize_provider_entities,
+        fingerprint=lambda provider, snapshot: (
+            _stamp(provider),
+            _stamp(provider.parent_entity),
+        ),
+    ),
+]
+
+# Findings of the last lint of the main entity in this process, reused for
+# unchanged objects. Findings do not depend on the requesting user.
+_lint_state = LintState()
+
+
+def run_lint_rule(
+    rule: LintRule, snapshot: LintSnapshot, state: Optional[LintState] = None
+) -> Tuple[List[Finding], Dict[str, Any]]:
     """
-    results = []
+    Evaluate one rule over the snapshot.
 
-    # Get all entities for b_01.02: main entity + subsidiaries
-    subsidiaries = Entity.objects.filter(
-        parent_entity=main_entity, dora_provider_person_type__isnull=False
-    ).exclude(dora_provider_person_type="")
+    When a state is given, per-object findings are reused for objects whose
+    fingerprint did not change since they were last checked.
 
-    all_entities = [main_entity] + list(subsidiaries)
-
-    # Collect LEIs
-    lei_map = {}  # lei -> list of entities with that LEI
-    for entity in all_entities:
-        if entity.legal_identifiers and entity.legal_identifiers.get("LEI"):
-            lei = entity.legal_identifiers.get("LEI")
-            if lei not in lei_map:
-                lei_map[lei] = []
-            lei_map[lei].append(entity)
-
-    # Check for duplicates
-    has_duplicates = False
-    for lei, entities in lei_map.items():
-        if len(entities) > 1:
-            has_duplicates = True
-            entity_names = ", ".join([f"'{e.name}'" for e in entities])
-            results.append(
-                {
-                    "severity": "error",
-                    "category": "Unique LEIs",
-                    "message": f"LEI '{lei}' is used by multiple entities: {entity_names}. Each entity in the DORA ROI report must have a unique LEI.",
-                    "field": "legal_identifiers",
-                    "object_type": None,
-                    "object_id": None,
-                    "object_name": None,
-                }
-            )
-
-    if not has_duplicates and lei_map:
-        results.append(
-            {
-                "severity": "ok",
-                "category": "Unique LEIs",
-                "message": "All entities have unique LEIs",
-                "field": None,
-                "object_type": None,
-                "object_id": None,
-                "object_name": None,
-            }
-        )
-
-    return results
+    Returns:
+        The rule's findings and its timing statistics
+    """
+    if state is not None:
+        with state.lock:
+            return _run_lint_rule(rule, snapshot, state)
+    return _run_lint_rule(rule, snapshot, None)
+
+
+def _run_lint_rule(
+    rule: LintRule, snapshot: LintSnapshot, state: Optional[LintState]
+) -> Tuple[List[Finding], Dict[str, Any]]:
+    start = time.perf_counter()
+    objects = list(rule.select(snapshot))
+    findings_by_object = []
+    checked = 0
+    if state is not None:
+        # Forget objects that are no longer selected by the rule
+        selected = {obj.id for obj in objects}
+        for key in [
+            key
+            for key in state.findings
+            if key[0] == rule.name and key[1] not in selected
+        ]:
+            del state.findings[key]
+
+    for obj in objects:
+        if rule.check is None:
+            findings_by_object.append([])
+            continue
+
+        key = (rule.name, obj.id)
+        fingerprint = rule.fingerprint(obj, snapshot)
+        cached = state.findings.get(key) if state is not None else None
+        if cached is not None and cached[0] == fingerprint:
+            findings = cached[1]
+        else:
+            findings = rule.check(obj, snapshot)
+            checked += 1
+            if state is not None:
+                state.findings[key] = (fingerprint, findings)
+        findings_by_object.append(findings)
+
+    results = rule.finalize(objects, findings_by_object, snapshot)
+    timing = {
+        "category": rule.category,
+        "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+        "objects": len(objects),
+        "checked": checked,
+    }
+    return results, timing
 
 
-def lint_dora_roi() -> Dict[str, Any]:
+def lint_dora_roi(incremental: bool = True) -> Dict[str, Any]:
     """
     Perform comprehensive linting for DORA ROI export.
 
+    Args:
+        incremental: Reuse findings of the previous lint for objects that
+            have not changed since
+
     Returns:
-        Dictionary containing validation results and summary
+        Dictionary containing validation results, summary and per-rule timings
     """
-    results = []
-
     # Get the main entity
     main_entity = Entity.get_main_entity()
 
     if not main_entity:
         return {
             "results": [
-                {
-                    "severity": "error",
-                    "category": "Main Entity",
-                    "message": "No main entity found in the system",
-                    "field": None,
-                    "object_type": None,
-                    "object_id": None,
-                    "object_name": None,
-                }
+                _finding("error", "Main Entity", "No main entity found in the system")
             ],
             "summary": {"errors": 1, "warnings": 0, "ok": 0},
         }
 
-    # Run all validation checks
-    results.extend(lint_main_entity(main_entity))
-    results.extend(lint_subsidiaries(main_entity))
-    results.extend(lint_branches(main_entity))
-    results.extend(lint_unique_leis(main_entity))
-    results.extend(lint_business_functions())
-    results.extend(lint_contracts())
-    results.extend(lint_b_02_02_contracts())
-    results.extend(lint_solutions())
-    results.extend(lint_provider_entities())
+    start = time.perf_counter()
+    snapshot = LintSnapshot.load(main_entity)
+    timings = {
+        "snapshot": {"duration_ms": round((time.perf_counter() - start) * 1000, 3)}
+    }
+
+    # Run all validation rules over the shared snapshot
+    state = _lint_state if incremental else None
+    if state is not None:
+        state.bind(main_entity)
+    results = []
+    for rule in DORA_LINT_RULES:
+        rule_results, timings[rule.name] = run_lint_rule(rule, snapshot, state)
+        results.extend(rule_results)
 
     # Calculate summary
     summary = {
@@ -1345,4 +1115,4 @@ def lint_dora_roi() -> Dict[str, Any]:
         "ok": sum(1 for r in results if r["severity"] == "ok"),
     }
 
-    return {"results": results, "summary": summary}
+    return {"results": results, "summary": summary, "timings": timings}
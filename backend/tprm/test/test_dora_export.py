@@ -0,0 +1,84 @@
+import csv
+import io
+import zipfile
+
+from django.test import TestCase
+
+from core.models import Asset
+from iam.models import Folder
+from tprm.dora_dataset import DoraDataset
+from tprm.dora_export import stream_dora_roi_zip
+from tprm.models import Contract, Entity, Solution
+
+
+class TestDoraRoiExport(TestCase):
+    def setUp(self):
+        """Main entity with one third-party contract supporting a business function."""
+        root_folder = Folder.get_root_folder()
+        self.main_entity = Entity.objects.create(
+            name="Acme Bank", folder=root_folder, legal_identifiers={"LEI": "MAINLEI"}
+        )
+        self.provider = Entity.objects.create(
+            name="Cloud Provider",
+            folder=root_folder,
+            legal_identifiers={"LEI": "PROVLEI"},
+        )
+        self.function = Asset.objects.create(
+            name="Payments",
+            type=Asset.Type.PRIMARY,
+            folder=root_folder,
+            is_business_function=True,
+        )
+        self.server = Asset.objects.create(
+            name="Server", type=Asset.Type.SUPPORT, folder=root_folder
+        )
+        self.server.parent_assets.add(self.function)
+
+        self.hosting = Solution.objects.create(
+            name="Hosting", provider_entity=self.provider
+        )
+        self.hosting.assets.add(self.server)
+        self.payments_app = Solution.objects.create(
+            name="Payments app", provider_entity=self.provider
+        )
+        self.payments_app.assets.add(self.function)
+
+        self.contract = Contract.objects.create(
+            name="Contract",
+            ref_id="C-1",
+            folder=root_folder,
+            provider_entity=self.provider,
+            beneficiary_entity=self.main_entity,
+        )
+        self.contract.solutions.add(self.hosting, self.payments_app)
+        Contract.objects.create(name="Unrelated", ref_id="C-2", folder=root_folder)
+
+    def _read_report(self, archive, filename):
+        with archive.open(f"ROI/reports/{filename}") as report:
+            return list(csv.reader(io.TextIOWrapper(report, encoding="utf-8")))[1:]
+
+    def test_dataset_links_child_assets_to_business_functions(self):
+        dataset = DoraDataset.load(self.main_entity)
+
+        self.assertTrue(dataset.supports_business_function(self.hosting))
+        self.assertEqual(dataset.business_function_contracts, [self.contract])
+        self.assertEqual(len(dataset.third_party_contracts), 1)
+
+    def test_streamed_archive_contains_every_report(self):
+        dataset = DoraDataset.load(self.main_entity)
+
+        with self.assertNumQueries(0):
+            chunks = list(stream_dora_roi_zip(dataset, "ROI"))
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+
+        self.assertIsNone(archive.testzip())
+        self.assertIn("ROI/reports/parameters.csv", archive.namelist())
+        self.assertIn("ROI/META-INF/reportPackage.json", archive.namelist())
+        # One row per solution of the business function contract
+        assessment = self._read_report(archive, "b_07.01.csv")
+        self.assertEqual([row[0] for row in assessment], ["C-1", "C-1"])
+        # One row per contract-function combination
+        services = self._read_report(archive, "b_02.02.csv")
+        self.assertEqual(
+            [(row[0], row[4]) for row in services], [("C-1", str(self.function.id))]
+        )
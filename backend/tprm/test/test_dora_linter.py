@@ -0,0 +1,133 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from core.models import Asset
+from iam.models import Folder
+from tprm.dora_linter import (
+    DORA_LINT_RULES,
+    LintSnapshot,
+    LintState,
+    run_lint_rule,
+)
+from tprm.models import Contract, Entity, Solution
+
+
+class TestDoraLinter(TestCase):
+    def setUp(self):
+        """Main entity, a provider without country and one business function."""
+        self.root_folder = Folder.get_root_folder()
+        self.main_entity = Entity.objects.create(
+            name="Acme Bank",
+            folder=self.root_folder,
+            legal_identifiers={"LEI": "A" * 20},
+        )
+        self.provider = Entity.objects.create(
+            name="Cloud Provider",
+            folder=self.root_folder,
+            legal_identifiers={"VAT": "FR1"},
+        )
+        self.function = Asset.objects.create(
+            name="Payments",
+            type=Asset.Type.PRIMARY,
+            folder=self.root_folder,
+            is_business_function=True,
+            ref_id="F1",
+        )
+        self.solution = Solution.objects.create(
+            name="Hosting", provider_entity=self.provider
+        )
+        self.solution.assets.add(self.function)
+
+    def _add_contract(self, name):
+        contract = Contract.objects.create(
+            name=name,
+            folder=self.root_folder,
+            provider_entity=self.provider,
+            beneficiary_entity=self.main_entity,
+        )
+        contract.solutions.add(self.solution)
+        return contract
+
+    def _lint(self, state=None):
+        snapshot = LintSnapshot.load(self.main_entity)
+        results, timings = [], {}
+        for rule in DORA_LINT_RULES:
+            rule_results, timings[rule.name] = run_lint_rule(rule, snapshot, state)
+            results.extend(rule_results)
+        return results, timings
+
+    def test_findings(self):
+        contract = self._add_contract("Contract")
+
+        results, _ = self._lint()
+
+        errors = {(r["category"], r["field"], r["object_id"]) for r in results}
+        self.assertIn(("Contracts", "ref_id", str(contract.id)), errors)
+        self.assertIn(("Solutions", "country", str(self.provider.id)), errors)
+        self.assertIn(
+            ("Provider Entities", "dora_provider_person_type", str(self.provider.id)),
+            errors,
+        )
+        self.assertNotIn(("Solutions", "contracts", str(self.solution.id)), errors)
+
+    def test_query_count_does_not_grow_with_contracts(self):
+        self._add_contract("First")
+        # Warm the asset graph snapshot, which is not affected by contracts
+        self._lint()
+        with CaptureQueriesContext(connection) as single:
+            self._lint()
+
+        for i in range(5):
+            self._add_contract(f"Contract {i}")
+        with CaptureQueriesContext(connection) as many:
+            self._lint()
+
+        self.assertEqual(len(many), len(single))
+
+    def test_incremental_lint_only_checks_changed_objects(self):
+        contract = self._add_contract("Contract")
+        self._add_contract("Other")
+        state = LintState()
+
+        first, timings = self._lint(state)
+        self.assertEqual(timings["contracts"]["checked"], 2)
+
+        second, timings = self._lint(state)
+        self.assertEqual(timings["contracts"]["checked"], 0)
+        self.assertEqual(second, first)
+
+        contract.ref_id = "C-1"
+        contract.save()
+        third, timings = self._lint(state)
+        self.assertEqual(timings["contracts"]["checked"], 1)
+        self.assertNotIn(
+            ("Contracts", "ref_id", str(contract.id)),
+            {(r["category"], r["field"], r["object_id"]) for r in third},
+        )
+
+    def test_incremental_lint_detects_queryset_updates(self):
+        contract = self._add_contract("Contract")
+        state = LintState()
+        self._lint(state)
+
+        # QuerySet.update() does not move updated_at
+        Contract.objects.filter(id=contract.id).update(ref_id="C-1")
+        results, timings = self._lint(state)
+
+        self.assertEqual(timings["contracts"]["checked"], 1)
+        self.assertNotIn(
+            ("Contracts", "ref_id", str(contract.id)),
+            {(r["category"], r["field"], r["object_id"]) for r in results},
+        )
+
+    def test_state_is_reset_for_another_main_entity(self):
+        self._add_contract("Contract")
+        state = LintState()
+        state.bind(self.main_entity)
+        self._lint(state)
+
+        state.bind(self.provider)
+
+        self.assertEqual(state.findings, {})
+        self.assertEqual(state.main_entity_id, self.provider.id)
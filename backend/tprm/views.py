@@ -10,7 +10,7 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 
 from django.utils.formats import date_format
-from django.http import HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
 from django.db.models import Sum, F, FloatField, Case, When, Value
 from django.db.models.functions import Cast, Greatest, Coalesce, Round
 
@@ -150,62 +150,11 @@ class EntityViewSet(BaseModelViewSet):
             object_type=Asset,
         )
 
-        # Prepare entity lists
-        # Subsidiaries: entities with main entity as parent AND dora_provider_person_type set (legal person)
-        # Branches: entities with main entity as parent AND dora_provider_person_type not set
-        subsidiaries = list(
-            Entity.objects.filter(
-                id__in=viewable_entities,
-                parent_entity=main_entity,
-                dora_provider_person_type__isnull=False,
-            ).exclude(dora_provider_person_type="")
-        )
-        branches = list(
-            Entity.objects.filter(
-                id__in=viewable_entities,
-                parent_entity=main_entity,
-                dora_provider_person_type__isnull=True,
-            )
-            | Entity.objects.filter(
-                id__in=viewable_entities,
-                parent_entity=main_entity,
-                dora_provider_person_type="",
-            )
-        )
-        # b_01.02 includes only main entity and subsidiaries (not branches)
-        entities_for_b_01_02 = [main_entity] + subsidiaries
-
-        # Prepare contract QuerySets
-        contracts = Contract.objects.filter(id__in=viewable_contracts)
-
-        # Prepare business functions
-        business_functions = Asset.objects.filter(
-            id__in=viewable_assets, is_business_function=True
-        )
-
-        # Collect all assets related to business functions (including child assets)
-        # This ensures that solutions linked to child assets are also captured in DORA reports
-        business_function_asset_ids = set(
-            business_functions.values_list("id", flat=True)
-        )
-        for business_function in business_functions:
-            # Get all descendant (child) assets for each business function
-            # Note: get_descendants() returns Asset objects, not IDs
-            descendants = business_function.get_descendants()
-            business_function_asset_ids.update(asset.id for asset in descendants)
-
-        # Get all solutions related to business functions and their child assets
-        # These are the ICT services that support critical business functions
-        related_solutions = Solution.objects.filter(
-            assets__id__in=business_function_asset_ids
-        ).distinct()
-
-        # Filter contracts to only those with solutions related to business functions
-        # This subset is used for reports that focus on ICT services supporting critical functions
-        # (b_02.02, b_07.01, b_99.01)
-        related_solution_ids = set(related_solutions.values_list("id", flat=True))
-        business_function_contracts = contracts.filter(
-            solutions__id__in=related_solution_ids
+        dataset = dora_export.DoraDataset.load(
+            main_entity,
+            entity_ids=viewable_entities,
+            contract_ids=viewable_contracts,
+            asset_ids=viewable_assets,
         )
 
         # Calculate folder name for the ZIP structure (without .zip extension)
@@ -218,81 +167,14 @@ class EntityViewSet(BaseModelViewSet):
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             base_folder_name = f"DORA_ROI_{timestamp}"
 
-        # Create zip file in memory
-        zip_buffer = io.BytesIO()
-        with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-            # Generate all DORA ROI reports (with folder prefix)
-            dora_export.generate_b_01_01_main_entity(
-                zip_file, main_entity, base_folder_name
-            )
-            dora_export.generate_b_01_02_entities(
-                zip_file, main_entity, entities_for_b_01_02, base_folder_name
-            )
-            dora_export.generate_b_01_03_branches(zip_file, branches, base_folder_name)
-
-            dora_export.generate_b_02_01_contracts(
-                zip_file, contracts, base_folder_name
-            )
-            dora_export.generate_b_02_02_ict_services(
-                zip_file, contracts, base_folder_name, business_function_asset_ids
-            )
-            dora_export.generate_b_02_03_intragroup_contracts(
-                zip_file, contracts, base_folder_name
-            )
-
-            dora_export.generate_b_03_01_signing_entities(
-                zip_file, main_entity, contracts, base_folder_name
-            )
-            dora_export.generate_b_03_02_ict_providers(
-                zip_file, contracts, base_folder_name
-            )
-            dora_export.generate_b_03_03_intragroup_providers(
-                zip_file, main_entity, contracts, base_folder_name
-            )
-
-            dora_export.generate_b_04_01_service_users(
-                zip_file, branches, contracts, base_folder_name
-            )
-
-            dora_export.generate_b_05_01_provider_details(
-                zip_file, main_entity, contracts, base_folder_name
-            )
-            dora_export.generate_b_05_02_supply_chains(
-                zip_file, contracts, base_folder_name
-            )
-
-            dora_export.generate_b_06_01_functions(
-                zip_file, main_entity, business_functions, base_folder_name
-            )
-
-            dora_export.generate_b_07_01_assessment(
-                zip_file, business_function_contracts, base_folder_name
-            )
-
-            dora_export.generate_b_99_01_aggregation(
-                zip_file,
-                business_function_contracts,
-                business_functions,
-                base_folder_name,
-            )
-
-            # Generate FilingIndicators.csv
-            dora_export.generate_filing_indicators(zip_file, base_folder_name)
-
-            # Generate parameters.csv
-            dora_export.generate_parameters(zip_file, main_entity, base_folder_name)
-
-            # Generate JSON metadata files
-            dora_export.generate_report_package_json(zip_file, base_folder_name)
-            dora_export.generate_report_json(zip_file, base_folder_name)
-
-        # Prepare response
-        zip_buffer.seek(0)
-
         # Use the same base folder name for the ZIP filename
         filename = f"{base_folder_name}.zip"
 
-        response = HttpResponse(zip_buffer.getvalue(), content_type="application/zip")
+        # Stream the archive as each report is compressed
+        response = StreamingHttpResponse(
+            dora_export.stream_dora_roi_zip(dataset, base_folder_name),
+            content_type="application/zip",
+        )
         response["Content-Disposition"] = f'attachment; filename="{filename}"'
 
         return response
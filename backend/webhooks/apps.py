@@ -4,3 +4,42 @@ from django.apps import AppConfig
 class WebhooksConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "webhooks"
+
+    def ready(self):
+        self._connect_subscriptions_cache_signals()
+
+    def _connect_subscriptions_cache_signals(self):
+        from django.db.models.signals import m2m_changed, post_delete, post_save
+
+        from webhooks.subscriptions import invalidate_webhook_subscriptions
+
+        WebhookEndpoint = self.get_model("WebhookEndpoint")
+        WebhookEventType = self.get_model("WebhookEventType")
+
+        def _subscriptions_changed(sender, **kwargs):
+            invalidate_webhook_subscriptions()
+
+        def _subscription_links_changed(sender, instance, action, **kwargs):
+            if action in {"post_add", "post_remove", "post_clear"}:
+                invalidate_webhook_subscriptions()
+
+        post_save.connect(
+            _subscriptions_changed,
+            sender=WebhookEndpoint,
+            dispatch_uid="webhooks.webhookendpoint.save.invalidate_subscriptions",
+            weak=False,
+        )
+        for model in (WebhookEndpoint, WebhookEventType):
+            post_delete.connect(
+                _subscriptions_changed,
+                sender=model,
+                dispatch_uid=f"webhooks.{model._meta.model_name}.delete.invalidate_subscriptions",
+                weak=False,
+            )
+        for field in ("event_types", "target_folders"):
+            m2m_changed.connect(
+                _subscription_links_changed,
+                sender=getattr(WebhookEndpoint, field).through,
+                dispatch_uid=f"webhooks.webhookendpoint.{field}.m2m.invalidate_subscriptions",
+                weak=False,
+            )
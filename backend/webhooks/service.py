@@ -1,12 +1,63 @@
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import partial
+
+from django.conf import settings
 from django.db import transaction
-from django.db.models import Q, Count
 
 from global_settings.utils import ff_is_enabled
 from iam.models import Folder
 
 from .models import WebhookEndpoint
 from .registry import webhook_registry
-from .tasks import send_webhook_request
+from .subscriptions import get_webhook_subscriptions
+from .tasks import build_webhook_body, send_webhook_batch
+
+_local = threading.local()
+
+
+def _schedule_deliveries(events_by_endpoint):
+    """One delivery task per endpoint and chunk of WEBHOOK_BATCH_SIZE events."""
+    batch_size = max(settings.WEBHOOK_BATCH_SIZE, 1)
+    for endpoint_id, events in events_by_endpoint.items():
+        for start in range(0, len(events), batch_size):
+            send_webhook_batch.schedule(
+                args=(endpoint_id, events[start : start + batch_size]), delay=1
+            )
+
+
+def _enqueue_deliveries(deliveries):
+    """Called once the transaction that produced the event is committed."""
+    batch = getattr(_local, "batch", None)
+    if batch is not None:
+        for endpoint_id, event in deliveries:
+            batch[endpoint_id].append(event)
+        return
+    events_by_endpoint = defaultdict(list)
+    for endpoint_id, event in deliveries:
+        events_by_endpoint[endpoint_id].append(event)
+    _schedule_deliveries(events_by_endpoint)
+
+
+@contextmanager
+def webhook_batch():
+    """
+    Group the events committed inside the block into one delivery task per
+    endpoint, scheduled when the block exits. Used by bulk operations so that
+    thousands of writes do not enqueue thousands of tasks.
+    Nested blocks are merged into the outermost one.
+    """
+    if getattr(_local, "batch", None) is not None:
+        yield
+        return
+    batch = _local.batch = defaultdict(list)
+    try:
+        yield
+    finally:
+        _local.batch = None
+        _schedule_deliveries(batch)
 
 
 def dispatch_webhook_event(instance, action, serializer=None):
@@ -27,32 +78,33 @@ def dispatch_webhook_event(instance, action, serializer=None):
     event_type = config.get_event_type(instance, action)
 
     # Find all active endpoints subscribed to this event
+    subscriptions = get_webhook_subscriptions().get(event_type)
+    if not subscriptions:
+        return
     folder = Folder.get_folder(instance)
-    endpoints = (
-        WebhookEndpoint.objects.annotate(folder_count=Count("target_folders"))
-        .filter(
-            Q(folder_count=0) | Q(target_folders=folder),
-            is_active=True,
-            event_types__name=event_type,
-        )
-        .distinct()
-    )
-
-    payloads = {}
-    for endpoint in endpoints:
-        _serializer = (
-            serializer
-            if endpoint.payload_format == WebhookEndpoint.PayloadFormats.FULL
-            else None
-        )
-        payloads[str(endpoint.id)] = config.get_payload(instance, _serializer)
+    folder_id = folder.id if folder else None
+    subscriptions = [s for s in subscriptions if s.matches(folder_id)]
+    if not subscriptions:
+        return
 
-    # Enqueue tasks
-    for endpoint in endpoints:
-        transaction.on_commit(
-            (
-                lambda e_id=str(endpoint.id): send_webhook_request.schedule(
-                    args=(e_id, event_type, payloads[e_id]), delay=1
-                )
+    # Serialize the event once per payload format, not once per endpoint
+    timestamp = datetime.now(timezone.utc)
+    bodies = {}
+    deliveries = []
+    for subscription in subscriptions:
+        payload_format = subscription.payload_format
+        if payload_format not in bodies:
+            _serializer = (
+                serializer
+                if payload_format == WebhookEndpoint.PayloadFormats.FULL
+                else None
+            )
+            bodies[payload_format] = build_webhook_body(
+                event_type, config.get_payload(instance, _serializer), timestamp
             )
+        deliveries.append(
+            (subscription.endpoint_id, (event_type, bodies[payload_format]))
         )
+
+    # Enqueue tasks
+    transaction.on_commit(partial(_enqueue_deliveries, deliveries))
@@ -0,0 +1,112 @@
+"""
+subscriptions.py
+
+Versioned snapshot of the webhook subscriptions: event type -> active endpoints
+subscribed to it, with the folders they are scoped to.
+
+dispatch_webhook_event runs on every tracked model write; with the snapshot it
+only does dictionary lookups instead of an annotated endpoint query per save.
+Accessing it costs a single CacheVersion SELECT, the snapshot is rebuilt when
+an endpoint, its event types or its target folders change (see apps.py).
+
+Key:
+- webhooks.subscriptions
+"""
+
+from __future__ import annotations
+
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import FrozenSet, Mapping, Optional, Tuple
+
+from django.apps import apps
+
+from iam.snapshot_cache import VersionedSnapshotCache, VersionStore
+
+WEBHOOK_SUBSCRIPTIONS_CACHE_KEY = "webhooks.subscriptions"
+
+
+@dataclass(frozen=True, slots=True)
+class Subscription:
+    endpoint_id: str
+    payload_format: str
+    # Empty: the endpoint receives the events of all folders
+    folder_ids: FrozenSet[uuid.UUID]
+
+    def matches(self, folder_id: Optional[uuid.UUID]) -> bool:
+        return not self.folder_ids or folder_id in self.folder_ids
+
+
+@dataclass(frozen=True, slots=True)
+class WebhookSubscriptions:
+    by_event_type: Mapping[str, Tuple[Subscription, ...]]
+
+    def get(self, event_type: str) -> Tuple[Subscription, ...]:
+        return self.by_event_type.get(event_type, ())
+
+
+def build_webhook_subscriptions() -> WebhookSubscriptions:
+    WebhookEndpoint = apps.get_model("webhooks", "WebhookEndpoint")
+
+    endpoints = {
+        endpoint_id: payload_format
+        for endpoint_id, payload_format in WebhookEndpoint.objects.filter(
+            is_active=True
+        ).values_list("id", "payload_format")
+    }
+    folders = defaultdict(set)
+    for endpoint_id, folder_id in WebhookEndpoint.target_folders.through.objects.filter(
+        webhookendpoint_id__in=endpoints
+    ).values_list("webhookendpoint_id", "folder_id"):
+        folders[endpoint_id].add(folder_id)
+
+    by_event_type = defaultdict(list)
+    for endpoint_id, event_type in WebhookEndpoint.event_types.through.objects.filter(
+        webhookendpoint_id__in=endpoints
+    ).values_list("webhookendpoint_id", "webhookeventtype__name"):
+        by_event_type[event_type].append(
+            Subscription(
+                endpoint_id=str(endpoint_id),
+                payload_format=endpoints[endpoint_id],
+                folder_ids=frozenset(folders[endpoint_id]),
+            )
+        )
+
+    return WebhookSubscriptions(
+        by_event_type=MappingProxyType(
+            {
+                event_type: tuple(subscriptions)
+                for event_type, subscriptions in by_event_type.items()
+            }
+        )
+    )
+
+
+_subscriptions_cache: VersionedSnapshotCache[WebhookSubscriptions] = (
+    VersionedSnapshotCache(
+        key=WEBHOOK_SUBSCRIPTIONS_CACHE_KEY, builder=build_webhook_subscriptions
+    )
+)
+
+
+def get_webhook_subscriptions(*, force_reload: bool = False) -> WebhookSubscriptions:
+    versions = VersionStore.ensure_and_get_versions(
+        [WEBHOOK_SUBSCRIPTIONS_CACHE_KEY]
+    ).versions
+    return _subscriptions_cache.get(versions, force_reload=force_reload)
+
+
+def invalidate_webhook_subscriptions() -> Optional[int]:
+    return _subscriptions_cache.invalidate()
+
+
+__all__ = [
+    "WEBHOOK_SUBSCRIPTIONS_CACHE_KEY",
+    "Subscription",
+    "WebhookSubscriptions",
+    "build_webhook_subscriptions",
+    "get_webhook_subscriptions",
+    "invalidate_webhook_subscriptions",
+]
@@ -3,12 +3,16 @@ import hashlib
 import hmac
 import json
 import secrets
+import threading
 import time
+from collections import defaultdict
 from datetime import datetime, timezone
 
 import requests
+from django.conf import settings
 from huey.contrib.djhuey import db_task
 from django.core.serializers.json import DjangoJSONEncoder
+from requests.adapters import HTTPAdapter
 
 from .models import WebhookEndpoint
 
@@ -16,32 +20,79 @@ import structlog
 
 logger = structlog.get_logger(__name__)
 
+WEBHOOK_TIMEOUT = 15
+WEBHOOK_MAX_RETRIES = 5
+WEBHOOK_RETRY_DELAY = 60
+WEBHOOK_RETRY_BACKOFF = 2.0
 
-@db_task(retries=5, retry_delay=60, retry_backoff=2.0)
-def send_webhook_request(endpoint_id, event_type, data_payload):
+
+class WebhookDeliveryError(Exception):
+    pass
+
+
+def _build_session():
+    """Keep-alive session shared by the deliveries of a worker process."""
+    session = requests.Session()
+    pool_size = max(settings.WEBHOOK_ENDPOINT_CONCURRENCY, 10)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_session = _build_session()
+
+
+class _EndpointLimiter:
     """
-    Huey task to send a single webhook event.
-    This task will be retried on failure.
+    Per-endpoint concurrency slots and minimum interval between two requests,
+    shared by the worker threads of a process.
     """
-    try:
-        endpoint = WebhookEndpoint.objects.get(id=endpoint_id, is_active=True)
-    except WebhookEndpoint.DoesNotExist:
-        logger.warning("Endpoint deleted. Task aborted.", endpoint_id=endpoint_id)
-        return
 
-    # Build payload
-    timestamp_iso = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    def __init__(self, concurrency: int, rate_limit: float):
+        self.slots = threading.BoundedSemaphore(max(concurrency, 1))
+        self.interval = 1.0 / rate_limit if rate_limit > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_request_at = 0.0
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            request_at = max(now, self._next_request_at)
+            self._next_request_at = request_at + self.interval
+        if request_at > now:
+            time.sleep(request_at - now)
+
+
+_limiters = defaultdict(
+    lambda: _EndpointLimiter(
+        settings.WEBHOOK_ENDPOINT_CONCURRENCY, settings.WEBHOOK_ENDPOINT_RATE_LIMIT
+    )
+)
+_limiters_lock = threading.Lock()
+
+
+def _get_limiter(endpoint_id) -> _EndpointLimiter:
+    with _limiters_lock:
+        return _limiters[str(endpoint_id)]
+
+
+def build_webhook_body(event_type, data_payload, timestamp=None):
+    """Minified JSON body of an event, as recommended."""
+    if timestamp is None:
+        timestamp = datetime.now(timezone.utc)
     full_payload = {
         "type": event_type,
-        "timestamp": timestamp_iso,  # Event occurrence timestamp
+        # Event occurrence timestamp
+        "timestamp": timestamp.isoformat().replace("+00:00", "Z"),
         "data": data_payload,
     }
+    return json.dumps(full_payload, separators=(",", ":"), cls=DjangoJSONEncoder)
 
-    # Send minified JSON, as recommended
-    json_payload = json.dumps(
-        full_payload, separators=(",", ":"), cls=DjangoJSONEncoder
-    )
 
+def _signed_headers(secret, json_payload):
     # Generate headers & signature
     webhook_id = f"msg_{secrets.token_hex(16)}"
     timestamp_unix = str(int(time.time()))
@@ -49,34 +100,113 @@ def send_webhook_request(endpoint_id, event_type, data_payload):
     content_to_sign = f"{webhook_id}.{timestamp_unix}.{json_payload}"
 
     digest = hmac.new(
-        endpoint.secret.encode("utf-8"), content_to_sign.encode("utf-8"), hashlib.sha256
+        secret.encode("utf-8"), content_to_sign.encode("utf-8"), hashlib.sha256
     ).digest()
 
     signature = base64.b64encode(digest).decode("utf-8")
 
-    headers = {
+    return {
         "Content-Type": "application/json",
         "webhook-id": webhook_id,
         "webhook-timestamp": timestamp_unix,
         "webhook-signature": f"v1,{signature}",
     }
 
-    # Send request (15s timeout)
+
+def deliver_webhook(endpoint, json_payload, limiter=None):
+    """
+    Sign and POST one event body to an endpoint.
+    Raises WebhookDeliveryError on network errors and non-2xx responses.
+    """
+    if limiter is not None:
+        limiter.wait()
     try:
-        response = requests.post(
-            endpoint.url, data=json_payload.encode("utf-8"), headers=headers, timeout=15
+        response = _session.post(
+            endpoint.url,
+            data=json_payload.encode("utf-8"),
+            headers=_signed_headers(endpoint.secret, json_payload),
+            timeout=WEBHOOK_TIMEOUT,
         )
-
-        # Any non-2xx status code is a failure
-        if 200 <= response.status_code < 300:
-            return f"Success: Sent {event_type} to {endpoint.url}"
-        else:
-            # Raise exception to trigger Huey retry
-            raise Exception(
-                f"Webhook failed for {endpoint_id} with status {response.status_code}."
-            )
-
     except requests.exceptions.RequestException as e:
         # Network error, timeout, etc.
-        # Raise exception to trigger Huey retry
-        raise Exception(f"Webhook network error for {endpoint_id}: {e}")
+        raise WebhookDeliveryError(f"Webhook network error for {endpoint.id}: {e}")
+
+    # Any non-2xx status code is a failure
+    if not 200 <= response.status_code < 300:
+        raise WebhookDeliveryError(
+            f"Webhook failed for {endpoint.id} with status {response.status_code}."
+        )
+
+
+@db_task()
+def send_webhook_batch(endpoint_id, events, attempt=0):
+    """
+    Huey task delivering a batch of events to one endpoint, in order.
+
+    'events' is a list of (event_type, json_payload) pairs. Delivery stops at
+    the first failure; the undelivered events are rescheduled with an
+    exponential backoff, so delivered events are never sent twice.
+    """
+    try:
+        endpoint = WebhookEndpoint.objects.only("id", "url", "secret").get(
+            id=endpoint_id, is_active=True
+        )
+    except WebhookEndpoint.DoesNotExist:
+        logger.warning("Endpoint deleted. Task aborted.", endpoint_id=endpoint_id)
+        return
+
+    limiter = _get_limiter(endpoint_id)
+    delivered = 0
+    with limiter.slots:
+        for _, json_payload in events:
+            try:
+                deliver_webhook(endpoint, json_payload, limiter)
+            except WebhookDeliveryError as e:
+                remaining = events[delivered:]
+                if attempt >= WEBHOOK_MAX_RETRIES:
+                    logger.error(
+                        "Webhook delivery failed, events dropped",
+                        endpoint_id=endpoint_id,
+                        dropped=len(remaining),
+                        error=str(e),
+                    )
+                    return
+                delay = WEBHOOK_RETRY_DELAY * WEBHOOK_RETRY_BACKOFF**attempt
+                logger.warning(
+                    "Webhook delivery failed, retrying",
+                    endpoint_id=endpoint_id,
+                    delivered=delivered,
+                    remaining=len(remaining),
+                    attempt=attempt + 1,
+                    delay=delay,
+                    error=str(e),
+                )
+                send_webhook_batch.schedule(
+                    args=(endpoint_id, remaining, attempt + 1), delay=delay
+                )
+                return
+            delivered += 1
+
+    return f"Success: Sent {delivered} events to {endpoint.url}"
+
+
+@db_task(retries=5, retry_delay=60, retry_backoff=2.0)
+def send_webhook_request(endpoint_id, event_type, data_payload):
+    """
+    Huey task to send a single webhook event.
+    This task will be retried on failure.
+    Kept for the tasks enqueued before batched delivery, see send_webhook_batch.
+    """
+    try:
+        endpoint = WebhookEndpoint.objects.get(id=endpoint_id, is_active=True)
+    except WebhookEndpoint.DoesNotExist:
+        logger.warning("Endpoint deleted. Task aborted.", endpoint_id=endpoint_id)
+        return
+
+    # Raise exception to trigger Huey retry
+    deliver_webhook(
+        endpoint,
+        build_webhook_body(event_type, data_payload),
+        _get_limiter(endpoint_id),
+    )
+    return f"Success: Sent {event_type} to {endpoint.url}"
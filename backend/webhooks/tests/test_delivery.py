@@ -0,0 +1,106 @@
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+
+from core.models import AppliedControl
+from iam.models import Folder
+from webhooks.models import WebhookEndpoint, WebhookEventType
+from webhooks.service import dispatch_webhook_event, webhook_batch
+from webhooks.subscriptions import get_webhook_subscriptions
+from webhooks.tasks import send_webhook_batch
+
+
+@pytest.fixture
+def folders():
+    return Folder.objects.create(name="scoped"), Folder.objects.create(name="other")
+
+
+@pytest.fixture
+def endpoints(folders):
+    created, _ = WebhookEventType.objects.get_or_create(name="appliedcontrol.created")
+    result = []
+    for name, payload_format in (("thin", "thin"), ("full", "full")):
+        endpoint = WebhookEndpoint.objects.create(
+            name=name,
+            folder=folders[0],
+            url=f"https://example.com/{name}",
+            secret="secret",
+            payload_format=payload_format,
+        )
+        endpoint.event_types.add(created)
+        result.append(endpoint)
+    result[0].target_folders.add(folders[0])
+    return result
+
+
+@pytest.mark.django_db
+class TestWebhookSubscriptions:
+    def test_index_follows_endpoint_changes(self, endpoints, folders):
+        subscriptions = get_webhook_subscriptions().get("appliedcontrol.created")
+        assert {s.endpoint_id for s in subscriptions} == {str(e.id) for e in endpoints}
+        scoped = next(s for s in subscriptions if s.endpoint_id == str(endpoints[0].id))
+        assert scoped.matches(folders[0].id)
+        assert not scoped.matches(folders[1].id)
+
+        endpoints[1].is_active = False
+        endpoints[1].save()
+        endpoints[0].target_folders.clear()
+        subscriptions = get_webhook_subscriptions().get("appliedcontrol.created")
+        assert [(s.endpoint_id, s.folder_ids) for s in subscriptions] == [
+            (str(endpoints[0].id), frozenset())
+        ]
+
+
+@pytest.mark.django_db
+class TestDispatchWebhookEvent:
+    @patch("webhooks.service.ff_is_enabled", return_value=True)
+    @patch("webhooks.service.send_webhook_batch")
+    def test_batch_schedules_one_task_per_endpoint(
+        self, task, _, endpoints, folders, django_capture_on_commit_callbacks
+    ):
+        controls = [
+            AppliedControl.objects.create(name=f"control {i}", folder=folder)
+            for i, folder in enumerate(folders * 2)
+        ]
+        with (
+            webhook_batch(),
+            django_capture_on_commit_callbacks(execute=True),
+        ):
+            for control in controls:
+                dispatch_webhook_event(control, "created")
+            # Not subscribed
+            dispatch_webhook_event(controls[0], "deleted")
+
+        scheduled = {
+            call.kwargs["args"][0]: call.kwargs["args"][1]
+            for call in task.schedule.call_args_list
+        }
+        assert task.schedule.call_count == 2
+        # The scoped endpoint only receives the events of its folder
+        assert [
+            json.loads(body)["data"]["id"]
+            for _, body in scheduled[str(endpoints[0].id)]
+        ] == [str(controls[0].id), str(controls[2].id)]
+        assert len(scheduled[str(endpoints[1].id)]) == 4
+
+
+@pytest.mark.django_db
+class TestSendWebhookBatch:
+    @patch("webhooks.tasks.send_webhook_batch.schedule")
+    @patch("webhooks.tasks._session")
+    def test_failed_events_are_rescheduled(self, session, schedule, endpoints):
+        session.post.side_effect = [Mock(status_code=200), Mock(status_code=503)]
+        events = [("appliedcontrol.created", f'{{"n":{i}}}') for i in range(3)]
+
+        send_webhook_batch.call_local(str(endpoints[0].id), events)
+
+        assert session.post.call_count == 2
+        headers = session.post.call_args.kwargs["headers"]
+        assert headers["webhook-signature"].startswith("v1,")
+        schedule.assert_called_once()
+        assert schedule.call_args.kwargs["args"] == (
+            str(endpoints[0].id),
+            events[1:],
+            1,
+        )
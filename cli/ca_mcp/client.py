@@ -1,9 +1,51 @@
 """HTTP client utilities for CISO Assistant API"""
 
-import requests
+import json
+import re
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
 from rich import print as rprint
-from .config import API_URL, TOKEN, VERIFY_CERTIFICATE, HTTP_TIMEOUT
+from urllib3.util.retry import Retry
+
+from .config import (
+    API_URL,
+    FETCH_CONCURRENCY,
+    HTTP_POOL_SIZE,
+    HTTP_RETRIES,
+    HTTP_TIMEOUT,
+    RESOLVER_CACHE_TTL,
+    RESOLVER_NEGATIVE_CACHE_TTL,
+    TOKEN,
+    VERIFY_CERTIFICATE,
+)
+
+
+def _build_session():
+    """Keep-alive session shared by all tools.
+    Only idempotent requests are retried on transient server errors."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        max_retries=Retry(
+            total=HTTP_RETRIES,
+            backoff_factor=0.5,
+            status_forcelist=(429, 502, 503, 504),
+            raise_on_status=False,
+        ),
+        pool_connections=HTTP_POOL_SIZE,
+        pool_maxsize=HTTP_POOL_SIZE,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+SESSION = _build_session()
 
 
 def get_headers():
@@ -33,7 +75,7 @@ def make_get_request(endpoint, params=None):
         Response object
     """
     url = f"{API_URL}{endpoint}"
-    return requests.get(
+    return SESSION.get(
         url,
         headers=get_headers(),
         params=params,
@@ -54,7 +96,8 @@ def make_post_request(endpoint, payload):
         Response object
     """
     url = f"{API_URL}{endpoint}"
-    return requests.post(
+    invalidate_resolver_cache(endpoint)
+    return SESSION.post(
         url,
         headers=get_json_headers(),
         json=payload,
@@ -75,7 +118,8 @@ def make_patch_request(endpoint, payload):
         Response object
     """
     url = f"{API_URL}{endpoint}"
-    return requests.patch(
+    invalidate_resolver_cache(endpoint)
+    return SESSION.patch(
         url,
         headers=get_json_headers(),
         json=payload,
@@ -95,7 +139,9 @@ def make_delete_request(endpoint):
         Response object
     """
     url = f"{API_URL}{endpoint}"
-    return requests.delete(
+    # Deletions cascade to other object types
+    invalidate_resolver_cache()
+    return SESSION.delete(
         url,
         headers=get_headers(),
         verify=VERIFY_CERTIFICATE,
@@ -103,6 +149,98 @@ def make_delete_request(endpoint):
     )
 
 
+class _CachedResponse:
+    """Successful list response replayed from the resolver cache"""
+
+    status_code = 200
+
+    def __init__(self, data):
+        self._data = data
+
+    def json(self):
+        return json.loads(self._data)
+
+    @property
+    def text(self):
+        return self._data
+
+
+_resolver_cache = {}
+_resolver_cache_lock = threading.Lock()
+_UUID_SEGMENT = re.compile(
+    r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$"
+)
+
+
+def _collection(endpoint):
+    """Collection path of an endpoint, e.g. /assets/ for /assets/{id}/"""
+    parts = []
+    for part in endpoint.split("/"):
+        if _UUID_SEGMENT.match(part.lower()):
+            break
+        parts.append(part)
+    return "/".join(parts).rstrip("/") + "/"
+
+
+def _cache_key(endpoint, params):
+    return endpoint, json.dumps(params or {}, sort_keys=True, default=str)
+
+
+def cache_lookup(endpoint, params, data):
+    """Store the JSON data of a successful list request in the resolver cache"""
+    if RESOLVER_CACHE_TTL <= 0:
+        return
+    ttl = (
+        RESOLVER_CACHE_TTL
+        if get_paginated_results(data)
+        else min(RESOLVER_NEGATIVE_CACHE_TTL, RESOLVER_CACHE_TTL)
+    )
+    with _resolver_cache_lock:
+        _resolver_cache[_cache_key(endpoint, params)] = (
+            time.monotonic() + ttl,
+            json.dumps(data),
+        )
+
+
+def get_cached_lookup(endpoint, params):
+    """JSON text of a cached list request, None if it is not cached"""
+    with _resolver_cache_lock:
+        entry = _resolver_cache.get(_cache_key(endpoint, params))
+    if entry and entry[0] > time.monotonic():
+        return entry[1]
+    return None
+
+
+def cached_get_request(endpoint, params=None):
+    """
+    Make a GET request to a list endpoint, served from the resolver cache when possible.
+    Used by the name -> id resolvers: found and not found (empty) results are cached,
+    errors are not.
+
+    Returns:
+        Response object
+    """
+    data = get_cached_lookup(endpoint, params)
+    if data is not None:
+        return _CachedResponse(data)
+
+    res = make_get_request(endpoint, params=params)
+    if res.status_code == 200:
+        cache_lookup(endpoint, params, res.json())
+    return res
+
+
+def invalidate_resolver_cache(endpoint=None):
+    """Drop the cached lookups of the collection of an endpoint, or all of them"""
+    with _resolver_cache_lock:
+        if endpoint is None:
+            _resolver_cache.clear()
+            return
+        collection = _collection(endpoint)
+        for key in [key for key in _resolver_cache if key[0].startswith(collection)]:
+            del _resolver_cache[key]
+
+
 def handle_response(res, error_message="Error"):
     """
     Handle API response and check for errors
@@ -137,16 +275,33 @@ def get_paginated_results(data):
     return []
 
 
-def fetch_all_results(endpoint, params=None):
+def _split_next_url(next_url):
+    """Path and query params of a pagination 'next' link"""
+    if next_url.startswith("http://") or next_url.startswith("https://"):
+        parsed = urlparse(next_url)
+        path = parsed.path
+        # Links are absolute, make_get_request prepends API_URL again
+        api_path = urlparse(API_URL).path.rstrip("/")
+        if api_path and path.startswith(f"{api_path}/"):
+            path = path[len(api_path) :]
+        return path, {
+            k: v[0] if len(v) == 1 else v for k, v in parse_qs(parsed.query).items()
+        }
+    return next_url, None
+
+
+def fetch_all_results(endpoint, params=None, concurrency=FETCH_CONCURRENCY):
     """
-    Fetch all paginated results from an API endpoint by following 'next' links.
+    Fetch all paginated results from an API endpoint.
 
-    This function handles Django REST Framework's LimitOffsetPagination by following
-    the 'next' URL in the response until all pages are retrieved.
+    This function handles Django REST Framework's LimitOffsetPagination. Once the
+    first page gives the total count, the remaining pages are fetched in parallel
+    (up to `concurrency` requests in flight), otherwise 'next' links are followed.
 
     Args:
         endpoint: API endpoint (e.g., "/compliance-assessments/")
         params: Optional query parameters (only applied to first request)
+        concurrency: Maximum number of pages fetched at the same time
 
     Returns:
         Tuple of (list of all results, error_message or None)
@@ -157,47 +312,56 @@ def fetch_all_results(endpoint, params=None):
             return error
         # process results...
     """
-    results_list = []
-    next_url = endpoint
-
-    # Only apply params to the first request
-    current_params = params
-
+    res = make_get_request(endpoint, params=params)
+    if res.status_code != 200:
+        return [], f"Error: HTTP {res.status_code} - {res.text}"
+
+    data = res.json()
+    # Handle non-paginated response (list)
+    if isinstance(data, list):
+        return data, None
+    if not isinstance(data, dict) or "results" not in data:
+        return [], f"Unexpected API response format: {type(data)}"
+
+    results_list = list(data.get("results", []))
+    next_url = data.get("next")
+    if not next_url:
+        return results_list, None
+
+    path, next_params = _split_next_url(next_url)
+    count = data.get("count")
+    if (
+        concurrency > 1
+        and isinstance(count, int)
+        and next_params
+        and "limit" in next_params
+        and "offset" in next_params
+    ):
+        limit = int(next_params["limit"])
+        pages = [
+            {**next_params, "offset": str(offset)}
+            for offset in range(int(next_params["offset"]), count, limit)
+        ]
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(pages))) as executor:
+            for res in executor.map(
+                lambda page_params: make_get_request(path, params=page_params), pages
+            ):
+                if res.status_code != 200:
+                    return results_list, f"Error: HTTP {res.status_code} - {res.text}"
+                results_list.extend(get_paginated_results(res.json()))
+        return results_list, None
+
+    # Follow 'next' links, which already include the query params
     while next_url:
-        # Make request - if next_url is a full URL from pagination, extract just the path
-        if next_url.startswith("http://") or next_url.startswith("https://"):
-            # Parse the full URL to extract path and query params
-            from urllib.parse import urlparse, parse_qs
-
-            parsed = urlparse(next_url)
-            next_url = parsed.path
-            # Convert query string to params dict for subsequent requests
-            current_params = {
-                k: v[0] if len(v) == 1 else v for k, v in parse_qs(parsed.query).items()
-            }
-
-        res = make_get_request(next_url, params=current_params)
+        path, current_params = _split_next_url(next_url)
+        res = make_get_request(path, params=current_params)
 
         if res.status_code != 200:
             error_msg = f"Error: HTTP {res.status_code} - {res.text}"
             return results_list, error_msg
 
         data = res.json()
-
-        # Handle paginated response
-        if isinstance(data, dict) and "results" in data:
-            results = data.get("results", [])
-            results_list.extend(results)
-            next_url = data.get("next")  # Get next page URL
-            current_params = (
-                None  # Clear params for subsequent requests (included in next_url)
-            )
-        # Handle non-paginated response (list)
-        elif isinstance(data, list):
-            results_list.extend(data)
-            next_url = None  # No pagination for list responses
-        else:
-            error_msg = f"Unexpected API response format: {type(data)}"
-            return results_list, error_msg
+        results_list.extend(get_paginated_results(data))
+        next_url = data.get("next") if isinstance(data, dict) else None
 
     return results_list, None
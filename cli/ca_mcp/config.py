@@ -21,3 +21,10 @@ VERIFY_CERTIFICATE = os.getenv("VERIFY_CERTIFICATE", "true").lower() in (
     "on",
 )
 HTTP_TIMEOUT = 30  # seconds
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "3"))
+HTTP_POOL_SIZE = 16
+FETCH_CONCURRENCY = int(os.getenv("FETCH_CONCURRENCY", "4"))
+
+# Name -> id lookups are cached in process, not-found names for a shorter time
+RESOLVER_CACHE_TTL = int(os.getenv("RESOLVER_CACHE_TTL", "300"))  # 0 disables it
+RESOLVER_NEGATIVE_CACHE_TTL = int(os.getenv("RESOLVER_NEGATIVE_CACHE_TTL", "30"))
@@ -1,6 +1,15 @@
 """Helper functions to resolve names to UUIDs"""
 
-from .client import make_get_request, get_paginated_results
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from .client import (
+    cached_get_request,
+    get_cached_lookup,
+    get_paginated_results,
+)
+from .config import FETCH_CONCURRENCY
 
 
 def resolve_folder_id(folder_name_or_id: str) -> str:
@@ -13,7 +22,7 @@ def resolve_folder_id(folder_name_or_id: str) -> str:
         return folder_name_or_id
 
     # Otherwise, look up by name - return exactly one result
-    res = make_get_request("/folders/", params={"name": folder_name_or_id})
+    res = cached_get_request("/folders/", params={"name": folder_name_or_id})
 
     if res.status_code != 200:
         raise ValueError(f"Folder '{folder_name_or_id}' API error {res.status_code}")
@@ -44,7 +53,7 @@ def resolve_perimeter_id(perimeter_name_or_id: str) -> str:
         return perimeter_name_or_id
 
     # Otherwise, look up by name - return exactly one result
-    res = make_get_request("/perimeters/", params={"name": perimeter_name_or_id})
+    res = cached_get_request("/perimeters/", params={"name": perimeter_name_or_id})
 
     if res.status_code != 200:
         raise ValueError(
@@ -76,7 +85,7 @@ def resolve_risk_matrix_id(matrix_name_or_id: str) -> str:
         return matrix_name_or_id
 
     # Otherwise, look up by name
-    res = make_get_request("/risk-matrices/", params={"name": matrix_name_or_id})
+    res = cached_get_request("/risk-matrices/", params={"name": matrix_name_or_id})
 
     if res.status_code != 200:
         raise ValueError(
@@ -107,12 +116,12 @@ def resolve_framework_id(framework_name_or_urn_or_id: str) -> str:
 
     # Try URN search first if it looks like a URN
     if framework_name_or_urn_or_id.startswith("urn:"):
-        res = make_get_request(
+        res = cached_get_request(
             "/frameworks/", params={"urn": framework_name_or_urn_or_id}
         )
     else:
         # Search by name
-        res = make_get_request(
+        res = cached_get_request(
             "/frameworks/", params={"name": framework_name_or_urn_or_id}
         )
 
@@ -144,7 +153,9 @@ def resolve_risk_assessment_id(assessment_name_or_id: str) -> str:
         return assessment_name_or_id
 
     # Otherwise, look up by name
-    res = make_get_request("/risk-assessments/", params={"name": assessment_name_or_id})
+    res = cached_get_request(
+        "/risk-assessments/", params={"name": assessment_name_or_id}
+    )
 
     if res.status_code != 200:
         raise ValueError(
@@ -182,7 +193,7 @@ def resolve_asset_id(asset_name_or_id: str, folder_id: str = None) -> str:
     if folder_id:
         params["folder"] = folder_id
 
-    res = make_get_request("/assets/", params=params)
+    res = cached_get_request("/assets/", params=params)
 
     if res.status_code != 200:
         raise ValueError(f"Asset '{asset_name_or_id}' API error {res.status_code}")
@@ -210,7 +221,7 @@ def resolve_risk_scenario_id(scenario_name_or_id: str) -> str:
         return scenario_name_or_id
 
     # Otherwise, look up by name
-    res = make_get_request("/risk-scenarios/", params={"name": scenario_name_or_id})
+    res = cached_get_request("/risk-scenarios/", params={"name": scenario_name_or_id})
 
     if res.status_code != 200:
         raise ValueError(
@@ -248,7 +259,7 @@ def resolve_applied_control_id(control_name_or_id: str, folder_id: str = None) -
     if folder_id:
         params["folder"] = folder_id
 
-    res = make_get_request("/applied-controls/", params=params)
+    res = cached_get_request("/applied-controls/", params=params)
 
     if res.status_code != 200:
         raise ValueError(
@@ -288,7 +299,7 @@ def resolve_compliance_assessment_id(assessment_name_or_id: str) -> str:
         return assessment_name_or_id
 
     # Otherwise, look up by name
-    res = make_get_request(
+    res = cached_get_request(
         "/compliance-assessments/", params={"name": assessment_name_or_id}
     )
 
@@ -328,7 +339,7 @@ def resolve_id_or_name(name_or_id: str, endpoint: str) -> str:
         return name_or_id
 
     # Otherwise, look up by name
-    res = make_get_request(endpoint, params={"name": name_or_id})
+    res = cached_get_request(endpoint, params={"name": name_or_id})
 
     if res.status_code != 200:
         raise ValueError(f"'{name_or_id}' at {endpoint} API error {res.status_code}")
@@ -347,6 +358,62 @@ def resolve_id_or_name(name_or_id: str, endpoint: str) -> str:
     return results[0]["id"]
 
 
+def prefetch_names(
+    names_or_ids,
+    endpoint: str,
+    params: dict = None,
+    field="name",
+    concurrency=FETCH_CONCURRENCY,
+):
+    """Seed the resolver cache for several names of the same endpoint.
+    Each name is looked up with its own filtered request, up to `concurrency` at a
+    time. UUIDs and names already cached are skipped, so a single name costs
+    nothing extra.
+
+    Args:
+        names_or_ids: Names or UUIDs about to be resolved
+        endpoint: API endpoint to query (e.g., "/assets/")
+        params: Optional filters shared by the lookups (e.g., {"folder": folder_id})
+        field: Field the names are matched against
+        concurrency: Maximum number of lookups in flight
+    """
+    params = params or {}
+    missing = {
+        value
+        for value in names_or_ids
+        if not ("-" in value and len(value) == 36)
+        and get_cached_lookup(endpoint, {field: value, **params}) is None
+    }
+    if len(missing) < 2 or concurrency < 2:
+        return
+
+    def lookup(value):
+        try:
+            cached_get_request(endpoint, params={field: value, **params})
+        except requests.RequestException:
+            # Errors are not cached, the name is looked up again and reports it
+            pass
+
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(missing))) as executor:
+        list(executor.map(lookup, missing))
+
+
+def resolve_ids(names_or_ids, endpoint: str) -> list:
+    """Resolve several names or UUIDs of the same endpoint, in order.
+    See resolve_id_or_name, the lookups run concurrently.
+    """
+    prefetch_names(names_or_ids, endpoint)
+    return [resolve_id_or_name(value, endpoint) for value in names_or_ids]
+
+
+def resolve_asset_ids(asset_names_or_ids, folder_id: str = None) -> list:
+    """Resolve several asset names or UUIDs, see resolve_asset_id"""
+    prefetch_names(
+        asset_names_or_ids, "/assets/", {"folder": folder_id} if folder_id else None
+    )
+    return [resolve_asset_id(asset, folder_id) for asset in asset_names_or_ids]
+
+
 def resolve_threat_id(
     threat_name_or_id: str, library: str = None, folder_id: str = None
 ) -> str:
@@ -374,7 +441,7 @@ def resolve_threat_id(
     if folder_id:
         params["folder"] = folder_id
 
-    res = make_get_request("/threats/", params=params)
+    res = cached_get_request("/threats/", params=params)
 
     if res.status_code != 200:
         raise ValueError(f"Threat '{threat_name_or_id}' API error {res.status_code}")
@@ -404,7 +471,7 @@ def resolve_library_id(library_urn_or_id: str) -> str:
     if "-" in library_urn_or_id and len(library_urn_or_id) == 36:
         return library_urn_or_id
 
-    res = make_get_request("/loaded-libraries/", params={"urn": library_urn_or_id})
+    res = cached_get_request("/loaded-libraries/", params={"urn": library_urn_or_id})
 
     if res.status_code != 200:
         raise ValueError(f"Library '{library_urn_or_id}' API error {res.status_code}")
@@ -433,7 +500,7 @@ def resolve_task_template_id(task_name_or_id: str) -> str:
         return task_name_or_id
 
     # Otherwise, look up by name
-    res = make_get_request("/task-templates/", params={"name": task_name_or_id})
+    res = cached_get_request("/task-templates/", params={"name": task_name_or_id})
 
     if res.status_code != 200:
         raise ValueError(
@@ -466,7 +533,7 @@ def resolve_entity_id(entity_name_or_id: str) -> str:
     if "-" in entity_name_or_id and len(entity_name_or_id) == 36:
         return entity_name_or_id
 
-    res = make_get_request("/entities/", params={"name": entity_name_or_id})
+    res = cached_get_request("/entities/", params={"name": entity_name_or_id})
 
     if res.status_code != 200:
         raise ValueError(f"Entity '{entity_name_or_id}' API error {res.status_code}")
@@ -492,7 +559,7 @@ def resolve_solution_id(solution_name_or_id: str) -> str:
     if "-" in solution_name_or_id and len(solution_name_or_id) == 36:
         return solution_name_or_id
 
-    res = make_get_request("/solutions/", params={"name": solution_name_or_id})
+    res = cached_get_request("/solutions/", params={"name": solution_name_or_id})
 
     if res.status_code != 200:
         raise ValueError(
@@ -520,7 +587,7 @@ def resolve_contract_id(contract_name_or_id: str) -> str:
     if "-" in contract_name_or_id and len(contract_name_or_id) == 36:
         return contract_name_or_id
 
-    res = make_get_request("/contracts/", params={"name": contract_name_or_id})
+    res = cached_get_request("/contracts/", params={"name": contract_name_or_id})
 
     if res.status_code != 200:
         raise ValueError(
@@ -548,7 +615,7 @@ def resolve_entity_assessment_id(assessment_name_or_id: str) -> str:
     if "-" in assessment_name_or_id and len(assessment_name_or_id) == 36:
         return assessment_name_or_id
 
-    res = make_get_request(
+    res = cached_get_request(
         "/entity-assessments/", params={"name": assessment_name_or_id}
     )
 
@@ -579,7 +646,7 @@ def resolve_representative_id(representative_email_or_id: str) -> str:
         return representative_email_or_id
 
     # Search by email since that's the unique identifier for representatives
-    res = make_get_request(
+    res = cached_get_request(
         "/representatives/", params={"search": representative_email_or_id}
     )
 
@@ -614,7 +681,7 @@ def resolve_ebios_rm_study_id(study_name_or_id: str) -> str:
     if "-" in study_name_or_id and len(study_name_or_id) == 36:
         return study_name_or_id
 
-    res = make_get_request("/ebios-rm/studies/", params={"name": study_name_or_id})
+    res = cached_get_request("/ebios-rm/studies/", params={"name": study_name_or_id})
 
     if res.status_code != 200:
         raise ValueError(
@@ -642,7 +709,7 @@ def resolve_feared_event_id(feared_event_name_or_id: str) -> str:
     if "-" in feared_event_name_or_id and len(feared_event_name_or_id) == 36:
         return feared_event_name_or_id
 
-    res = make_get_request(
+    res = cached_get_request(
         "/ebios-rm/feared-events/", params={"name": feared_event_name_or_id}
     )
 
@@ -692,7 +759,7 @@ def resolve_strategic_scenario_id(scenario_name_or_id: str) -> str:
     if "-" in scenario_name_or_id and len(scenario_name_or_id) == 36:
         return scenario_name_or_id
 
-    res = make_get_request(
+    res = cached_get_request(
         "/ebios-rm/strategic-scenarios/", params={"name": scenario_name_or_id}
     )
 
@@ -722,7 +789,7 @@ def resolve_attack_path_id(attack_path_name_or_id: str) -> str:
     if "-" in attack_path_name_or_id and len(attack_path_name_or_id) == 36:
         return attack_path_name_or_id
 
-    res = make_get_request(
+    res = cached_get_request(
         "/ebios-rm/attack-paths/", params={"name": attack_path_name_or_id}
     )
 
@@ -762,7 +829,7 @@ def resolve_elementary_action_id(action_name_or_id: str) -> str:
     if "-" in action_name_or_id and len(action_name_or_id) == 36:
         return action_name_or_id
 
-    res = make_get_request(
+    res = cached_get_request(
         "/ebios-rm/elementary-actions/", params={"name": action_name_or_id}
     )
 
@@ -792,7 +859,7 @@ def resolve_operating_mode_id(mode_name_or_id: str) -> str:
     if "-" in mode_name_or_id and len(mode_name_or_id) == 36:
         return mode_name_or_id
 
-    res = make_get_request(
+    res = cached_get_request(
         "/ebios-rm/operating-modes/", params={"name": mode_name_or_id}
     )
 
@@ -19,7 +19,7 @@ from ..resolvers import (
     resolve_operating_mode_id,
     resolve_kill_chain_id,
     resolve_risk_matrix_id,
-    resolve_asset_id,
+    resolve_asset_ids,
     resolve_entity_id,
 )
 from ..utils.response_formatter import (
@@ -972,10 +972,7 @@ async def create_ebios_rm_study(
             payload["reference_entity"] = resolve_entity_id(reference_entity_id)
 
         if assets:
-            resolved_assets = []
-            for asset in assets:
-                resolved_assets.append(resolve_asset_id(asset))
-            payload["assets"] = resolved_assets
+            payload["assets"] = resolve_asset_ids(assets)
 
         if compliance_assessments:
             resolved_assessments = []
@@ -1048,10 +1045,7 @@ async def create_feared_event(
             payload["ref_id"] = ref_id
 
         if assets:
-            resolved_assets = []
-            for asset in assets:
-                resolved_assets.append(resolve_asset_id(asset))
-            payload["assets"] = resolved_assets
+            payload["assets"] = resolve_asset_ids(assets)
 
         res = make_post_request("/ebios-rm/feared-events/", payload)
 
@@ -1372,7 +1366,7 @@ async def create_operational_scenario(
         threats: List of threat IDs/names to link
     """
     try:
-        from ..resolvers import resolve_id_or_name
+        from ..resolvers import resolve_ids
 
         ebios_rm_study_id = resolve_ebios_rm_study_id(ebios_rm_study_id)
         attack_path_id = resolve_attack_path_id(attack_path_id)
@@ -1387,10 +1381,7 @@ async def create_operational_scenario(
         }
 
         if threats:
-            resolved_threats = []
-            for threat in threats:
-                resolved_threats.append(resolve_id_or_name(threat, "/threats/"))
-            payload["threats"] = resolved_threats
+            payload["threats"] = resolve_ids(threats, "/threats/")
 
         res = make_post_request("/ebios-rm/operational-scenarios/", payload)
 
@@ -1689,10 +1680,7 @@ async def update_ebios_rm_study(
             payload["observation"] = observation
 
         if assets is not None:
-            resolved_assets = []
-            for asset in assets:
-                resolved_assets.append(resolve_asset_id(asset))
-            payload["assets"] = resolved_assets
+            payload["assets"] = resolve_asset_ids(assets)
 
         if compliance_assessments is not None:
             resolved_assessments = []
@@ -1771,10 +1759,7 @@ async def update_feared_event(
             payload["justification"] = justification
 
         if assets is not None:
-            resolved_assets = []
-            for asset in assets:
-                resolved_assets.append(resolve_asset_id(asset))
-            payload["assets"] = resolved_assets
+            payload["assets"] = resolve_asset_ids(assets)
 
         if not payload:
             return "Error: No fields provided to update"
@@ -2096,7 +2081,7 @@ async def update_operational_scenario(
         threats: List of threat IDs/names (replaces existing)
     """
     try:
-        from ..resolvers import resolve_id_or_name
+        from ..resolvers import resolve_ids
 
         resolved_scenario_id = resolve_operational_scenario_id(scenario_id)
 
@@ -2112,10 +2097,7 @@ async def update_operational_scenario(
             payload["justification"] = justification
 
         if threats is not None:
-            resolved_threats = []
-            for threat in threats:
-                resolved_threats.append(resolve_id_or_name(threat, "/threats/"))
-            payload["threats"] = resolved_threats
+            payload["threats"] = resolve_ids(threats, "/threats/")
 
         if not payload:
             return "Error: No fields provided to update"
@@ -610,7 +610,7 @@ async def create_solution(
         assets: List of asset IDs/names to link
     """
     try:
-        from ..resolvers import resolve_asset_id
+        from ..resolvers import resolve_asset_ids
 
         provider_entity_id = resolve_entity_id(provider_entity_id)
 
@@ -628,11 +628,7 @@ async def create_solution(
             payload["reference_link"] = reference_link
 
         if assets:
-            resolved_assets = []
-            for asset in assets:
-                resolved_asset_id = resolve_asset_id(asset)
-                resolved_assets.append(resolved_asset_id)
-            payload["assets"] = resolved_assets
+            payload["assets"] = resolve_asset_ids(assets)
 
         res = make_post_request("/solutions/", payload)
 
@@ -991,7 +987,7 @@ async def update_solution(
         assets: List of asset IDs/names (replaces existing)
     """
     try:
-        from ..resolvers import resolve_asset_id
+        from ..resolvers import resolve_asset_ids
 
         resolved_solution_id = resolve_solution_id(solution_id)
 
@@ -1011,11 +1007,7 @@ async def update_solution(
             payload["criticality"] = criticality
 
         if assets is not None:
-            resolved_assets = []
-            for asset in assets:
-                resolved_asset_id = resolve_asset_id(asset)
-                resolved_assets.append(resolved_asset_id)
-            payload["assets"] = resolved_assets
+            payload["assets"] = resolve_asset_ids(assets)
 
         if not payload:
             return "Error: No fields provided to update"
@@ -1,13 +1,18 @@
 #! python3
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import sys
 from pathlib import Path
 import tempfile
 import hashlib
+import shutil
 import struct
+import threading
 import click
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import os
 from dotenv import load_dotenv
 import json
@@ -40,6 +45,68 @@ VERIFY_CERTIFICATE = os.getenv("VERIFY_CERTIFICATE", "true").lower() in (
     "yes",
     "on",
 )
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "3"))
+HTTP_POOL_SIZE = 32
+
+# name -> id maps fetched by ids_map, kept for the rest of the run
+_ids_cache = {}
+_ids_cache_lock = threading.Lock()
+
+
+def _build_session():
+    """Keep-alive session retrying transient failures.
+    POST requests are only retried when the connection could not be established,
+    so that rows are never created twice."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        max_retries=Retry(
+            total=HTTP_RETRIES,
+            backoff_factor=0.5,
+            status_forcelist=(429, 502, 503, 504),
+            raise_on_status=False,
+        ),
+        pool_connections=HTTP_POOL_SIZE,
+        pool_maxsize=HTTP_POOL_SIZE,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+SESSION = _build_session()
+
+concurrency_option = click.option(
+    "--concurrency",
+    default=1,
+    show_default=True,
+    type=click.IntRange(1, HTTP_POOL_SIZE),
+    help="Number of rows imported in parallel",
+)
+
+
+def run_concurrently(func, items, concurrency):
+    """Apply func to each item with at most `concurrency` calls in flight.
+    Results are yielded in the order of the items."""
+    if concurrency <= 1:
+        for item in items:
+            yield func(item)
+        return
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        yield from executor.map(func, items)
+
+
+def _cached_ids(model):
+    with _ids_cache_lock:
+        return _ids_cache.get(model)
+
+
+def _update_ids_cache(model, ids=None):
+    """Store the ids of a model, or drop them when ids is None (after creations)."""
+    with _ids_cache_lock:
+        if ids is None:
+            _ids_cache.pop(model, None)
+        else:
+            _ids_cache[model] = ids
 
 
 def ids_map(model, folder=None):
@@ -50,17 +117,18 @@ def ids_map(model, folder=None):
         )
         sys.exit(1)
 
-    my_map = dict()
-    url = f"{API_URL}/{model}/ids/"
-    headers = {"Authorization": f"Token {TOKEN}"}
-    res = requests.get(url, headers=headers, verify=VERIFY_CERTIFICATE)
-    if res.status_code != 200:
-        print("something went wrong. check authentication.")
-        sys.exit(1)
-    if folder:
-        my_map = res.json().get(folder)
-    else:
+    my_map = _cached_ids(model)
+    if my_map is None:
+        url = f"{API_URL}/{model}/ids/"
+        headers = {"Authorization": f"Token {TOKEN}"}
+        res = SESSION.get(url, headers=headers, verify=VERIFY_CERTIFICATE)
+        if res.status_code != 200:
+            print("something went wrong. check authentication.")
+            sys.exit(1)
         my_map = res.json()
+        _update_ids_cache(model, my_map)
+    if folder:
+        my_map = my_map.get(folder)
     return my_map
 
 
@@ -74,7 +142,7 @@ def _get_folders():
 
     url = f"{API_URL}/folders/"
     headers = {"Authorization": f"Token {TOKEN}"}
-    res = requests.get(url, headers=headers, verify=VERIFY_CERTIFICATE)
+    res = SESSION.get(url, headers=headers, verify=VERIFY_CERTIFICATE)
     if res.status_code == 200:
         output = res.json()
         for folder in output["results"]:
@@ -113,7 +181,7 @@ def get_unique_parsed_values(df, column_name):
     return set(parsed_values)
 
 
-def batch_create(model, items, folder_id):
+def batch_create(model, items, folder_id, concurrency=1):
     if not TOKEN:
         print(
             "No authentication token available. Please set PAT token in .clica.env.",
@@ -126,17 +194,21 @@ def batch_create(model, items, folder_id):
     }
     output = dict()
     url = f"{API_URL}/{model}/"
-    for item in items:
+
+    def create(item):
         data = {
             "folder": folder_id,
             "name": item,
         }
-        res = requests.post(url, json=data, headers=headers)
+        return item, SESSION.post(url, json=data, headers=headers)
+
+    for item, res in run_concurrently(create, items, concurrency):
         if res.status_code != 201:
             print("something went wrong")
             print(res.json())
         else:
             output.update({item: res.json()["id"]})
+    _update_ids_cache(model)
     return output
 
 
@@ -153,7 +225,10 @@ def batch_create(model, items, folder_id):
     default=False,
     help="Create all associated objects (threats, assets)",
 )
-def import_risk_assessment(file, folder, perimeter, name, matrix, create_all):
+@concurrency_option
+def import_risk_assessment(
+    file, folder, perimeter, name, matrix, create_all, concurrency
+):
     """crawl a risk assessment (see template) and create the assoicated objects"""
     if not TOKEN:
         print(
@@ -177,7 +252,7 @@ def import_risk_assessment(file, folder, perimeter, name, matrix, create_all):
         "perimeter": perimeter_id,
         "risk_matrix": matrix_id,
     }
-    res = requests.post(
+    res = SESSION.post(
         f"{API_URL}/risk-assessments/",
         json=data,
         headers=headers,
@@ -193,15 +268,15 @@ def import_risk_assessment(file, folder, perimeter, name, matrix, create_all):
 
     if create_all:
         threats = get_unique_parsed_values(df, "threats")
-        batch_create("threats", threats, folder_id)
+        batch_create("threats", threats, folder_id, concurrency)
         assets = get_unique_parsed_values(df, "assets")
-        batch_create("assets", assets, folder_id)
+        batch_create("assets", assets, folder_id, concurrency)
         existing_controls = get_unique_parsed_values(df, "existing_controls")
-        batch_create("applied-controls", existing_controls, folder_id)
+        batch_create("applied-controls", existing_controls, folder_id, concurrency)
         additional_controls = get_unique_parsed_values(df, "additional_controls")
-        batch_create("applied-controls", additional_controls, folder_id)
+        batch_create("applied-controls", additional_controls, folder_id, concurrency)
 
-    res = requests.get(f"{API_URL}/risk-matrices/{matrix_id}", headers=headers)
+    res = SESSION.get(f"{API_URL}/risk-matrices/{matrix_id}", headers=headers)
     if res.status_code == 200:
         matrix_def = res.json().get("json_definition")
         matrix_def = json.loads(matrix_def)
@@ -231,6 +306,7 @@ def import_risk_assessment(file, folder, perimeter, name, matrix, create_all):
     assets = ids_map("assets", folder)
     controls = ids_map("applied-controls", folder)
 
+    scenarios = []
     for scenario in df.itertuples():
         data = {
             "ref_id": scenario.ref_id,
@@ -276,7 +352,14 @@ def import_risk_assessment(file, folder, perimeter, name, matrix, create_all):
             items = str(scenario.threats).split(",")
             data.update({"threats": [threats[item] for item in items]})
 
-        res = requests.post(f"{API_URL}/risk-scenarios/", json=data, headers=headers)
+        scenarios.append(data)
+
+    def create_scenario(data):
+        return data, SESSION.post(
+            f"{API_URL}/risk-scenarios/", json=data, headers=headers
+        )
+
+    for data, res in run_concurrently(create_scenario, scenarios, concurrency):
         if res.status_code != 201:
             rprint(res.json())
             rprint(data)
@@ -284,7 +367,8 @@ def import_risk_assessment(file, folder, perimeter, name, matrix, create_all):
 
 @click.command()
 @click.option("--file", required=True, help="Path of the csv file with assets")
-def import_assets(file):
+@concurrency_option
+def import_assets(file, concurrency):
     """import assets from a csv. Check the samples for format."""
     if not TOKEN:
         print(
@@ -299,35 +383,41 @@ def import_assets(file):
     headers = {
         "Authorization": f"Token {TOKEN}",
     }
-    if click.confirm(f"I'm about to create {len(df)} assets. Are you sure?"):
-        for _, row in df.iterrows():
+
+    def create_asset(row):
+        asset_type = "SP"
+        name = row["name"]
+        if row["type"].lower() == "primary":
+            asset_type = "PR"
+        else:
             asset_type = "SP"
-            name = row["name"]
-            if row["type"].lower() == "primary":
-                asset_type = "PR"
-            else:
-                asset_type = "SP"
-
-            data = {
-                "name": name,
-                "folder": GLOBAL_FOLDER_ID,
-                "type": asset_type,
-            }
-            res = requests.post(
-                url, json=data, headers=headers, verify=VERIFY_CERTIFICATE
-            )
+
+        data = {
+            "name": name,
+            "folder": GLOBAL_FOLDER_ID,
+            "type": asset_type,
+        }
+        return name, SESSION.post(
+            url, json=data, headers=headers, verify=VERIFY_CERTIFICATE
+        )
+
+    if click.confirm(f"I'm about to create {len(df)} assets. Are you sure?"):
+        rows = (row for _, row in df.iterrows())
+        for name, res in run_concurrently(create_asset, rows, concurrency):
             if res.status_code != 201:
                 click.echo("❌ something went wrong", err=True)
                 rprint(res.json())
             else:
                 rprint(f"✅ {name} created", file=sys.stderr)
+        _update_ids_cache("assets")
 
 
 @click.command()
 @click.option(
     "--file", required=True, help="Path of the csv file with applied controls"
 )
-def import_controls(file):
+@concurrency_option
+def import_controls(file, concurrency):
     """import applied controls. Check the samples for format."""
     if not TOKEN:
         print(
@@ -342,35 +432,41 @@ def import_controls(file):
     headers = {
         "Authorization": f"Token {TOKEN}",
     }
+
+    def create_control(row):
+        name = row["name"]
+        description = row["description"]
+        csf_function = row["csf_function"]
+        category = row["category"]
+
+        data = {
+            "name": name,
+            "folder": GLOBAL_FOLDER_ID,
+            "description": description,
+            "csf_function": csf_function.lower(),
+            "category": category.lower(),
+        }
+        return name, SESSION.post(
+            url, json=data, headers=headers, verify=VERIFY_CERTIFICATE
+        )
+
     if click.confirm(f"I'm about to create {len(df)} applied controls. Are you sure?"):
-        for _, row in df.iterrows():
-            name = row["name"]
-            description = row["description"]
-            csf_function = row["csf_function"]
-            category = row["category"]
-
-            data = {
-                "name": name,
-                "folder": GLOBAL_FOLDER_ID,
-                "description": description,
-                "csf_function": csf_function.lower(),
-                "category": category.lower(),
-            }
-            res = requests.post(
-                url, json=data, headers=headers, verify=VERIFY_CERTIFICATE
-            )
+        rows = (row for _, row in df.iterrows())
+        for name, res in run_concurrently(create_control, rows, concurrency):
             if res.status_code != 201:
                 click.echo("❌ something went wrong", err=True)
                 rprint(res.json())
             else:
                 rprint(f"✅ {name} created", file=sys.stderr)
+        _update_ids_cache("applied-controls")
 
 
 @click.command()
 @click.option(
     "--file", required=True, help="Path of the csv file with the list of evidences"
 )
-def import_evidences(file):
+@concurrency_option
+def import_evidences(file, concurrency):
     """Import evidences. Check the samples for format."""
     if not TOKEN:
         print(
@@ -386,23 +482,28 @@ def import_evidences(file):
     headers = {
         "Authorization": f"Token {TOKEN}",
     }
+
+    def create_evidence(row):
+        data = {
+            "name": row["name"],
+            "description": row["description"],
+            "folder": GLOBAL_FOLDER_ID,
+            "applied_controls": [],
+            "requirement_assessments": [],
+        }
+        return row["name"], SESSION.post(
+            url, json=data, headers=headers, verify=VERIFY_CERTIFICATE
+        )
+
     if click.confirm(f"I'm about to create {len(df)} evidences. Are you sure?"):
-        for _, row in df.iterrows():
-            data = {
-                "name": row["name"],
-                "description": row["description"],
-                "folder": GLOBAL_FOLDER_ID,
-                "applied_controls": [],
-                "requirement_assessments": [],
-            }
-            res = requests.post(
-                url, json=data, headers=headers, verify=VERIFY_CERTIFICATE
-            )
+        rows = (row for _, row in df.iterrows())
+        for name, res in run_concurrently(create_evidence, rows, concurrency):
             if res.status_code != 201:
                 click.echo("❌ something went wrong", err=True)
                 rprint(res.json())
             else:
-                rprint(f"✅ {row['name']} created", file=sys.stderr)
+                rprint(f"✅ {name} created", file=sys.stderr)
+        _update_ids_cache("evidences")
 
 
 @click.command()
@@ -422,7 +523,7 @@ def upload_attachment(file, name):
     }
     # Get evidence ID by name
     url = f"{API_URL}/evidences/"
-    res = requests.get(
+    res = SESSION.get(
         url, headers=headers, params={"name": name}, verify=VERIFY_CERTIFICATE
     )
     data = res.json()
@@ -445,11 +546,190 @@ def upload_attachment(file, name):
         "Content-Disposition": f'attachment;filename="{filename}"',
     }
     with open(file, "rb") as f:
-        res = requests.post(url, headers=headers, data=f, verify=VERIFY_CERTIFICATE)
+        res = SESSION.post(url, headers=headers, data=f, verify=VERIFY_CERTIFICATE)
     rprint(res)
     rprint(res.text)
 
 
+ATTACHMENT_CHUNK_SIZE = 1024 * 1024
+
+
+class _ChunkReader:
+    """File-like reader over the chunks of a streamed response"""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buffer = b""
+
+    def read(self, size):
+        while len(self._buffer) < size:
+            chunk = next(self._chunks, b"")
+            if not chunk:
+                break
+            self._buffer += chunk
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+def _attachment_path(attachments_dir, entry):
+    return (
+        attachments_dir
+        / f"{entry['evidence_id']}_v{entry['version']}_{entry['filename']}"
+    )
+
+
+def _load_backup_manifest(backup_dir):
+    """Return the downloaded manifest entries of a backup whose file is still on disk"""
+    manifest_file = Path(backup_dir) / "backup-manifest.jsonl"
+    attachments_dir = Path(backup_dir) / "attachments" / "evidence-revisions"
+    manifest = {}
+    if not manifest_file.exists():
+        return manifest
+    with open(manifest_file, "r") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            # Missing files are simply left out so that they are downloaded again
+            if (
+                entry.get("downloaded")
+                and _attachment_path(attachments_dir, entry).exists()
+            ):
+                manifest[entry["id"]] = entry
+    return manifest
+
+
+def _load_failed_attachments(backup_dir):
+    """Return the manifest entries of a backup whose attachment could not be saved"""
+    manifest_file = Path(backup_dir) / "backup-manifest.jsonl"
+    failed = {}
+    if not manifest_file.exists():
+        return failed
+    with open(manifest_file, "r") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if entry.get("downloaded"):
+                failed.pop(entry["id"], None)
+            else:
+                failed[entry["id"]] = entry
+    return failed
+
+
+def _link_attachment(source, target):
+    """Reuse a file already on disk, hard linking it when possible"""
+    if target.exists():
+        target.unlink()
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+
+
+def _read_block_header(reader, wide):
+    """
+    Read the header of the next block of a batch download stream:
+    stream:   [4-byte total size][JSON header][file bytes]
+    stream64: [4-byte header size][8-byte file size][JSON header][file bytes]
+    Returns (header, first file bytes, remaining file size), header is None at the end.
+    """
+    prefix_size = 12 if wide else 4
+    prefix = reader.read(prefix_size)
+    if len(prefix) < prefix_size:
+        return None, b"", 0
+    if wide:
+        header_size, remaining = struct.unpack(">IQ", prefix)
+        try:
+            return json.loads(reader.read(header_size)), b"", remaining
+        except ValueError:
+            return {}, b"", remaining
+
+    total_size = struct.unpack(">I", prefix)[0]
+    head = reader.read(min(total_size, 4096))
+    remaining = total_size - len(head)
+    try:
+        # The header is ASCII JSON, latin-1 keeps byte offsets unchanged
+        header, header_end = json.JSONDecoder().raw_decode(head.decode("latin-1"))
+    except ValueError:
+        return {}, b"", remaining
+    return header, head[header_end:], remaining
+
+
+def _write_attachment_block(reader, attachments_dir, wide=False):
+    """
+    Stream one block of a batch download to disk.
+    Returns the block header, {} if the block was skipped and None at the end of the stream.
+    """
+    header, chunk, remaining = _read_block_header(reader, wide)
+    if header is None:
+        return None
+    if not header:
+        rprint("[yellow]Warning: Could not parse header in block[/yellow]")
+        while remaining > 0 and (
+            chunk := reader.read(min(remaining, ATTACHMENT_CHUNK_SIZE))
+        ):
+            remaining -= len(chunk)
+        return {}
+
+    file_path = _attachment_path(attachments_dir, header)
+    partial_path = file_path.with_name(file_path.name + ".part")
+    hash_obj = hashlib.sha256()
+    size = 0
+    with open(partial_path, "wb") as f:
+        while True:
+            f.write(chunk)
+            hash_obj.update(chunk)
+            size += len(chunk)
+            if remaining <= 0:
+                break
+            chunk = reader.read(min(remaining, ATTACHMENT_CHUNK_SIZE))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+
+    if remaining > 0:
+        partial_path.unlink()
+        raise IOError(f"Stream interrupted while downloading {header['filename']}")
+    if header.get("hash") and hash_obj.hexdigest() != header["hash"]:
+        partial_path.unlink()
+        rprint(
+            f"[yellow]Warning: Hash mismatch for {header['filename']}, skipped[/yellow]"
+        )
+        return {}
+    os.replace(partial_path, file_path)
+    header["size"] = size
+    return header
+
+
+def _download_attachment_batch(batch_ids, headers, attachments_dir):
+    """Download one batch of attachments. Returns (headers of saved files, error)"""
+    url = f"{API_URL}/serdes/batch-download-attachments/"
+    res = SESSION.post(
+        url,
+        headers=headers,
+        json={"revision_ids": batch_ids, "format": "stream64"},
+        verify=VERIFY_CERTIFICATE,
+        stream=True,
+    )
+    if res.status_code != 200:
+        return [], f"{res.status_code} {res.text}"
+    # Servers without 64-bit framing ignore the format and send 4-byte lengths
+    wide = res.headers.get("X-Attachment-Format") == "stream64"
+
+    saved = []
+    reader = _ChunkReader(res.iter_content(chunk_size=ATTACHMENT_CHUNK_SIZE))
+    try:
+        while (
+            header := _write_attachment_block(reader, attachments_dir, wide)
+        ) is not None:
+            if header:
+                saved.append(header)
+    except (IOError, requests.RequestException) as e:
+        return saved, str(e)
+    return saved, None
+
+
 @click.command()
 @click.option(
     "--dest-dir",
@@ -468,7 +748,26 @@ def upload_attachment(file, name):
     default=True,
     help="Resume from existing manifest (default: True)",
 )
-def backup_full(dest_dir, batch_size, resume):
+@click.option(
+    "--concurrency",
+    default=4,
+    show_default=True,
+    type=click.IntRange(1, HTTP_POOL_SIZE),
+    help="Number of batches downloaded in parallel",
+)
+@click.option(
+    "--incremental",
+    is_flag=True,
+    default=False,
+    help="Only list attachments created since the last backup in the manifest",
+)
+@click.option(
+    "--reference-dir",
+    multiple=True,
+    type=click.Path(exists=True, file_okay=False, dir_okay=True),
+    help="Previous backup whose files are reused by content hash (repeatable)",
+)
+def backup_full(dest_dir, batch_size, resume, concurrency, incremental, reference_dir):
     """Create a full backup including database and attachments using streaming"""
     if not TOKEN:
         print(
@@ -488,7 +787,7 @@ def backup_full(dest_dir, batch_size, resume):
     # Step 1: Backup database
     rprint("[bold blue]Step 1/2: Exporting database backup...[/bold blue]")
     url = f"{API_URL}/serdes/dump-db/"
-    res = requests.get(url, headers=headers, verify=VERIFY_CERTIFICATE)
+    res = SESSION.get(url, headers=headers, verify=VERIFY_CERTIFICATE, stream=True)
 
     if res.status_code != 200:
         rprint(
@@ -499,8 +798,11 @@ def backup_full(dest_dir, batch_size, resume):
         sys.exit(1)
 
     backup_file = dest_path / "backup.json.gz"
-    with open(backup_file, "wb") as f:
-        f.write(res.content)
+    partial_file = backup_file.with_name(backup_file.name + ".part")
+    with open(partial_file, "wb") as f:
+        for chunk in res.iter_content(chunk_size=ATTACHMENT_CHUNK_SIZE):
+            f.write(chunk)
+    os.replace(partial_file, backup_file)
     rprint(f"[green]✓ Database backup saved to {backup_file}[/green]")
 
     # Step 2: Backup attachments using streaming approach
@@ -508,34 +810,55 @@ def backup_full(dest_dir, batch_size, resume):
 
     # Load existing manifest if resuming
     existing_manifest = {}
-    if resume and manifest_file.exists():
+    # Attachments that could not be saved, retried whatever the listing returns
+    failed = {}
+    if resume or incremental:
         rprint("[dim]Loading existing manifest for resume...[/dim]")
-        with open(manifest_file, "r") as f:  # FIX: "r" not "a"
-            for line in f:
-                if line.strip():
-                    entry = json.loads(line)
-                    if entry.get("downloaded"):
-                        # Verify file actually exists on disk before adding to manifest
-                        evidence_id = entry.get("evidence_id")
-                        version = entry.get("version")
-                        filename = entry.get("filename")
-                        file_path = (
-                            attachments_dir / f"{evidence_id}_v{version}_{filename}"
-                        )
+        existing_manifest = _load_backup_manifest(dest_path)
+        rprint(f"[dim]Found {len(existing_manifest)} already downloaded files[/dim]")
+        failed = {
+            revision_id: entry
+            for revision_id, entry in _load_failed_attachments(dest_path).items()
+            if revision_id not in existing_manifest
+        }
+
+    # Files already on disk by content hash, in this backup and the reference ones
+    known_files = {}
+    for backup_dir, manifest in [(dest_path, existing_manifest)] + [
+        (Path(ref), _load_backup_manifest(ref)) for ref in reference_dir
+    ]:
+        for entry in manifest.values():
+            if entry.get("hash"):
+                known_files.setdefault(
+                    entry["hash"],
+                    _attachment_path(
+                        backup_dir / "attachments" / "evidence-revisions", entry
+                    ),
+                )
 
-                        if file_path.exists():
-                            existing_manifest[entry["id"]] = entry
-                        # If file doesn't exist, simply don't add it to existing_manifest
-                        # (it will be re-downloaded)
+    params = {}
+    if incremental:
+        last_created_at = max(
+            (
+                e["created_at"]
+                for e in existing_manifest.values()
+                if e.get("created_at")
+            ),
+            default=None,
+        )
+        if last_created_at:
+            params["created_after"] = last_created_at
+            rprint(f"[dim]Listing attachments created since {last_created_at}[/dim]")
 
-        rprint(f"[dim]Found {len(existing_manifest)} already downloaded files[/dim]")
-    # Fetch all attachment metadata from API (paginated)
+    # Fetch attachment metadata from API (paginated)
     rprint("[dim]Fetching attachment metadata from server...[/dim]")
     all_metadata = []
     url = f"{API_URL}/serdes/attachment-metadata/"
 
     while url:
-        res = requests.get(url, headers=headers, verify=VERIFY_CERTIFICATE)
+        res = SESSION.get(
+            url, headers=headers, params=params, verify=VERIFY_CERTIFICATE
+        )
 
         if res.status_code != 200:
             rprint(
@@ -547,6 +870,8 @@ def backup_full(dest_dir, batch_size, resume):
 
         data = res.json()
         all_metadata.extend(data["results"])
+        # Next links already carry the query parameters
+        params = {}
         url = data.get("next")
         if url and not url.startswith("http"):
             # Convert relative URL to absolute
@@ -554,140 +879,146 @@ def backup_full(dest_dir, batch_size, resume):
 
     rprint(f"[cyan]Found {len(all_metadata)} total attachments[/cyan]")
 
-    # Determine which files need to be downloaded
+    # The incremental cursor only moves past failed attachments once they are saved
+    listed = {meta["id"] for meta in all_metadata}
+    retried = [
+        {**entry, "attachment_hash": entry.get("hash")}
+        for entry in failed.values()
+        if entry["id"] not in listed
+    ]
+    if retried:
+        rprint(f"[dim]Retrying {len(retried)} attachments not saved previously[/dim]")
+        all_metadata.extend(retried)
+
+    # Determine which files need to be downloaded, and which can be reused
+    metadata_by_id = {meta["id"]: meta for meta in all_metadata}
     to_download = []
+    to_link = []
+    scheduled_hashes = set()
     for meta in all_metadata:
-        revision_id = meta["id"]
         file_hash = meta["attachment_hash"]
 
-        # Skip if already downloaded with matching hash AND file exists on disk
-        if revision_id in existing_manifest:
-            manifest_entry = existing_manifest[revision_id]
-            if manifest_entry.get("hash") == file_hash:
-                # Verify file actually exists on disk
-                evidence_id = meta["evidence_id"]
-                version = meta["version"]
-                filename = meta["filename"]
-                file_path = attachments_dir / f"{evidence_id}_v{version}_{filename}"
-
-                if file_path.exists():
-                    continue
+        # Skip if already downloaded with matching hash (the file exists on disk)
+        manifest_entry = existing_manifest.get(meta["id"])
+        if manifest_entry and manifest_entry.get("hash") == file_hash:
+            continue
 
+        if file_hash and (file_hash in known_files or file_hash in scheduled_hashes):
+            to_link.append(meta)
+            continue
+        if file_hash:
+            scheduled_hashes.add(file_hash)
         to_download.append(meta)
 
+    if not resume and not incremental:
+        manifest_file.unlink(missing_ok=True)
+
+    def add_to_manifest(meta, size, manifest_out, downloaded=True):
+        entry = {
+            "id": meta["id"],
+            "evidence_id": meta["evidence_id"],
+            "version": meta["version"],
+            "filename": meta["filename"],
+            "hash": meta.get("attachment_hash") or meta.get("hash"),
+            "size": size,
+            "created_at": metadata_by_id.get(meta["id"], {}).get("created_at"),
+            "downloaded": downloaded,
+            "timestamp": datetime.now().isoformat(),
+        }
+        if downloaded:
+            existing_manifest[meta["id"]] = entry
+            failed.pop(meta["id"], None)
+        else:
+            failed[meta["id"]] = entry
+        # Written as we go so that an interrupted backup can be resumed
+        manifest_out.write(json.dumps(entry) + "\n")
+        manifest_out.flush()
+
     total_downloaded = 0
     total_bytes = 0
+    total_linked = 0
 
-    if not to_download:
-        rprint("[green]✓ All attachments already downloaded[/green]")
-    else:
-        rprint(
-            f"[cyan]Downloading {len(to_download)} attachments in batches of {batch_size}...[/cyan]"
-        )
-
-        # Download in batches
-        for i in range(0, len(to_download), batch_size):
-            batch = to_download[i : i + batch_size]
-            batch_ids = [meta["id"] for meta in batch]
-
+    with open(manifest_file, "a") as manifest_out:
+        if not to_download:
+            rprint("[green]✓ All attachments already downloaded[/green]")
+        else:
+            batches = [
+                [meta["id"] for meta in to_download[i : i + batch_size]]
+                for i in range(0, len(to_download), batch_size)
+            ]
             rprint(
-                f"[dim]Downloading batch {i // batch_size + 1}/{(len(to_download) + batch_size - 1) // batch_size}...[/dim]"
+                f"[cyan]Downloading {len(to_download)} attachments in {len(batches)} batches of {batch_size} ({concurrency} in parallel)...[/cyan]"
             )
 
-            # Request batch download
-            url = f"{API_URL}/serdes/batch-download-attachments/"
-            res = requests.post(
-                url,
-                headers=headers,
-                json={"revision_ids": batch_ids},
-                verify=VERIFY_CERTIFICATE,
-                stream=True,
+            results = run_concurrently(
+                lambda batch_ids: _download_attachment_batch(
+                    batch_ids, headers, attachments_dir
+                ),
+                batches,
+                concurrency,
             )
+            for n, (batch_ids, (saved, error)) in enumerate(
+                zip(batches, results), start=1
+            ):
+                if error:
+                    rprint(
+                        f"[bold red]Error downloading batch {n}: {error}[/bold red]",
+                        file=sys.stderr,
+                    )
+                for header in saved:
+                    add_to_manifest(header, header["size"], manifest_out)
+                    if header.get("hash"):
+                        known_files.setdefault(
+                            header["hash"], _attachment_path(attachments_dir, header)
+                        )
+                    total_downloaded += 1
+                    total_bytes += header["size"]
+                saved_ids = {header["id"] for header in saved}
+                for revision_id in batch_ids:
+                    if revision_id not in saved_ids:
+                        add_to_manifest(
+                            metadata_by_id[revision_id],
+                            None,
+                            manifest_out,
+                            downloaded=False,
+                        )
 
-            if res.status_code != 200:
                 rprint(
-                    f"[bold red]Error downloading batch: {res.status_code}[/bold red]",
-                    file=sys.stderr,
+                    f"[green]✓ Batch {n}/{len(batches)} completed ({total_downloaded} files, {total_bytes / 1024 / 1024:.1f} MB)[/green]"
                 )
-                rprint(res.text, file=sys.stderr)
-                continue
-
-            # Parse streaming response
-            buffer = b""
-            for chunk in res.iter_content(chunk_size=10240 * 1024):  # NOTE: 10MB chunks
-                buffer += chunk
-
-                while len(buffer) >= 4:
-                    # Read 4-byte length prefix
-                    total_size = struct.unpack(">I", buffer[:4])[0]
-
-                    if len(buffer) < 4 + total_size:
-                        # Not enough data yet
-                        break
-
-                    # Extract block
-                    block_data = buffer[4 : 4 + total_size]
-                    buffer = buffer[4 + total_size :]
-
-                    # Parse JSON header (try up to 1KB)
-                    header = None
-                    header_end = 0
-                    for j in range(1, min(1024, len(block_data))):
-                        try:
-                            header = json.loads(block_data[:j].decode("utf-8"))
-                            header_end = j
-                            break
-                        except (json.JSONDecodeError, UnicodeDecodeError):
-                            continue
-
-                    if not header:
-                        rprint(
-                            "[yellow]Warning: Could not parse header in block[/yellow]"
-                        )
-                        continue
-
-                    file_bytes = block_data[header_end:]
-
-                    # Save file
-                    evidence_id = header["evidence_id"]
-                    version = header["version"]
-                    filename = header["filename"]
-                    file_hash = header["hash"]
-
-                    file_path = attachments_dir / f"{evidence_id}_v{version}_{filename}"
-                    with open(file_path, "wb") as f:
-                        f.write(file_bytes)
-
-                    total_downloaded += 1
-                    total_bytes += len(file_bytes)
-
-                    # Add to manifest
-                    manifest_entry = {
-                        "id": header["id"],
-                        "evidence_id": evidence_id,
-                        "version": version,
-                        "filename": filename,
-                        "hash": file_hash,
-                        "size": len(file_bytes),
-                        "downloaded": True,
-                        "timestamp": datetime.now().isoformat(),
-                    }
-
-                    existing_manifest[header["id"]] = manifest_entry
 
             rprint(
-                f"[green]✓ Batch {i // batch_size + 1} completed ({total_downloaded} files, {total_bytes / 1024 / 1024:.1f} MB)[/green]"
+                f"[bold green]✓ Downloaded {total_downloaded} attachments ({total_bytes / 1024 / 1024:.1f} MB total)[/bold green]"
             )
 
+        # Identical files are copied from disk instead of being downloaded again
+        for meta in to_link:
+            source = known_files.get(meta["attachment_hash"])
+            if source is None or not source.exists():
+                rprint(
+                    f"[yellow]Warning: No local copy of {meta['filename']}, it will be downloaded on the next run[/yellow]"
+                )
+                add_to_manifest(meta, None, manifest_out, downloaded=False)
+                continue
+            target = _attachment_path(attachments_dir, meta)
+            if source != target:
+                _link_attachment(source, target)
+            add_to_manifest(meta, target.stat().st_size, manifest_out)
+            total_linked += 1
+
+    if total_linked:
+        rprint(f"[green]✓ Reused {total_linked} attachments already on disk[/green]")
+
+    if failed:
         rprint(
-            f"[bold green]✓ Downloaded {total_downloaded} attachments ({total_bytes / 1024 / 1024:.1f} MB total)[/bold green]"
+            f"[yellow]Warning: {len(failed)} attachments could not be saved, they will be retried on the next run[/yellow]"
         )
 
     # Rebuild manifest removing duplicates and missing files
-    if existing_manifest or total_downloaded > 0:
+    if existing_manifest or failed:
         rprint("[dim]Cleaning up manifest...[/dim]")
         with open(manifest_file, "w") as f:
-            for entry in existing_manifest.values():
+            for entry in [*existing_manifest.values(), *failed.values()]:
                 f.write(json.dumps(entry) + "\n")
     rprint("[bold green]Full backup completed successfully![/bold green]")
     rprint(f"[dim]Location: {dest_path}[/dim]")
@@ -839,7 +1170,7 @@ def restore_full(src_dir, verify_hashes):
         rprint("[dim]Sending restore request (database only)...[/dim]")
 
     try:
-        res = requests.post(
+        res = SESSION.post(
             url,
             headers=headers,
             files=files,
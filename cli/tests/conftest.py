@@ -21,7 +21,10 @@ def auth_headers(mock_token):
 @pytest.fixture
 def mock_requests_success():
     """Authentication headers for testing"""
-    with patch("requests.get") as mock_get, patch("requests.post") as mock_post:
+    with (
+        patch("clica.SESSION.get") as mock_get,
+        patch("clica.SESSION.post") as mock_post,
+    ):
         # Mock successful GET response
         mock_get_response = MagicMock()
         mock_get_response.status_code = 200
@@ -40,7 +43,10 @@ def mock_requests_success():
 @pytest.fixture
 def mock_requests_auth_failure():
     """Mock requests with authentication failure"""
-    with patch("requests.get") as mock_get, patch("requests.post") as mock_post:
+    with (
+        patch("clica.SESSION.get") as mock_get,
+        patch("clica.SESSION.post") as mock_post,
+    ):
         # Mock authentication failure
         mock_response = MagicMock()
         mock_response.status_code = 401
@@ -374,3 +380,11 @@ def reset_global_variables():
 
     # Restaurer les valeurs
     clica.GLOBAL_FOLDER_ID = original_global_folder_id
+
+
+@pytest.fixture(autouse=True)
+def clear_ids_cache(monkeypatch):
+    """Keep ids_map lookups independent between tests"""
+    import clica
+
+    monkeypatch.setattr(clica, "_ids_cache", {})
@@ -1,5 +1,7 @@
 import pytest
+import hashlib
 import json
+import struct
 import tempfile
 import os
 from pathlib import Path
@@ -24,6 +26,7 @@ from clica import (
     import_controls,
     import_evidences,
     upload_attachment,
+    backup_full,
     ids_map,
     batch_create,
     get_unique_parsed_values,
@@ -44,7 +47,7 @@ class TestAuthentication:
         Assertions: status_code == 200
         """
         with patch("clica.TOKEN", mock_token):
-            with patch("requests.get") as mock_get:
+            with patch("clica.SESSION.get") as mock_get:
                 mock_response = MagicMock()
                 mock_response.status_code = 200
                 mock_response.json.return_value = {"folders": {"test": 1}}
@@ -103,7 +106,7 @@ class TestAuthentication:
         for api_url, model, expected_url in test_cases:
             with patch("clica.API_URL", api_url):
                 with patch("clica.TOKEN", mock_token):
-                    with patch("requests.get") as mock_get:
+                    with patch("clica.SESSION.get") as mock_get:
                         mock_response = MagicMock()
                         mock_response.status_code = 200
                         mock_response.json.return_value = {"test": "data"}
@@ -126,7 +129,7 @@ class TestAuthentication:
         Assertions: "check authentication" in output
         """
         with patch("clica.TOKEN", mock_token):
-            with patch("requests.get") as mock_get:
+            with patch("clica.SESSION.get") as mock_get:
                 mock_response = MagicMock()
                 mock_response.status_code = 401
                 mock_get.return_value = mock_response
@@ -146,7 +149,7 @@ class TestAuthentication:
         Assertions: "check authentication" in output
         """
         with patch("clica.TOKEN", mock_token):
-            with patch("requests.get") as mock_get:
+            with patch("clica.SESSION.get") as mock_get:
                 mock_response = MagicMock()
                 mock_response.status_code = 403
                 mock_get.return_value = mock_response
@@ -172,8 +175,8 @@ class TestAuthentication:
 
         for verify_value, expected in test_cases:
             with patch("clica.VERIFY_CERTIFICATE", verify_value):
-                with patch("clica.TOKEN", mock_token):
-                    with patch("requests.get") as mock_get:
+                with patch("clica.TOKEN", mock_token), patch("clica._ids_cache", {}):
+                    with patch("clica.SESSION.get") as mock_get:
                         mock_response = MagicMock()
                         mock_response.status_code = 200
                         mock_response.json.return_value = {}
@@ -199,7 +202,7 @@ class TestAuthentication:
         }
 
         with patch("clica.TOKEN", mock_token):
-            with patch("requests.get") as mock_get:
+            with patch("clica.SESSION.get") as mock_get:
                 mock_response = MagicMock()
                 mock_response.status_code = 200
                 mock_response.json.return_value = mock_folders_response
@@ -247,7 +250,7 @@ class TestQueryCommands:
         }
 
         with patch("clica.TOKEN", mock_token):
-            with patch("requests.get") as mock_get:
+            with patch("clica.SESSION.get") as mock_get:
                 mock_response = MagicMock()
                 mock_response.status_code = 200
                 mock_response.json.return_value = {
@@ -282,7 +285,7 @@ class TestQueryCommands:
         }
 
         with patch("clica.TOKEN", mock_token):
-            with patch("requests.get") as mock_get:
+            with patch("clica.SESSION.get") as mock_get:
                 mock_response = MagicMock()
                 mock_response.status_code = 200
                 mock_response.json.return_value = mock_perimeters_data
@@ -332,7 +335,7 @@ class TestQueryCommands:
         Assertions: Command succeeds but returns empty data
         """
         with patch("clica.TOKEN", mock_token):
-            with patch("requests.get") as mock_get:
+            with patch("clica.SESSION.get") as mock_get:
                 mock_response = MagicMock()
                 mock_response.status_code = 200
                 mock_response.json.return_value = {}
@@ -353,7 +356,7 @@ class TestQueryCommands:
         Assertions: Command succeeds but returns empty data
         """
         with patch("clica.TOKEN", mock_token):
-            with patch("requests.get") as mock_get:
+            with patch("clica.SESSION.get") as mock_get:
                 mock_response = MagicMock()
                 mock_response.status_code = 200
                 mock_response.json.return_value = {}
@@ -393,7 +396,7 @@ class TestQueryCommands:
 
         for command in commands_to_test:
             with patch("clica.TOKEN", mock_token):
-                with patch("requests.get") as mock_get:
+                with patch("clica.SESSION.get") as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 401
                     mock_get.return_value = mock_response
@@ -416,7 +419,7 @@ class TestQueryCommands:
 
         for command in commands_to_test:
             with patch("clica.TOKEN", mock_token):
-                with patch("requests.get") as mock_get:
+                with patch("clica.SESSION.get") as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 403
                     mock_get.return_value = mock_response
@@ -438,7 +441,7 @@ class TestQueryCommands:
 
         for command in commands_to_test:
             with patch("clica.TOKEN", mock_token):
-                with patch("requests.get") as mock_get:
+                with patch("clica.SESSION.get") as mock_get:
                     mock_response = MagicMock()
                     mock_response.status_code = 500
                     mock_get.return_value = mock_response
@@ -476,7 +479,7 @@ class TestQueryCommands:
         mock_data = {"folders": {"Global": 1, "Test": 2}}
 
         with patch("clica.TOKEN", mock_token):
-            with patch("requests.get") as mock_get:
+            with patch("clica.SESSION.get") as mock_get:
                 mock_response = MagicMock()
                 mock_response.status_code = 200
                 mock_response.json.return_value = mock_data
@@ -504,7 +507,7 @@ class TestQueryCommands:
         mock_data = {"Global": {"Orion": 1}, "Project1": {"Alpha": 2}}
 
         with patch("clica.TOKEN", mock_token):
-            with patch("requests.get") as mock_get:
+            with patch("clica.SESSION.get") as mock_get:
                 mock_response = MagicMock()
                 mock_response.status_code = 200
                 mock_response.json.return_value = mock_data
@@ -549,7 +552,7 @@ class TestQueryCommands:
 class TestUtilityFunctions:
     """Test utility functions used across the CLI"""
 
-    @patch("clica.requests.get")
+    @patch("clica.SESSION.get")
     @patch("clica.TOKEN", "test-token-12345")
     def test_ids_map_success(self, mock_get):
         """Test ids_map with successful API response"""
@@ -576,7 +579,7 @@ class TestUtilityFunctions:
             verify=VERIFY_CERTIFICATE,
         )
 
-    @patch("clica.requests.get")
+    @patch("clica.SESSION.get")
     @patch("clica.TOKEN", "test-token-12345")
     def test_ids_map_with_folder_filter(self, mock_get):
         """Test ids_map with folder filter"""
@@ -600,7 +603,7 @@ class TestUtilityFunctions:
             verify=VERIFY_CERTIFICATE,
         )
 
-    @patch("clica.requests.get")
+    @patch("clica.SESSION.get")
     @patch("clica.TOKEN", "invalid-token")
     def test_ids_map_auth_failure(self, mock_get):
         """Test ids_map handles authentication failure"""
@@ -664,7 +667,7 @@ class TestUtilityFunctions:
         expected_result = {"value1", "value2", "value3", "value4", "value5"}
         assert result == expected_result
 
-    @patch("clica.requests.post")
+    @patch("clica.SESSION.post")
     @patch("clica.TOKEN", "test-token-12345")
     def test_batch_create_success(self, mock_post):
         """Test successful batch creation of objects"""
@@ -693,7 +696,7 @@ class TestUtilityFunctions:
                 "Authorization": "Token test-token-12345"
             }
 
-    @patch("clica.requests.post")
+    @patch("clica.SESSION.post")
     @patch("clica.TOKEN", "test-token-12345")
     def test_batch_create_partial_failure(self, mock_post):
         """Test batch_create when some creations fail"""
@@ -715,7 +718,7 @@ class TestUtilityFunctions:
         expected_result = {"asset1": 1, "asset3": 3}
         assert result == expected_result
 
-    @patch("clica.requests.post")
+    @patch("clica.SESSION.post")
     @patch("clica.TOKEN", "test-token-12345")
     def test_batch_create_empty_items(self, mock_post):
         """Test batch_create with empty items list"""
@@ -724,6 +727,38 @@ class TestUtilityFunctions:
         assert result == {}
         mock_post.assert_not_called()
 
+    @patch("clica.SESSION.post")
+    @patch("clica.TOKEN", "test-token-12345")
+    def test_batch_create_concurrent(self, mock_post):
+        """Test batch_create with several rows in flight"""
+        mock_post.side_effect = lambda url, json, headers: MagicMock(
+            status_code=201, json=lambda: {"id": json["name"].upper()}
+        )
+
+        items = [f"asset{i}" for i in range(20)]
+        result = batch_create("assets", items, 10, concurrency=4)
+
+        assert result == {item: item.upper() for item in items}
+        assert mock_post.call_count == 20
+
+    @patch("clica.SESSION.get")
+    @patch("clica.TOKEN", "test-token-12345")
+    def test_ids_map_caches_within_the_run(self, mock_get):
+        """Test ids_map reuses the cached map until objects are created"""
+        import clica
+
+        mock_get.return_value = MagicMock(
+            status_code=200, json=lambda: {"Global": {"asset1": 1}}
+        )
+
+        assert ids_map("assets", folder="Global") == {"asset1": 1}
+        assert ids_map("assets", folder="Global") == {"asset1": 1}
+        assert mock_get.call_count == 1
+
+        clica._update_ids_cache("assets")
+        ids_map("assets")
+        assert mock_get.call_count == 2
+
 
 class TestImportRiskAssessment:
     @pytest.fixture
@@ -782,8 +817,8 @@ class TestImportRiskAssessment:
         try:
             with (
                 patch("clica.TOKEN", "test-token"),
-                patch("clica.requests.get") as mock_get,
-                patch("clica.requests.post") as mock_post,
+                patch("clica.SESSION.get") as mock_get,
+                patch("clica.SESSION.post") as mock_post,
                 patch("clica.ids_map") as mock_ids_map,
                 patch("clica.batch_create") as mock_batch_create,
             ):
@@ -907,8 +942,8 @@ R.1;Test Risk"""
         try:
             with (
                 patch("clica.TOKEN", "test-token"),
-                patch("clica.requests.get") as mock_get,
-                patch("clica.requests.post") as mock_post,
+                patch("clica.SESSION.get") as mock_get,
+                patch("clica.SESSION.post") as mock_post,
                 patch("clica.ids_map") as mock_ids_map,
                 patch("builtins.print") as mock_print,
             ):
@@ -1036,7 +1071,7 @@ R.1;Test Risk"""
         try:
             with (
                 patch("clica.TOKEN", "test-token"),
-                patch("clica.requests.post") as mock_post,
+                patch("clica.SESSION.post") as mock_post,
                 patch("clica.ids_map") as mock_ids_map,
                 patch("builtins.print") as mock_print,
             ):
@@ -1073,7 +1108,7 @@ R.1;Test Risk"""
 class TestImportAssets:
     """Tests for import_assets command"""
 
-    @patch("clica.requests.post")
+    @patch("clica.SESSION.post")
     @patch("clica._get_folders")
     @patch("pandas.read_csv")
     @patch("click.confirm")
@@ -1161,7 +1196,7 @@ class TestImportAssets:
 
         try:
             # Execute
-            with patch("clica.requests.post") as mock_post:
+            with patch("clica.SESSION.post") as mock_post:
                 result = runner.invoke(import_assets, ["--file", temp_file])
 
                 # Assertions
@@ -1190,7 +1225,7 @@ class TestImportAssets:
         assert result.exit_code != 0
         assert isinstance(result.exception, FileNotFoundError)
 
-    @patch("clica.requests.post")
+    @patch("clica.SESSION.post")
     @patch("clica._get_folders")
     @patch("pandas.read_csv")
     @patch("click.confirm")
@@ -1232,7 +1267,7 @@ class TestImportAssets:
         finally:
             os.unlink(temp_file)
 
-    @patch("clica.requests.post")
+    @patch("clica.SESSION.post")
     @patch("clica._get_folders")
     @patch("pandas.read_csv")
     @patch("click.confirm")
@@ -1319,7 +1354,7 @@ class TestImportEvidences:
             with patch("clica._get_folders", return_value=(1, [])):
                 with patch("pandas.read_csv", return_value=sample_evidences_csv):
                     with patch("click.confirm", return_value=True):
-                        with patch("requests.post") as mock_post:
+                        with patch("clica.SESSION.post") as mock_post:
                             # Mock successful creation responses
                             mock_response = MagicMock()
                             mock_response.status_code = 201
@@ -1361,7 +1396,7 @@ class TestImportEvidences:
             with patch("clica._get_folders", return_value=(1, [])):
                 with patch("pandas.read_csv", return_value=sample_evidences_csv):
                     with patch("click.confirm", return_value=False):
-                        with patch("requests.post") as mock_post:
+                        with patch("clica.SESSION.post") as mock_post:
                             runner = CliRunner()
                             result = runner.invoke(
                                 import_evidences, ["--file", "test.csv"]
@@ -1382,7 +1417,7 @@ class TestImportEvidences:
             with patch("clica._get_folders", return_value=(1, [])):
                 with patch("pandas.read_csv", return_value=sample_evidences_csv):
                     with patch("click.confirm", return_value=True):
-                        with patch("requests.post") as mock_post:
+                        with patch("clica.SESSION.post") as mock_post:
                             # Mock API error response
                             mock_response = MagicMock()
                             mock_response.status_code = 400
@@ -1448,7 +1483,7 @@ class TestImportEvidences:
             with patch("clica._get_folders", return_value=(1, [])):
                 with patch("pandas.read_csv", return_value=sample_evidences_csv):
                     with patch("click.confirm", return_value=True):
-                        with patch("requests.post") as mock_post:
+                        with patch("clica.SESSION.post") as mock_post:
                             # Alternate between success and failure responses
                             responses = []
                             for i in range(len(sample_evidences_csv)):
@@ -1494,8 +1529,8 @@ class TestUploadAttachment:
         evidence_name = "Test Evidence"
 
         with patch("clica.TOKEN", mock_token):
-            with patch("requests.get") as mock_get:
-                with patch("requests.post") as mock_post:
+            with patch("clica.SESSION.get") as mock_get:
+                with patch("clica.SESSION.post") as mock_post:
                     # Mock evidence search response
                     mock_get_response = MagicMock()
                     mock_get_response.status_code = 200
@@ -1557,8 +1592,8 @@ class TestUploadAttachment:
         evidence_name = "Duplicate Evidence"
 
         with patch("clica.TOKEN", mock_token):
-            with patch("requests.get") as mock_get:
-                with patch("requests.post") as mock_post:
+            with patch("clica.SESSION.get") as mock_get:
+                with patch("clica.SESSION.post") as mock_post:
                     # Mock evidence search response - multiple results
                     mock_get_response = MagicMock()
                     mock_get_response.status_code = 200
@@ -1591,3 +1626,170 @@ class TestUploadAttachment:
                     assert upload_call[0][0] == f"{API_URL}/evidences/456/upload/"
 
                     assert result.exit_code == 0
+
+
+class TestBackupFull:
+    @staticmethod
+    def _block(revision_id, content, wide=False):
+        header = {
+            "id": revision_id,
+            "evidence_id": f"ev-{revision_id}",
+            "version": 1,
+            "filename": "report.pdf",
+            "hash": hashlib.sha256(content).hexdigest(),
+        }
+        header_bytes = json.dumps(header).encode()
+        if wide:
+            return (
+                struct.pack(">IQ", len(header_bytes), len(content))
+                + header_bytes
+                + content
+            )
+        return (
+            struct.pack(">I", len(header_bytes) + len(content)) + header_bytes + content
+        )
+
+    @staticmethod
+    def _metadata(revision_id, content, created_at="2025-01-01T00:00:00"):
+        return {
+            "id": revision_id,
+            "evidence_id": f"ev-{revision_id}",
+            "version": 1,
+            "filename": "report.pdf",
+            "attachment_hash": hashlib.sha256(content).hexdigest(),
+            "created_at": created_at,
+        }
+
+    def _run(
+        self,
+        mock_token,
+        dest_dir,
+        metadata,
+        blocks,
+        extra_args=(),
+        stream_format=None,
+        failing=(),
+    ):
+        def get(url, **kwargs):
+            response = MagicMock(status_code=200)
+            response.iter_content.return_value = [b"dump"]
+            response.json.return_value = {"results": metadata, "next": None}
+            return response
+
+        def post(url, json, **kwargs):
+            if set(json["revision_ids"]) & set(failing):
+                return MagicMock(status_code=500, text="error")
+            data = b"".join(blocks[revision_id] for revision_id in json["revision_ids"])
+            response = MagicMock(status_code=200)
+            response.headers = {"X-Attachment-Format": stream_format or "stream"}
+            # Split the stream so that blocks straddle chunk boundaries
+            response.iter_content.return_value = [
+                data[i : i + 7] for i in range(0, len(data), 7)
+            ]
+            return response
+
+        with patch("clica.TOKEN", mock_token):
+            with patch("clica.SESSION.get", side_effect=get) as mock_get:
+                with patch("clica.SESSION.post", side_effect=post) as mock_post:
+                    result = CliRunner().invoke(
+                        backup_full,
+                        ["--dest-dir", str(dest_dir), "--batch-size", "1"]
+                        + list(extra_args),
+                    )
+        assert result.exit_code == 0, result.output
+        return mock_get, mock_post
+
+    def test_backup_full_downloads_and_deduplicates(self, mock_token, tmp_path):
+        """Test attachments are streamed to disk and identical files fetched once"""
+        content = b"%PDF same content"
+        other = b"%PDF other content"
+        metadata = [
+            self._metadata("r1", content),
+            self._metadata("r2", content),
+            self._metadata("r3", other),
+        ]
+        blocks = {
+            m["id"]: self._block(m["id"], c)
+            for m, c in zip(metadata, [content, content, other])
+        }
+
+        _, mock_post = self._run(
+            mock_token, tmp_path, metadata, blocks, ["--concurrency", "2"]
+        )
+
+        attachments = tmp_path / "attachments" / "evidence-revisions"
+        assert (tmp_path / "backup.json.gz").read_bytes() == b"dump"
+        assert (attachments / "ev-r1_v1_report.pdf").read_bytes() == content
+        assert (attachments / "ev-r2_v1_report.pdf").read_bytes() == content
+        assert (attachments / "ev-r3_v1_report.pdf").read_bytes() == other
+        downloaded = [
+            revision_id
+            for call in mock_post.call_args_list
+            for revision_id in call.kwargs["json"]["revision_ids"]
+        ]
+        assert sorted(downloaded) == ["r1", "r3"]
+        manifest = (tmp_path / "backup-manifest.jsonl").read_text().splitlines()
+        assert len(manifest) == 3
+
+    def test_backup_full_incremental(self, mock_token, tmp_path):
+        """Test incremental backups only list revisions created since the last one"""
+        content = b"%PDF content"
+        metadata = [self._metadata("r1", content, "2025-02-01T00:00:00")]
+        blocks = {"r1": self._block("r1", content)}
+        self._run(mock_token, tmp_path, metadata, blocks)
+
+        mock_get, mock_post = self._run(
+            mock_token, tmp_path, metadata, blocks, ["--incremental"]
+        )
+
+        listing = mock_get.call_args_list[-1]
+        assert listing.kwargs["params"] == {"created_after": "2025-02-01T00:00:00"}
+        mock_post.assert_not_called()
+
+    def test_backup_full_incremental_retries_failed_batches(self, mock_token, tmp_path):
+        """Test revisions of a failed batch are retried once later ones are saved"""
+        contents = {f"r{i}": f"%PDF content {i}".encode() for i in range(1, 4)}
+        metadata = [
+            self._metadata(revision_id, content, f"2025-02-0{i}T00:00:00")
+            for i, (revision_id, content) in enumerate(contents.items(), start=1)
+        ]
+        blocks = {
+            revision_id: self._block(revision_id, content)
+            for revision_id, content in contents.items()
+        }
+        self._run(mock_token, tmp_path, metadata, blocks, failing=["r2"])
+
+        # The server only lists the revisions created after the cursor (r3)
+        mock_get, mock_post = self._run(
+            mock_token, tmp_path, [], blocks, ["--incremental"]
+        )
+
+        listing = mock_get.call_args_list[-1]
+        assert listing.kwargs["params"] == {"created_after": "2025-02-03T00:00:00"}
+        assert mock_post.call_args.kwargs["json"]["revision_ids"] == ["r2"]
+        attachment = (
+            tmp_path / "attachments" / "evidence-revisions" / "ev-r2_v1_report.pdf"
+        )
+        assert attachment.read_bytes() == contents["r2"]
+        manifest = [
+            json.loads(line)
+            for line in (tmp_path / "backup-manifest.jsonl").read_text().splitlines()
+        ]
+        assert sorted(entry["id"] for entry in manifest) == ["r1", "r2", "r3"]
+        assert all(entry["downloaded"] for entry in manifest)
+
+    def test_backup_full_stream64(self, mock_token, tmp_path):
+        """Test 64-bit framed blocks are used when the server supports them"""
+        content = b"%PDF content" * 1000
+        metadata = [self._metadata("r1", content)]
+        blocks = {"r1": self._block("r1", content, wide=True)}
+
+        _, mock_post = self._run(
+            mock_token, tmp_path, metadata, blocks, stream_format="stream64"
+        )
+
+        assert mock_post.call_args.kwargs["json"]["format"] == "stream64"
+        attachment = (
+            tmp_path / "attachments" / "evidence-revisions" / "ev-r1_v1_report.pdf"
+        )
+        assert attachment.read_bytes() == content
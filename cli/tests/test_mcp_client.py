@@ -0,0 +1,153 @@
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from ca_mcp import client, resolvers
+
+ASSET_ID = "0b6d3b5e-8f0a-4f4e-9b8e-2f7b8c1d2e3f"
+
+
+def response(data, status_code=200):
+    res = MagicMock(status_code=status_code, text=str(data))
+    res.json.return_value = data
+    return res
+
+
+@pytest.fixture(autouse=True)
+def resolver_cache(monkeypatch):
+    monkeypatch.setattr(client, "_resolver_cache", {})
+    monkeypatch.setattr(client, "RESOLVER_CACHE_TTL", 300)
+    monkeypatch.setattr(client, "RESOLVER_NEGATIVE_CACHE_TTL", 30)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(client.time, "monotonic", lambda: now[0])
+    return now
+
+
+class TestResolverCache:
+    def test_lookups_are_served_from_the_cache(self):
+        data = {"results": [{"id": ASSET_ID, "name": "Server"}]}
+        with patch("ca_mcp.client.SESSION.get", return_value=response(data)) as get:
+            first = client.cached_get_request("/assets/", params={"name": "Server"})
+            second = client.cached_get_request("/assets/", params={"name": "Server"})
+
+        assert get.call_count == 1
+        assert first.json() == second.json() == data
+        assert resolvers.resolve_asset_id("Server") == ASSET_ID
+
+    def test_errors_are_not_cached(self):
+        with patch(
+            "ca_mcp.client.SESSION.get", return_value=response({}, status_code=500)
+        ) as get:
+            client.cached_get_request("/assets/", params={"name": "Server"})
+            client.cached_get_request("/assets/", params={"name": "Server"})
+
+        assert get.call_count == 2
+
+    def test_not_found_names_expire_sooner(self, clock):
+        found = {"results": [{"id": ASSET_ID, "name": "Server"}]}
+
+        def get(url, params=None, **kwargs):
+            return response(found if params["name"] == "Server" else {"results": []})
+
+        with patch("ca_mcp.client.SESSION.get", side_effect=get) as mock_get:
+            client.cached_get_request("/assets/", params={"name": "Server"})
+            client.cached_get_request("/assets/", params={"name": "Missing"})
+            clock[0] += 29
+            client.cached_get_request("/assets/", params={"name": "Missing"})
+            assert mock_get.call_count == 2
+
+            clock[0] += 2
+            client.cached_get_request("/assets/", params={"name": "Server"})
+            client.cached_get_request("/assets/", params={"name": "Missing"})
+
+        assert mock_get.call_count == 3
+        assert mock_get.call_args.kwargs["params"] == {"name": "Missing"}
+
+    @pytest.mark.parametrize(
+        "write",
+        [
+            lambda: client.make_post_request("/assets/", {"name": "Server"}),
+            lambda: client.make_patch_request(f"/assets/{ASSET_ID}/", {"name": "New"}),
+        ],
+        ids=["create", "update"],
+    )
+    def test_writes_invalidate_the_lookups_of_their_collection(self, write):
+        with patch(
+            "ca_mcp.client.SESSION.get", return_value=response({"results": []})
+        ) as get:
+            client.cached_get_request("/assets/", params={"name": "Server"})
+            client.cached_get_request("/threats/", params={"name": "Server"})
+            with (
+                patch("ca_mcp.client.SESSION.post"),
+                patch("ca_mcp.client.SESSION.patch"),
+            ):
+                write()
+            client.cached_get_request("/assets/", params={"name": "Server"})
+            client.cached_get_request("/threats/", params={"name": "Server"})
+
+        assert [call.args[0].split("/")[-2] for call in get.call_args_list] == [
+            "assets",
+            "threats",
+            "assets",
+        ]
+
+
+class TestFetchAllResults:
+    def test_pages_fetched_concurrently_keep_their_order(self):
+        count, limit = 7, 2
+
+        def get(url, params=None, **kwargs):
+            offset = int((params or {}).get("offset", 0))
+            # Later pages answer first
+            time.sleep((count - offset) * 0.01)
+            return response(
+                {
+                    "count": count,
+                    "next": (
+                        f"http://testserver/api/assets/?limit={limit}&offset={offset + limit}"
+                        if offset + limit < count
+                        else None
+                    ),
+                    "results": [{"id": i} for i in range(offset, offset + limit)][
+                        : count - offset
+                    ],
+                }
+            )
+
+        with patch("ca_mcp.client.SESSION.get", side_effect=get) as mock_get:
+            results, error = client.fetch_all_results("/assets/", concurrency=4)
+
+        assert error is None
+        assert [result["id"] for result in results] == list(range(count))
+        assert mock_get.call_count == 4
+
+
+class TestPrefetchNames:
+    def test_names_are_looked_up_with_filtered_requests(self):
+        lock = threading.Lock()
+        requested = []
+
+        def get(url, params=None, **kwargs):
+            with lock:
+                requested.append(params)
+            return response(
+                {"results": [{"id": f"id-{params['name']}", "name": params["name"]}]}
+            )
+
+        with patch("ca_mcp.client.SESSION.get", side_effect=get):
+            ids = resolvers.resolve_asset_ids(["Server", ASSET_ID, "Laptop"], "folder")
+
+        assert ids == ["id-Server", ASSET_ID, "id-Laptop"]
+        assert sorted(requested, key=lambda params: params["name"]) == [
+            {"name": "Laptop", "folder": "folder"},
+            {"name": "Server", "folder": "folder"},
+        ]
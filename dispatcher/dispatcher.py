@@ -1,13 +1,14 @@
 import sys
+import time
 
 import click
 import requests
 import json
 import yaml
-from kafka import KafkaConsumer, KafkaProducer
+from kafka import KafkaConsumer, KafkaProducer, OffsetAndMetadata, TopicPartition
 from kafka.errors import NoBrokersAvailable, UnsupportedCodecError
 
-from messages import message_registry
+from messages import message_registry, update_objects_batch
 import settings
 from settings import init_config
 
@@ -16,6 +17,7 @@ import utils.api as api
 from loguru import logger
 
 from utils.kafka import build_kafka_config
+from utils.metrics import ConsumerMetrics
 
 
 log_message_format = (
@@ -77,6 +79,149 @@ def auth(email: str, password: str):
     return _auth(email, password)
 
 
+def _decode_record(record) -> dict | None:
+    """Decode a Kafka record, None if it cannot be processed."""
+    logger.trace("Consumed record.", key=record.key, value=record.value)
+    try:
+        message = json.loads(record.value.decode("utf-8"))
+    except Exception as e:
+        logger.error(f"Error decoding message: {e}")
+        return None
+
+    if message.get("message_type") not in message_registry.REGISTRY:
+        logger.error(
+            "Message type not supported. Skipping. Check the message registry for supported events.",
+            message_type=message.get("message_type"),
+            supported_message_types=list(message_registry.REGISTRY.keys()),
+        )
+        return None
+    return message
+
+
+def _run_messages(messages: list[dict]) -> list[Exception | None]:
+    """
+    Run the handlers of the messages and return the error of each one.
+    Consecutive batchable updates are applied together, other messages one by one,
+    so that messages of different types keep their order.
+    The messages following a failed request are not run, the returned errors end
+    with the error of that request.
+    """
+    errors = []
+    batch = []
+    for message in messages + [None]:
+        if message is not None and (
+            message.get("message_type") in message_registry.BATCHABLE
+        ):
+            batch.append(message)
+            continue
+        if batch:
+            logger.info(f"Processing {len(batch)} update events")
+            for error in update_objects_batch(batch):
+                errors.append(error)
+                if isinstance(error, requests.exceptions.RequestException):
+                    return errors
+            batch = []
+        if message is None:
+            break
+        logger.info(f"Processing event: {message.get('message_type')}")
+        try:
+            message_registry.REGISTRY[message.get("message_type")](message)
+        except Exception as e:
+            errors.append(e)
+            if isinstance(e, requests.exceptions.RequestException):
+                return errors
+        else:
+            errors.append(None)
+    return errors
+
+
+def _is_session_expired(error: Exception | None) -> bool:
+    return (
+        isinstance(error, requests.exceptions.RequestException)
+        and error.response is not None
+        and error.response.status_code == 401
+    )
+
+
+class BatchInterrupted(Exception):
+    """A request failed, only the messages of the batch before it were handled."""
+
+    def __init__(self, handled: int, error: requests.exceptions.RequestException):
+        super().__init__(str(error))
+        self.handled = handled
+        self.error = error
+
+
+def _process_messages(messages: list[dict], error_producer) -> int:
+    """
+    Process a batch of messages and return the number of failed messages.
+    Failed messages are sent to the errors topic. Processing stops at the first
+    request error and raises BatchInterrupted, so that the messages handled before
+    it are committed and the following ones get consumed again.
+    """
+    errors = _run_messages(messages)
+
+    if errors and _is_session_expired(errors[-1]):
+        if not settings.AUTO_RENEW_SESSION:
+            logger.error("Session expired. Please run the `auth` command.")
+        else:
+            try:
+                logger.debug(
+                    "Automatic session renewal enabled, attempting silent reauthentication."
+                )
+                _auth(settings.USER_EMAIL, settings.USER_PASSWORD)
+            except Exception as e:
+                logger.error(
+                    "Silent reauthentication failed. Please run the `auth` command.",
+                    e,
+                )
+            else:
+                expired = len(errors) - 1
+                errors[expired:] = _run_messages(messages[expired:])
+
+    request_error = None
+    if errors and isinstance(errors[-1], requests.exceptions.RequestException):
+        request_error = errors.pop()
+
+    failed = 0
+    for message, error in zip(messages, errors):
+        if error is None:
+            continue
+        # NOTE: Errors are reported instead of raised to avoid the dispatcher stopping and not consuming any more messages.
+        failed += 1
+        logger.opt(exception=error).error("Message could not be consumed")
+        error_producer.send(
+            settings.ERRORS_TOPIC,
+            value=json.dumps({"message": message, "error": str(error)}).encode(),
+        )
+
+    if request_error is not None:
+        logger.error("Request failed", response=request_error.response)
+        if request_error.response is not None:
+            logger.error(
+                f"Request failed with status code {request_error.response.status_code} and message: {request_error.response.text}"
+            )
+        raise BatchInterrupted(len(errors), request_error)
+    return failed
+
+
+def _handled_offsets(records: list[tuple], handled: int) -> dict:
+    """
+    The offsets to commit once the first `handled` decoded messages of a batch of
+    (record, message) pairs have been handled.
+    """
+    offsets = {}
+    for record, message in records:
+        if message is not None:
+            if handled == 0:
+                break
+            handled -= 1
+        offsets[TopicPartition(record.topic, record.partition)] = OffsetAndMetadata(
+            record.offset + 1, "", -1
+        )
+    return offsets
+
+
 @click.command()
 def consume():
     """
@@ -91,6 +236,8 @@ def consume():
             # consumer configs
             group_id="my-group",
             auto_offset_reset="earliest",
+            # Offsets are committed once the messages of a batch have been processed
+            enable_auto_commit=False,
             **kafka_cfg,
             # value_deserializer=lambda v: v,
         )
@@ -119,67 +266,32 @@ def consume():
         logger.info(
             f"Dispatcher up and running {'(authenticated)' if kafka_cfg.get('security_protocol') else '(unauthenticated)'}",
         )
-        for msg in consumer:
-            logger.trace("Consumed record.", key=msg.key, value=msg.value)
-            try:
-                message = json.loads(msg.value.decode("utf-8"))
-            except Exception as e:
-                logger.error(f"Error decoding message: {e}")
-                continue
-
-            if message.get("message_type") not in message_registry.REGISTRY:
-                logger.error(
-                    "Message type not supported. Skipping. Check the message registry for supported events.",
-                    message_type=message.get("message_type"),
-                    supported_message_types=list(message_registry.REGISTRY.keys()),
-                )
-                continue
-
-            logger.info(f"Processing event: {message.get('message_type')}")
-
-            # Wrap the processing in a loop that allows for retries.
-            while True:
+        metrics = ConsumerMetrics(settings.METRICS_INTERVAL)
+        while True:
+            records = consumer.poll(
+                timeout_ms=settings.CONSUMER_POLL_TIMEOUT_MS,
+                max_records=settings.CONSUMER_BATCH_SIZE,
+            )
+            batch = [record for partition in records.values() for record in partition]
+            if batch:
+                started = time.monotonic()
+                records = [(record, _decode_record(record)) for record in batch]
+                messages = [message for _, message in records if message is not None]
                 try:
-                    message_registry.REGISTRY[message.get("message_type")](message)
-                except requests.exceptions.RequestException as e:
-                    logger.error("Request failed", response=e.response)
-                    if e.response is not None:
-                        logger.error(
-                            f"Request failed with status code {e.response.status_code} and message: {e.response.text}"
-                        )
-                        if e.response.status_code == 401:
-                            if not settings.AUTO_RENEW_SESSION:
-                                logger.error(
-                                    "Session expired. Please run the `auth` command."
-                                )
-                                raise
-                            try:
-                                logger.debug(
-                                    "Automatic session renewal enabled, attempting silent reauthentication."
-                                )
-                                _auth(settings.USER_EMAIL, settings.USER_PASSWORD)
-                                continue
-                            except Exception as e:
-                                logger.error(
-                                    "Silent reauthentication failed. Please run the `auth` command.",
-                                    e,
-                                )
-                                raise
-                        raise
-
-                except Exception as e:
-                    # NOTE: This exception is necessary to avoid the dispatcher stopping and not consuming any more messages.
-                    logger.exception("Message could not be consumed")
-                    error_producer.send(
-                        settings.ERRORS_TOPIC,
-                        value=json.dumps(
-                            {"message": message, "error": str(e)}
-                        ).encode(),
-                    )
-                    break  # break out of retry loop; we don't want to retry on non-request errors
-                else:
-                    # Processing succeeded; break out of the retry loop.
-                    break
+                    failed = _process_messages(messages, error_producer)
+                except BatchInterrupted as e:
+                    # Messages handled before the failed request must not be
+                    # applied again (attachments would be uploaded twice)
+                    error_producer.flush()
+                    offsets = _handled_offsets(records, e.handled)
+                    if offsets:
+                        consumer.commit(offsets)
+                    raise e.error
+                # Errors must be on their topic before the batch is acknowledged
+                error_producer.flush()
+                consumer.commit()
+                metrics.record_batch(len(batch), failed, time.monotonic() - started)
+            metrics.report(consumer)
 
     except UnsupportedCodecError as e:
         logger.exception("KO", e)
@@ -1,6 +1,10 @@
 import base64
+import copy
 import io
+import json
 import urllib.parse
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from filtering import process_selector
 from s3fs import S3FileSystem
 
@@ -15,9 +19,13 @@ import utils.api as api
 
 class MessageRegistry:
     REGISTRY = {}
+    # Update messages that can be applied in batches, with their resource endpoint
+    BATCHABLE = {}
 
-    def add(self, message):
+    def add(self, message, batch_resource: str | None = None):
         self.REGISTRY[message.__name__] = message
+        if batch_resource:
+            self.BATCHABLE[message.__name__] = batch_resource
 
 
 message_registry = MessageRegistry()
@@ -172,6 +180,130 @@ def update_objects(
     return updated_objects
 
 
+def update_objects_batch(
+    messages: list[dict], max_workers: int = settings.UPDATE_WORKERS
+) -> list[Exception | None]:
+    """
+    Apply several update messages at once, with the result of applying them
+    one by one.
+
+    Each distinct selector is resolved once per resource, then the values of all
+    the messages targeting an object are merged in message order and sent as a
+    single PATCH. PATCH requests run concurrently on at most max_workers threads.
+    Pending updates are applied before resolving a selector that filters on a
+    field they change.
+
+    Args:
+        messages (list): Messages whose type is registered as batchable.
+        max_workers (int): Maximum number of concurrent update requests.
+
+    Returns:
+        list: The error raised for each message, None if it was applied.
+    """
+    errors: list[Exception | None] = [None] * len(messages)
+    selected = {}
+    # (resource, object id) -> [(message index, values), ...] in message order
+    updates = {}
+    updated_fields = defaultdict(set)
+
+    def flush():
+        apply_updates(updates, errors, max_workers)
+        updates.clear()
+        updated_fields.clear()
+        selected.clear()
+
+    for index, message in enumerate(messages):
+        resource_endpoint = message_registry.BATCHABLE[message.get("message_type")]
+        try:
+            selector, values = extract_update_data(message)
+            if updated_fields[resource_endpoint] & set(selector):
+                flush()
+            key = (resource_endpoint, json.dumps(selector, sort_keys=True))
+            if key not in selected:
+                try:
+                    # process_selector mutates the selector it is given
+                    selected[key] = get_object_ids(
+                        copy.deepcopy(selector), resource_endpoint
+                    )
+                except Exception as e:
+                    selected[key] = e
+            if isinstance(selected[key], Exception):
+                raise selected[key]
+        except Exception as e:
+            errors[index] = e
+            continue
+
+        for obj_id in selected[key]:
+            updates.setdefault((resource_endpoint, obj_id), []).append((index, values))
+        updated_fields[resource_endpoint].update(values)
+
+    flush()
+    return errors
+
+
+def apply_updates(
+    updates: dict, errors: list[Exception | None], max_workers: int
+) -> None:
+    """Send the updates of each object concurrently and record the errors of their messages."""
+    if not updates:
+        return
+    logger.info(
+        "Updating objects in batch",
+        messages=len(
+            {
+                index
+                for object_updates in updates.values()
+                for index, _ in object_updates
+            }
+        ),
+        objects=len(updates),
+    )
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(update_object, resource_endpoint, obj_id, object_updates)
+            for (resource_endpoint, obj_id), object_updates in updates.items()
+        ]
+        for future in futures:
+            for index, error in future.result():
+                errors[index] = errors[index] or error
+
+
+def update_object(
+    resource_endpoint: str, obj_id: str, updates: list[tuple[int, dict]]
+) -> list[tuple[int, Exception]]:
+    """
+    Send the merged values of the messages targeting an object as one PATCH.
+    If it is rejected, the messages are sent one by one so that only the
+    invalid ones fail.
+
+    Returns:
+        list: (message index, error) of the messages that could not be applied.
+    """
+    merged_values = {}
+    for _, values in updates:
+        merged_values.update(values)
+    try:
+        update_single_object(resource_endpoint, obj_id, merged_values)
+        return []
+    except Exception as e:
+        if len(updates) == 1:
+            return [(updates[0][0], e)]
+        logger.warning(
+            "Merged update failed, updating message by message",
+            resource=resource_endpoint,
+            id=obj_id,
+            error=str(e),
+        )
+
+    failed = []
+    for index, values in updates:
+        try:
+            update_single_object(resource_endpoint, obj_id, values)
+        except Exception as e:
+            failed.append((index, e))
+    return failed
+
+
 def update_applied_control(message: dict):
     return update_objects(message, "applied-controls")
 
@@ -386,6 +518,8 @@ def upload_attachment(message: dict):
     update_applied_controls_with_evidence(values, evidence_id, file_name)
 
 
-message_registry.add(update_applied_control)
-message_registry.add(update_requirement_assessment)
+message_registry.add(update_applied_control, batch_resource="applied-controls")
+message_registry.add(
+    update_requirement_assessment, batch_resource="requirement-assessments"
+)
 message_registry.add(upload_attachment)
@@ -33,6 +33,11 @@ def load_yaml_config(config_path=DEFAULT_CONFIG_PATH):
         sys.exit(1)
 
 
+def _int_env(name):
+    value = os.getenv(name)
+    return int(value) if value else None
+
+
 def load_env_config():
     """Load configuration values from environment variables."""
     # Note: For booleans, we compare to the string "True"
@@ -60,6 +65,12 @@ def load_env_config():
         "s3_url": os.getenv("S3_URL"),
         "s3_access_key": os.getenv("S3_ACCESS_KEY"),
         "s3_secret_key": os.getenv("S3_SECRET_KEY"),
+        "consumer": {
+            "batch_size": _int_env("CONSUMER_BATCH_SIZE"),
+            "poll_timeout_ms": _int_env("CONSUMER_POLL_TIMEOUT_MS"),
+            "update_workers": _int_env("UPDATE_WORKERS"),
+            "metrics_interval": _int_env("METRICS_INTERVAL"),
+        },
     }
     logger.trace("Loaded environment configuration", config=config)
     return config
@@ -301,6 +312,10 @@ ERRORS_TOPIC = config.get("errors_topic", "errors")
 S3_URL = config.get("s3_url", "http://localhost:9000")
 S3_ACCESS_KEY = config.get("s3_access_key", "")
 S3_SECRET_KEY = config.get("s3_secret_key", "")
+CONSUMER_BATCH_SIZE = config.get("consumer", {}).get("batch_size") or 100
+CONSUMER_POLL_TIMEOUT_MS = config.get("consumer", {}).get("poll_timeout_ms") or 1000
+UPDATE_WORKERS = config.get("consumer", {}).get("update_workers") or 8
+METRICS_INTERVAL = config.get("consumer", {}).get("metrics_interval") or 60
 
 
 def get_access_token(token_file=".tmp.yaml", user_token=None):
@@ -0,0 +1,168 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+import requests
+from kafka import OffsetAndMetadata, TopicPartition
+
+import dispatcher as ds
+
+
+class StopConsuming(BaseException):
+    """Ends the consume loop, which only catches Exception."""
+
+
+class FakeConsumer:
+    def __init__(self, batches, events):
+        self.batches = list(batches)
+        self.events = events
+
+    def poll(self, timeout_ms, max_records):
+        if not self.batches:
+            raise StopConsuming
+        return {"observation-0": self.batches.pop(0)}
+
+    def commit(self, offsets=None):
+        self.events.append("commit" if offsets is None else ("commit", offsets))
+
+    def assignment(self):
+        return set()
+
+    def close(self):
+        pass
+
+
+class FakeProducer:
+    def __init__(self, events):
+        self.events = events
+        self.sent = []
+
+    def send(self, topic, value):
+        self.sent.append((topic, json.loads(value)))
+        self.events.append("send")
+
+    def flush(self):
+        self.events.append("flush")
+
+    def close(self):
+        pass
+
+
+def record(message, offset=0):
+    return SimpleNamespace(
+        topic="observation",
+        partition=0,
+        offset=offset,
+        key=None,
+        value=json.dumps(message).encode(),
+    )
+
+
+@pytest.fixture
+def kafka(monkeypatch):
+    events = []
+    batches = [
+        [
+            record({"message_type": "update_applied_control", "values": {}}),
+            record({"message_type": "upload_attachment"}, offset=1),
+            record({"message_type": "upload_attachment"}, offset=2),
+        ]
+    ]
+    consumer = FakeConsumer(batches, events)
+    producer = FakeProducer(events)
+    monkeypatch.setattr(ds, "build_kafka_config", lambda: {})
+    monkeypatch.setattr(ds, "KafkaConsumer", lambda *args, **kwargs: consumer)
+    monkeypatch.setattr(ds, "KafkaProducer", lambda *args, **kwargs: producer)
+    return events, producer
+
+
+def test_batch_is_committed_once_processed(kafka, monkeypatch):
+    events, producer = kafka
+
+    def run_messages(messages):
+        events.append(f"process {len(messages)}")
+        return [Exception("invalid"), None, None]
+
+    monkeypatch.setattr(ds, "_run_messages", run_messages)
+
+    with pytest.raises(StopConsuming):
+        ds.consume.callback()
+
+    assert events[:4] == ["process 3", "send", "flush", "commit"]
+    assert producer.sent[0][1]["error"] == "invalid"
+
+
+def test_batch_is_not_committed_when_its_first_request_fails(kafka, monkeypatch):
+    events, producer = kafka
+
+    def run_messages(messages):
+        return [requests.exceptions.ConnectionError("down")]
+
+    monkeypatch.setattr(ds, "_run_messages", run_messages)
+
+    ds.consume.callback()
+
+    assert not any("commit" in event for event in events)
+    assert producer.sent == []
+
+
+def test_messages_before_a_failed_request_are_committed(kafka, monkeypatch):
+    events, producer = kafka
+
+    def run_messages(messages):
+        return [Exception("invalid"), requests.exceptions.ConnectionError("down")]
+
+    monkeypatch.setattr(ds, "_run_messages", run_messages)
+
+    ds.consume.callback()
+
+    # The failed message and the ones after it get consumed again
+    assert events == [
+        "send",
+        "flush",
+        ("commit", {TopicPartition("observation", 0): OffsetAndMetadata(1, "", -1)}),
+        "flush",
+    ]
+    assert producer.sent[0][1]["error"] == "invalid"
+
+
+def test_messages_after_a_failed_request_are_not_run(monkeypatch):
+    calls = []
+
+    def upload(message):
+        calls.append(message["id"])
+        if message["id"] == 2:
+            raise requests.exceptions.ConnectionError("down")
+
+    monkeypatch.setitem(ds.message_registry.REGISTRY, "upload_attachment", upload)
+    messages = [{"message_type": "upload_attachment", "id": i} for i in range(1, 4)]
+
+    errors = ds._run_messages(messages)
+
+    assert calls == [1, 2]
+    assert errors[0] is None
+    assert isinstance(errors[1], requests.exceptions.ConnectionError)
+    assert len(errors) == 2
+
+
+def test_consecutive_updates_are_batched_in_order(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        ds,
+        "update_objects_batch",
+        lambda batch: calls.append([m["id"] for m in batch]) or [None] * len(batch),
+    )
+    monkeypatch.setitem(
+        ds.message_registry.REGISTRY,
+        "upload_attachment",
+        lambda message: calls.append(message["id"]),
+    )
+    messages = [
+        {"message_type": "update_applied_control", "id": 1},
+        {"message_type": "update_requirement_assessment", "id": 2},
+        {"message_type": "upload_attachment", "id": 3},
+        {"message_type": "update_applied_control", "id": 4},
+    ]
+
+    assert ds._run_messages(messages) == [None] * 4
+    assert calls == [[1, 2], 3, [4]]
@@ -0,0 +1,110 @@
+import pytest
+
+import messages
+from messages import update_objects_batch
+
+
+def update_message(selector, values, message_type="update_applied_control"):
+    return {"message_type": message_type, "selector": selector, "values": values}
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """Fake API: objects by id, selectors match on field values."""
+    objects = {
+        "1": {"ref_id": "AC-1", "status": "to_do"},
+        "2": {"ref_id": "AC-2", "status": "to_do"},
+    }
+    calls = {"selectors": [], "patches": []}
+
+    def get_object_ids(selector, resource_endpoint, selector_mapping=None):
+        selector.pop("target", None)
+        calls["selectors"].append(dict(selector))
+        ids = [
+            obj_id
+            for obj_id, fields in objects.items()
+            if all(fields.get(key) == value for key, value in selector.items())
+        ]
+        if not ids:
+            raise Exception("No objects matched the provided selector.")
+        return ids
+
+    def update_single_object(resource_endpoint, obj_id, values):
+        calls["patches"].append((obj_id, dict(values)))
+        if "invalid" in values:
+            raise Exception(f"Failed to update {resource_endpoint} {obj_id}: 400")
+        objects[obj_id].update(values)
+        return {"id": obj_id, **objects[obj_id]}
+
+    monkeypatch.setattr(messages, "get_object_ids", get_object_ids)
+    monkeypatch.setattr(messages, "update_single_object", update_single_object)
+    return objects, calls
+
+
+def test_values_of_messages_targeting_an_object_are_merged(api):
+    objects, calls = api
+
+    errors = update_objects_batch(
+        [
+            update_message({"ref_id": "AC-1"}, {"status": "active"}),
+            update_message({"ref_id": "AC-1"}, {"name": "Firewall"}),
+            update_message({"ref_id": "AC-2"}, {"status": "deprecated"}),
+        ]
+    )
+
+    assert errors == [None, None, None]
+    assert calls["selectors"] == [{"ref_id": "AC-1"}, {"ref_id": "AC-2"}]
+    assert sorted(calls["patches"]) == [
+        ("1", {"status": "active", "name": "Firewall"}),
+        ("2", {"status": "deprecated"}),
+    ]
+
+
+def test_rejected_merged_update_falls_back_to_each_message(api):
+    objects, calls = api
+
+    errors = update_objects_batch(
+        [
+            update_message({"ref_id": "AC-1"}, {"status": "active"}),
+            update_message({"ref_id": "AC-1"}, {"invalid": "value"}),
+            update_message({"ref_id": "AC-1"}, {"name": "Firewall"}),
+        ]
+    )
+
+    assert errors[0] is None
+    assert "400" in str(errors[1])
+    assert errors[2] is None
+    assert objects["1"]["status"] == "active"
+    assert objects["1"]["name"] == "Firewall"
+
+
+def test_selectors_see_the_updates_of_earlier_messages(api):
+    objects, calls = api
+
+    errors = update_objects_batch(
+        [
+            update_message({"ref_id": "AC-1"}, {"status": "active"}),
+            update_message({"status": "active", "target": "multiple"}, {"name": "On"}),
+        ]
+    )
+
+    assert errors == [None, None]
+    assert calls["patches"] == [("1", {"status": "active"}), ("1", {"name": "On"})]
+    assert "name" not in objects["2"]
+
+
+def test_selector_errors_are_reported_per_message(api):
+    objects, calls = api
+
+    errors = update_objects_batch(
+        [
+            update_message({"ref_id": "AC-3"}, {"status": "active"}),
+            update_message({"ref_id": "AC-2"}, {}),
+            update_message({"ref_id": "AC-1"}, {"status": "active"}),
+        ]
+    )
+
+    assert "No objects matched" in str(errors[0])
+    assert "No update values" in str(errors[1])
+    assert errors[2] is None
+    assert calls["patches"] == [("1", {"status": "active"})]
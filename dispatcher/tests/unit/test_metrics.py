@@ -0,0 +1,58 @@
+from collections import namedtuple
+
+from utils import metrics
+from utils.metrics import ConsumerMetrics
+
+TopicPartition = namedtuple("TopicPartition", ["topic", "partition"])
+
+
+class FakeConsumer:
+    def __init__(self, end_offsets, positions):
+        self._end_offsets = end_offsets
+        self._positions = positions
+
+    def assignment(self):
+        return set(self._end_offsets)
+
+    def end_offsets(self, partitions):
+        return {tp: self._end_offsets[tp] for tp in partitions}
+
+    def position(self, tp):
+        return self._positions[tp]
+
+
+def test_lag_by_partition():
+    first = TopicPartition("observation", 0)
+    second = TopicPartition("observation", 1)
+    consumer = FakeConsumer({first: 10, second: 5}, {first: 4, second: 5})
+
+    assert ConsumerMetrics.lag(consumer) == {
+        "observation[0]": 6,
+        "observation[1]": 0,
+    }
+
+
+def test_report_logs_once_per_interval(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(metrics.time, "monotonic", lambda: now[0])
+    reports = []
+    monkeypatch.setattr(
+        metrics.logger, "info", lambda message, **fields: reports.append(fields)
+    )
+    consumer = FakeConsumer({}, {})
+    consumer_metrics = ConsumerMetrics(interval=60)
+
+    consumer_metrics.record_batch(consumed=30, failed=1, duration=0.5)
+    consumer_metrics.record_batch(consumed=30, failed=0, duration=1.5)
+    now[0] = 130.0
+    consumer_metrics.report(consumer)
+    assert reports == []
+
+    now[0] = 160.0
+    consumer_metrics.report(consumer)
+
+    assert reports[0]["consumed"] == 60
+    assert reports[0]["failed"] == 1
+    assert reports[0]["throughput"] == "1.0 msg/s"
+    assert reports[0]["average_batch_time"] == "1.000s"
+    assert consumer_metrics.consumed == 0
@@ -1,7 +1,12 @@
 import requests
-from settings import API_URL, get_access_token
+from requests.adapters import HTTPAdapter
+from settings import API_URL, UPDATE_WORKERS, get_access_token
 
 session = requests.Session()
+# Updates are sent concurrently, keep one connection per worker
+adapter = HTTPAdapter(pool_connections=UPDATE_WORKERS, pool_maxsize=UPDATE_WORKERS)
+session.mount("http://", adapter)
+session.mount("https://", adapter)
 
 
 def update_session_token():
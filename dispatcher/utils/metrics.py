@@ -0,0 +1,65 @@
+import time
+
+from kafka.errors import KafkaError
+from loguru import logger
+
+
+class ConsumerMetrics:
+    """
+    Throughput and lag of the consumer, logged every `interval` seconds.
+    """
+
+    def __init__(self, interval: int):
+        self.interval = interval
+        self._reset(time.monotonic())
+
+    def _reset(self, now: float):
+        self.started = now
+        self.consumed = 0
+        self.failed = 0
+        self.batches = 0
+        self.processing_time = 0.0
+
+    def record_batch(self, consumed: int, failed: int, duration: float):
+        self.consumed += consumed
+        self.failed += failed
+        self.batches += 1
+        self.processing_time += duration
+
+    @staticmethod
+    def lag(consumer) -> dict:
+        """Number of records left to consume on each assigned partition."""
+        partitions = list(consumer.assignment())
+        if not partitions:
+            return {}
+        end_offsets = consumer.end_offsets(partitions)
+        return {
+            f"{tp.topic}[{tp.partition}]": max(
+                end_offsets[tp] - consumer.position(tp), 0
+            )
+            for tp in partitions
+        }
+
+    def report(self, consumer):
+        now = time.monotonic()
+        elapsed = now - self.started
+        if elapsed < self.interval:
+            return
+        try:
+            lag = self.lag(consumer)
+        except KafkaError as e:
+            logger.debug("Could not compute consumer lag", error=str(e))
+            lag = {}
+        logger.info(
+            "Consumer metrics",
+            consumed=self.consumed,
+            failed=self.failed,
+            batches=self.batches,
+            throughput=f"{self.consumed / elapsed:.1f} msg/s" if elapsed else None,
+            average_batch_time=f"{self.processing_time / self.batches:.3f}s"
+            if self.batches
+            else None,
+            lag=sum(lag.values()),
+            lag_by_partition=lag,
+        )
+        self._reset(now)